@@ -0,0 +1,149 @@
+import atexit
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from name_index import isim_normalize
+
+
+def metni_normalize_et(metin):
+    """
+    Önbellek anahtarı için metni sadeleştirir: fazla boşluklar, büyük/küçük harf
+    ve Türkçe karakter farkları ('VİNÇ' / 'vinç' / 'vinc') yok sayılır.
+    """
+    return isim_normalize(metin or "")
+
+
+class AnalizOnbellegi:
+    """
+    metin_analiz_et sonuçları için LRU + TTL önbelleği.
+    Anahtar; normalize edilmiş metin, model adı ve prompt sürümünden oluşur.
+    Kayıtlar diske JSON olarak yazılır, böylece Streamlit yeniden başlasa da korunur.
+    """
+
+    def __init__(self, dosya=None, max_boyut=5000, ttl=7 * 24 * 3600, kaydetme_araligi=20):
+        """
+        :param dosya: Kalıcı kayıt dosyası; None ise yalnızca bellekte tutulur.
+        :param max_boyut: En fazla kayıt sayısı; aşılınca en eski kullanılan atılır.
+        :param ttl: Kaydın geçerlilik süresi (saniye).
+        :param kaydetme_araligi: Bu kadar yeni kayıttan sonra dosya güncellenir.
+        """
+        self.dosya = dosya
+        self.max_boyut = max_boyut
+        self.ttl = ttl
+        self.kaydetme_araligi = kaydetme_araligi
+        self._kayitlar = OrderedDict()  # anahtar -> (zaman, sonuç)
+        self._kilit = threading.Lock()
+        # Eşzamanlı kaydetmelerin dosyayı sırayla yazması için (okuma/yazma kilidini tutmaz)
+        self._yazma_kilidi = threading.Lock()
+        self._kirli = 0
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        if dosya:
+            self.yukle()
+            atexit.register(self.kaydet)
+
+    @staticmethod
+    def anahtar(metin, model, surum):
+        ham = f"{surum}\x1f{model}\x1f{metni_normalize_et(metin)}"
+        return hashlib.sha1(ham.encode("utf-8")).hexdigest()
+
+    def al(self, metin, model, surum):
+        """Geçerli bir kayıt varsa sonucun kopyasını, yoksa None döndürür."""
+        anahtar = self.anahtar(metin, model, surum)
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None and time.time() - kayit[0] > self.ttl:
+                del self._kayitlar[anahtar]
+                kayit = None
+            if kayit is None:
+                self.iska += 1
+                return None
+            self._kayitlar.move_to_end(anahtar)
+            self.isabet += 1
+            return copy.deepcopy(kayit[1])
+
+    def koy(self, metin, model, surum, sonuc):
+        """Sonucu önbelleğe ekler."""
+        anahtar = self.anahtar(metin, model, surum)
+        kaydet = False
+        with self._kilit:
+            self._kayitlar[anahtar] = (time.time(), copy.deepcopy(sonuc))
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.max_boyut:
+                self._kayitlar.popitem(last=False)
+                self.tahliye += 1
+            self._kirli += 1
+            if self.dosya and self._kirli >= self.kaydetme_araligi:
+                kaydet = True
+        if kaydet:
+            self.kaydet()
+
+    def istatistik(self):
+        """İsabet/ıska sayıları, isabet oranı ve boyut bilgisini döndürür."""
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                "isabet": self.isabet,
+                "iska": self.iska,
+                "isabet_orani": self.isabet / toplam if toplam else 0.0,
+                "boyut": len(self._kayitlar),
+                "tahliye": self.tahliye,
+            }
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+            self._kirli += 1
+
+    def kaydet(self):
+        """
+        Kayıtları benzersiz bir geçici dosyaya yazıp atomik olarak yerine taşır.
+        Yazma başarısız olursa kayıtlar kirli kalır ve sonraki kaydetmede yeniden denenir.
+        """
+        if not self.dosya:
+            return
+        with self._yazma_kilidi:
+            with self._kilit:
+                if not self._kirli:
+                    return
+                veri = [[anahtar, zaman, sonuc] for anahtar, (zaman, sonuc) in self._kayitlar.items()]
+                kirli, self._kirli = self._kirli, 0
+            gecici = None
+            try:
+                with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, suffix=".tmp",
+                                                 dir=os.path.dirname(os.path.abspath(self.dosya)),
+                                                 prefix=os.path.basename(self.dosya) + ".") as f:
+                    gecici = f.name
+                    json.dump(veri, f, ensure_ascii=False, default=str)
+                os.replace(gecici, self.dosya)
+            except OSError as e:
+                print(f"Analiz önbelleği kaydedilemedi: {e}")
+                with self._kilit:
+                    self._kirli += kirli
+                if gecici and os.path.exists(gecici):
+                    try:
+                        os.remove(gecici)
+                    except OSError:
+                        pass
+
+    def yukle(self):
+        """Dosyadaki süresi geçmemiş kayıtları belleğe alır."""
+        if not self.dosya or not os.path.exists(self.dosya):
+            return
+        try:
+            with open(self.dosya, encoding="utf-8") as f:
+                veri = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Analiz önbelleği okunamadı: {e}")
+            return
+        simdi = time.time()
+        with self._kilit:
+            for anahtar, zaman, sonuc in veri[-self.max_boyut:]:
+                if simdi - zaman <= self.ttl:
+                    self._kayitlar[anahtar] = (zaman, sonuc)
@@ -0,0 +1,191 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# DatabaseManager.analiz_satirlari_al ile aynı sütun sırası
+SUTUNLAR = ['Personel', 'Arac', 'Durum', 'Baslangic_tarihi', 'Tahmini_bitis', 'Bitis_tarihi']
+KATEGORIK_SUTUNLAR = ['Personel', 'Arac', 'Durum']
+GUNLER = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
+
+
+def araliklari_hazirla(tamamlanan, aktif=None, simdi=None):
+    """
+    Tamamlanan ve aktif işleri tek bir aralık tablosunda birleştirir.
+    Aktif işlerin bitişi 'simdi' kabul edilir; başlangıcı bilinmeyen satırlar (Baslangic_tarihi
+    sütunu eklenmeden önce yazılanlar) atılır ve sayıları attrs["baslangici_bilinmeyen"]e yazılır.
+    :param tamamlanan: SUTUNLAR sırasında satırlar veya DataFrame (ör. GorevArsivi.sorgula sonucu).
+    :param aktif: Aktif işler, aynı biçimde.
+    :return: DataFrame - Personel/Arac/Durum kategorik; Baslangic, Bitis, Tahmini_bitis zaman; Aktif bool.
+    """
+    simdi = pd.Timestamp(simdi or datetime.now())
+    parcalar = []
+    for satirlar, aktif_mi in ((tamamlanan, False), (aktif, True)):
+        if satirlar is None:
+            continue
+        if isinstance(satirlar, pd.DataFrame):
+            df = satirlar.reindex(columns=SUTUNLAR)
+        else:
+            df = pd.DataFrame.from_records(list(satirlar), columns=SUTUNLAR)
+        df["Aktif"] = aktif_mi
+        parcalar.append(df)
+    df = pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame(columns=SUTUNLAR + ["Aktif"])
+
+    for sutun in ("Baslangic_tarihi", "Tahmini_bitis", "Bitis_tarihi"):
+        df[sutun] = pd.to_datetime(df[sutun], errors="coerce").astype("datetime64[us]")
+    df["Aktif"] = df["Aktif"].astype(bool)
+    df.loc[df["Aktif"], "Bitis_tarihi"] = simdi
+    bilinmeyen = int(df["Baslangic_tarihi"].isna().sum())
+    df = df[df["Baslangic_tarihi"].notna() & (df["Bitis_tarihi"] >= df["Baslangic_tarihi"])]
+    df = df.rename(columns={"Baslangic_tarihi": "Baslangic", "Bitis_tarihi": "Bitis"})
+    for sutun in KATEGORIK_SUTUNLAR:
+        df[sutun] = df[sutun].astype("category")
+    df = df.reset_index(drop=True)
+    df.attrs["baslangici_bilinmeyen"] = bilinmeyen
+    return df
+
+
+class KullanimAnalizi:
+    """
+    Araç ve personel kullanımını görev aralıkları üzerinden hesaplar.
+    Aynı araç/personelin çakışan işleri önce meşguliyet bloklarına birleştirilir;
+    kullanım oranı, boşta kalma süreleri ve saatlik doluluk bu bloklardan çıkarılır.
+    Tüm hesaplar satır satır döngü yerine sıralama, grup işlemleri ve NumPy
+    dizileriyle yapılır; bir yıllık geçmiş saniyenin altında işlenir.
+    """
+
+    def __init__(self, araliklar, baslangic=None, bitis=None):
+        """
+        :param araliklar: araliklari_hazirla sonucu.
+        :param baslangic: Analiz penceresinin başı (varsayılan: ilk işin başlangıcı).
+        :param bitis: Analiz penceresinin sonu (varsayılan: son işin bitişi).
+        """
+        self.baslangic = pd.Timestamp(baslangic) if baslangic is not None else araliklar["Baslangic"].min()
+        self.bitis = pd.Timestamp(bitis) if bitis is not None else araliklar["Bitis"].max()
+        # Gecikme hesabı kırpılmamış bitişle yapılır; diğer hesaplar pencereye kırpılmış aralıklarla
+        df = araliklar[(araliklar["Bitis"] > self.baslangic) & (araliklar["Baslangic"] < self.bitis)].copy()
+        df["Gercek_bitis"] = df["Bitis"]
+        df["Baslangic"] = df["Baslangic"].clip(lower=self.baslangic)
+        df["Bitis"] = df["Bitis"].clip(upper=self.bitis)
+        self.araliklar = df.reset_index(drop=True)
+        self._bloklar = {}
+
+    @property
+    def pencere_saat(self):
+        if pd.isna(self.baslangic) or pd.isna(self.bitis):
+            return 0.0
+        return max((self.bitis - self.baslangic) / pd.Timedelta(hours=1), 0.0)
+
+    def bloklar(self, anahtar="Arac"):
+        """
+        Aynı araç/personelin çakışan veya uç uca eklenen işlerini birleştirir.
+        Her işin başlangıcı, grubunda kendisinden önce gelen işlerin en geç bitişinden
+        sonraysa yeni bir blok başlar (cummax + shift).
+        :param anahtar: "Arac" veya "Personel".
+        :return: DataFrame - anahtar, Baslangic, Bitis, Is_sayisi.
+        """
+        if anahtar not in self._bloklar:
+            df = self.araliklar[self.araliklar[anahtar].notna()].sort_values([anahtar, "Baslangic"])
+            onceki_bitis = df.groupby(anahtar, observed=True)["Bitis"].cummax() \
+                .groupby(df[anahtar], observed=True).shift()
+            blok_no = (onceki_bitis.isna() | (df["Baslangic"] > onceki_bitis)).cumsum()
+            bloklar = df.groupby(blok_no, sort=True).agg(
+                **{anahtar: (anahtar, "first"),
+                   "Baslangic": ("Baslangic", "min"),
+                   "Bitis": ("Bitis", "max"),
+                   "Is_sayisi": ("Baslangic", "size")})
+            bloklar[anahtar] = bloklar[anahtar].astype(df[anahtar].dtype)
+            self._bloklar[anahtar] = bloklar.reset_index(drop=True)
+        return self._bloklar[anahtar]
+
+    def kullanim(self, anahtar="Arac"):
+        """
+        Pencere içindeki meşgul süre ve kullanım oranı.
+        :return: anahtar indeksli DataFrame - Is_sayisi, Mesgul_saat, Kullanim_orani (0-1), Ortalama_is_saat.
+        """
+        bloklar = self.bloklar(anahtar)
+        mesgul = (bloklar["Bitis"] - bloklar["Baslangic"]) / pd.Timedelta(hours=1)
+        ozet = mesgul.groupby(bloklar[anahtar], observed=True).sum().to_frame("Mesgul_saat")
+        df = self.araliklar[self.araliklar[anahtar].notna()]
+        is_suresi = (df["Bitis"] - df["Baslangic"]) / pd.Timedelta(hours=1)
+        isler = is_suresi.groupby(df[anahtar], observed=True).agg(["size", "mean"])
+        ozet.insert(0, "Is_sayisi", isler["size"])
+        ozet["Kullanim_orani"] = ozet["Mesgul_saat"] / self.pencere_saat if self.pencere_saat else 0.0
+        ozet["Ortalama_is_saat"] = isler["mean"]
+        ozet.index.name = anahtar
+        return ozet.sort_values("Kullanim_orani", ascending=False)
+
+    def bosluklar(self, anahtar="Arac"):
+        """
+        Ardışık meşguliyet blokları arasındaki boşta kalma aralıkları.
+        :return: DataFrame - anahtar, Baslangic, Bitis, Sure_saat.
+        """
+        bloklar = self.bloklar(anahtar)
+        sonraki = bloklar.groupby(anahtar, observed=True)["Baslangic"].shift(-1)
+        bosluk = pd.DataFrame({anahtar: bloklar[anahtar], "Baslangic": bloklar["Bitis"], "Bitis": sonraki})
+        bosluk = bosluk[bosluk["Bitis"].notna()].reset_index(drop=True)
+        bosluk["Sure_saat"] = (bosluk["Bitis"] - bosluk["Baslangic"]) / pd.Timedelta(hours=1)
+        return bosluk
+
+    def bosluk_ozeti(self, anahtar="Arac"):
+        """:return: anahtar indeksli DataFrame - Bosluk_sayisi, Ortalama_bosluk_saat, En_uzun_bosluk_saat."""
+        return self.bosluklar(anahtar).groupby(anahtar, observed=True)["Sure_saat"].agg(
+            Bosluk_sayisi="size", Ortalama_bosluk_saat="mean", En_uzun_bosluk_saat="max")
+
+    def asimlar(self, anahtar="Arac"):
+        """
+        Tahmini bitişe göre gecikmeler. Tamamlanan işlerde gerçek bitiş, aktif işlerde
+        şimdiki zaman tahmini bitişle karşılaştırılır.
+        :return: anahtar indeksli DataFrame - Tahminli_is, Geciken_is, Gecikme_orani,
+            Ortalama_gecikme_dk (yalnızca gecikenler), Suresi_gecen_aktif.
+        """
+        df = self.araliklar[self.araliklar[anahtar].notna() & self.araliklar["Tahmini_bitis"].notna()]
+        gecikme_dk = (df["Gercek_bitis"] - df["Tahmini_bitis"]) / pd.Timedelta(minutes=1)
+        gecikti = gecikme_dk > 0
+        grup = df[anahtar]
+        ozet = pd.DataFrame({
+            "Tahminli_is": gecikme_dk.groupby(grup, observed=True).size(),
+            "Geciken_is": gecikti.groupby(grup, observed=True).sum(),
+            "Ortalama_gecikme_dk": gecikme_dk.where(gecikti).groupby(grup, observed=True).mean(),
+            "Suresi_gecen_aktif": (gecikti & df["Aktif"]).groupby(grup, observed=True).sum(),
+        })
+        ozet.insert(2, "Gecikme_orani", ozet["Geciken_is"] / ozet["Tahminli_is"])
+        ozet.index.name = anahtar
+        return ozet
+
+    def ozet(self, anahtar="Arac"):
+        """Kullanım, boşluk ve gecikme tablolarının birleşimi."""
+        return self.kullanim(anahtar).join(self.bosluk_ozeti(anahtar)).join(self.asimlar(anahtar))
+
+    def saatlik_doluluk(self, anahtar="Arac", secim=None):
+        """
+        Haftanın günü x günün saati doluluk ısı haritası: o saatte ortalama kaç
+        araç/personel meşguldü. Bloklar dakika çözünürlüğünde bir fark dizisine
+        (+1 başlangıç, -1 bitiş) işlenir, kümülatif toplamla eş zamanlı meşguliyet
+        bulunur ve saatlik ortalamaları gün/saate göre toplanır. Pencerenin tamamına
+        girmeyen uç saatler ortalamaya katılmaz.
+        :param secim: Yalnızca bu araç/personel adları için hesapla.
+        :return: GUNLER x 0-23 DataFrame.
+        """
+        bloklar = self.bloklar(anahtar)
+        if secim:
+            bloklar = bloklar[bloklar[anahtar].isin(list(secim))]
+        if pd.isna(self.baslangic) or pd.isna(self.bitis):
+            return pd.DataFrame(np.nan, index=GUNLER, columns=range(24))
+
+        t0 = self.baslangic.floor("h")
+        saat_sayisi = int(np.ceil((self.bitis - t0) / pd.Timedelta(hours=1)))
+        dakika = pd.Timedelta(minutes=1)
+        bas = ((bloklar["Baslangic"] - t0) // dakika).to_numpy(dtype=np.int64)
+        bit = ((bloklar["Bitis"] - t0) // dakika).to_numpy(dtype=np.int64)
+        uzunluk = saat_sayisi * 60 + 1
+        fark = np.bincount(bas, minlength=uzunluk) - np.bincount(bit, minlength=uzunluk)
+        es_zamanli = np.cumsum(fark[:saat_sayisi * 60])
+        saatlik = es_zamanli.reshape(saat_sayisi, 60).mean(axis=1)
+
+        saatler = t0 + pd.to_timedelta(np.arange(saat_sayisi), unit="h")
+        tam = (saatler >= self.baslangic) & (saatler + pd.Timedelta(hours=1) <= self.bitis)
+        tablo = pd.DataFrame({"Gun": saatler.dayofweek[tam], "Saat": saatler.hour[tam], "Doluluk": saatlik[tam]}) \
+            .pivot_table(index="Gun", columns="Saat", values="Doluluk", aggfunc="mean")
+        tablo = tablo.reindex(index=range(7), columns=range(24))
+        tablo.index = GUNLER
+        return tablo
@@ -0,0 +1,82 @@
+import os
+from datetime import date, datetime, time, timedelta
+import altair as alt
+import pandas as pd
+import streamlit as st
+from analytics import GUNLER, araliklari_hazirla, KullanimAnalizi
+import task_archive
+from task_archive import GorevArsivi
+
+GRUPLAMALAR = {"Arac": "Araç", "Personel": "Personel"}
+# Arşiv ayları bitişe göre bölünür; pencerenin sonundan bu kadar sonra biten işler de okunur ki
+# pencerede başlayıp sonra biten işler kaybolmasın (daha uzun işlerin pencere içi kısmı eksik kalır)
+ARSIV_PAYI = timedelta(days=7)
+
+
+@st.cache_data(ttl=300, show_spinner="Analiz verisi okunuyor...")
+def analiz_verisi_oku(_db_manager, baslangic, bitis, arsiv_dahil, surumler):
+    """
+    Pencereyle kesişen işleri okur; 'surumler' tablolara yazıldığında önbelleği geçersiz kılar.
+    :return: araliklari_hazirla sonucu; okunamazsa None.
+    """
+    satirlar = _db_manager.analiz_satirlari_al(baslangic, bitis)
+    if satirlar is None:
+        return None
+    tamamlanan = pd.DataFrame.from_records(satirlar["Tamamlanan_isler"], columns=_db_manager.ANALIZ_SUTUNLARI)
+    if arsiv_dahil:
+        # Arşive taşınmış eski işler canlı tablodaki işlerle birlikte analiz edilir
+        arsiv = GorevArsivi(os.getenv("ARSIV_DIZINI", "arsiv")).sorgula(baslangic=baslangic, bitis=bitis + ARSIV_PAYI)
+        tamamlanan = pd.concat([arsiv.reindex(columns=tamamlanan.columns), tamamlanan], ignore_index=True)
+    return araliklari_hazirla(tamamlanan, satirlar["Aktif_isler"])
+
+
+def analiz_sayfasi(db_manager):
+    """Araç ve personel kullanımı, boşta kalma, gecikme ve saatlik doluluk panosu."""
+    st.subheader("Kullanım Analizi")
+    sol, orta, sag = st.columns([2, 1, 1])
+    aralik = sol.date_input("Tarih aralığı", value=(date.today() - timedelta(days=30), date.today()))
+    anahtar = orta.radio("Gruplama", list(GRUPLAMALAR), format_func=GRUPLAMALAR.get, horizontal=True)
+    arsiv_var = task_archive.pa is not None and bool(GorevArsivi(os.getenv("ARSIV_DIZINI", "arsiv")).aylar())
+    arsiv_dahil = sag.checkbox("Arşivi dahil et", value=False, disabled=not arsiv_var)
+    if len(aralik) != 2:
+        st.info("Başlangıç ve bitiş tarihini seçin.")
+        return
+
+    baslangic = datetime.combine(aralik[0], time.min)
+    bitis = min(datetime.combine(aralik[1], time.min) + timedelta(days=1), datetime.now())
+    araliklar = analiz_verisi_oku(db_manager, baslangic, bitis, arsiv_dahil,
+                                  (db_manager.tablo_surumu("Aktif_isler"), db_manager.tablo_surumu("Tamamlanan_isler")))
+    if araliklar is None:
+        st.error("Analiz verisi okunamadı.")
+        return
+    bilinmeyen = araliklar.attrs.get("baslangici_bilinmeyen", 0)
+    if bilinmeyen:
+        st.warning(f"Başlangıç zamanı kaydedilmemiş {bilinmeyen} iş (Baslangic_tarihi sütunundan önceki kayıtlar) "
+                   "analize dahil edilmedi; kullanım oranları eksik olabilir.")
+    if araliklar.empty:
+        st.info("Bu aralıkta başlangıç zamanı bilinen iş yok.")
+        return
+
+    analiz = KullanimAnalizi(araliklar, baslangic, bitis)
+    ozet = analiz.ozet(anahtar)
+    st.dataframe(ozet, use_container_width=True, column_config={
+        "Kullanim_orani": st.column_config.ProgressColumn("Kullanım", format="%.2f", min_value=0, max_value=1),
+        "Gecikme_orani": st.column_config.NumberColumn("Gecikme oranı", format="%.2f"),
+    })
+    st.bar_chart(ozet["Kullanim_orani"])
+
+    secim = st.multiselect(f"Isı haritası için {GRUPLAMALAR[anahtar].lower()} seçin (boş: hepsi)",
+                           ozet.index.tolist())
+    isi = analiz.saatlik_doluluk(anahtar, secim)
+    veri = isi.reset_index(names="Gün").melt(id_vars="Gün", var_name="Saat", value_name="Doluluk")
+    grafik = alt.Chart(veri).mark_rect().encode(
+        x=alt.X("Saat:O"),
+        y=alt.Y("Gün:N", sort=GUNLER),
+        color=alt.Color("Doluluk:Q", scale=alt.Scale(scheme="orangered")),
+        tooltip=["Gün", "Saat", alt.Tooltip("Doluluk:Q", format=".2f")],
+    )
+    st.caption("Saatlik doluluk: o saatte ortalama kaç " + GRUPLAMALAR[anahtar].lower() + " meşguldü")
+    st.altair_chart(grafik, use_container_width=True)
+
+    with st.expander("En uzun boşta kalma aralıkları"):
+        st.dataframe(analiz.bosluklar(anahtar).nlargest(20, "Sure_saat"), use_container_width=True)
@@ -4,24 +4,277 @@ from dotenv import load_dotenv
 import os
 from datetime import datetime, timedelta
 from operator_manager import OperatorYoneticisi
-from ollama import metin_analiz_et
+from ollama import metin_analiz_et, kural_sozlugu_baglan, ayristirma_istatistikleri
 from arac_yoneticisi import AracYoneticisi
-from is_yoneticisi import IsYoneticisi
+from is_yoneticisi import IsYoneticisi, bitis_zamani_hesapla
 from database_manager import DatabaseManager
-from sqlalchemy import create_engine
+from batch_ingest import TopluKomutIsleyici
+from database_backends import backend_olustur
+from change_feed import DegisiklikAkisi
+from deadline_scheduler import BitisZamanlayici
+from fleet_store import FiloAynasi
+from reservation import RezervasyonDefteri, arac_turu
+from dispatch_optimizer import GorevDagitici
+from analytics_page import analiz_sayfasi
+from metrics import KAYIT, havuz_metrikleri, metrik_sunucusunu_baslat
+from sql_tracer import sql_komutu
+
+load_dotenv()
+
+# Pano tabloları değişiklik akışıyla bu aralıkta (saniye) yenilenir; değişiklik izleme
+# yoksa tablolar en geç TABLO_ONBELLEK_SURESI saniyede bir tam okunur
+PANO_YENILEME_ARALIGI = int(os.getenv("PANO_YENILEME_ARALIGI", "5"))
+TABLO_ONBELLEK_SURESI = int(os.getenv("TABLO_ONBELLEK_SURESI", "30"))
+# {tablo: (gösterilecek sütunlar, anahtar sütun)}
+PANO_TABLOLARI = {
+    "Aktif_isler": (["Personel", "Arac", "Gorev", "Tahmini_bitis", "Durum"], "ID"),
+    "Personeller": (["Personel", "Durum", "Arac"], "Personel"),
+    "Araclar": (["Arac", "Durum"], "Arac"),
+}
+
+@st.cache_resource
+def db_manager_al():
+    """Süreç genelinde paylaşılan DatabaseManager (bağlantı havuzu oturumlar arasında ortaktır)."""
+    db_manager = DatabaseManager(backend=backend_olustur())
+    db_manager.connect()
+    # Kural tabanlı ayrıştırıcı için personel ve araç listelerini sözlük olarak yükle
+    # (listeler tablolar değiştikçe yeniden okunur)
+    kural_sozlugu_baglan(db_manager)
+    return db_manager
+
+@st.cache_resource
+def metrik_sunucusu_al(_db_manager):
+    """METRIK_PORTU ayarlıysa Prometheus metrik sunucusunu süreçte bir kez başlatır."""
+    KAYIT.toplayici_ekle(lambda: havuz_metrikleri(_db_manager))
+    return metrik_sunucusunu_baslat()
+
+@st.cache_resource
+def degisiklik_akisi_al(_db_manager):
+    """Süreç genelinde paylaşılan, pano tablolarını delta okumalarla güncel tutan akış."""
+    return DegisiklikAkisi(_db_manager, PANO_TABLOLARI, yoklama_araligi=PANO_YENILEME_ARALIGI,
+                           tam_okuma_araligi=TABLO_ONBELLEK_SURESI)
+
+@st.cache_resource
+def zamanlayici_al(_db_manager):
+    """Süreç genelinde paylaşılan, aktif görevlerin tahmini bitişlerini bekleyen zamanlayıcı."""
+    zamanlayici = BitisZamanlayici(_db_manager)
+    zamanlayici.geri_cagirma_ekle(
+        lambda personel, bitis, gorev: print(f"⏰ '{personel}' görevinin tahmini bitişi geçti: {bitis:%H:%M}"))
+    zamanlayici.yukle()
+    zamanlayici.baslat()
+    return zamanlayici
+
+@st.cache_resource
+def filo_aynasi_al(_db_manager):
+    """Süreç genelinde paylaşılan personel/araç durum aynası (müsaitlik kontrolleri sorgu göndermez)."""
+    ayna = FiloAynasi(_db_manager)
+    ayna.mutabakat()
+    return ayna
+
+@st.cache_resource
+def rezervasyon_defteri_al(_db_manager):
+    """Süreç genelinde paylaşılan, araç/operatör takvimlerini aralık ağaçlarında tutan defter."""
+    defter = RezervasyonDefteri(_db_manager)
+    defter.yukle()
+    return defter
+
+def cakisma_goster(son_cakisma):
+    """Reddedilen atama veya rezervasyonun çakışmalarını ve önerilerini gösterir."""
+    if not son_cakisma:
+        return
+    if son_cakisma.get("cakismalar"):
+        st.dataframe(pd.DataFrame(son_cakisma["cakismalar"]).drop(columns=["Kimlik"]), use_container_width=True)
+    alternatifler = son_cakisma.get("alternatifler") or {}
+    if alternatifler.get("araclar"):
+        st.info("Bu aralıkta boş olan araçlar: " + ", ".join(alternatifler["araclar"]))
+    if alternatifler.get("ilk_bos"):
+        st.info(f"İstenen araç/operatör en erken {alternatifler['ilk_bos']:%d.%m.%Y %H:%M} itibarıyla boş.")
+
+def rezervasyon_paneli(db_manager, defter):
+    """İleri tarihli araç rezervasyonları ve türe göre ilk boş aralık sorgusu."""
+    with st.expander("Rezervasyonlar"):
+        araclar = defter.araclar
+        col1, col2 = st.columns(2)
+        arac = col1.selectbox("Araç", araclar, key="rez_arac")
+        personel = col2.selectbox("Operatör", ["(yok)"] + filo_aynasi_al(db_manager).personel_adlari(),
+                                  key="rez_personel")
+        col1, col2, col3 = st.columns(3)
+        gun = col1.date_input("Tarih", key="rez_gun")
+        saat = col2.time_input("Saat", key="rez_saat")
+        sure_saat = col3.number_input("Süre (saat)", min_value=0.25, value=2.0, step=0.25, key="rez_sure")
+        aciklama = st.text_input("Açıklama", key="rez_aciklama")
+        baslangic = datetime.combine(gun, saat)
+        bitis = baslangic + timedelta(hours=sure_saat)
+
+        col1, col2 = st.columns(2)
+        if col1.button("Rezerve Et") and arac:
+            kimlik, sorun = defter.rezerve_et(arac, None if personel == "(yok)" else personel, baslangic, bitis,
+                                              aciklama or None)
+            if kimlik is not None:
+                st.success(f"Rezervasyon #{kimlik}: {arac} {baslangic:%d.%m %H:%M} - {bitis:%H:%M}")
+            else:
+                st.error(sorun.get("hata") or "Rezervasyon yapılamadı.")
+                cakisma_goster(sorun)
+        turler = sorted({arac_turu(a) for a in araclar if arac_turu(a)})
+        tur = col2.selectbox("Araç türü", turler, key="rez_tur") if turler else None
+        if col2.button("İlk boş aralığı bul") and tur:
+            bulunan = defter.sonraki_bos_aralik(timedelta(hours=sure_saat), tur=tur, bas=max(baslangic, datetime.now()))
+            if bulunan:
+                st.info(f"En erken: {bulunan[0]} - {bulunan[1]:%d.%m.%Y %H:%M}")
+            else:
+                st.warning("Bu türde uygun araç bulunamadı.")
+
+        planlanan = [r for r in defter.rezervasyonlar() if r["Kimlik"][0] == "rezervasyon"]
+        if planlanan:
+            tablo = pd.DataFrame(planlanan)
+            tablo["Kimlik"] = tablo["Kimlik"].map(lambda k: k[1])
+            st.dataframe(tablo, use_container_width=True)
+            iptal = st.selectbox("İptal edilecek rezervasyon", tablo["Kimlik"].tolist(), key="rez_iptal")
+            if st.button("İptal Et") and defter.iptal_et(iptal):
+                st.success(f"Rezervasyon #{iptal} iptal edildi.")
+
+def toplu_atama_paneli(db_manager):
+    """Bekleyen görevler için boştaki operatör ve araçlardan en uygun atamayı önerir ve uygular."""
+    with st.expander("Toplu Atama Önerisi"):
+        defter = rezervasyon_defteri_al(db_manager)
+        turler = sorted({arac_turu(a) for a in defter.araclar if arac_turu(a)})
+        bekleyenler = st.data_editor(
+            pd.DataFrame({"Gorev": pd.Series(dtype=str), "Arac_turu": pd.Series(dtype=str),
+                          "Sure_dakika": pd.Series(dtype=int)}),
+            num_rows="dynamic", use_container_width=True, key="atama_gorevleri",
+            column_config={"Arac_turu": st.column_config.SelectboxColumn("Araç türü", options=turler),
+                           "Sure_dakika": st.column_config.NumberColumn("Süre (dk)", min_value=1, default=60)})
+        dagitici = GorevDagitici(db_manager, IsYoneticisi(db_manager, defter), defter, filo_aynasi_al(db_manager))
+        if st.button("Öneri Oluştur"):
+            gorevler = [{"Gorev": satir.Gorev, "Arac_turu": satir.Arac_turu or None, "Sure": satir.Sure_dakika}
+                        for satir in bekleyenler.dropna(subset=["Gorev", "Sure_dakika"]).itertuples()]
+            st.session_state.atama_plani = dagitici.planla(gorevler)
+        atamalar, atanamayanlar = st.session_state.get("atama_plani") or ([], [])
+        if atamalar is None:
+            st.error("Boştaki personel ve araçlar okunamadı.")
+            return
+        if atamalar:
+            st.dataframe(pd.DataFrame(atamalar), use_container_width=True)
+        if atanamayanlar:
+            st.warning("Uygun operatör/araç bulunamayan görevler: " + ", ".join(g["Gorev"] for g in atanamayanlar))
+        if atamalar and st.button("Atamaları Uygula"):
+            with sql_komutu(db_manager, "toplu_atama"):
+                sonuclar = dagitici.uygula(atamalar)
+            st.dataframe(pd.DataFrame(sonuclar), use_container_width=True)
+            st.session_state.atama_plani = None
+
+# Tamamlanan işler bellekte tutulmaz; filtreli sayfalar halinde sunucudan okunur
+TAMAMLANAN_SUTUNLARI = ["Personel", "Arac", "Gorev", "Tahmini_bitis", "Bitis_tarihi", "Durum"]
+
+@st.cache_data(ttl=TABLO_ONBELLEK_SURESI, show_spinner=False)
+def tamamlanan_sayfasi_oku(_db_manager, filtreler, sayfa_boyutu, imlec, surum):
+    """Tek bir sayfayı okur; 'surum' tabloya yazıldığında önbelleği geçersiz kılar."""
+    return _db_manager.tamamlanan_isler_sayfasi(**dict(filtreler), sayfa_boyutu=sayfa_boyutu, imlec=imlec)
+
+def _sayfa_degistir(ileri, imlec=None):
+    imlecler = st.session_state.tamamlanan_imlecler
+    if ileri:
+        imlecler.append(imlec)
+    elif len(imlecler) > 1:
+        imlecler.pop()
+
+def tamamlanan_isler_goster(db_manager, akis):
+    """Tamamlanan işleri tarih, personel, araç ve duruma göre filtreli, sayfalı gösterir."""
+    st.subheader("Tamamlanan İşler")
+    col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 1, 1])
+    tarih_araligi = col1.date_input("Bitiş tarihi aralığı", value=(), key="tamamlanan_tarih")
+    personel = col2.selectbox("Personel", ["Tümü"] + akis.tablo("Personeller")["Personel"].tolist(), key="tamamlanan_personel")
+    arac = col3.selectbox("Araç", ["Tümü"] + akis.tablo("Araclar")["Arac"].tolist(), key="tamamlanan_arac")
+    durum = col4.text_input("Durum", key="tamamlanan_durum").strip()
+    sayfa_boyutu = col5.selectbox("Satır", [25, 50, 100, 200], index=1, key="tamamlanan_sayfa_boyutu")
+
+    baslangic = bitis = None
+    if len(tarih_araligi) >= 1:
+        baslangic = datetime.combine(tarih_araligi[0], datetime.min.time())
+        # Bitiş günü dahil
+        bitis = datetime.combine(tarih_araligi[-1], datetime.min.time()) + timedelta(days=1)
+    filtreler = (("baslangic", baslangic), ("bitis", bitis),
+                 ("personel", None if personel == "Tümü" else personel),
+                 ("arac", None if arac == "Tümü" else arac),
+                 ("durum", durum or None))
+
+    # Filtre değişince ilk sayfaya dön
+    if st.session_state.get("tamamlanan_filtreler") != (filtreler, sayfa_boyutu):
+        st.session_state.tamamlanan_filtreler = (filtreler, sayfa_boyutu)
+        st.session_state.tamamlanan_imlecler = [None]
+    imlecler = st.session_state.tamamlanan_imlecler
+
+    try:
+        satirlar, sonraki = tamamlanan_sayfasi_oku(db_manager, filtreler, sayfa_boyutu, imlecler[-1],
+                                                   db_manager.tablo_surumu("Tamamlanan_isler"))
+        st.dataframe(pd.DataFrame(satirlar).reindex(columns=TAMAMLANAN_SUTUNLARI), use_container_width=True)
+    except Exception as e:
+        st.error(f"Tamamlanan işler yüklenirken hata oluştu: {e}")
+        return
+
+    onceki_col, bilgi_col, sonraki_col = st.columns([1, 4, 1])
+    onceki_col.button("◀ Önceki", key="tamamlanan_onceki", disabled=len(imlecler) == 1,
+                      on_click=_sayfa_degistir, args=(False,))
+    bilgi_col.caption(f"Sayfa {len(imlecler)}")
+    sonraki_col.button("Sonraki ▶", key="tamamlanan_sonraki", disabled=sonraki is None,
+                       on_click=_sayfa_degistir, args=(True, sonraki))
+
+@st.fragment(run_every=PANO_YENILEME_ARALIGI)
+def pano_goster(db_manager, akis, zamanlayici):
+    """Pano tablolarını gösterir; sayfanın geri kalanını yeniden çalıştırmadan kendini yeniler."""
+    if akis.yenile() is None:
+        st.warning("Değişiklikler okunamadı, son bilinen durum gösteriliyor.")
+
+    # Tahmini bitişi geçmiş görevler zamanlayıcıdan okunur (tablo taranmaz)
+    gecikenler = zamanlayici.gecikenler()
+    if gecikenler:
+        st.warning("Tahmini bitişi geçen görevler: " + ", ".join(
+            f"{personel} ({bitis:%H:%M})" for personel, (bitis, _) in sorted(gecikenler.items(), key=lambda k: k[1][0])))
+
+    # Aktif İşler tablosunu göster
+    st.subheader("Aktif İşler")
+    try:
+        aktif_isler = akis.tablo("Aktif_isler")
+        st.dataframe(aktif_isler, use_container_width=True)
+    except Exception as e:
+        st.error(f"Aktif işler yüklenirken hata oluştu: {e}")
+
+    # Tamamlanan İşler tablosunu göster
+    tamamlanan_isler_goster(db_manager, akis)
+
+    # Operatör ve Araç durumlarını göster
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Operatör Durumları")
+        try:
+            operator_durumlari = akis.tablo("Personeller")
+            st.dataframe(operator_durumlari, use_container_width=True)
+        except Exception as e:
+            st.error(f"Operatör durumları yüklenirken hata oluştu: {e}")
+    with col2:
+        st.subheader("Araç Durumları")
+        try:
+            arac_durumlari = akis.tablo("Araclar")
+            st.dataframe(arac_durumlari, use_container_width=True)
+        except Exception as e:
+            st.error(f"Araç durumları yüklenirken hata oluştu: {e}")
 
 def main():
     st.set_page_config(page_title="Görev Yönetim Sistemi", layout="wide")
     st.title("Görev Yönetim Sistemi")
 
-    if "db_manager" not in st.session_state:
-        st.session_state.db_manager = DatabaseManager()
-        st.session_state.db_manager.connect()
-
-    db_manager = st.session_state.db_manager
+    db_manager = db_manager_al()
+    if not db_manager.havuz:
+        # Bağlanılamadıysa bir sonraki yenilemede yeniden denensin
+        db_manager_al.clear()
+        st.error("Veritabanına bağlanılamadı.")
+        return
+    metrik_sunucusu_al(db_manager)
 
-    # SQLAlchemy engine oluştur
-    engine = create_engine("mssql+pyodbc:///?odbc_connect=" + db_manager.connection_string)
+    sayfa = st.sidebar.radio("Sayfa", ["Görev Yönetimi", "Kullanım Analizi"])
+    if sayfa == "Kullanım Analizi":
+        analiz_sayfasi(db_manager)
+        return
 
     st.subheader("Metin Girişi")
     metin = st.text_input("Metni giriniz (ör: 'Ahmet Yılmaz işi bitti' veya yeni görev)", key="metin_giris")
@@ -36,140 +289,141 @@ def main():
                 
             komut_turu = analiz_sonucu.get('komut_turu')
             
-            if komut_turu == 'sure_uzatma':
-                # Süre uzatma komutu
-                gelen_kisi = analiz_sonucu.get('person')
-                sure_bilgisi = analiz_sonucu.get('duration')
+            with sql_komutu(db_manager, komut_turu or "bilinmiyor"):
+                if komut_turu == 'sure_uzatma':
+                    # Süre uzatma komutu
+                    gelen_kisi = analiz_sonucu.get('person')
+                    sure_bilgisi = analiz_sonucu.get('duration')
                 
-                if gelen_kisi and sure_bilgisi:
-                    try:
-                        db_manager.operator_durum_guncelle(gelen_kisi, "Aktif")
-                        st.success(f"{gelen_kisi} için süre uzatıldı: {sure_bilgisi['value']} {sure_bilgisi['unit']}")
-                    except Exception as e:
-                        st.error(f"Hata: {e}")
-                else:
-                    st.warning("Süre uzatma bilgisi eksik.")
+                    if gelen_kisi and sure_bilgisi:
+                        basarili, mesaj = IsYoneticisi(db_manager).süre_uzat(gelen_kisi, sure_bilgisi)
+                        if basarili:
+                            st.success(f"{mesaj} (+{sure_bilgisi['value']} {sure_bilgisi['unit']})")
+                        else:
+                            st.error(mesaj)
+                    else:
+                        st.warning("Süre uzatma bilgisi eksik.")
                     
-            elif komut_turu == 'gorev_bitti':
-                # Görev bitti komutu
-                personel_adi = analiz_sonucu.get('person')
+                elif komut_turu == 'gorev_bitti':
+                    # Görev bitti komutu
+                    personel_adi = analiz_sonucu.get('person')
                 
-                if personel_adi:
-                    try:
+                    if personel_adi:
+                        try:
                         
-                        # Önce aktif görev var mı kontrol et
-                        tamamlanan_gorev = db_manager.get_aktif_gorev(personel_adi)
+                            # Görevi tek işlemde taşı, operatörü ve aracı boşa al
+                            tamamlanan_gorev = db_manager.gorev_tamamla(personel_adi)
                         
-                        if tamamlanan_gorev:
-                            
-                            # Bitiş tarihini ve durumu güncelle
-                            tamamlanan_gorev['Bitis_tarihi'] = datetime.now()
-                            tamamlanan_gorev['Durum'] = 'Tamamlandı'
-                            
-                            # Tamamlanan görevi ekle
-                            db_manager.tamamlanan_gorev_ekle(tamamlanan_gorev)
-                            
-                            # Aktif görevden sil
-                            db_manager.aktif_gorev_sil(personel_adi)
+                            if tamamlanan_gorev:
+                                st.success(f"{personel_adi} işi bitti olarak güncellendi ve tamamlanan görevlere eklendi.")
+                            else:
                             
-                            # Operatörü boşa al ve aracını güncelle
-                            db_manager.operatoru_bosa_al(personel_adi)
+                                # Yine de operatör durumunu güncelle
+                                db_manager.operator_durum_guncelle(personel_adi, "Boşta")
                             
-                            st.success(f"{personel_adi} işi bitti olarak güncellendi ve tamamlanan görevlere eklendi.")
-                        else:
-                            
-                            # Yine de operatör durumunu güncelle
-                            db_manager.operator_durum_guncelle(personel_adi, "Boşta")
-                            
-                            st.warning(f"{personel_adi} için aktif görev bulunamadı, sadece durum 'Boşta' olarak güncellendi.")
+                                st.warning(f"{personel_adi} için aktif görev bulunamadı, sadece durum 'Boşta' olarak güncellendi.")
                             
-                    except Exception as e:
-                        st.error(f"Hata: {e}")
-                else:
-                    st.warning("Personel adı bulunamadı.")
+                        except Exception as e:
+                            st.error(f"Hata: {e}")
+                    else:
+                        st.warning("Personel adı bulunamadı.")
                     
-            elif komut_turu == 'yeni_gorev':
-                # Yeni görev komutu
-                gelen_kisi = analiz_sonucu.get('person')
-                gorev = analiz_sonucu.get('task')
-                arac = analiz_sonucu.get('vehicle')
-                sure_bilgisi = analiz_sonucu.get('duration')
-                bitis_zamani = None
-                
-                if sure_bilgisi and 'value' in sure_bilgisi and 'unit' in sure_bilgisi:
-                    try:
-                        deger = int(sure_bilgisi['value'])
-                        birim = sure_bilgisi['unit'].lower()
-                        if 'saat' in birim:
-                            bitis_zamani = datetime.now() + timedelta(hours=deger)
-                        elif 'gün' in birim:
-                            bitis_zamani = datetime.now() + timedelta(days=deger)
-                        elif 'dakika' in birim:
-                            bitis_zamani = datetime.now() + timedelta(minutes=deger)
-                    except (ValueError, TypeError):
-                        pass
+                elif komut_turu == 'yeni_gorev':
+                    # Yeni görev komutu
+                    gelen_kisi = analiz_sonucu.get('person')
+                    gorev = analiz_sonucu.get('task')
+                    arac = analiz_sonucu.get('vehicle')
+                    sure_bilgisi = analiz_sonucu.get('duration')
+                    bitis_zamani = bitis_zamani_hesapla(sure_bilgisi)
                         
-                if gelen_kisi and gorev:
-                    # İş yöneticisi oluştur ve araç kontrolü yap
-                    is_yoneticisi = IsYoneticisi(db_manager)
+                    if gelen_kisi and gorev:
+                        # Müsaitlik bellekteki aynadan kontrol edilir
+                        ayna = filo_aynasi_al(db_manager)
+                        kisi = db_manager.personel_bul(gelen_kisi)
+                        if kisi and not ayna.personel_musait(kisi):
+                            st.warning(f"'{kisi}' şu anda başka bir görevde.")
+                        gercek_arac = db_manager.arac_bul(arac) if arac else None
+                        if gercek_arac and not ayna.arac_musait(gercek_arac):
+                            st.warning(f"'{gercek_arac}' şu anda kullanımda.")
+
+                        # İş yöneticisi oluştur ve araç kontrolü yap
+                        is_yoneticisi = IsYoneticisi(db_manager, rezervasyon_defteri_al(db_manager))
                     
-                    try:
-                        # is_ekle metodu artık araç kontrolü yapıyor
-                        basarili = is_yoneticisi.is_ekle(
-                            gorevli=gelen_kisi,
-                            arac=arac,
-                            gorev=gorev,
-                            bitis_tarihi=bitis_zamani
-                        )
+                        try:
+                            # is_ekle metodu artık araç kontrolü yapıyor
+                            basarili = is_yoneticisi.is_ekle(
+                                gorevli=kisi or gelen_kisi,
+                                arac=gercek_arac or arac,
+                                gorev=gorev,
+                                bitis_tarihi=bitis_zamani
+                            )
                         
-                        if basarili:
-                            # Operatörü aktif yap
-                            db_manager.operatoru_aktif_yap(gelen_kisi, arac)
-                            print(f"DEBUG: operatör eklendi: {gelen_kisi}, Araç: {arac}")
-                            st.success(f"{gelen_kisi} için yeni görev eklendi: {gorev}")
+                            if basarili:
+                                # Operatörü aktif yap
+                                db_manager.operatoru_aktif_yap(kisi or gelen_kisi, gercek_arac or arac)
+                                print(f"DEBUG: operatör eklendi: {kisi or gelen_kisi}, Araç: {gercek_arac or arac}")
+                                st.success(f"{gelen_kisi} için yeni görev eklendi: {gorev}")
                            
-                        else:
-                            st.error("Görev eklenemedi. Araç kontrolü başarısız oldu.")
+                            elif is_yoneticisi.son_cakisma:
+                                st.error("Görev eklenemedi: görevli veya araç bu aralıkta meşgul.")
+                                cakisma_goster(is_yoneticisi.son_cakisma)
+                            else:
+                                st.error("Görev eklenemedi. Araç kontrolü başarısız oldu.")
                             
-                    except Exception as e:
-                        st.error(f"Hata: {e}")
+                        except Exception as e:
+                            st.error(f"Hata: {e}")
+                    else:
+                        st.warning("Yeni görev bilgileri eksik.")
                 else:
-                    st.warning("Yeni görev bilgileri eksik.")
+                    st.warning("Komut türü anlaşılamadı. Lütfen daha açık bir ifade kullanın.")
+
+    rezervasyon_paneli(db_manager, rezervasyon_defteri_al(db_manager))
+    toplu_atama_paneli(db_manager)
+
+    # Bir araçtaki veya süresi geçmiş tüm görevleri tek seferde uzatma
+    with st.expander("Toplu Süre Uzatma"):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        uzatilacak_arac = col1.selectbox("Araç", ["(tümü)"] + rezervasyon_defteri_al(db_manager).araclar, key="uzatma_arac")
+        uzatma_degeri = col2.number_input("Süre", min_value=1, value=30, step=5, key="uzatma_deger")
+        uzatma_birimi = col3.selectbox("Birim", ["dakika", "saat", "gün"], key="uzatma_birim")
+        sadece_gecikenler = st.checkbox("Yalnızca tahmini bitişi geçmiş görevler", key="uzatma_gecikenler")
+        if st.button("Süreleri Uzat"):
+            with sql_komutu(db_manager, "toplu_sure_uzatma"):
+                basarili, mesaj = IsYoneticisi(db_manager).toplu_süre_uzat(
+                    {"value": uzatma_degeri, "unit": uzatma_birimi},
+                    arac=None if uzatilacak_arac == "(tümü)" else uzatilacak_arac,
+                    sadece_gecikenler=sadece_gecikenler)
+            (st.success if basarili else st.warning)(mesaj)
+
+    # Vardiya başı toplu giriş
+    with st.expander("Toplu Giriş"):
+        toplu_metin = st.text_area("Her satıra bir komut yazın", key="toplu_giris", height=200)
+        yuklenen_dosya = st.file_uploader("veya komut dosyası yükleyin", type=["txt", "csv"], key="toplu_dosya")
+        if st.button("Toplu İşle"):
+            if yuklenen_dosya is not None:
+                toplu_metin = yuklenen_dosya.getvalue().decode("utf-8")
+            with sql_komutu(db_manager, "toplu_giris"):
+                rapor = TopluKomutIsleyici(db_manager, ayna=filo_aynasi_al(db_manager),
+                                           defter=rezervasyon_defteri_al(db_manager)).isle(toplu_metin)
+            if rapor:
+                basarili = sum(1 for kayit in rapor if kayit["Sonuç"] in ("eklendi", "tamamlandı", "uzatıldı"))
+                st.info(f"{len(rapor)} satırdan {basarili} tanesi uygulandı.")
+                st.dataframe(pd.DataFrame(rapor), use_container_width=True)
             else:
-                st.warning("Komut türü anlaşılamadı. Lütfen daha açık bir ifade kullanın.")
+                st.warning("İşlenecek komut bulunamadı.")
 
-    # Aktif İşler tablosunu göster
-    st.subheader("Aktif İşler")
-    try:
-        aktif_isler = pd.read_sql_query("SELECT [Personel],[Arac],[Gorev],[Tahmini_bitis],[Durum] FROM Aktif_isler", engine)
-        st.dataframe(aktif_isler, use_container_width=True)
-    except Exception as e:
-        st.error(f"Aktif işler yüklenirken hata oluştu: {e}")
+    # LLM'e gitmeden çözülen komut oranı
+    with st.sidebar.expander("Analiz istatistikleri"):
+        istatistik = ayristirma_istatistikleri()
+        st.metric("LLM'siz çözülen", f"%{istatistik['llm_disi_oran'] * 100:.0f}", help=f"Toplam {istatistik['toplam']} komut")
+        st.json(istatistik["yollar"])
 
-    # Tamamlanan İşler tablosunu göster
-    st.subheader("Tamamlanan İşler")
-    try:
-        tamamlanan_isler = pd.read_sql_query("SELECT [Personel],[Arac],[Gorev],[Tahmini_bitis],[Durum] FROM Tamamlanan_isler", engine)
-        st.dataframe(tamamlanan_isler, use_container_width=True)
-    except Exception as e:
-        st.error(f"Tamamlanan işler yüklenirken hata oluştu: {e}")
+    # SQL_IZLEME=1 ise komut başına ifade/commit sayıları
+    if db_manager.sql_izleyici is not None:
+        with st.sidebar.expander("SQL izleme"):
+            st.text(db_manager.sql_izleyici.rapor() or "Henüz komut işlenmedi.")
 
-    # Operatör ve Araç durumlarını göster
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("Operatör Durumları")
-        try:
-            operator_durumlari = pd.read_sql_query("SELECT [Personel],[Durum],[Arac] FROM Personeller", engine)
-            st.dataframe(operator_durumlari, use_container_width=True)
-        except Exception as e:
-            st.error(f"Operatör durumları yüklenirken hata oluştu: {e}")
-    with col2:
-        st.subheader("Araç Durumları")
-        try:
-            arac_durumlari = pd.read_sql_query("SELECT [Arac],[Durum] FROM Araclar", engine)
-            st.dataframe(arac_durumlari, use_container_width=True)
-        except Exception as e:
-            st.error(f"Araç durumları yüklenirken hata oluştu: {e}")
+    pano_goster(db_manager, degisiklik_akisi_al(db_manager), zamanlayici_al(db_manager))
 
 if __name__ == "__main__":
     main()
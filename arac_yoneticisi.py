@@ -1,25 +1,32 @@
-import pandas as pd
 from thefuzz import process
+from name_index import IsimIndeksi
+from fleet_store import DurumDeposu
 
 class AracYoneticisi:
     """Araçların listesini ve durumlarını (çalışıyor/boşta) yönetir."""
     def __init__(self, arac_adlari):
-        """Başlangıç araç listesi ile DataFrame'i oluşturur."""
+        """Başlangıç araç listesi ile durum deposunu oluşturur."""
         self.araclar = arac_adlari
-        self.df_araclar = pd.DataFrame({
-            'Araç': self.araclar,
-            'Durum': ['boşta'] * len(self.araclar)
-        })
+        self._indeks = IsimIndeksi(self.araclar)
+        self._depo = DurumDeposu(self.araclar, varsayilan_durum='boşta')
 
     def durum_df_al(self):
-        """Araç durumlarını içeren DataFrame'i döndürür."""
-        return self.df_araclar
+        """Araç durumlarını içeren DataFrame'i döndürür (yalnızca değişiklik olduysa yeniden kurulur)."""
+        return self._depo.tablo('Araç', 'Durum')
+
+    def bostaki_araclar(self):
+        """Boşta olan araçların adları."""
+        return list(self._depo.durumdakiler('boşta'))
 
     def _arac_bul(self, isim):
         """Verilen isme en çok benzeyen aracı bulur (yazım hatalarını tolere eder)."""
         if not isim:
             return None
-        # thefuzz kütüphanesi ile %80 ve üzeri benzerlikte olan en iyi eşleşmeyi bulur.
+        tam = self._indeks.tam(isim)
+        if tam:
+            return tam
+        # thefuzz ile tüm listede %80 ve üzeri benzerlikte olan en iyi eşleşmeyi bul. Ön eleme yapılmaz:
+        # thefuzz'un kısmi oranları az 3-gram paylaşan adlara da yüksek puan verebilir.
         eslesme = process.extractOne(isim, self.araclar, score_cutoff=80)
         return eslesme[0] if eslesme else None
 
@@ -27,7 +34,7 @@ class AracYoneticisi:
         """Bir aracın durumunu 'çalışıyor' olarak günceller."""
         eslesen_arac = self._arac_bul(arac_adi)
         if eslesen_arac:
-            self.df_araclar.loc[self.df_araclar['Araç'] == eslesen_arac, 'Durum'] = 'çalışıyor'
+            self._depo.durum_ata(eslesen_arac, 'çalışıyor')
             print(f"\n'{eslesen_arac}' adlı aracın durumu 'çalışıyor' olarak güncellendi.")
         else:
             print(f"\nUyarı: '{arac_adi}' araç listesiyle eşleşmedi.")
@@ -36,7 +43,7 @@ class AracYoneticisi:
         """Bir aracın durumunu 'boşta' olarak günceller."""
         eslesen_arac = self._arac_bul(arac_adi)
         if eslesen_arac:
-            self.df_araclar.loc[self.df_araclar['Araç'] == eslesen_arac, 'Durum'] = 'boşta'
+            self._depo.durum_ata(eslesen_arac, 'boşta')
             print(f"\n'{eslesen_arac}' adlı aracın durumu 'boşta' olarak güncellendi.")
         else:
             print(f"\nUyarı: '{arac_adi}' araç listesiyle eşleşmedi.")
@@ -45,6 +52,5 @@ class AracYoneticisi:
         """Belirtilen aracın boşta olup olmadığını kontrol eder."""
         eslesen_arac = self._arac_bul(arac_adi)
         if eslesen_arac:
-            durum = self.df_araclar.loc[self.df_araclar['Araç'] == eslesen_arac, 'Durum'].iloc[0]
-            return durum == 'boşta'
+            return self._depo.durum(eslesen_arac) == 'boşta'
         return False
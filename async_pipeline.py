@@ -0,0 +1,367 @@
+import asyncio
+import contextvars
+import json
+import ssl
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit
+
+import ollama
+from ollama import (JsonTamamlayici, analiz_onbellekten_al, analiz_onbellege_koy,
+                    analiz_yolunu_kaydet, llm_yanitini_coz, yerel_analiz)
+from is_yoneticisi import IsYoneticisi, bitis_zamani_hesapla, sure_timedelta
+from command_trace import komut_izine_yaz
+from metrics import OLLAMA_ISTEK, OLLAMA_SURE
+from sql_tracer import sql_komutu
+
+
+class OllamaHatasi(Exception):
+    """Ollama isteği bağlantı, zaman aşımı veya HTTP hatası nedeniyle başarısız olduğunda fırlatılır."""
+
+
+class AsenkronOllamaIstemcisi:
+    """
+    Ollama API için asyncio tabanlı istemci (yalnızca standart kütüphane).
+    HTTP/1.1 keep-alive bağlantıları sınırlı bir havuzda yeniden kullanılır,
+    akış modunda ilk tam JSON nesnesi okunduğu anda bağlantı kapatılarak
+    model üretimi kesilir. İptal edilen veya zaman aşımına uğrayan isteklerin
+    bağlantıları havuza geri konmaz.
+    """
+
+    def __init__(self, base_url=None, havuz_boyutu=10, baglanti_zaman_asimi=3.05,
+                 okuma_zaman_asimi=30, keep_alive="10m"):
+        """
+        :param base_url: Ollama sunucu adresi (varsayılan: ollama.OLLAMA_BASE_URL).
+        :param havuz_boyutu: Aynı anda açık olabilecek en fazla HTTP bağlantısı.
+        :param baglanti_zaman_asimi: TCP bağlantısı için zaman aşımı (saniye).
+        :param okuma_zaman_asimi: Bir isteğin tamamı için varsayılan zaman aşımı (saniye).
+        :param keep_alive: Modelin sunucuda bellekte tutulacağı süre.
+        """
+        self.base_url = base_url or ollama.OLLAMA_BASE_URL
+        adres = urlsplit(self.base_url)
+        self._ssl = ssl.create_default_context() if adres.scheme == "https" else None
+        self._host = adres.hostname or "localhost"
+        self._port = adres.port or (443 if self._ssl else 80)
+        self._yol = f"{adres.path.rstrip('/')}/api/generate"
+        self.baglanti_zaman_asimi = baglanti_zaman_asimi
+        self.okuma_zaman_asimi = okuma_zaman_asimi
+        self.keep_alive = keep_alive
+        self._sinir = asyncio.Semaphore(havuz_boyutu)
+        self._bostakiler = []  # (reader, writer) çiftleri
+
+    async def _baglanti_al(self):
+        """Boştaki bir bağlantıyı veya yenisini döndürür: (reader, writer, yeniden_kullanildi)."""
+        while self._bostakiler:
+            reader, writer = self._bostakiler.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port, ssl=self._ssl),
+            self.baglanti_zaman_asimi)
+        return reader, writer, False
+
+    @staticmethod
+    async def _basliklari_oku(reader):
+        """Durum satırını ve başlıkları okur: (durum kodu, {küçük harfli ad: değer})."""
+        durum_satiri = await reader.readline()
+        if not durum_satiri:
+            raise asyncio.IncompleteReadError(b"", None)
+        durum = int(durum_satiri.split(None, 2)[1])
+        basliklar = {}
+        while True:
+            satir = await reader.readline()
+            if satir in (b"\r\n", b"\n", b""):
+                return durum, basliklar
+            ad, _, deger = satir.decode("latin-1").partition(":")
+            basliklar[ad.strip().lower()] = deger.strip()
+
+    @staticmethod
+    async def _govde_parcalari(reader, basliklar):
+        """Yanıt gövdesini chunked / Content-Length / bağlantı sonuna göre parça parça verir."""
+        if "chunked" in basliklar.get("transfer-encoding", "").lower():
+            while True:
+                boyut_satiri = await reader.readline()
+                if not boyut_satiri:
+                    raise asyncio.IncompleteReadError(b"", None)
+                boyut = int(boyut_satiri.split(b";")[0].strip(), 16)
+                if boyut == 0:
+                    # Varsa sondaki başlıkları (trailer) ve kapanış satırını tüket
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                yield await reader.readexactly(boyut)
+                await reader.readexactly(2)
+        elif "content-length" in basliklar:
+            kalan = int(basliklar["content-length"])
+            while kalan:
+                parca = await reader.read(min(kalan, 65536))
+                if not parca:
+                    raise asyncio.IncompleteReadError(b"", kalan)
+                kalan -= len(parca)
+                yield parca
+        else:
+            while True:
+                parca = await reader.read(65536)
+                if not parca:
+                    return
+                yield parca
+
+    async def _istek(self, reader, writer, govde, stream, format):
+        """
+        İsteği gönderip yanıtı okur.
+        :return: (üretilen metin, bağlantı yeniden kullanılabilir mi)
+        """
+        writer.write(
+            (f"POST {self._yol} HTTP/1.1\r\n"
+             f"Host: {self._host}:{self._port}\r\n"
+             "Content-Type: application/json\r\n"
+             f"Content-Length: {len(govde)}\r\n"
+             "Connection: keep-alive\r\n\r\n").encode("ascii") + govde)
+        await writer.drain()
+
+        durum, basliklar = await self._basliklari_oku(reader)
+        parcalar = self._govde_parcalari(reader, basliklar)
+        # Gövdesi sonuna kadar okunabilen yanıtlarda bağlantı açık kalır
+        kalici = (basliklar.get("connection", "").lower() != "close"
+                  and ("content-length" in basliklar or "chunked" in basliklar.get("transfer-encoding", "").lower()))
+
+        if durum != 200:
+            icerik = b"".join([parca async for parca in parcalar])
+            raise OllamaHatasi(f"HTTP {durum}: {icerik[:200].decode('utf-8', 'replace')}")
+
+        if not stream:
+            icerik = b"".join([parca async for parca in parcalar])
+            return json.loads(icerik)["response"], kalici
+
+        toplayici = JsonTamamlayici()
+        tampon = b""
+        bitti = False
+        async for parca in parcalar:
+            if bitti:
+                # 'done' sonrası akışın kalanı tüketilir ki bağlantı yeniden kullanılabilsin
+                continue
+            tampon += parca
+            *satirlar, tampon = tampon.split(b"\n")
+            for satir in satirlar:
+                if not satir.strip():
+                    continue
+                veri = json.loads(satir)
+                if format == "json" and toplayici.ekle(veri.get("response", "")):
+                    # JSON tamamlandı; kalan üretimi beklemeden bağlantıyı kapat
+                    await parcalar.aclose()
+                    return toplayici.metin(), False
+                if format != "json":
+                    toplayici.parcalar.append(veri.get("response", ""))
+                if veri.get("done"):
+                    bitti = True
+                    break
+        if not bitti and tampon.strip():
+            toplayici.parcalar.append(json.loads(tampon).get("response", ""))
+        return toplayici.metin(), kalici
+
+    async def uret(self, prompt, model="qwen2.5vl:3b", stream=True, format="json", zaman_asimi=None):
+        """
+        /api/generate çağrısı yapar ve üretilen metni döndürür.
+        :param zaman_asimi: Bu çağrı için toplam zaman aşımı (saniye); verilmezse varsayılan.
+        :raises OllamaHatasi: Bağlantı, zaman aşımı, HTTP veya yanıt biçimi hatasında.
+        """
+        baslangic = time.perf_counter()
+        sonuc = "hata"
+        try:
+            metin = await self._uret(prompt, model, stream, format, zaman_asimi)
+            sonuc = "tamam"
+            return metin
+        finally:
+            OLLAMA_SURE.gozlemle(time.perf_counter() - baslangic, model, "asenkron")
+            OLLAMA_ISTEK.artir(model, "asenkron", sonuc)
+
+    async def _uret(self, prompt, model, stream, format, zaman_asimi):
+        govde = json.dumps({
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "format": format,
+            "keep_alive": self.keep_alive,
+        }).encode("utf-8")
+
+        async with self._sinir:
+            try:
+                for deneme in range(2):
+                    reader, writer, yeniden_kullanildi = await self._baglanti_al()
+                    tekrar_kullan = False
+                    try:
+                        metin, tekrar_kullan = await asyncio.wait_for(
+                            self._istek(reader, writer, govde, stream, format),
+                            zaman_asimi or self.okuma_zaman_asimi)
+                        return metin
+                    except (ConnectionError, asyncio.IncompleteReadError):
+                        # Sunucu boştaki keep-alive bağlantısını kapatmış olabilir; bir kez yenisiyle dene
+                        if not yeniden_kullanildi or deneme:
+                            raise
+                    finally:
+                        if tekrar_kullan:
+                            self._bostakiler.append((reader, writer))
+                        else:
+                            writer.close()
+            except asyncio.TimeoutError as e:
+                raise OllamaHatasi("Ollama isteği zaman aşımına uğradı.") from e
+            except (OSError, EOFError, ValueError, KeyError) as e:
+                raise OllamaHatasi(f"{type(e).__name__}: {e}") from e
+
+    async def kapat(self):
+        """Boştaki bağlantıları kapatır."""
+        while self._bostakiler:
+            _, writer = self._bostakiler.pop()
+            writer.close()
+
+
+class AsenkronKomutHatti:
+    """
+    Komut akışının asyncio sürümü: analiz, görev atama ve görev bitirme.
+    Ollama çağrıları olay döngüsünde beklenir, engelleyici veritabanı çağrıları
+    bağlantı havuzu boyutunda bir iş parçacığı havuzuna devredilir. Böylece tek
+    bir süreç, istek başına iş parçacığı açmadan yüzlerce komutu aynı anda
+    yürütebilir; yavaş bir LLM üretimi diğer komutları bekletmez.
+
+    Eşzamanlı komut sayısı max_eszamanli ile sınırlanır. İptal edilen veya zaman
+    aşımına uğrayan komutların Ollama bağlantısı hemen kapatılır; iş parçacığında
+    başlamış bir veritabanı işlemi ise yarıda kesilmez, kendi işlemi içinde tamamlanır.
+    """
+
+    def __init__(self, db_manager, model="qwen2.5vl:3b", max_eszamanli=200, db_isci_sayisi=None,
+                 istemci=None, zaman_asimi=60, defter=None):
+        """
+        :param db_manager: Bağlanmış DatabaseManager örneği.
+        :param max_eszamanli: Aynı anda yürütülecek en fazla komut sayısı.
+        :param db_isci_sayisi: Veritabanı iş parçacığı sayısı (varsayılan: bağlantı havuzu boyutu).
+        :param istemci: AsenkronOllamaIstemcisi örneği (varsayılan: yeni istemci).
+        :param zaman_asimi: Komut başına varsayılan zaman aşımı (saniye); None ise sınırsız.
+        :param defter: Atamalarda çakışma kontrolü için RezervasyonDefteri (isteğe bağlı).
+        """
+        self.db_manager = db_manager
+        self.is_yoneticisi = IsYoneticisi(db_manager, defter)
+        self.model = model
+        self.istemci = istemci or AsenkronOllamaIstemcisi()
+        self.zaman_asimi = zaman_asimi
+        self._sinir = asyncio.Semaphore(max_eszamanli)
+        # Havuzdaki bağlantıdan fazla iş parçacığı yalnızca bağlantı beklerdi
+        self._db_havuzu = ThreadPoolExecutor(
+            max_workers=db_isci_sayisi or getattr(db_manager, "havuz_boyutu", 5),
+            thread_name_prefix="db")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *hata):
+        await self.kapat()
+
+    async def _db(self, fonksiyon, *args, **kwargs):
+        """Engelleyici veritabanı çağrısını iş parçacığı havuzunda çalıştırır."""
+        dongu = asyncio.get_running_loop()
+        # run_in_executor bağlamı taşımaz; SQL izinin komutu bilmesi için kopyası verilir
+        baglam = contextvars.copy_context()
+        return await dongu.run_in_executor(self._db_havuzu, partial(baglam.run, fonksiyon, *args, **kwargs))
+
+    async def _sinirli(self, coro, zaman_asimi):
+        """Koroutini eşzamanlılık sınırı ve zaman aşımı altında çalıştırır."""
+        try:
+            async with self._sinir:
+                return await asyncio.wait_for(coro, zaman_asimi or self.zaman_asimi)
+        finally:
+            # Sıra beklerken iptal edilirse koroutin hiç başlamamış olur
+            coro.close()
+
+    async def _analiz(self, metin):
+        baslangic = time.perf_counter()
+        sonuc = analiz_onbellekten_al(metin, self.model)
+        if sonuc is None:
+            sonuc, istek = yerel_analiz(metin)
+            if istek is not None:
+                prompt, komut_turu = istek
+                try:
+                    yanit = await self.istemci.uret(prompt, self.model)
+                except OllamaHatasi as e:
+                    print(f"Ollama API hatası: {e}")
+                    yanit = None
+                sonuc = llm_yanitini_coz(yanit, komut_turu)
+                # Önbellek dolduğunda diske yazılır (AnalizOnbellegi.kaydet); olay döngüsü bu sırada bekletilmez
+                await asyncio.get_running_loop().run_in_executor(None, analiz_onbellege_koy, metin, self.model, sonuc)
+        analiz_yolunu_kaydet(sonuc)
+        komut_izine_yaz(metin, sonuc, time.perf_counter() - baslangic, kaynak="asenkron")
+        return sonuc
+
+    def _ata(self, gorevli, arac, gorev, bitis_tarihi):
+        # Tek iş parçacığı işinde çalışır: görev eklenemezse operatör aktif yapılmaz.
+        # Adlar bir kez çözülür; görev, rezervasyon ve durum kayıtları aynı adları kullanır
+        gorevli = self.db_manager.personel_bul(gorevli) or gorevli
+        arac = (self.db_manager.arac_bul(arac) or arac) if arac else None
+        if not self.is_yoneticisi.is_ekle(gorevli, arac, gorev, bitis_tarihi):
+            return False
+        self.db_manager.operatoru_aktif_yap(gorevli, arac)
+        return True
+
+    def _tamamla(self, personel_adi, bitis_tarihi):
+        tamamlanan = self.db_manager.gorev_tamamla(personel_adi, bitis_tarihi)
+        if not tamamlanan:
+            # Aktif görev yoksa yine de operatörü boşa al (arayüzdeki davranış)
+            self.db_manager.operator_durum_guncelle(personel_adi, "Boşta")
+        return tamamlanan
+
+    async def analyze(self, metin, zaman_asimi=None):
+        """Metni analiz eder (önbellek, kural tabanlı ayrıştırıcı, gerekirse LLM)."""
+        return await self._sinirli(self._analiz(metin), zaman_asimi)
+
+    async def assign(self, gorevli, arac, gorev, bitis_tarihi=None, zaman_asimi=None):
+        """Yeni görevi ekler (IsYoneticisi.is_ekle) ve operatörü aktif yapar. :return: Başarılı mı."""
+        return await self._sinirli(self._db(self._ata, gorevli, arac, gorev, bitis_tarihi), zaman_asimi)
+
+    async def complete(self, personel_adi, bitis_tarihi=None, zaman_asimi=None):
+        """Personelin aktif görevini tamamlar. :return: Tamamlanan görevin sözlüğü veya None."""
+        return await self._sinirli(self._db(self._tamamla, personel_adi, bitis_tarihi), zaman_asimi)
+
+    async def extend(self, personel_adi, dakika, zaman_asimi=None):
+        """Personelin aktif görevinin bitişini uzatır. :return: Güncellenen görevin sözlüğü veya None."""
+        return await self._sinirli(self._db(self.db_manager.sure_uzat, personel_adi, dakika), zaman_asimi)
+
+    async def _isle(self, metin):
+        sonuc = await self._analiz(metin)
+        if not sonuc:
+            return sonuc, False
+        with sql_komutu(self.db_manager, sonuc.get("komut_turu") or "bilinmiyor"):
+            return sonuc, await self._uygula(sonuc)
+
+    async def _uygula(self, sonuc):
+        komut_turu = sonuc.get("komut_turu")
+        kisi = sonuc.get("person")
+        if komut_turu == "gorev_bitti" and kisi:
+            return bool(await self._db(self._tamamla, kisi, None))
+        if komut_turu == "yeni_gorev" and kisi and sonuc.get("task"):
+            bitis = bitis_zamani_hesapla(sonuc.get("duration"))
+            return await self._db(self._ata, kisi, sonuc.get("vehicle"), sonuc["task"], bitis)
+        if komut_turu == "sure_uzatma" and kisi:
+            sure = sure_timedelta(sonuc.get("duration"))
+            if sure is not None:
+                return bool(await self._db(self.db_manager.sure_uzat, kisi, sure.total_seconds() // 60))
+        return False
+
+    async def isle(self, metin, zaman_asimi=None):
+        """
+        Metni analiz edip komutu uygular.
+        :return: (analiz sonucu, uygulandı mı)
+        """
+        return await self._sinirli(self._isle(metin), zaman_asimi)
+
+    async def hepsini_isle(self, metinler, zaman_asimi=None):
+        """
+        Komutları aynı anda işler; sonuçlar girdi sırasıyla döner.
+        Başarısız veya zaman aşımına uğrayan komutun yerinde hata nesnesi bulunur.
+        """
+        return await asyncio.gather(*(self.isle(metin, zaman_asimi) for metin in metinler),
+                                    return_exceptions=True)
+
+    async def kapat(self):
+        """Ollama bağlantılarını kapatır ve veritabanı iş parçacıklarını durdurur."""
+        await self.istemci.kapat()
+        self._db_havuzu.shutdown(wait=False)
@@ -0,0 +1,194 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from name_index import IsimIndeksi
+from ollama import metin_analiz_et
+from is_yoneticisi import bitis_zamani_hesapla, sure_timedelta
+from reservation import ACIK_UC
+
+
+class TopluKomutIsleyici:
+    """
+    Vardiya başında girilen çok satırlı komutları toplu işler.
+    Satırlar sınırlı bir iş parçacığı havuzunda paralel analiz edilir, sonuçlar
+    personel/araç listesine karşı tek geçişte doğrulanır ve satırlar yazıldıkları
+    sırayla uygulanır; ardışık yeni görevler DatabaseManager.toplu_gorev_ata ile
+    tek işlemde veritabanına yazılır.
+    """
+
+    def __init__(self, db_manager, max_isci=8, model="qwen2.5vl:3b", analiz=metin_analiz_et, ayna=None, defter=None):
+        """
+        :param db_manager: DatabaseManager örneği.
+        :param max_isci: Aynı anda analiz edilecek en fazla satır sayısı.
+        :param analiz: Metin analiz fonksiyonu (varsayılan: ollama.metin_analiz_et).
+        :param ayna: Verilirse personel/araç durumları veritabanı yerine bu FiloAynasi'ndan okunur.
+        :param defter: Verilirse yeni görevler bu RezervasyonDefteri'ne karşı çakışma kontrolünden geçer.
+        """
+        self.db_manager = db_manager
+        self.ayna = ayna
+        self.defter = defter
+        self.max_isci = max_isci
+        self.model = model
+        self.analiz = analiz
+
+    @staticmethod
+    def satirlari_ayir(metin):
+        """Boş satırları ve '#' ile başlayan açıklamaları atarak (satır no, metin) listesi döndürür."""
+        return [(no, satir.strip()) for no, satir in enumerate((metin or "").splitlines(), start=1)
+                if satir.strip() and not satir.strip().startswith('#')]
+
+    def _analiz_et(self, satir):
+        try:
+            return self.analiz(satir, self.model)
+        except Exception as e:
+            print(f"Toplu analiz hatası: {e}")
+            return None
+
+    def _atamalari_uygula(self, bekleyenler):
+        """Biriken yeni görevleri DatabaseManager.toplu_gorev_ata ile tek işlemde ekler ve listeyi boşaltır."""
+        if not bekleyenler:
+            return
+        eklenen = self.db_manager.toplu_gorev_ata([atama for _, atama in bekleyenler])
+        for kayit, _ in bekleyenler:
+            if eklenen is None:
+                kayit["Sonuç"], kayit["Mesaj"] = "hata", "Toplu ekleme geri alındı."
+            else:
+                kayit["Sonuç"] = "eklendi"
+        bekleyenler.clear()
+
+    def isle(self, metin):
+        """
+        Metindeki tüm komutları işler.
+        :return: Her satır için {"Satır", "Metin", "Komut", "Kaynak", "Sonuç", "Mesaj"} sözlüklerinin listesi.
+        """
+        satirlar = self.satirlari_ayir(metin)
+        if not satirlar:
+            return []
+
+        # 1. Paralel analiz (LLM çağrıları birbirini beklemez)
+        with ThreadPoolExecutor(max_workers=self.max_isci) as havuz:
+            analizler = list(havuz.map(self._analiz_et, [satir for _, satir in satirlar]))
+
+        rapor = []
+        for (no, satir), analiz in zip(satirlar, analizler):
+            rapor.append({
+                "Satır": no,
+                "Metin": satir,
+                "Komut": analiz.get("komut_turu") if analiz else None,
+                "Kaynak": analiz.get("kaynak") if analiz else None,
+                "Sonuç": "hata" if not analiz else "bekliyor",
+                "Mesaj": "" if analiz else "Metin analiz edilemedi.",
+            })
+
+        # 2. Personel/araç listesine karşı tek geçişte doğrulama
+        if self.ayna is not None:
+            personeller, araclar = self.ayna.durum_tablolari()
+        else:
+            personeller, araclar = self.db_manager.durum_tablolari_al()
+        if personeller is None:
+            for kayit in rapor:
+                if kayit["Sonuç"] == "bekliyor":
+                    kayit["Sonuç"], kayit["Mesaj"] = "hata", "Personel/araç listesi okunamadı."
+            return rapor
+        personel_indeksi = IsimIndeksi(personeller)
+        arac_indeksi = IsimIndeksi(araclar)
+
+        # Kişiler önce çözülür: yeni görev, sonraki bir satırın bitireceği aktif görevle karışmasın
+        cozulenler = []
+        for kayit, analiz in zip(rapor, analizler):
+            if not analiz:
+                continue
+            kisi = personel_indeksi.en_iyi(analiz.get("person") or "")
+            if not kisi:
+                kayit["Sonuç"], kayit["Mesaj"] = "hata", f"Personel bulunamadı: {analiz.get('person')}"
+                continue
+            cozulenler.append((kayit, analiz, kisi))
+        kalan_bitisler = Counter(kisi for _, analiz, kisi in cozulenler if analiz.get("komut_turu") == "gorev_bitti")
+
+        # 3. Satırlar yazıldıkları sırayla uygulanır; ardışık yeni görevler tek işlemde eklenir
+        bekleyenler = []
+        kullanilan_personel, kullanilan_arac = set(), set()
+        bitirilenler, bosalan_araclar = set(), set()
+        for kayit, analiz, kisi in cozulenler:
+            komut = analiz.get("komut_turu")
+            if komut == "gorev_bitti":
+                kalan_bitisler[kisi] -= 1
+                self._atamalari_uygula(bekleyenler)
+                gorev = self.db_manager.gorev_tamamla(kisi)
+                if gorev:
+                    kayit["Sonuç"] = "tamamlandı"
+                    bitirilenler.add(kisi)
+                    kullanilan_personel.discard(kisi)
+                    if gorev.get("Arac"):
+                        bosalan_araclar.add(gorev["Arac"])
+                        kullanilan_arac.discard(gorev["Arac"])
+                else:
+                    kayit["Sonuç"], kayit["Mesaj"] = "hata", f"'{kisi}' için aktif görev bulunamadı."
+                continue
+            if komut == "sure_uzatma":
+                sure = sure_timedelta(analiz.get("duration"))
+                if sure is None:
+                    kayit["Sonuç"], kayit["Mesaj"] = "hata", "Süre bilgisi anlaşılamadı."
+                    continue
+                # Önceki satırlarda eklenen görevler de uzatılabilsin diye bekleyenler önce yazılır
+                self._atamalari_uygula(bekleyenler)
+                gorev = self.db_manager.sure_uzat(kisi, sure.total_seconds() // 60)
+                if gorev:
+                    kayit["Sonuç"], kayit["Mesaj"] = "uzatıldı", f"Yeni bitiş: {gorev['Tahmini_bitis']:%d.%m.%Y %H:%M}"
+                else:
+                    kayit["Sonuç"], kayit["Mesaj"] = "hata", f"'{kisi}' için aktif görev bulunamadı."
+                continue
+            if komut != "yeni_gorev":
+                kayit["Sonuç"], kayit["Mesaj"] = "atlandı", "Bu komut türü toplu modda desteklenmiyor."
+                continue
+
+            arac = None
+            if analiz.get("vehicle"):
+                arac = arac_indeksi.en_iyi(analiz["vehicle"])
+                if not arac:
+                    kayit["Sonuç"], kayit["Mesaj"] = "hata", f"Araç bulunamadı: {analiz['vehicle']}"
+                    continue
+            if not analiz.get("task"):
+                kayit["Sonuç"], kayit["Mesaj"] = "hata", "Görev açıklaması eksik."
+                continue
+            if kisi in kullanilan_personel:
+                kayit["Sonuç"], kayit["Mesaj"] = "hata", f"'{kisi}' bu listede zaten görevlendirildi."
+                continue
+            if arac and arac in kullanilan_arac:
+                kayit["Sonuç"], kayit["Mesaj"] = "hata", f"'{arac}' bu listede zaten kullanılıyor."
+                continue
+            personel_aktif = (personeller.get(kisi) or (None,))[0] == "Aktif" and kisi not in bitirilenler
+            if personel_aktif and kalan_bitisler[kisi] > 0:
+                # gorev_tamamla personelin tüm aktif satırlarını taşır; yeni görev de hemen tamamlanmış olurdu
+                kayit["Sonuç"], kayit["Mesaj"] = "hata", (
+                    f"'{kisi}' aktif görevi sonraki bir satırda bitiriliyor; yeni görev o satırdan sonra yazılmalı.")
+                continue
+
+            bitis = bitis_zamani_hesapla(analiz.get("duration"))
+            if self.defter is not None:
+                cakismalar = self.defter.cakismalar(arac, kisi, datetime.now(), bitis or ACIK_UC)
+                if cakismalar:
+                    ilk = cakismalar[0]
+                    kayit["Sonuç"], kayit["Mesaj"] = "hata", (
+                        f"Çakışma ({ilk['Neden']}): {ilk['Personel'] or '-'} / {ilk['Arac'] or '-'} "
+                        f"{ilk['Baslangic']:%d.%m %H:%M}")
+                    continue
+
+            kullanilan_personel.add(kisi)
+            if arac:
+                kullanilan_arac.add(arac)
+            uyari = []
+            if personel_aktif:
+                uyari.append(f"'{kisi}' zaten aktif")
+            if arac and araclar.get(arac) == "Aktif" and arac not in bosalan_araclar:
+                uyari.append(f"'{arac}' zaten aktif")
+            kayit["Mesaj"] = "; ".join(uyari)
+            bekleyenler.append((kayit, {
+                "Personel": kisi,
+                "Arac": arac,
+                "Gorev": analiz["task"],
+                "Tahmini_bitis": bitis,
+            }))
+
+        self._atamalari_uygula(bekleyenler)
+        return rapor
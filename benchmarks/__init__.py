@@ -0,0 +1,5 @@
+"""
+Sıcak yollar için benchmark paketi.
+Sentetik kadro/komut üreteci (synthetic), sahte Ollama sunucusu (fake_ollama) ve
+gömülü SQLite ile canlı servis gerektirmeden çalışır: python -m benchmarks
+"""
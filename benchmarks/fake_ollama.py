@@ -0,0 +1,161 @@
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_METIN = re.compile(r'Metin:\s*"([^"]*)"')
+
+
+def varsayilan_yanit(prompt):
+    """Prompt'taki metinden geçerli görünen bir görev/uzatma yanıtı üretir (model çıktısı taklidi)."""
+    eslesme = _METIN.search(prompt)
+    kelimeler = (eslesme.group(1) if eslesme else "").split()
+    return json.dumps({
+        "person": ' '.join(kelimeler[:2]),
+        "task": ' '.join(kelimeler[2:4]) or "görev",
+        "vehicle": None,
+        "duration": {"value": 1, "unit": "saat"},
+    }, ensure_ascii=False)
+
+
+class _Sunucu(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # İstemcinin keep-alive bağlantısını kapatması hata değildir
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class SahteOllama:
+    """
+    Yerel /api/generate sunucusu. Gerçek Ollama gibi akış modunda yanıtı satır
+    satır (NDJSON, chunked) gönderir; ilk parça öncesi ve parçalar arası gecikme
+    ayarlanabilir. Benchmark'larda model kurulmadan LLM yolunu ölçmek içindir.
+    """
+
+    AKTARIMLAR = ("chunked", "kapat")
+
+    def __init__(self, ilk_parca_gecikmesi=0.2, parca_gecikmesi=0.002, parca_boyu=4, yanit=varsayilan_yanit,
+                 host="127.0.0.1", port=0, aktarim="chunked"):
+        """
+        :param ilk_parca_gecikmesi: İstek ile ilk parça arasındaki süre (saniye; prompt işleme taklidi).
+        :param parca_gecikmesi: Parçalar arası süre (saniye; token üretim hızı taklidi).
+        :param parca_boyu: Parça başına karakter sayısı.
+        :param yanit: prompt -> model yanıtı metni.
+        :param port: 0 ise boş bir port seçilir.
+        :param aktarim: "chunked" (gerçek Ollama gibi; akışsız yanıtlar Content-Length ile) veya
+            "kapat" (uzunluk bildirmeden gövdeyi yazıp bağlantıyı kapatan HTTP/1.0 tarzı sunucu).
+        """
+        if aktarim not in self.AKTARIMLAR:
+            raise ValueError(f"Bilinmeyen aktarım: {aktarim}")
+        self.aktarim = aktarim
+        self.ilk_parca_gecikmesi = ilk_parca_gecikmesi
+        self.parca_gecikmesi = parca_gecikmesi
+        self.parca_boyu = parca_boyu
+        self.yanit = yanit
+        self.istek_sayisi = 0
+        self.baglanti_sayisi = 0
+        self._kilit = threading.Lock()
+        self._sunucu = _Sunucu((host, port), self._isleyici_sinifi())
+        self._is_parcacigi = None
+
+    @property
+    def url(self):
+        host, port = self._sunucu.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _isleyici_sinifi(self):
+        sahte = self
+
+        class Isleyici(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with sahte._kilit:
+                    sahte.baglanti_sayisi += 1
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self.send_error(404)
+                    return
+                istek = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with sahte._kilit:
+                    sahte.istek_sayisi += 1
+                metin = sahte.yanit(istek.get("prompt", ""))
+                time.sleep(sahte.ilk_parca_gecikmesi)
+                if sahte.aktarim == "kapat":
+                    self._kapatarak_yaz(istek, metin)
+                    return
+                if not istek.get("stream", True):
+                    govde = json.dumps({"model": istek.get("model"), "response": metin, "done": True}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(govde)))
+                    self.end_headers()
+                    self.wfile.write(govde)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                parcalar = [metin[i:i + sahte.parca_boyu] for i in range(0, len(metin), sahte.parca_boyu)]
+                try:
+                    for parca in parcalar:
+                        self._parca_yaz({"model": istek.get("model"), "response": parca, "done": False})
+                        time.sleep(sahte.parca_gecikmesi)
+                    self._parca_yaz({"model": istek.get("model"), "response": "", "done": True})
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # İstemci JSON tamamlanınca bağlantıyı erken kapatır
+                    self.close_connection = True
+
+            def _kapatarak_yaz(self, istek, metin):
+                """Gövde uzunluğu bildirilmez; yanıtın sonu bağlantının kapanmasıyla anlaşılır."""
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                if not istek.get("stream", True):
+                    self.wfile.write(json.dumps({"model": istek.get("model"), "response": metin, "done": True}).encode())
+                    return
+                parcalar = [metin[i:i + sahte.parca_boyu] for i in range(0, len(metin), sahte.parca_boyu)]
+                try:
+                    for parca in parcalar + [""]:
+                        nesne = {"model": istek.get("model"), "response": parca, "done": not parca}
+                        self.wfile.write(json.dumps(nesne, ensure_ascii=False).encode() + b"\n")
+                        self.wfile.flush()
+                        time.sleep(sahte.parca_gecikmesi)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _parca_yaz(self, nesne):
+                veri = json.dumps(nesne, ensure_ascii=False).encode() + b"\n"
+                self.wfile.write(f"{len(veri):x}\r\n".encode() + veri + b"\r\n")
+                self.wfile.flush()
+
+        return Isleyici
+
+    def baslat(self):
+        self._is_parcacigi = threading.Thread(target=self._sunucu.serve_forever, name="SahteOllama", daemon=True)
+        self._is_parcacigi.start()
+        return self
+
+    def durdur(self):
+        self._sunucu.shutdown()
+        self._sunucu.server_close()
+        if self._is_parcacigi is not None:
+            self._is_parcacigi.join()
+
+    def __enter__(self):
+        return self.baslat()
+
+    def __exit__(self, *args):
+        self.durdur()
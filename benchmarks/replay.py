@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import ollama
+from async_pipeline import AsenkronKomutHatti, AsenkronOllamaIstemcisi
+from command_trace import izi_oku, komut_izini_ayarla
+from database_backends import SqliteBackend, backend_olustur
+from database_manager import DatabaseManager
+from sql_tracer import SqlIzleyici
+from benchmarks.fake_ollama import SahteOllama
+from benchmarks.run import ortam_bilgisi
+from benchmarks.synthetic import arac_listesi, komut_uret, personel_listesi
+
+KOMUT_TURLERI = ("yeni_gorev", "gorev_bitti", "sure_uzatma")
+
+
+def sentetik_iz(adet, oran, personel_sayisi=500, arac_sayisi=100, tohum=0):
+    """
+    Yük üreteci: Poisson varışlı (saniyede ortalama 'oran' komut) sentetik komut izi.
+    :return: izi_oku ile aynı biçimde kayıtlar.
+    """
+    rng = random.Random(tohum)
+    kadro = personel_listesi(personel_sayisi, tohum=tohum)
+    araclar = arac_listesi(arac_sayisi)
+    zaman = datetime(2026, 1, 5, 8, 0)
+    kayitlar = []
+    for tur, kisi, metin in komut_uret(kadro, araclar, adet, tohum=tohum, tutarli=True):
+        zaman += timedelta(seconds=rng.expovariate(oran))
+        kayitlar.append({"zaman": zaman, "metin": metin, "sonuc": {"komut_turu": tur, "person": kisi}})
+    return kayitlar, kadro, araclar
+
+
+def izdeki_adlar(kayitlar):
+    """Kayıtlı analiz sonuçlarındaki personel ve araç adları (stand-in veritabanını doldurmak için)."""
+    personeller, araclar = set(), set()
+    for kayit in kayitlar:
+        sonuc = kayit.get("sonuc") or {}
+        if sonuc.get("person"):
+            personeller.add(sonuc["person"])
+        if sonuc.get("vehicle"):
+            araclar.add(sonuc["vehicle"])
+    return sorted(personeller), sorted(araclar)
+
+
+def sahte_veritabani(personeller, araclar):
+    """Adları 'Boşta' olarak eklenmiş bellek içi SQLite DatabaseManager."""
+    db = DatabaseManager(backend=SqliteBackend(":memory:"), havuz_boyutu=8)
+    db.connect()
+    with db._baglanti() as baglanti:
+        cursor = baglanti.cursor()
+        db.backend.coklu_calistir(cursor, "INSERT INTO Personeller (Personel, Durum) VALUES (?, ?)",
+                                  [(ad, "Boşta") for ad in personeller])
+        db.backend.coklu_calistir(cursor, "INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)",
+                                  [(ad, "Boşta") for ad in araclar])
+        baglanti.commit()
+    return db
+
+
+async def tekrar_oynat(hat, kayitlar, hiz=1.0, zaman_asimi=None):
+    """
+    Kayıtları özgün aralıklarını 'hiz' kat sıkıştırarak hatta gönderir.
+    Gecikme, komutun planlanan gönderim anından sonucunun alınmasına kadar ölçülür;
+    eşzamanlılık sınırında sıra bekleme de gecikmeye dahildir.
+    :return: (ölçümler, toplam süre saniye)
+    """
+    dongu = asyncio.get_running_loop()
+    ilk = kayitlar[0]["zaman"]
+    baslangic = dongu.time()
+
+    async def gonder(kayit):
+        planlanan = baslangic + (kayit["zaman"] - ilk).total_seconds() / hiz
+        await asyncio.sleep(max(0.0, planlanan - dongu.time()))
+        sonuc, uygulandi, hata = None, False, None
+        try:
+            sonuc, uygulandi = await hat.isle(kayit["metin"], zaman_asimi)
+            if not sonuc:
+                hata = "analiz"
+        except asyncio.TimeoutError:
+            hata = "zaman_asimi"
+        except Exception as e:
+            hata = type(e).__name__
+        tur = (sonuc or kayit.get("sonuc") or {}).get("komut_turu") or "bilinmiyor"
+        return {"tur": tur, "gecikme_ms": (dongu.time() - planlanan) * 1000, "uygulandi": bool(uygulandi),
+                "hata": hata}
+
+    olcumler = await asyncio.gather(*(gonder(kayit) for kayit in kayitlar))
+    return olcumler, dongu.time() - baslangic
+
+
+def _yuzdelik(sirali, oran):
+    if not sirali:
+        return None
+    return round(sirali[min(len(sirali) - 1, max(0, int(round(oran * len(sirali))) - 1))], 3)
+
+
+def _istatistik(olcumler, sure):
+    gecikmeler = sorted(o["gecikme_ms"] for o in olcumler)
+    hatalar = [o for o in olcumler if o["hata"]]
+    return {
+        "adet": len(olcumler),
+        "islem_hizi": round(len(olcumler) / sure, 3) if sure else None,
+        "p50_ms": _yuzdelik(gecikmeler, 0.50),
+        "p95_ms": _yuzdelik(gecikmeler, 0.95),
+        "p99_ms": _yuzdelik(gecikmeler, 0.99),
+        "hata_orani": round(len(hatalar) / len(olcumler), 4) if olcumler else 0.0,
+        # Hatasız işlenip uygulanamayan komutlar (ör. aktif görevi olmayan personel)
+        "uygulanmayan_orani": round(sum(1 for o in olcumler if not o["hata"] and not o["uygulandi"])
+                                    / len(olcumler), 4) if olcumler else 0.0,
+        "hatalar": {ad: sum(1 for o in hatalar if o["hata"] == ad) for ad in sorted({o["hata"] for o in hatalar})},
+    }
+
+
+def ozetle(olcumler, sure, iz_suresi, hiz):
+    """Komut türü bazında ve toplamda gecikme yüzdelikleri, işlem hızı ve hata oranları."""
+    turler = {}
+    for olcum in olcumler:
+        turler.setdefault(olcum["tur"], []).append(olcum)
+    return {
+        "hiz": hiz,
+        "sure_s": round(sure, 3),
+        # Hattın karşılaması gereken ortalama istek hızı; islem_hizi bunun altında kalıyorsa hat doymuştur
+        "teklif_hizi": round(len(olcumler) / (iz_suresi / hiz), 3) if iz_suresi else None,
+        "toplam": _istatistik(olcumler, sure),
+        "turler": {tur: _istatistik(turler[tur], sure)
+                   for tur in [t for t in KOMUT_TURLERI if t in turler] + sorted(set(turler) - set(KOMUT_TURLERI))},
+    }
+
+
+async def _calistir(kayitlar, hiz, eszamanli, ollama_url, veritabani, zaman_asimi, sql_izleme=False):
+    db = veritabani()
+    if sql_izleme:
+        db.sql_izleyici = SqlIzleyici(yazdir=False)
+    hat = AsenkronKomutHatti(db, max_eszamanli=eszamanli, istemci=AsenkronOllamaIstemcisi(ollama_url),
+                             zaman_asimi=zaman_asimi)
+    try:
+        olcumler, sure = await tekrar_oynat(hat, kayitlar, hiz)
+    finally:
+        await hat.kapat()
+        db.close()
+    iz_suresi = (kayitlar[-1]["zaman"] - kayitlar[0]["zaman"]).total_seconds()
+    ozet = ozetle(olcumler, sure, iz_suresi, hiz)
+    if sql_izleme:
+        # Komut türü başına ortalama ifade/commit sayısı ve işaretlenen gereksiz gidiş-dönüşler
+        ozet["sql"] = db.sql_izleyici.ozet(komut_disi=False)
+        ozet["sql_rapor"] = db.sql_izleyici.rapor()
+    return ozet
+
+
+def _rapor_satiri(ozet):
+    t = ozet["toplam"]
+    satirlar = [f"x{ozet['hiz']:<6} teklif {ozet['teklif_hizi']}/sn  işlenen {t['islem_hizi']}/sn  "
+                f"p50 {t['p50_ms']} p95 {t['p95_ms']} p99 {t['p99_ms']} ms  hata %{t['hata_orani'] * 100:.1f}"]
+    for tur, s in ozet["turler"].items():
+        satirlar.append(f"    {tur:<12} n={s['adet']:<6} p50 {s['p50_ms']} p95 {s['p95_ms']} p99 {s['p99_ms']} ms  "
+                        f"hata %{s['hata_orani'] * 100:.1f}  uygulanmayan %{s['uygulanmayan_orani'] * 100:.1f}")
+    return "\n".join(satirlar)
+
+
+def main(argv=None):
+    ayristirici = argparse.ArgumentParser(
+        description="Kaydedilmiş (KOMUT_IZI_DOSYASI) veya sentetik komut izini tüm hatta N kat hızla oynatır.")
+    ayristirici.add_argument("iz", nargs="?", help="Komut izi dosyası (JSON Lines); verilmezse sentetik yük üretilir")
+    ayristirici.add_argument("--hizlar", default="1", help="Virgülle ayrılmış hız katları (ör. 1,5,10,50)")
+    ayristirici.add_argument("--eszamanli", type=int, default=50, help="Aynı anda işlenecek en fazla komut")
+    ayristirici.add_argument("--sentetik", type=int, default=1000, help="Sentetik yükte komut sayısı")
+    ayristirici.add_argument("--oran", type=float, default=5, help="Sentetik yükte saniyedeki ortalama komut")
+    ayristirici.add_argument("--ollama", help="Gerçek Ollama adresi; verilmezse sahte sunucu kullanılır")
+    ayristirici.add_argument("--ilk-parca-ms", type=float, default=200, help="Sahte Ollama'nın ilk parça gecikmesi")
+    ayristirici.add_argument("--parca-ms", type=float, default=2, help="Sahte Ollama'nın parçalar arası gecikmesi")
+    ayristirici.add_argument("--ortam-veritabani", action="store_true",
+                             help=".env'deki veritabanını kullan (DİKKAT: komutlar gerçekten uygulanır)")
+    ayristirici.add_argument("--kuralsiz", action="store_true", help="Kural tabanlı ayrıştırıcıyı kapat (hepsi LLM'e)")
+    ayristirici.add_argument("--sql-izleme", action="store_true",
+                             help="Komut türü başına SQL ifade/commit sayılarını da raporla (bkz. sql_tracer)")
+    ayristirici.add_argument("--zaman-asimi", type=float, default=60, help="Komut başına zaman aşımı (saniye)")
+    ayristirici.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası (varsayılan: standart çıktı)")
+    secenekler = ayristirici.parse_args(argv)
+
+    if secenekler.iz:
+        kayitlar = izi_oku(secenekler.iz)
+        personeller, araclar = izdeki_adlar(kayitlar)
+    else:
+        kayitlar, personeller, araclar = sentetik_iz(secenekler.sentetik, secenekler.oran)
+    if not kayitlar:
+        ayristirici.error("Oynatılacak komut yok.")
+
+    if secenekler.ortam_veritabani:
+        from dotenv import load_dotenv
+        load_dotenv()
+
+        def veritabani():
+            db = DatabaseManager(backend=backend_olustur())
+            db.connect()
+            return db
+    else:
+        def veritabani():
+            return sahte_veritabani(personeller, araclar)
+
+    # Oynatılan komutlar ize yeniden yazılmaz; önbellek her çalıştırmada aynı koşulları bozmasın diye kapalı
+    komut_izini_ayarla(None)
+    ollama.analiz_onbellegini_ayarla(None)
+    if not secenekler.kuralsiz:
+        ollama.kural_sozlugu_ayarla(personeller, araclar)
+
+    with contextlib.ExitStack() as yigin:
+        ollama_url = secenekler.ollama
+        if ollama_url is None:
+            ollama_url = yigin.enter_context(
+                SahteOllama(secenekler.ilk_parca_ms / 1000, secenekler.parca_ms / 1000)).url
+        ozetler = []
+        for hiz in [float(h) for h in secenekler.hizlar.split(",")]:
+            with open(os.devnull, "w") as bos, contextlib.redirect_stdout(bos):
+                ozet = asyncio.run(_calistir(kayitlar, hiz, secenekler.eszamanli, ollama_url, veritabani,
+                                             secenekler.zaman_asimi, secenekler.sql_izleme))
+            print(_rapor_satiri(ozet), file=sys.stderr)
+            if secenekler.sql_izleme:
+                print(ozet.pop("sql_rapor"), file=sys.stderr)
+            ozetler.append(ozet)
+
+    rapor = {"zaman": datetime.now().isoformat(timespec="seconds"), "ortam": ortam_bilgisi(),
+             "iz": secenekler.iz or f"sentetik:{secenekler.sentetik}@{secenekler.oran}/sn",
+             "komut_sayisi": len(kayitlar), "eszamanli": secenekler.eszamanli, "sonuclar": ozetler}
+    metin = json.dumps(rapor, ensure_ascii=False, indent=2)
+    if secenekler.cikti:
+        with open(secenekler.cikti, "w", encoding="utf-8") as dosya:
+            dosya.write(metin)
+    else:
+        print(metin)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
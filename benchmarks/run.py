@@ -0,0 +1,248 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import ollama
+from analysis_cache import AnalizOnbellegi
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from name_index import IsimIndeksi
+from benchmarks.fake_ollama import SahteOllama
+from benchmarks.synthetic import arac_listesi, komut_uret, personel_listesi, yazim_hatasi
+
+SONUC_SURUMU = 1
+GRUPLAR = ("isim", "analiz", "db")
+
+
+def olc(ad, fonksiyon, girdiler, **parametreler):
+    """
+    fonksiyon(girdi) çağrısını her girdi için ayrı ayrı ölçer.
+    :return: {"ad", "parametreler", "tekrar", "min_ms", "medyan_ms", "p95_ms", "ortalama_ms", "toplam_s"}
+    """
+    sureler = []
+    for girdi in girdiler:
+        baslangic = time.perf_counter()
+        fonksiyon(girdi)
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+    sureler.sort()
+    return {
+        "ad": ad,
+        "parametreler": parametreler,
+        "tekrar": len(sureler),
+        "min_ms": round(sureler[0], 4),
+        "medyan_ms": round(statistics.median(sureler), 4),
+        "p95_ms": round(sureler[min(len(sureler) - 1, int(len(sureler) * 0.95))], 4),
+        "ortalama_ms": round(statistics.fmean(sureler), 4),
+        "toplam_s": round(sum(sureler) / 1000, 4),
+    }
+
+
+def _ilerleme(sonuc):
+    print(f"{sonuc['ad']:<32} {json.dumps(sonuc['parametreler'], ensure_ascii=False):<28} "
+          f"medyan {sonuc['medyan_ms']:>10.3f} ms  p95 {sonuc['p95_ms']:>10.3f} ms  (n={sonuc['tekrar']})",
+          file=sys.stderr)
+
+
+def isim_eslestirme(boyutlar, tekrar):
+    """_normalize_name ve _smart_name_match'i farklı kadro büyüklüklerinde ölçer."""
+    db = DatabaseManager(backend=SqliteBackend(":memory:"))
+    rng = random.Random(1)
+    for n in boyutlar:
+        kadro = personel_listesi(n, tohum=n)
+        dogru = [rng.choice(kadro) for _ in range(tekrar)]
+        aranan = [yazim_hatasi(ad, rng) for ad in dogru]
+        yield olc("isim.normalize_name", db._normalize_name, aranan, n=n)
+        # Tek seferlik listeler: her çağrı indeksi baştan kurar
+        adet = max(3, min(tekrar, 200_000 // n))
+        yield olc("isim.smart_name_match", lambda a: db._smart_name_match(a, kadro), aranan[:adet], n=n)
+        # Tablolar için kurulu indeksten sorgu (_isim_cozumle yolu)
+        indeks = IsimIndeksi(kadro)
+        bulunan = []
+        sonuc = olc("isim.indeks_en_iyi", lambda a: bulunan.append(indeks.en_iyi(a)), aranan, n=n)
+        sonuc["ek"] = {"dogru_oran": round(sum(b == d for b, d in zip(bulunan, dogru)) / len(dogru), 4)}
+        yield sonuc
+
+
+def analiz_yollari(tekrar, ilk_parca_gecikmesi, parca_gecikmesi):
+    """metin_analiz_et'i kural, LLM (sahte sunucu) ve önbellek yollarında ölçer."""
+    kadro = personel_listesi(1000, tohum=7)
+    araclar = arac_listesi(100)
+    komutlar = [metin for _, _, metin in komut_uret(kadro, araclar, tekrar, tohum=3)]
+
+    ollama.analiz_onbellegini_ayarla(None)
+    ollama.kural_sozlugu_ayarla(kadro, araclar)
+    onceki = ollama.ayristirma_istatistikleri()["yollar"]
+    sonuc = olc("analiz.kural", lambda m: ollama.metin_analiz_et(m), komutlar, kadro=len(kadro))
+    sonraki = ollama.ayristirma_istatistikleri()["yollar"]
+    sonuc["ek"] = {"yollar": {yol: adet - onceki.get(yol, 0) for yol, adet in sonraki.items()}}
+    yield sonuc
+
+    with SahteOllama(ilk_parca_gecikmesi, parca_gecikmesi) as sunucu:
+        ollama.ollama_yapilandir(sunucu.url)
+        # Kural sözlüğü olmadan yeni görev ve uzatma komutları LLM'e gider
+        ollama._kural_ayristirici = None
+        llm_komutlari = [m for m in komutlar if not any(k in m for k in ("bitti", "tamamladı"))][:max(5, tekrar // 5)]
+        sonuc = olc("analiz.llm", lambda m: ollama.metin_analiz_et(m), llm_komutlari,
+                    ilk_parca_ms=round(ilk_parca_gecikmesi * 1000), parca_ms=round(parca_gecikmesi * 1000))
+        sonuc["ek"] = {"istek": sunucu.istek_sayisi}
+        yield sonuc
+
+        ollama.analiz_onbellegini_ayarla(AnalizOnbellegi())
+        for metin in llm_komutlari:
+            ollama.metin_analiz_et(metin)
+        yield olc("analiz.onbellek", lambda m: ollama.metin_analiz_et(m), llm_komutlari)
+        ollama.analiz_onbellegini_ayarla(None)
+
+
+def _veritabani_hazirla(personel_sayisi, arac_sayisi):
+    db = DatabaseManager(backend=SqliteBackend(":memory:"))
+    db.connect()
+    kadro = personel_listesi(personel_sayisi, tohum=11)
+    araclar = arac_listesi(arac_sayisi)
+    with db._baglanti() as baglanti:
+        cursor = baglanti.cursor()
+        db.backend.coklu_calistir(cursor, "INSERT INTO Personeller (Personel, Durum) VALUES (?, ?)",
+                                  [(ad, "Boşta") for ad in kadro])
+        db.backend.coklu_calistir(cursor, "INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)",
+                                  [(ad, "Boşta") for ad in araclar])
+        baglanti.commit()
+    return db, kadro, araclar
+
+
+def veritabani_akislari(personel_sayisi, tekrar):
+    """DatabaseManager akışlarını gömülü SQLite üzerinde uçtan uca ölçer."""
+    db, kadro, araclar = _veritabani_hazirla(personel_sayisi, max(tekrar, 100))
+    rng = random.Random(5)
+    secilen = rng.sample(kadro, tekrar)
+    eslesme = list(zip(secilen, araclar))
+    p = {"personel": personel_sayisi}
+
+    def yeni_gorev(girdi):
+        kisi, arac = girdi
+        db.aktif_gorev_ekle({"Personel": kisi, "Arac": arac, "Gorev": "kazı", "Durum": "Aktif",
+                             "Tahmini_bitis": (datetime.now() + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')})
+        db.operatoru_aktif_yap(kisi, arac)
+
+    yield olc("db.yeni_gorev", yeni_gorev, eslesme, **p)
+    yield olc("db.sure_uzat", lambda kisi: db.sure_uzat(kisi, 30), secilen, **p)
+    yield olc("db.toplu_sure_uzat", lambda arac: db.toplu_sure_uzat(15, arac_adi=arac), araclar[:tekrar], **p)
+    yield olc("db.durum_tablolari_al", lambda _: db.durum_tablolari_al(), range(max(3, tekrar // 10)), **p)
+    yield olc("db.personel_bul", db.personel_bul, [yazim_hatasi(k, rng) for k in secilen], **p)
+    yield olc("db.gorev_tamamla", db.gorev_tamamla, secilen, **p)
+    yield olc("db.tamamlanan_isler_sayfasi", lambda _: db.tamamlanan_isler_sayfasi(sayfa_boyutu=50),
+              range(max(3, tekrar // 10)), **p)
+
+    # Toplu atama: 50'lik gruplar tek işlemde yazılır ve ardından tek tek tamamlanır
+    gruplar = [[{"Personel": kisi, "Arac": arac, "Gorev": "yükleme", "Tahmini_bitis": None}
+                for kisi, arac in eslesme[i:i + 50]] for i in range(0, len(eslesme), 50)]
+
+    def toplu_ata(grup):
+        db.toplu_gorev_ata(grup)
+        for atama in grup:
+            db.gorev_tamamla(atama["Personel"])
+
+    yield olc("db.toplu_gorev_ata+tamamla", toplu_ata, gruplar, grup=50, **p)
+    db.close()
+
+
+def ortam_bilgisi():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "islemci": platform.processor() or platform.machine(), "commit": commit or None}
+
+
+def _anahtar(sonuc):
+    return sonuc["ad"], json.dumps(sonuc["parametreler"], sort_keys=True)
+
+
+def karsilastir(onceki, simdiki, esik=0.25):
+    """
+    İki sonuç dosyasını medyan süreye göre karşılaştırır.
+    :param esik: Bu orandan fazla yavaşlayan ölçümler gerileme sayılır (0.25: %25).
+    :return: [{"ad", "parametreler", "onceki_ms", "simdiki_ms", "oran", "gerileme"}] listesi.
+    """
+    eski = {_anahtar(s): s for s in onceki["sonuclar"]}
+    satirlar = []
+    for sonuc in simdiki["sonuclar"]:
+        karsi = eski.get(_anahtar(sonuc))
+        if karsi is None or not karsi["medyan_ms"]:
+            continue
+        oran = sonuc["medyan_ms"] / karsi["medyan_ms"]
+        satirlar.append({"ad": sonuc["ad"], "parametreler": sonuc["parametreler"], "onceki_ms": karsi["medyan_ms"],
+                         "simdiki_ms": sonuc["medyan_ms"], "oran": round(oran, 3), "gerileme": oran > 1 + esik})
+    return satirlar
+
+
+def calistir(gruplar=GRUPLAR, boyutlar=(100, 1000, 10_000, 100_000), tekrar=200, personel_sayisi=10_000,
+             ilk_parca_gecikmesi=0.2, parca_gecikmesi=0.002):
+    """Seçilen benchmark gruplarını çalıştırır ve JSON'a yazılabilir sonuç sözlüğünü döndürür."""
+    sonuclar = []
+    uretecler = {
+        "isim": lambda: isim_eslestirme(boyutlar, tekrar),
+        "analiz": lambda: analiz_yollari(tekrar, ilk_parca_gecikmesi, parca_gecikmesi),
+        "db": lambda: veritabani_akislari(personel_sayisi, tekrar),
+    }
+    # Uygulamanın DEBUG çıktıları ölçüm raporuna karışmasın
+    with open(os.devnull, "w") as bos, contextlib.redirect_stdout(bos):
+        for grup in gruplar:
+            for sonuc in uretecler[grup]():
+                _ilerleme(sonuc)
+                sonuclar.append(sonuc)
+    return {"surum": SONUC_SURUMU, "zaman": datetime.now().isoformat(timespec="seconds"),
+            "ortam": ortam_bilgisi(), "sonuclar": sonuclar}
+
+
+def main(argv=None):
+    ayristirici = argparse.ArgumentParser(description="Sıcak yollar için benchmark (yerel SQLite ve sahte Ollama ile).")
+    ayristirici.add_argument("--gruplar", default=",".join(GRUPLAR), help="Virgülle ayrılmış: isim,analiz,db")
+    ayristirici.add_argument("--boyutlar", default="100,1000,10000,100000", help="İsim eşleştirme kadro büyüklükleri")
+    ayristirici.add_argument("--tekrar", type=int, default=200, help="Ölçüm başına çağrı sayısı")
+    ayristirici.add_argument("--personel", type=int, default=10_000, help="Veritabanı akışlarındaki personel sayısı")
+    ayristirici.add_argument("--ilk-parca-ms", type=float, default=200, help="Sahte Ollama'nın ilk parça gecikmesi")
+    ayristirici.add_argument("--parca-ms", type=float, default=2, help="Sahte Ollama'nın parçalar arası gecikmesi")
+    ayristirici.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası (varsayılan: standart çıktı)")
+    ayristirici.add_argument("--karsilastir", help="Önceki bir sonuç dosyası; gerileme varsa çıkış kodu 1 olur")
+    ayristirici.add_argument("--esik", type=float, default=0.25, help="Gerileme eşiği (0.25: medyan %%25 yavaşlama)")
+    secenekler = ayristirici.parse_args(argv)
+
+    gruplar = [g.strip() for g in secenekler.gruplar.split(",") if g.strip()]
+    bilinmeyen = set(gruplar) - set(GRUPLAR)
+    if bilinmeyen:
+        ayristirici.error(f"Bilinmeyen grup: {', '.join(sorted(bilinmeyen))}")
+    rapor = calistir(gruplar, [int(b) for b in secenekler.boyutlar.split(",")], secenekler.tekrar,
+                     secenekler.personel, secenekler.ilk_parca_ms / 1000, secenekler.parca_ms / 1000)
+
+    metin = json.dumps(rapor, ensure_ascii=False, indent=2)
+    if secenekler.cikti:
+        with open(secenekler.cikti, "w", encoding="utf-8") as dosya:
+            dosya.write(metin)
+    else:
+        print(metin)
+
+    if secenekler.karsilastir:
+        with open(secenekler.karsilastir, encoding="utf-8") as dosya:
+            satirlar = karsilastir(json.load(dosya), rapor, secenekler.esik)
+        for satir in satirlar:
+            isaret = "GERİLEME" if satir["gerileme"] else ""
+            print(f"{satir['ad']:<32} {json.dumps(satir['parametreler'], ensure_ascii=False):<28} "
+                  f"{satir['onceki_ms']:>10.3f} -> {satir['simdiki_ms']:>10.3f} ms  x{satir['oran']:<6} {isaret}",
+                  file=sys.stderr)
+        if any(satir["gerileme"] for satir in satirlar):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
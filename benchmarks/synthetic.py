@@ -0,0 +1,95 @@
+import random
+
+ADLAR = ["Ali", "Ahmet", "Mehmet", "Mustafa", "Murat", "Hüseyin", "Hasan", "İbrahim", "İsmail", "Osman",
+         "Yusuf", "Ömer", "Ramazan", "Emre", "Burak", "Serkan", "Çağrı", "Gökhan", "Şükrü", "Fatih",
+         "Ayşe", "Fatma", "Zeynep", "Elif", "Özlem", "Gül", "Şule", "Büşra", "Esra", "Merve"]
+SOYADLAR = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın", "Özdemir",
+            "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek",
+            "Baydemir", "Aslantaş", "Güneş", "Polat", "Erdoğan", "Taş", "Bulut", "Avcı", "Korkmaz", "Uçar"]
+ARAC_TURLERI = ["Vinç", "Kamyon", "Forklift", "Ekskavatör", "Loder", "Silindir", "Greyder", "Beton Pompası"]
+GOREVLER = ["kazı", "beton dökümü", "malzeme taşıma", "yükleme", "boşaltma", "iskele kurulumu",
+            "hafriyat", "zemin düzeltme", "demir taşıma", "kalıp sökümü"]
+SURELER = ["30 dakika", "45 dk", "1 saat", "2 saat", "yarım saat", "iki saat", "3 saat", "1 gün"]
+
+# Yazım hatası için ASCII karşılıklar (klavyede Türkçe karakter olmadan yazılmış gibi)
+ASCII = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+
+def personel_listesi(n, tohum=0):
+    """
+    Benzersiz 'Ad [İkinci ad] Soyad [İkinci soyad]' adlarından oluşan kadro.
+    İkinci ad/soyad isteğe bağlı olduğundan yaklaşık 865 bin farklı ad üretilebilir.
+    """
+    rng = random.Random(tohum)
+    ikinciler = [None] + ADLAR
+    ikinci_soyadlar = [None] + SOYADLAR
+    taban = (len(ADLAR), len(ikinciler), len(SOYADLAR), len(ikinci_soyadlar))
+    toplam = taban[0] * taban[1] * taban[2] * taban[3]
+    adlar = []
+    for sayi in rng.sample(range(toplam), n):
+        sayi, a = divmod(sayi, taban[0])
+        sayi, b = divmod(sayi, taban[1])
+        d, c = divmod(sayi, taban[2])
+        parcalar = [ADLAR[a], ikinciler[b], SOYADLAR[c], ikinci_soyadlar[d]]
+        adlar.append(' '.join(p for p in parcalar if p))
+    return adlar
+
+
+def arac_listesi(n):
+    """'Vinç 1', 'Kamyon 2', ... biçiminde n araç."""
+    return [f"{ARAC_TURLERI[i % len(ARAC_TURLERI)]} {i + 1}" for i in range(n)]
+
+
+def yazim_hatasi(metin, rng):
+    """Metne sahada sık görülen tek bir hata ekler: Türkçe karakter kaybı, harf düşmesi veya yer değiştirme."""
+    secim = rng.random()
+    if secim < 0.4 and metin != metin.translate(ASCII):
+        return metin.translate(ASCII)
+    kelimeler = metin.split()
+    adaylar = [i for i, k in enumerate(kelimeler) if len(k) > 3]
+    if not adaylar:
+        return metin
+    i = rng.choice(adaylar)
+    k = kelimeler[i]
+    j = rng.randrange(1, len(k) - 1)
+    kelimeler[i] = k[:j] + k[j + 1:] if secim < 0.7 else k[:j - 1] + k[j] + k[j - 1] + k[j + 1:]
+    return ' '.join(kelimeler)
+
+
+def komut_uret(personeller, araclar, n, tohum=0, hata_orani=0.2, tutarli=False):
+    """
+    Operatörlerin yazdığına benzer komutlar üretir.
+    :param tutarli: True ise akış bir vardiya gibi ilerler: yeni görev boştaki personele verilir,
+        uzatma ve bitirme yalnızca görevi süren personel için üretilir.
+    :return: [(beklenen komut türü, beklenen kişi, metin)] listesi.
+    """
+    rng = random.Random(tohum)
+    komutlar = []
+    aktifler, aktif_sira = set(), []
+    for _ in range(n):
+        tur = rng.choices(["yeni_gorev", "sure_uzatma", "gorev_bitti"], weights=[5, 2, 3])[0]
+        if not tutarli:
+            kisi = rng.choice(personeller)
+        elif tur == "yeni_gorev" or not aktifler:
+            tur = "yeni_gorev"
+            kisi = rng.choice(personeller)
+            while kisi in aktifler and len(aktifler) < len(personeller):
+                kisi = rng.choice(personeller)
+            aktifler.add(kisi)
+            aktif_sira.append(kisi)
+        else:
+            i = rng.randrange(len(aktif_sira))
+            kisi = aktif_sira[i]
+            if tur == "gorev_bitti":
+                aktif_sira[i] = aktif_sira[-1]
+                aktif_sira.pop()
+                aktifler.discard(kisi)
+        yazilan = yazim_hatasi(kisi, rng) if rng.random() < hata_orani else kisi
+        if tur == "yeni_gorev":
+            metin = f"{yazilan} {rng.choice(araclar)} ile {rng.choice(GOREVLER)} {rng.choice(SURELER)}"
+        elif tur == "sure_uzatma":
+            metin = f"{yazilan} {rng.choice(SURELER)} uzat"
+        else:
+            metin = f"{yazilan} {rng.choice(['bitti', 'işi bitti', 'tamamladı'])}"
+        komutlar.append((tur, kisi, metin))
+    return komutlar
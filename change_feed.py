@@ -0,0 +1,103 @@
+import threading
+import time
+import pandas as pd
+
+
+class DegisiklikAkisi:
+    """
+    Pano tablolarını bellekte DataFrame olarak tutar ve her yenilemede yalnızca
+    son filigrandan bu yana eklenen, güncellenen veya silinen satırları okur.
+    SQL Server'da Change Tracking (CHANGETABLE), SQLite'ta tetikleyicilerle
+    doldurulan değişiklik günlüğü kullanılır.
+
+    Veritabanı yalnızca bu süreçte bir tabloya yazıldığında (DatabaseManager.tablo_surumu)
+    veya yoklama aralığı dolduğunda sorgulanır; arada yapılan yenilemeler sorgu
+    göndermez. Değişiklik izleme kullanılamıyorsa tablolar tam okunur: yazılan
+    tablolar hemen, diğerleri tam_okuma_araligi dolduğunda.
+    """
+
+    def __init__(self, db_manager, tablolar, yoklama_araligi=5, tam_okuma_araligi=30):
+        """
+        :param db_manager: Bağlanmış DatabaseManager örneği.
+        :param tablolar: {tablo: (gösterilecek sütunlar, anahtar sütun)}
+        :param yoklama_araligi: Değişikliklerin en geç kaç saniyede bir sorgulanacağı.
+        :param tam_okuma_araligi: İzleme yoksa tabloların en geç kaç saniyede bir okunacağı.
+        """
+        self.db_manager = db_manager
+        self.tablolar = {}
+        for tablo, (sutunlar, anahtar) in tablolar.items():
+            okunacak = list(sutunlar) if anahtar in sutunlar else [anahtar] + list(sutunlar)
+            self.tablolar[tablo] = (list(sutunlar), anahtar, okunacak)
+        self.yoklama_araligi = yoklama_araligi
+        self.tam_okuma_araligi = tam_okuma_araligi
+        self.destekleniyor = db_manager.degisiklik_izlemeyi_hazirla(
+            {tablo: anahtar for tablo, (_, anahtar, _) in self.tablolar.items()})
+
+        self.surum = None
+        self._veriler = {}           # tablo -> anahtar indeksli DataFrame
+        self._yerel_surumler = {}    # tablo -> son okumadaki DatabaseManager.tablo_surumu
+        self._son_okuma = 0.0
+        self._kilit = threading.Lock()
+        self.son_okunan = {}         # tablo -> son yenilemede okunan satır sayısı
+
+    def _okunacak_tablolar(self):
+        """Bu yenilemede okunacak tablolar: aralık dolduysa hepsi, aksi halde bu süreçte yazılanlar."""
+        aralik = self.yoklama_araligi if self.destekleniyor else self.tam_okuma_araligi
+        if time.monotonic() - self._son_okuma >= aralik:
+            return list(self.tablolar)
+        degisenler = [tablo for tablo in self.tablolar
+                      if tablo not in self._veriler
+                      or self.db_manager.tablo_surumu(tablo) != self._yerel_surumler.get(tablo)]
+        if degisenler and self.destekleniyor:
+            # Filigran tüm tablolar için ortak olduğundan hepsinin değişikliği birlikte okunur
+            return list(self.tablolar)
+        return degisenler
+
+    def yenile(self):
+        """
+        Değişiklikleri okuyup bellekteki tablolara uygular.
+        :return: {tablo: okunan satır sayısı} - yalnızca okunan tablolar; hata olursa None.
+        """
+        with self._kilit:
+            tablolar = self._okunacak_tablolar()
+            if not tablolar:
+                self.son_okunan = {}
+                return {}
+
+            yerel_surumler = {tablo: self.db_manager.tablo_surumu(tablo) for tablo in tablolar}
+            sonuc = self.db_manager.degisiklikleri_al(
+                {tablo: (self.tablolar[tablo][2], self.tablolar[tablo][1]) for tablo in tablolar},
+                self.surum if self.destekleniyor and len(self._veriler) == len(self.tablolar) else None)
+            if sonuc is None:
+                return None
+            yeni_surum, degisiklikler = sonuc
+
+            for tablo, (tam, satirlar, anahtarlar) in degisiklikler.items():
+                self._uygula(tablo, tam, satirlar, anahtarlar)
+            self._yerel_surumler.update(yerel_surumler)
+            if len(tablolar) == len(self.tablolar):
+                self._son_okuma = time.monotonic()
+            self.surum = yeni_surum
+            self.son_okunan = {tablo: len(satirlar) for tablo, (_, satirlar, _) in degisiklikler.items()}
+            return self.son_okunan
+
+    def _uygula(self, tablo, tam, satirlar, anahtarlar):
+        """Okunan satırları tablonun DataFrame'ine işler; satırı dönmeyen anahtarlar silinir."""
+        _, anahtar, okunacak = self.tablolar[tablo]
+        yeni = pd.DataFrame.from_records(satirlar, columns=okunacak)
+        yeni.index = pd.Index(yeni[anahtar].tolist())
+        eski = self._veriler.get(tablo)
+        if tam or eski is None:
+            df = yeni
+        else:
+            df = pd.concat([eski.drop(index=anahtarlar, errors="ignore"), yeni])
+        self._veriler[tablo] = df.sort_index(kind="stable")
+
+    def tablo(self, tablo):
+        """Tablonun güncel kopyasını gösterilecek sütunlarla döndürür (henüz okunmadıysa boş)."""
+        sutunlar = self.tablolar[tablo][0]
+        with self._kilit:
+            df = self._veriler.get(tablo)
+            if df is None:
+                return pd.DataFrame(columns=sutunlar)
+            return df[sutunlar].reset_index(drop=True)
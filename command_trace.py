@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class KomutIzi:
+    """
+    Gelen komutların izini JSON Lines dosyasına yazar: her satırda zaman, metin,
+    analiz sonucu ve analiz süresi bulunur. Kaydedilen iz benchmarks.replay ile
+    tüm hatta istenen hızda yeniden oynatılabilir.
+    """
+
+    def __init__(self, dosya):
+        """:param dosya: İzin ekleneceği dosya (yoksa oluşturulur)."""
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self._akis = open(dosya, "a", encoding="utf-8")
+
+    def kaydet(self, metin, sonuc, sure=None, zaman=None, kaynak=None):
+        """
+        :param sonuc: metin_analiz_et sonucu (analiz başarısızsa None).
+        :param sure: Analiz süresi (saniye).
+        :param kaynak: Komutun geldiği yer (ör. "arayuz", "toplu", "asenkron").
+        """
+        satir = json.dumps({
+            "zaman": (zaman or datetime.now()).isoformat(),
+            "metin": metin,
+            "sonuc": sonuc,
+            "sure_ms": round(sure * 1000, 3) if sure is not None else None,
+            "kaynak": kaynak,
+        }, ensure_ascii=False, default=str)
+        with self._kilit:
+            try:
+                self._akis.write(satir + "\n")
+                self._akis.flush()
+            except (OSError, ValueError) as e:
+                print(f"Komut izi yazılamadı: {e}")
+
+    def kapat(self):
+        with self._kilit:
+            self._akis.close()
+
+
+def izi_oku(dosya):
+    """
+    Kaydedilmiş izi okur; bozuk satırlar atlanır.
+    :return: 'zaman' alanı datetime'a çevrilmiş kayıtlar, zaman sırasıyla.
+    """
+    kayitlar = []
+    with open(dosya, encoding="utf-8") as akis:
+        for no, satir in enumerate(akis, start=1):
+            if not satir.strip():
+                continue
+            try:
+                kayit = json.loads(satir)
+                kayit["zaman"] = datetime.fromisoformat(kayit["zaman"])
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"İz satırı {no} atlandı: {e}")
+                continue
+            kayitlar.append(kayit)
+    kayitlar.sort(key=lambda k: k["zaman"])
+    return kayitlar
+
+
+_komut_izi = None
+_iz_hazir = False
+_iz_kilidi = threading.Lock()
+
+def komut_izi():
+    """
+    Süreç genelindeki komut izini döndürür.
+    KOMUT_IZI_DOSYASI ortam değişkeni verilmemişse kayıt yapılmaz ve None döner.
+    """
+    global _komut_izi, _iz_hazir
+    with _iz_kilidi:
+        if not _iz_hazir:
+            dosya = os.getenv("KOMUT_IZI_DOSYASI")
+            if dosya:
+                _komut_izi = KomutIzi(dosya)
+            _iz_hazir = True
+        return _komut_izi
+
+def komut_izini_ayarla(iz):
+    """Komut izini değiştirir (kapatmak için None)."""
+    global _komut_izi, _iz_hazir
+    with _iz_kilidi:
+        _komut_izi = iz
+        _iz_hazir = True
+
+def komut_izine_yaz(metin, sonuc, sure=None, kaynak=None):
+    """İz açıksa komutu kaydeder."""
+    iz = komut_izi()
+    if iz is not None:
+        iz.kaydet(metin, sonuc, sure, kaynak=kaynak)
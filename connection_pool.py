@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class HavuzHatasi(Exception):
+    """Havuzdan belirtilen sürede bağlantı alınamadığında fırlatılır."""
+
+
+class BaglantiHavuzu:
+    """
+    Sınırlı boyutlu, iş parçacığı güvenli bağlantı havuzu.
+    Boşta bekleyen bağlantılar belirli bir süre sonra kapatılır, uzun süre
+    kullanılmamış bağlantılar verilmeden önce 'SELECT 1' ile yoklanır ve
+    kopmuş bağlantılar otomatik olarak yenileriyle değiştirilir.
+    """
+
+    def __init__(self, backend, max_boyut=5, bosta_zaman_asimi=300, yoklama_araligi=30, bekleme_suresi=30):
+        """
+        :param backend: connect() metodu olan veritabanı arka ucu.
+        :param max_boyut: Aynı anda açık olabilecek en fazla bağlantı sayısı.
+        :param bosta_zaman_asimi: Bu kadar saniye kullanılmayan bağlantı kapatılır.
+        :param yoklama_araligi: Bu kadar saniyedir kullanılmayan bağlantı verilmeden önce yoklanır.
+        :param bekleme_suresi: Havuz doluyken bağlantı için beklenecek en uzun süre (saniye).
+        """
+        self.backend = backend
+        self.max_boyut = max_boyut
+        self.bosta_zaman_asimi = bosta_zaman_asimi
+        self.yoklama_araligi = yoklama_araligi
+        self.bekleme_suresi = bekleme_suresi
+
+        self._bostakiler = deque()  # (bağlantı, son_kullanim) çiftleri
+        self._acik_sayisi = 0
+        self._kosul = threading.Condition()
+        self._kapali = False
+
+    def _canli_mi(self, baglanti):
+        """Bağlantıya hafif bir sorgu göndererek canlı olup olmadığını kontrol eder."""
+        try:
+            cursor = baglanti.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            return True
+        except Exception:
+            return False
+
+    def _kapat(self, baglanti):
+        try:
+            baglanti.close()
+        except Exception:
+            pass
+
+    def al(self):
+        """Havuzdan bir bağlantı alır; gerekirse yeni bağlantı açar."""
+        son_tarih = time.monotonic() + self.bekleme_suresi
+        while True:
+            with self._kosul:
+                if self._kapali:
+                    raise HavuzHatasi("Bağlantı havuzu kapatılmış.")
+
+                baglanti, son_kullanim = None, 0
+                while self._bostakiler:
+                    aday, son_kullanim = self._bostakiler.pop()
+                    if time.monotonic() - son_kullanim > self.bosta_zaman_asimi:
+                        # Çok uzun süre boşta kalmış, sunucu tarafında kopmuş olabilir
+                        self._acik_sayisi -= 1
+                        self._kapat(aday)
+                        continue
+                    baglanti = aday
+                    break
+
+                if baglanti is None:
+                    if self._acik_sayisi < self.max_boyut:
+                        # Yer ayır, bağlantıyı kilidin dışında aç
+                        self._acik_sayisi += 1
+                    else:
+                        kalan = son_tarih - time.monotonic()
+                        if kalan <= 0:
+                            raise HavuzHatasi(f"{self.bekleme_suresi} saniye içinde boş bağlantı bulunamadı.")
+                        self._kosul.wait(kalan)
+                        continue
+
+            if baglanti is not None:
+                if time.monotonic() - son_kullanim > self.yoklama_araligi and not self._canli_mi(baglanti):
+                    print("Kopmuş veritabanı bağlantısı yenileniyor...")
+                    self._at(baglanti)
+                    continue
+                return baglanti
+
+            try:
+                return self.backend.connect()
+            except Exception:
+                with self._kosul:
+                    self._acik_sayisi -= 1
+                    self._kosul.notify()
+                raise
+
+    def iade(self, baglanti):
+        """Bağlantıyı havuza geri koyar."""
+        with self._kosul:
+            if self._kapali:
+                self._acik_sayisi -= 1
+                self._kapat(baglanti)
+            else:
+                self._bostakiler.append((baglanti, time.monotonic()))
+            self._kosul.notify()
+
+    def _at(self, baglanti):
+        """Bozuk bağlantıyı kapatır ve havuzdaki yerini boşaltır."""
+        self._kapat(baglanti)
+        with self._kosul:
+            self._acik_sayisi -= 1
+            self._kosul.notify()
+
+    @contextmanager
+    def baglanti(self):
+        """
+        'with' bloğu boyunca bir bağlantı kullandırır.
+        Bağlantı her iadede geri alınır (rollback): commit edilmemiş okuma işlemleri ve
+        kilitleri sonraki kullanıcıya kalmaz. Blok hata ile biterse geri alma da başarısız
+        olursa bağlantı kopmuş sayılır ve havuzdan atılır.
+        """
+        baglanti = self.al()
+        try:
+            yield baglanti
+        except BaseException:
+            try:
+                baglanti.rollback()
+            except Exception:
+                self._at(baglanti)
+                raise
+            if not self._canli_mi(baglanti):
+                self._at(baglanti)
+                raise
+            self.iade(baglanti)
+            raise
+        else:
+            # SELECT'ten sonra commit etmeden dönen metotların açık işlemi burada kapanır
+            try:
+                baglanti.rollback()
+            except Exception:
+                self._at(baglanti)
+                return
+            self.iade(baglanti)
+
+    def istatistik(self):
+        """Açık ve boşta bekleyen bağlantı sayılarını döndürür."""
+        with self._kosul:
+            return {"acik": self._acik_sayisi, "bosta": len(self._bostakiler), "max": self.max_boyut}
+
+    def kapat(self):
+        """Boştaki tüm bağlantıları kapatır; kullanımdakiler iade edilince kapanır."""
+        with self._kosul:
+            self._kapali = True
+            while self._bostakiler:
+                baglanti, _ = self._bostakiler.pop()
+                self._acik_sayisi -= 1
+                self._kapat(baglanti)
+            self._kosul.notify_all()
@@ -0,0 +1,364 @@
+import os
+import sqlite3
+from datetime import datetime
+
+try:
+    import pyodbc
+except ImportError:  # SQLite arka ucu pyodbc olmadan da çalışabilmeli
+    pyodbc = None
+
+
+def _datetime_adapt(deger):
+    return deger.isoformat(" ")
+
+
+def _datetime_convert(deger):
+    return datetime.fromisoformat(deger.decode())
+
+
+# SQLite'ta tarih sütunları ISO metin olarak saklanır, okurken datetime'a çevrilir
+sqlite3.register_adapter(datetime, _datetime_adapt)
+sqlite3.register_converter("DATETIME", _datetime_convert)
+sqlite3.register_converter("TIMESTAMP", _datetime_convert)
+
+
+class SqlServerBackend:
+    """pyodbc ve 'ODBC Driver 17 for SQL Server' üzerinden SQL Server bağlantısı."""
+
+    ad = "mssql"
+    Error = pyodbc.Error if pyodbc is not None else Exception
+
+    def __init__(self, server="DESKTOP-R738L1R", database="arac_takip"):
+        """
+        Bağlantı dizesini oluşturur.
+        :param server: SQL Server sunucu adı.
+        :param database: Veritabanı adı.
+        """
+        self.connection_string = (
+            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+            f"SERVER={server};"
+            f"DATABASE={database};"
+            f"Trusted_Connection=yes;"
+        )
+
+    def connect(self):
+        """Yeni bir DB-API bağlantısı açar."""
+        if pyodbc is None:
+            raise RuntimeError("SQL Server arka ucu için pyodbc kurulu olmalı.")
+        return pyodbc.connect(self.connection_string)
+
+    def katalog_sorgula(self, cursor):
+        """
+        Tüm kullanıcı tablolarının sütunlarını tek sorguda okur.
+        :return: (tablo, sütun, tip, boş_olabilir, kimlik) demetleri.
+        """
+        cursor.execute("""
+            SELECT c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.IS_NULLABLE,
+                   COLUMNPROPERTY(OBJECT_ID(QUOTENAME(c.TABLE_SCHEMA) + '.' + QUOTENAME(c.TABLE_NAME)),
+                                  c.COLUMN_NAME, 'IsIdentity')
+            FROM INFORMATION_SCHEMA.COLUMNS c
+            JOIN INFORMATION_SCHEMA.TABLES t
+              ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+            WHERE t.TABLE_TYPE = 'BASE TABLE'
+            ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+        """)
+        return [(row[0], row[1], row[2], row[3] == 'YES', row[4] == 1) for row in cursor.fetchall()]
+
+    def toplu_calistir(self, cursor, ifadeler):
+        """
+        (sorgu, parametreler) listesini tek bir T-SQL toplu işi olarak gönderir;
+        böylece tüm ifadeler sunucuya tek gidiş-dönüşte ulaşır.
+        """
+        sorgu = "SET NOCOUNT ON; SET XACT_ABORT ON;\n" + ";\n".join(ifade for ifade, _ in ifadeler)
+        parametreler = [deger for _, degerler in ifadeler for deger in degerler]
+        cursor.execute(sorgu, parametreler)
+
+    def coklu_calistir(self, cursor, sorgu, satirlar):
+        """Aynı sorguyu çok satır için çalıştırır; parametreler dizi halinde tek seferde gönderilir."""
+        if not satirlar:
+            return
+        cursor.fast_executemany = True
+        cursor.executemany(sorgu, satirlar)
+
+    def sinirla(self, sorgu, satir_sayisi):
+        """'SELECT ...' sorgusunu ilk satir_sayisi satırla sınırlar (TOP)."""
+        return sorgu.replace("SELECT ", f"SELECT TOP ({int(satir_sayisi)}) ", 1)
+
+    def dakika_ekle(self, ifade):
+        """Tarih ifadesine '?' parametresiyle verilen dakikayı ekler; ifade boşsa şimdiden başlar."""
+        return f"DATEADD(minute, ?, COALESCE({ifade}, GETDATE()))"
+
+    def guncelle_dondur(self, tablo, atama, kosul, sutunlar):
+        """Güncellenen satırların yeni değerlerini aynı ifadede döndüren UPDATE (OUTPUT)."""
+        cikti = ', '.join(f"inserted.{sutun}" for sutun in sutunlar)
+        return f"UPDATE {tablo} SET {atama} OUTPUT {cikti} WHERE {kosul}"
+
+    def ekle_dondur(self, tablo, sutunlar, kimlik):
+        """Eklenen satırın kimliğini aynı ifadede döndüren INSERT (OUTPUT)."""
+        return (f"INSERT INTO {tablo} ({', '.join(sutunlar)}) OUTPUT inserted.{kimlik} "
+                f"VALUES ({', '.join('?' * len(sutunlar))})")
+
+    def izleme_hazirla(self, cursor, tablolar):
+        """
+        Tablolarda SQL Server Change Tracking'i açar.
+        Veritabanı düzeyinde izleme bir yönetici tarafından açılmış olmalıdır:
+        ALTER DATABASE ... SET CHANGE_TRACKING = ON (CHANGE_RETENTION = 2 DAYS, AUTO_CLEANUP = ON)
+        :param tablolar: {tablo: anahtar sütun}; izlenen tabloların birincil anahtarı olmalıdır.
+        :return: İzleme kullanılabiliyorsa True.
+        """
+        cursor.execute("SELECT 1 FROM sys.change_tracking_databases WHERE database_id = DB_ID()")
+        if not cursor.fetchone():
+            print("Değişiklik izleme veritabanında kapalı; pano tabloları tam okunacak.")
+            return False
+        for tablo in tablolar:
+            cursor.execute("SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID(?)", (tablo,))
+            if not cursor.fetchone():
+                cursor.execute(f"ALTER TABLE [{tablo}] ENABLE CHANGE_TRACKING")
+        return True
+
+    def izleme_surumu(self, cursor):
+        """Geçerli değişiklik sürümünü (filigran) döndürür; izleme kapalıysa None."""
+        cursor.execute("SELECT CHANGE_TRACKING_CURRENT_VERSION()")
+        return cursor.fetchone()[0]
+
+    def degisen_anahtarlar(self, cursor, tablo, anahtar, surum):
+        """
+        'surum'dan sonra eklenen, güncellenen veya silinen satırların anahtarları.
+        :return: Anahtar listesi; sürüm artık geçerli değilse (temizlenmişse) None.
+        """
+        cursor.execute("SELECT CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID(?))", (tablo,))
+        en_kucuk = cursor.fetchone()[0]
+        if en_kucuk is None or surum < en_kucuk:
+            return None
+        cursor.execute(f"SELECT CT.[{anahtar}] FROM CHANGETABLE(CHANGES [{tablo}], ?) AS CT", (surum,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def gunlugu_buda(self, cursor):
+        """SQL Server eski değişiklikleri AUTO_CLEANUP ile kendisi temizler."""
+
+    def sqlalchemy_url(self):
+        """pandas/SQLAlchemy okumaları için bağlantı URL'sini döndürür."""
+        return "mssql+pyodbc:///?odbc_connect=" + self.connection_string
+
+
+class SqliteBackend:
+    """
+    Gömülü SQLite (WAL modu) arka ucu.
+    Küçük sahalarda ağ gidiş-dönüşü olmadan yerel yazma yapmak ve
+    canlı SQL Server olmadan DatabaseManager akışlarını denemek için kullanılır.
+    """
+
+    ad = "sqlite"
+    Error = sqlite3.Error
+
+    SEMA = """
+        CREATE TABLE IF NOT EXISTS Personeller (
+            Personel TEXT PRIMARY KEY,
+            Durum TEXT DEFAULT 'Boşta',
+            Arac TEXT
+        );
+        CREATE TABLE IF NOT EXISTS Araclar (
+            Arac TEXT PRIMARY KEY,
+            Durum TEXT DEFAULT 'Boşta'
+        );
+        CREATE TABLE IF NOT EXISTS Aktif_isler (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Personel TEXT,
+            Arac TEXT,
+            Gorev TEXT,
+            Baslangic_tarihi DATETIME,
+            Tahmini_bitis DATETIME,
+            Durum TEXT
+        );
+        CREATE TABLE IF NOT EXISTS Tamamlanan_isler (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Personel TEXT,
+            Arac TEXT,
+            Gorev TEXT,
+            Baslangic_tarihi DATETIME,
+            Tahmini_bitis DATETIME,
+            Bitis_tarihi DATETIME,
+            Durum TEXT
+        );
+        CREATE TABLE IF NOT EXISTS Rezervasyonlar (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Arac TEXT,
+            Personel TEXT,
+            Baslangic DATETIME NOT NULL,
+            Bitis DATETIME NOT NULL,
+            Aciklama TEXT
+        );
+        CREATE INDEX IF NOT EXISTS IX_Aktif_isler_Personel ON Aktif_isler (Personel);
+        CREATE INDEX IF NOT EXISTS IX_Rezervasyonlar_Bitis ON Rezervasyonlar (Bitis);
+        CREATE INDEX IF NOT EXISTS IX_Tamamlanan_isler_Bitis ON Tamamlanan_isler (Bitis_tarihi, ID);
+        CREATE INDEX IF NOT EXISTS IX_Tamamlanan_isler_Personel ON Tamamlanan_isler (Personel, Bitis_tarihi, ID);
+        CREATE INDEX IF NOT EXISTS IX_Tamamlanan_isler_Arac ON Tamamlanan_isler (Arac, Bitis_tarihi, ID);
+    """
+
+    # Önceki sürümlerde oluşturulmuş dosyalara eklenecek sütunlar: (tablo, sütun, tip)
+    GOCLER = [
+        ("Aktif_isler", "Baslangic_tarihi", "DATETIME"),
+        ("Tamamlanan_isler", "Baslangic_tarihi", "DATETIME"),
+    ]
+
+    def __init__(self, yol="arac_takip.db"):
+        """
+        :param yol: Veritabanı dosyasının yolu. ':memory:' verilirse süreç içi
+            paylaşımlı bir bellek veritabanı kullanılır.
+        """
+        self.yol = yol
+        self._sema_hazir = False
+        # Bellek veritabanı her bağlantıda sıfırlanmasın diye paylaşımlı URI kullanılır
+        if yol == ":memory:":
+            self._uri = f"file:arac_takip_{id(self)}?mode=memory&cache=shared"
+        else:
+            self._uri = None
+        self._bellek_tutucu = None
+
+    def connect(self):
+        """Yeni bir bağlantı açar, WAL modunu ve şemayı hazırlar."""
+        if self._uri:
+            baglanti = sqlite3.connect(self._uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES,
+                                       check_same_thread=False)
+            if self._bellek_tutucu is None:
+                # Son bağlantı kapanınca bellek veritabanı silinmesin
+                self._bellek_tutucu = baglanti
+                baglanti = sqlite3.connect(self._uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES,
+                                           check_same_thread=False)
+        else:
+            baglanti = sqlite3.connect(self.yol, detect_types=sqlite3.PARSE_DECLTYPES,
+                                       check_same_thread=False, timeout=30)
+            baglanti.execute("PRAGMA journal_mode=WAL")
+        baglanti.execute("PRAGMA synchronous=NORMAL")
+
+        if not self._sema_hazir:
+            baglanti.executescript(self.SEMA)
+            for tablo, sutun, tur in self.GOCLER:
+                mevcut = {row[1] for row in baglanti.execute(f"PRAGMA table_info([{tablo}])")}
+                if sutun not in mevcut:
+                    baglanti.execute(f"ALTER TABLE [{tablo}] ADD COLUMN [{sutun}] {tur}")
+            baglanti.commit()
+            self._sema_hazir = True
+        return baglanti
+
+    def katalog_sorgula(self, cursor):
+        """
+        Tüm kullanıcı tablolarının sütunlarını okur.
+        :return: (tablo, sütun, tip, boş_olabilir, kimlik) demetleri.
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+        tablolar = [row[0] for row in cursor.fetchall()]
+        sonuc = []
+        for tablo in tablolar:
+            cursor.execute(f"PRAGMA table_info([{tablo}])")
+            for _, ad, tur, notnull, _, pk in cursor.fetchall():
+                # SQLite'ta INTEGER PRIMARY KEY sütunu rowid takma adıdır, yani otomatik artar
+                kimlik = pk == 1 and (tur or "").upper() == "INTEGER"
+                sonuc.append((tablo, ad, tur, not notnull, kimlik))
+        return sonuc
+
+    def toplu_calistir(self, cursor, ifadeler):
+        """(sorgu, parametreler) listesini sırayla çalıştırır; yerel olduğu için ayrı çağrılar ucuzdur."""
+        for ifade, degerler in ifadeler:
+            cursor.execute(ifade, degerler)
+
+    def coklu_calistir(self, cursor, sorgu, satirlar):
+        """Aynı sorguyu çok satır için çalıştırır."""
+        if satirlar:
+            cursor.executemany(sorgu, satirlar)
+
+    def sinirla(self, sorgu, satir_sayisi):
+        """'SELECT ...' sorgusunu ilk satir_sayisi satırla sınırlar (LIMIT)."""
+        return f"{sorgu} LIMIT {int(satir_sayisi)}"
+
+    def dakika_ekle(self, ifade):
+        """Tarih ifadesine '?' parametresiyle verilen dakikayı ekler; ifade boşsa şimdiden başlar."""
+        return f"datetime(COALESCE({ifade}, datetime('now', 'localtime')), printf('%+d minutes', ?))"
+
+    def guncelle_dondur(self, tablo, atama, kosul, sutunlar):
+        """Güncellenen satırların yeni değerlerini aynı ifadede döndüren UPDATE (RETURNING)."""
+        return f"UPDATE {tablo} SET {atama} WHERE {kosul} RETURNING {', '.join(sutunlar)}"
+
+    def ekle_dondur(self, tablo, sutunlar, kimlik):
+        """Eklenen satırın kimliğini aynı ifadede döndüren INSERT (RETURNING)."""
+        return (f"INSERT INTO {tablo} ({', '.join(sutunlar)}) "
+                f"VALUES ({', '.join('?' * len(sutunlar))}) RETURNING {kimlik}")
+
+    # Değişiklik günlüğünde tutulacak en fazla kayıt; daha eski filigranlar tam okuma gerektirir
+    GUNLUK_SINIRI = 100000
+
+    def izleme_hazirla(self, cursor, tablolar):
+        """
+        Change Tracking karşılığı olarak, tablolardaki her ekleme/güncelleme/silmede
+        satır anahtarını 'Degisiklik_gunlugu'ne yazan tetikleyicileri oluşturur.
+        :param tablolar: {tablo: anahtar sütun}
+        :return: Her zaman True.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Degisiklik_gunlugu (
+                Surum INTEGER PRIMARY KEY AUTOINCREMENT,
+                Tablo TEXT NOT NULL,
+                Anahtar
+            )""")
+        cursor.execute("CREATE INDEX IF NOT EXISTS IX_Degisiklik_gunlugu_Tablo ON Degisiklik_gunlugu (Tablo, Surum)")
+        for tablo, anahtar in tablolar.items():
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS [TR_{tablo}_izle_ekle] AFTER INSERT ON [{tablo}] BEGIN
+                    INSERT INTO Degisiklik_gunlugu (Tablo, Anahtar) VALUES ('{tablo}', NEW.[{anahtar}]);
+                END""")
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS [TR_{tablo}_izle_guncelle] AFTER UPDATE ON [{tablo}] BEGIN
+                    INSERT INTO Degisiklik_gunlugu (Tablo, Anahtar) VALUES ('{tablo}', OLD.[{anahtar}]);
+                    INSERT INTO Degisiklik_gunlugu (Tablo, Anahtar)
+                        SELECT '{tablo}', NEW.[{anahtar}] WHERE NEW.[{anahtar}] IS NOT OLD.[{anahtar}];
+                END""")
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS [TR_{tablo}_izle_sil] AFTER DELETE ON [{tablo}] BEGIN
+                    INSERT INTO Degisiklik_gunlugu (Tablo, Anahtar) VALUES ('{tablo}', OLD.[{anahtar}]);
+                END""")
+        return True
+
+    def izleme_surumu(self, cursor):
+        """Günlükteki son sürümü döndürür; izleme hazırlanmamışsa None."""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'Degisiklik_gunlugu'")
+        if not cursor.fetchone():
+            return None
+        cursor.execute("SELECT COALESCE(MAX(Surum), 0) FROM Degisiklik_gunlugu")
+        return cursor.fetchone()[0]
+
+    def degisen_anahtarlar(self, cursor, tablo, anahtar, surum):
+        """
+        'surum'dan sonra eklenen, güncellenen veya silinen satırların anahtarları.
+        :return: Anahtar listesi; aradaki kayıtlar budanmışsa None.
+        """
+        cursor.execute("SELECT MIN(Surum) FROM Degisiklik_gunlugu")
+        en_kucuk = cursor.fetchone()[0]
+        if en_kucuk is not None and surum < en_kucuk - 1:
+            return None
+        cursor.execute("SELECT DISTINCT Anahtar FROM Degisiklik_gunlugu WHERE Tablo = ? AND Surum > ?", (tablo, surum))
+        return [row[0] for row in cursor.fetchall()]
+
+    def gunlugu_buda(self, cursor):
+        """Günlüğü son GUNLUK_SINIRI kayıtla sınırlar."""
+        cursor.execute("DELETE FROM Degisiklik_gunlugu WHERE Surum <= (SELECT MAX(Surum) FROM Degisiklik_gunlugu) - ?",
+                       (self.GUNLUK_SINIRI,))
+
+    def sqlalchemy_url(self):
+        """pandas/SQLAlchemy okumaları için bağlantı URL'sini döndürür."""
+        if self._uri:
+            return f"sqlite:///{self._uri}&uri=true"
+        return f"sqlite:///{os.path.abspath(self.yol)}"
+
+
+def backend_olustur(tur=None):
+    """
+    Ortam değişkenlerine göre arka uç oluşturur.
+    DB_BACKEND=sqlite ise SQLITE_PATH dosyası, aksi halde DB_SERVER/DB_DATABASE kullanılır.
+    """
+    tur = (tur or os.getenv("DB_BACKEND", "mssql")).lower()
+    if tur == "sqlite":
+        return SqliteBackend(os.getenv("SQLITE_PATH", "arac_takip.db"))
+    return SqlServerBackend(
+        server=os.getenv("DB_SERVER", "DESKTOP-R738L1R"),
+        database=os.getenv("DB_DATABASE", "arac_takip"),
+    )
@@ -1,109 +1,239 @@
-import pyodbc
+import os
 import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from database_backends import SqlServerBackend
+from schema_catalog import SemaKatalogu
+from connection_pool import BaglantiHavuzu, HavuzHatasi
+from name_index import IsimIndeksi, isim_normalize
+from metrics import ISIM_ESLESME, ISIM_INDEKSI_KURULUM, hata_bildir, metriklerle_olc
+from sql_tracer import SqlIzleyici
 
+@metriklerle_olc
 class DatabaseManager:
-    def __init__(self, server="DESKTOP-R738L1R", database="arac_takip"):
+    def __init__(self, server="DESKTOP-R738L1R", database="arac_takip", backend=None, havuz_boyutu=5):
         """
-        Veritabanı bağlantı dizesini oluşturur.
+        Veritabanı arka ucunu hazırlar.
+        :param backend: Kullanılacak arka uç (ör. SqliteBackend). Verilmezse
+            server/database ile SQL Server arka ucu oluşturulur.
+        :param havuz_boyutu: Bağlantı havuzundaki en fazla bağlantı sayısı.
         """
-        self.connection_string = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={server};"
-            f"DATABASE={database};"
-            f"Trusted_Connection=yes;"
-        )
-        self.connection = None
+        self.backend = backend or SqlServerBackend(server, database)
+        self.connection_string = getattr(self.backend, "connection_string", None)
+        self.havuz_boyutu = havuz_boyutu
+        self.havuz = None
+        self.katalog = SemaKatalogu(self.backend)
+        # Metotların yakaladığı hatalar: sürücü hataları ve havuz zaman aşımı
+        self._db_hatalari = (self.backend.Error, HavuzHatasi)
+        # (tablo, sütun) -> (IsimIndeksi, kurulma zamanı)
+        self._isim_indeksleri = {}
+        self._indeks_kilidi = threading.Lock()
+        # Tablo -> bu süreçte DatabaseManager üzerinden yapılan yazma sayısı
+        self._tablo_surumleri = Counter()
+        self._surum_kilidi = threading.Lock()
+        # Aktif görev değişikliklerini dinleyen fonksiyonlar: dinleyici(olay, personel, gorev)
+        self._gorev_dinleyicileri = []
+        # Her onaylanmış yazmada çağrılan fonksiyonlar: dinleyici(tablolar, satirlar)
+        self._yazma_dinleyicileri = []
+        # SQL_IZLEME=1 ise her ifade tetikleyen komuta göre kaydedilir (bkz. sql_tracer)
+        self.sql_izleyici = SqlIzleyici() if os.getenv("SQL_IZLEME") == "1" else None
+
+    # Bu süreden eski bir isim indeksi, eşleşme bulamazsa veritabanından yeniden kurulur
+    ISIM_INDEKSI_TAZELIK = 60
 
     def _normalize_name(self, name):
         """İsmi normalize eder - Türkçe karakterleri düzeltir, fazla boşlukları temizler"""
-        if not name:
-            return ""
-        
-        # Türkçe karakter dönüşümleri (daha doğru mapping)
-        turkce_map = {
-            'ç': 'c', 'Ç': 'c',
-            'ğ': 'g', 'Ğ': 'g', 
-            'ı': 'i', 'I': 'i', 'İ': 'i', 'i̇': 'i',
-            'ö': 'o', 'Ö': 'o',
-            'ş': 's', 'Ş': 's',
-            'ü': 'u', 'Ü': 'u'
-        }
-        
-        # Fazla boşlukları temizle ve küçük harfe çevir
-        normalized = ' '.join(name.split()).lower()
-        
-        # Türkçe karakterleri değiştir
-        for tr_char, en_char in turkce_map.items():
-            normalized = normalized.replace(tr_char, en_char)
-            
-        return normalized
+        return isim_normalize(name)
 
     def _smart_name_match(self, aranan_isim, mevcut_isimler):
-        """Akıllı isim eşleştirme yapar"""
+        """Akıllı isim eşleştirme yapar (tek seferlik listeler için; tablolar için _isim_cozumle kullanılır)"""
         if not aranan_isim or not mevcut_isimler:
             return None
-            
-        aranan_norm = self._normalize_name(aranan_isim)
-        aranan_kelimeler = aranan_norm.split()
-        
-        en_iyi_eslesme = None
-        en_yuksek_skor = 0
-        
-        
-        for mevcut_isim in mevcut_isimler:
-            mevcut_norm = self._normalize_name(mevcut_isim)
-            mevcut_kelimeler = mevcut_norm.split()
-            
-            skor = 0
-            
-            # 1. Tam eşleşme (en yüksek skor)
-            if aranan_norm == mevcut_norm:
-                return mevcut_isim
-            
-            # 2. Tüm kelimeler eşleşiyor mu kontrol et
-            if len(aranan_kelimeler) <= len(mevcut_kelimeler):
-                eslesme_sayisi = 0
-                for aranan_kelime in aranan_kelimeler:
-                    for mevcut_kelime in mevcut_kelimeler:
-                        if aranan_kelime == mevcut_kelime:
-                            eslesme_sayisi += 1
-                            break
-                        elif len(aranan_kelime) >= 3 and (aranan_kelime in mevcut_kelime or mevcut_kelime in aranan_kelime):
-                            eslesme_sayisi += 0.7
-                            break
-                
-                skor = (eslesme_sayisi / len(aranan_kelimeler)) * 100
-            
-            # 3. Kısmi eşleşme için ek puanlar
-            if aranan_norm in mevcut_norm or mevcut_norm in aranan_norm:
-                skor += 20
-                
-            
-            # En yüksek skoru güncelle
-            if skor > en_yuksek_skor and skor >= 60:  # En az %60 eşleşme gerekli
-                en_yuksek_skor = skor
-                en_iyi_eslesme = mevcut_isim
-        
-        if en_iyi_eslesme:
-        
-            return en_iyi_eslesme
+        return IsimIndeksi(mevcut_isimler).en_iyi(aranan_isim)
+
+    def _isim_indeksi(self, cursor, tablo, sutun, yenile=False):
+        """Tablonun ad sütunu için önbellekteki isim indeksini döndürür; yoksa kurar."""
+        anahtar = (tablo, sutun)
+        kayit = self._isim_indeksleri.get(anahtar)
+        if kayit is None or yenile:
+            cursor.execute(f"SELECT DISTINCT {sutun} FROM {tablo} WHERE {sutun} IS NOT NULL")
+            indeks = IsimIndeksi(row[0] for row in cursor.fetchall())
+            ISIM_INDEKSI_KURULUM.artir(tablo)
+            kayit = (indeks, time.monotonic())
+            with self._indeks_kilidi:
+                self._isim_indeksleri[anahtar] = kayit
+        return kayit
+
+    def _isim_cozumle(self, cursor, tablo, sutun, aranan_isim):
+        """
+        Tam eşleşmesi olmayan bir adı tablonun isim indeksinden çözer.
+        Önbellekteki indeks eskiyse ve eşleşme bulunamazsa bir kez yeniden kurulur.
+        """
+        indeks, kurulma = self._isim_indeksi(cursor, tablo, sutun)
+        eslesme = indeks.en_iyi(aranan_isim)
+        if eslesme is None and time.monotonic() - kurulma > self.ISIM_INDEKSI_TAZELIK:
+            indeks, _ = self._isim_indeksi(cursor, tablo, sutun, yenile=True)
+            eslesme = indeks.en_iyi(aranan_isim)
+        if eslesme is None:
+            ISIM_ESLESME.artir(tablo, "bulunamadi")
+        elif eslesme != indeks.tam(aranan_isim):
+            # Yazım hatası toleranslı (akıllı) eşleşmeyle bulundu
+            ISIM_ESLESME.artir(tablo, "bulanik")
+        else:
+            ISIM_ESLESME.artir(tablo, "tam")
+        return eslesme
+
+    def _isim_indeksine_ekle(self, tablo, sutun, isim):
+        """Yeni eklenen adı (indeks kuruluysa) yeniden kurmadan indekse ekler."""
+        kayit = self._isim_indeksleri.get((tablo, sutun))
+        if kayit and isim:
+            with self._indeks_kilidi:
+                kayit[0].ekle(isim)
+
+    def _isim_indeksini_gecersiz_kil(self, tablo):
+        """Tablodaki ad kümesi değiştiğinde ilgili indeksleri siler."""
+        with self._indeks_kilidi:
+            for anahtar in [a for a in self._isim_indeksleri if a[0] == tablo]:
+                del self._isim_indeksleri[anahtar]
+
+    def _tablolari_degisti(self, *tablolar, satirlar=None):
+        """
+        Yazma işlemi onaylandıktan sonra etkilenen tabloların sürüm sayaçlarını artırır
+        ve yazma dinleyicilerine bildirir.
+        :param satirlar: Bilinen satır değişiklikleri [(tablo, ad, {sütun: yeni değer})];
+            None ise değişikliğin ayrıntısı bilinmiyordur.
+        """
+        tablolar = tuple(tablo for tablo in tablolar if tablo)
+        with self._surum_kilidi:
+            for tablo in tablolar:
+                self._tablo_surumleri[tablo] += 1
+        for dinleyici in list(self._yazma_dinleyicileri):
+            try:
+                dinleyici(tablolar, satirlar)
+            except Exception as e:
+                print(f"Yazma dinleyicisi hatası ({', '.join(tablolar)}): {e}")
+
+    def yazma_dinleyicisi_ekle(self, dinleyici):
+        """
+        Bu DatabaseManager üzerinden yapılan her onaylanmış yazmada çağrılacak fonksiyonu kaydeder:
+        dinleyici(tablolar, satirlar). 'Personeller' ve 'Araclar' yazmaları satirlar içinde
+        (tablo, ad, {"Durum": ..., "Arac": ...}) olarak ayrıntılı bildirilir; diğer yazmalarda None gelir.
+        """
+        self._yazma_dinleyicileri.append(dinleyici)
+
+    def gorev_dinleyicisi_ekle(self, dinleyici):
+        """
+        Aktif görev değişikliklerinde çağrılacak fonksiyonu kaydeder.
+        Dinleyici yazma onaylandıktan sonra dinleyici(olay, personel, gorev) ile çağrılır;
+        olay "eklendi", "uzatildi", "tamamlandi" veya "silindi", gorev satırın bilinen sütunlarıdır.
+        """
+        self._gorev_dinleyicileri.append(dinleyici)
+
+    def _gorev_olayi(self, olay, personel, gorev=None):
+        for dinleyici in list(self._gorev_dinleyicileri):
+            try:
+                dinleyici(olay, personel, gorev or {})
+            except Exception as e:
+                print(f"Görev dinleyicisi hatası ({olay}, {personel}): {e}")
+
+    def tablo_surumu(self, tablo):
+        """
+        Tablonun değişiklik sayacını döndürür. Bu DatabaseManager üzerinden yapılan
+        her yazmada artar; arayüz önbellekleri bunu anahtar olarak kullanır.
+        """
+        with self._surum_kilidi:
+            return self._tablo_surumleri[tablo]
+
+    def personel_bul(self, isim):
+        """Verilen ada karşılık gelen 'Personeller' kaydının adını döndürür (yoksa None)."""
+        return self._ad_bul('Personeller', 'Personel', isim)
+
+    def arac_bul(self, isim):
+        """Verilen ada karşılık gelen 'Araclar' kaydının adını döndürür (yoksa None)."""
+        return self._ad_bul('Araclar', 'Arac', isim)
+
+    def _ad_bul(self, tablo, sutun, isim):
+        """Veritabanı hataları çağırana iletilir; eşleşme yoksa None döner."""
+        if not isim:
+            return None
+        if not self.havuz:
+            self.connect()
+        with self._baglanti() as baglanti:
+            return self._isim_cozumle(baglanti.cursor(), tablo, sutun, isim)
 
     def connect(self):
+        """
+        Bağlantı havuzunu oluşturur ve ilk bağlantıyı açarak erişimi doğrular.
+        Havuz birden çok oturum ve arka plan işçisi tarafından paralel kullanılabilir.
+        """
         try:
-            self.connection = pyodbc.connect(self.connection_string)
+            havuz = BaglantiHavuzu(self.backend, max_boyut=self.havuz_boyutu)
+            # İlk bağlantıyı hemen açıp havuza koy; erişim hatası burada görünsün
+            havuz.iade(havuz.al())
+            if self.havuz:
+                self.havuz.kapat()
+            self.havuz = havuz
+            # Şema kataloğu bağlantı başına bir kez yüklenir
+            self.katalog.gecersiz_kil()
             print("Veritabanına başarıyla bağlanıldı.")
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             print("Veritabanına bağlanırken hata oluştu:", e)
 
+    def _baglanti(self):
+        """Havuzdan bir bağlantı ödünç alan context manager döndürür."""
+        if self.sql_izleyici is not None:
+            return self.sql_izleyici.baglanti(self.havuz.baglanti(), sys._getframe(1).f_code.co_name)
+        return self.havuz.baglanti()
+
+    def katalogu_gecersiz_kil(self):
+        """Şema değiştiğinde (tablo/sütun ekleme vb.) önbelleğe alınmış kataloğu siler."""
+        self.katalog.gecersiz_kil()
+
+    def _tablo_kontrol(self, cursor, tablo, sutun=None):
+        """
+        Tablonun (ve verilmişse sütunun) varlığını katalogdan kontrol eder.
+        Bulunamazsa şema değişmiş olabilir diye katalog bir kez yeniden yüklenir.
+        """
+        self.katalog.hazirla(cursor)
+        if not self.katalog.tablo_var_mi(tablo) or (sutun and not self.katalog.sutun_var_mi(tablo, sutun)):
+            self.katalog.yukle(cursor)
+
+        if not self.katalog.tablo_var_mi(tablo):
+            print(f"HATA: '{tablo}' tablosu bulunamadı!")
+            print(f"Mevcut tablolar: {self.katalog.tablolar()}")
+            return False
+        if sutun and not self.katalog.sutun_var_mi(tablo, sutun):
+            print(f"HATA: '{tablo}' tablosunda '{sutun}' sütunu bulunamadı!")
+            print(f"Mevcut sütunlar: {self.katalog.sutunlar(tablo)}")
+            return False
+        return True
+
+    def _kimlik_sutunlarini_cikar(self, cursor, tablo, veri):
+        """IDENTITY sütunlarını (katalogdan) ekleme verisinden çıkarır."""
+        self.katalog.hazirla(cursor)
+        kimlikler = set(self.katalog.kimlik_sutunlari(tablo))
+        return {sutun: deger for sutun, deger in veri.items() if sutun not in kimlikler}
+
+    def _insert_sorgusu(self, tablo, veri):
+        """Sözlükten parametreli INSERT sorgusu ve değer listesi üretir."""
+        sutunlar = ', '.join(veri.keys())
+        yer_tutucular = ', '.join(['?'] * len(veri))
+        return f"INSERT INTO {tablo} ({sutunlar}) VALUES ({yer_tutucular})", list(veri.values())
+
     def arac_listesi_al(self):
         """Veritabanından araç listesini alır."""
         try:
-            if not self.connection:
+            if not self.havuz:
                 self.connect()
             
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT Arac FROM Araclar WHERE Arac IS NOT NULL")
-            araclar = [row[0].strip() if row[0] else '' for row in cursor.fetchall()]
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                cursor.execute("SELECT Arac FROM Araclar WHERE Arac IS NOT NULL")
+                araclar = [row[0].strip() if row[0] else '' for row in cursor.fetchall()]
             
             # Boş olanları filtrele
             araclar = [arac for arac in araclar if arac]
@@ -111,31 +241,50 @@ class DatabaseManager:
             return araclar
             
         except Exception as e:
+            hata_bildir()
             print(f"Araç listesi alınırken hata oluştu: {e}")
             return []
 
+    def personel_listesi_al(self):
+        """Veritabanından personel listesini alır."""
+        try:
+            if not self.havuz:
+                self.connect()
+            
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                cursor.execute("SELECT Personel FROM Personeller WHERE Personel IS NOT NULL")
+                personeller = [row[0].strip() if row[0] else '' for row in cursor.fetchall()]
+            
+            return [personel for personel in personeller if personel]
+            
+        except Exception as e:
+            hata_bildir()
+            print(f"Personel listesi alınırken hata oluştu: {e}")
+            return []
+
     def gorev_ekle(self, tablo_adi, gorev_verisi):
         """
         Veritabanına görev eklemek için bir fonksiyon.
         :param tablo_adi: Görevlerin ekleneceği tablo adı.
         :param gorev_verisi: Sözlük formatında görev verileri (ör. {"column1": "value1", "column2": "value2"}).
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
-        sutunlar = ', '.join(gorev_verisi.keys())
-        yer_tutucular = ', '.join(['?'] * len(gorev_verisi))
-        degerler = list(gorev_verisi.values())
-
-        sorgu = f"INSERT INTO {tablo_adi} ({sutunlar}) VALUES ({yer_tutucular})"
-
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(sorgu, degerler)
-            self.connection.commit()
-            print("Görev başarıyla eklendi.")
-        except pyodbc.Error as e:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                sorgu, degerler = self._insert_sorgusu(
+                    tablo_adi, self._kimlik_sutunlarini_cikar(cursor, tablo_adi, gorev_verisi))
+                cursor.execute(sorgu, degerler)
+                baglanti.commit()
+                self._tablolari_degisti(tablo_adi)
+                self._isim_indeksini_gecersiz_kil(tablo_adi)
+                print("Görev başarıyla eklendi.")
+        except self._db_hatalari as e:
+            hata_bildir()
             print("Görev eklenirken hata oluştu:", e)
 
     def aktif_gorev_ekle(self, gorev_verisi):
@@ -143,22 +292,26 @@ class DatabaseManager:
         'Aktif_isler' tablosuna yeni bir aktif görev ekler.
         :param gorev_verisi: Görev detaylarını içeren sözlük (ör. {"Personel": "Ahmet Yılmaz", "Arac": "Vinç 1", "Gorev": "Taşıma", "Tahmini_bitis": datetime, "Durum": "Aktif"}).
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
-        sutunlar = ', '.join(gorev_verisi.keys())
-        yer_tutucular = ', '.join(['?'] * len(gorev_verisi))
-        degerler = list(gorev_verisi.values())
-
-        sorgu = f"INSERT INTO Aktif_isler ({sutunlar}) VALUES ({yer_tutucular})"
-
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(sorgu, degerler)
-            self.connection.commit()
-            print("Aktif görev başarıyla eklendi.")
-        except pyodbc.Error as e:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                veri = self._kimlik_sutunlarini_cikar(cursor, 'Aktif_isler', gorev_verisi)
+                # Başlangıç zamanı (kullanım analizleri için) şemada varsa kaydedilir
+                if 'Baslangic_tarihi' not in veri and self.katalog.sutun_var_mi('Aktif_isler', 'Baslangic_tarihi'):
+                    veri['Baslangic_tarihi'] = datetime.now()
+                sorgu, degerler = self._insert_sorgusu('Aktif_isler', veri)
+                cursor.execute(sorgu, degerler)
+                baglanti.commit()
+                self._tablolari_degisti('Aktif_isler')
+                self._isim_indeksine_ekle('Aktif_isler', 'Personel', gorev_verisi.get('Personel'))
+                self._gorev_olayi('eklendi', veri.get('Personel'), veri)
+                print("Aktif görev başarıyla eklendi.")
+        except self._db_hatalari as e:
+            hata_bildir()
             print("Aktif görev eklenirken hata oluştu:", e)
 
     def tamamlanan_gorev_ekle(self, gorev_verisi):
@@ -166,61 +319,38 @@ class DatabaseManager:
         'Tamamlanan_isler' tablosuna yeni bir tamamlanan görev ekler.
         :param gorev_verisi: Görev detaylarını içeren sözlük (ör. {"Personel": "Ahmet Yılmaz", "Arac": "Vinç 1", "Gorev": "Taşıma", "Bitis_tarihi": datetime.now(), "Durum": "Tamamlandı", "Tahmini_bitis": datetime}).
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
 
-        # ID sütununu çıkar (IDENTITY sütunu olduğu için)
-        gorev_kopyasi = gorev_verisi.copy()
-        if 'ID' in gorev_kopyasi:
-            del gorev_kopyasi['ID']
-        if 'Id' in gorev_kopyasi:
-            del gorev_kopyasi['Id']
-        if 'id' in gorev_kopyasi:
-            del gorev_kopyasi['id']
-
-        sutunlar = ', '.join(gorev_kopyasi.keys())
-        yer_tutucular = ', '.join(['?'] * len(gorev_kopyasi))
-        degerler = list(gorev_kopyasi.values())
-
-        sorgu = f"INSERT INTO Tamamlanan_isler ({sutunlar}) VALUES ({yer_tutucular})"
+        sorgu, degerler = None, None
 
         try:
-            cursor = self.connection.cursor()
-            
-            # Önce tabloyu kontrol et
-            cursor.execute("SELECT name FROM sys.tables WHERE name = 'Tamamlanan_isler'")
-            tablo_var = cursor.fetchone()
-            
-            if not tablo_var:
-                print("HATA: 'Tamamlanan_isler' tablosu bulunamadı!")
-                # Mevcut tabloları listele
-                cursor.execute("SELECT name FROM sys.tables WHERE type = 'U'")
-                tablolar = [row[0] for row in cursor.fetchall()]
-                print(f"Mevcut tablolar: {tablolar}")
-                return
-            
-            # Tablo sütunlarını kontrol et
-            cursor.execute("""
-                SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_NAME = 'Tamamlanan_isler'
-                ORDER BY ORDINAL_POSITION
-            """)
-            sutun_bilgileri = cursor.fetchall()
-            
-            # Ekleme işlemi
-            cursor.execute(sorgu, degerler)
-            etkilenen_satir = cursor.rowcount
-            self.connection.commit()
-            
-            if etkilenen_satir > 0:
-                print(f"✅ Tamamlanan görev başarıyla eklendi. ({etkilenen_satir} satır eklendi)")
-            else:
-                print("⚠️ UYARI: Hiçbir satır eklenmedi!")
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+            
+                # Önce tabloyu kontrol et (katalogdan, sorgu yapmadan)
+                if not self._tablo_kontrol(cursor, 'Tamamlanan_isler'):
+                    return
+            
+                # IDENTITY sütunlarını katalogdan bulup çıkar
+                sorgu, degerler = self._insert_sorgusu(
+                    'Tamamlanan_isler', self._kimlik_sutunlarini_cikar(cursor, 'Tamamlanan_isler', gorev_verisi))
+            
+                # Ekleme işlemi
+                cursor.execute(sorgu, degerler)
+                etkilenen_satir = cursor.rowcount
+                baglanti.commit()
+                self._tablolari_degisti('Tamamlanan_isler')
+            
+                if etkilenen_satir > 0:
+                    print(f"✅ Tamamlanan görev başarıyla eklendi. ({etkilenen_satir} satır eklendi)")
+                else:
+                    print("⚠️ UYARI: Hiçbir satır eklenmedi!")
                 
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             print(f"❌ Tamamlanan görev eklenirken hata oluştu: {e}")
             print(f"   SQL: {sorgu}")
             print(f"   Değerler: {degerler}")
@@ -231,76 +361,53 @@ class DatabaseManager:
         :param operator_adi: Operatörün adı.
         :param durum: Yeni durum.
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
         try:
-            cursor = self.connection.cursor()
-            
-            # Önce tabloyu ve sütunları kontrol et
-            cursor.execute("SELECT name FROM sys.tables WHERE name = 'Personeller'")
-            tablo_var = cursor.fetchone()
-            
-            if not tablo_var:
-                print("HATA: 'Personeller' tablosu bulunamadı!")
-                cursor.execute("SELECT name FROM sys.tables WHERE type = 'U'")
-                tablolar = [row[0] for row in cursor.fetchall()]
-                print(f"Mevcut tablolar: {tablolar}")
-                return
-            
-            # Personeller tablosunun sütunlarını kontrol et
-            cursor.execute("""
-                SELECT COLUMN_NAME 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_NAME = 'Personeller'
-                ORDER BY ORDINAL_POSITION
-            """)
-            sutunlar = [row[0] for row in cursor.fetchall()]
-            
-            # Durum sütunu var mı kontrol et
-            if 'Durum' not in sutunlar:
-                print("HATA: 'Personeller' tablosunda 'Durum' sütunu bulunamadı!")
-                print(f"Mevcut sütunlar: {sutunlar}")
-                return
-            
-            # Önce tam eşleşme dene
-            kontrol_sorgu = "SELECT COUNT(*) FROM Personeller WHERE Personel = ?"
-            cursor.execute(kontrol_sorgu, (operator_adi,))
-            kayit_sayisi = cursor.fetchone()[0]
-            
-            gercek_isim = operator_adi
-            
-            if kayit_sayisi == 0:
-                # Tam eşleşme yoksa, akıllı eşleştirme yap
-                print(f"'{operator_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
-                
-                cursor.execute("SELECT Personel FROM Personeller")
-                tum_personeller = [row[0] for row in cursor.fetchall()]
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+            
+                # Tabloyu ve Durum sütununu katalogdan kontrol et
+                if not self._tablo_kontrol(cursor, 'Personeller', 'Durum'):
+                    return
+            
+                # Önce tam eşleşme dene
+                kontrol_sorgu = "SELECT COUNT(*) FROM Personeller WHERE Personel = ?"
+                cursor.execute(kontrol_sorgu, (operator_adi,))
+                kayit_sayisi = cursor.fetchone()[0]
+            
+                gercek_isim = operator_adi
+            
+                if kayit_sayisi == 0:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{operator_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
                 
-                # Akıllı eşleştirme kullan
-                eslesme = self._smart_name_match(operator_adi, tum_personeller)
+                    # Akıllı eşleştirme kullan (önbellekteki isim indeksinden)
+                    eslesme = self._isim_cozumle(cursor, 'Personeller', 'Personel', operator_adi)
                 
-                if eslesme:
-                    gercek_isim = eslesme
-                    print(f"Akıllı eşleşme bulundu: '{operator_adi}' -> '{gercek_isim}'")
-                else:
-                    print(f"HATA: '{operator_adi}' adında personel bulunamadı!")
-                    print(f"Mevcut personeller: {tum_personeller}")
-                    return
+                    if eslesme:
+                        gercek_isim = eslesme
+                        print(f"Akıllı eşleşme bulundu: '{operator_adi}' -> '{gercek_isim}'")
+                    else:
+                        print(f"HATA: '{operator_adi}' adında personel bulunamadı!")
+                        return
             
-            # Güncelleme yap
-            sorgu = "UPDATE Personeller SET Durum = ? WHERE Personel = ?"
-            cursor.execute(sorgu, (durum, gercek_isim))
-            etkilenen_satir = cursor.rowcount
-            self.connection.commit()
+                # Güncelleme yap
+                sorgu = "UPDATE Personeller SET Durum = ? WHERE Personel = ?"
+                cursor.execute(sorgu, (durum, gercek_isim))
+                etkilenen_satir = cursor.rowcount
+                baglanti.commit()
+                self._tablolari_degisti('Personeller', satirlar=[('Personeller', gercek_isim, {'Durum': durum})])
             
-            if etkilenen_satir > 0:
-                print(f"'{gercek_isim}' için durum başarıyla güncellendi. ({etkilenen_satir} satır etkilendi)")
-            else:
-                print(f"UYARI: '{gercek_isim}' için hiçbir satır güncellenmedi!")
+                if etkilenen_satir > 0:
+                    print(f"'{gercek_isim}' için durum başarıyla güncellendi. ({etkilenen_satir} satır etkilendi)")
+                else:
+                    print(f"UYARI: '{gercek_isim}' için hiçbir satır güncellenmedi!")
                 
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             print("Durum güncellenirken hata oluştu:", e)
 
     def arac_durum_guncelle(self, arac_adi, durum):
@@ -309,134 +416,311 @@ class DatabaseManager:
         :param arac_adi: Aracın adı.
         :param durum: Yeni durum.
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
         try:
-            cursor = self.connection.cursor()
-            
-            # Önce tabloyu ve sütunları kontrol et
-            cursor.execute("SELECT name FROM sys.tables WHERE name = 'Araclar'")
-            tablo_var = cursor.fetchone()
-            
-            if not tablo_var:
-                print("HATA: 'Araclar' tablosu bulunamadı!")
-                cursor.execute("SELECT name FROM sys.tables WHERE type = 'U'")
-                tablolar = [row[0] for row in cursor.fetchall()]
-                print(f"Mevcut tablolar: {tablolar}")
-                return
-            
-            # Araclar tablosunun sütunlarını kontrol et
-            cursor.execute("""
-                SELECT COLUMN_NAME 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_NAME = 'Araclar'
-                ORDER BY ORDINAL_POSITION
-            """)
-            sutunlar = [row[0] for row in cursor.fetchall()]
-            
-            # Durum sütunu var mı kontrol et
-            if 'Durum' not in sutunlar:
-                print("HATA: 'Araclar' tablosunda 'Durum' sütunu bulunamadı!")
-                print(f"Mevcut sütunlar: {sutunlar}")
-                return
-            
-            # Önce tam eşleşme dene
-            kontrol_sorgu = "SELECT COUNT(*) FROM Araclar WHERE Arac = ?"
-            cursor.execute(kontrol_sorgu, (arac_adi,))
-            kayit_sayisi = cursor.fetchone()[0]
-            
-            gercek_isim = arac_adi
-            
-            if kayit_sayisi == 0:
-                # Tam eşleşme yoksa, akıllı eşleştirme yap
-                print(f"'{arac_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
-                
-                cursor.execute("SELECT Arac FROM Araclar")
-                tum_araclar = [row[0] for row in cursor.fetchall()]
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+            
+                # Tabloyu ve Durum sütununu katalogdan kontrol et
+                if not self._tablo_kontrol(cursor, 'Araclar', 'Durum'):
+                    return
+            
+                # Önce tam eşleşme dene
+                kontrol_sorgu = "SELECT COUNT(*) FROM Araclar WHERE Arac = ?"
+                cursor.execute(kontrol_sorgu, (arac_adi,))
+                kayit_sayisi = cursor.fetchone()[0]
+            
+                gercek_isim = arac_adi
+            
+                if kayit_sayisi == 0:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{arac_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
                 
-                # Akıllı eşleştirme kullan
-                eslesme = self._smart_name_match(arac_adi, tum_araclar)
+                    # Akıllı eşleştirme kullan (önbellekteki isim indeksinden)
+                    eslesme = self._isim_cozumle(cursor, 'Araclar', 'Arac', arac_adi)
                 
-                if eslesme:
-                    gercek_isim = eslesme
-                    print(f"Akıllı eşleşme bulundu: '{arac_adi}' -> '{gercek_isim}'")
-                else:
-                    print(f"HATA: '{arac_adi}' adında araç bulunamadı!")
-                    print(f"Mevcut araçlar: {tum_araclar}")
-                    return
+                    if eslesme:
+                        gercek_isim = eslesme
+                        print(f"Akıllı eşleşme bulundu: '{arac_adi}' -> '{gercek_isim}'")
+                    else:
+                        print(f"HATA: '{arac_adi}' adında araç bulunamadı!")
+                        return
             
-            # Güncelleme yap
-            sorgu = "UPDATE Araclar SET Durum = ? WHERE Arac = ?"
-            cursor.execute(sorgu, (durum, gercek_isim))
-            etkilenen_satir = cursor.rowcount
-            self.connection.commit()
+                # Güncelleme yap
+                sorgu = "UPDATE Araclar SET Durum = ? WHERE Arac = ?"
+                cursor.execute(sorgu, (durum, gercek_isim))
+                etkilenen_satir = cursor.rowcount
+                baglanti.commit()
+                self._tablolari_degisti('Araclar', satirlar=[('Araclar', gercek_isim, {'Durum': durum})])
             
-            if etkilenen_satir > 0:
-                print(f"'{gercek_isim}' için durum başarıyla güncellendi. ({etkilenen_satir} satır etkilendi)")
-            else:
-                print(f"UYARI: '{gercek_isim}' için hiçbir satır güncellenmedi!")
+                if etkilenen_satir > 0:
+                    print(f"'{gercek_isim}' için durum başarıyla güncellendi. ({etkilenen_satir} satır etkilendi)")
+                else:
+                    print(f"UYARI: '{gercek_isim}' için hiçbir satır güncellenmedi!")
                 
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             print("Durum güncellenirken hata oluştu:", e)
 
+    def aktif_gorev_bitisleri(self):
+        """
+        Tüm aktif görevlerin tahmini bitiş zamanlarını okur (zamanlayıcının ilk yüklemesi için).
+        :return: [(Personel, Arac, Gorev, Tahmini_bitis)] listesi; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Aktif_isler'):
+                    return None
+                cursor.execute("SELECT Personel, Arac, Gorev, Tahmini_bitis FROM Aktif_isler")
+                return [tuple(row) for row in cursor.fetchall()]
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Aktif görev bitişleri okunurken hata oluştu: {e}")
+            return None
+
+    def personel_arac_deneyimi(self):
+        """
+        Her personelin her araçta tamamladığı iş sayısını okur (atama optimizasyonu için).
+        :return: [(Personel, Arac, adet)] listesi; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Tamamlanan_isler'):
+                    return None
+                cursor.execute("SELECT Personel, Arac, COUNT(*) FROM Tamamlanan_isler "
+                               "WHERE Personel IS NOT NULL AND Arac IS NOT NULL GROUP BY Personel, Arac")
+                return [tuple(row) for row in cursor.fetchall()]
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Personel deneyimi okunurken hata oluştu: {e}")
+            return None
+
+    def _sure_uzat(self, cursor, kosul, degerler, dakika):
+        """Koşula uyan aktif görevlerin Tahmini_bitis'ini tek ifadede uzatır ve yeni satırları döndürür."""
+        sutunlar = ['Personel', 'Arac', 'Gorev', 'Tahmini_bitis']
+        sorgu = self.backend.guncelle_dondur(
+            'Aktif_isler', f"Tahmini_bitis = {self.backend.dakika_ekle('Tahmini_bitis')}", kosul, sutunlar)
+        cursor.execute(sorgu, [int(dakika)] + list(degerler))
+        gorevler = [dict(zip(sutunlar, row)) for row in cursor.fetchall()]
+        for gorev in gorevler:
+            # SQLite RETURNING sütun tipini taşımaz; tarih metin olarak döner
+            if isinstance(gorev['Tahmini_bitis'], str):
+                gorev['Tahmini_bitis'] = datetime.fromisoformat(gorev['Tahmini_bitis'])
+        return gorevler
+
+    def _uzatmalari_bildir(self, gorevler):
+        if gorevler:
+            self._tablolari_degisti('Aktif_isler')
+        for gorev in gorevler:
+            self._gorev_olayi('uzatildi', gorev['Personel'], gorev)
+
+    def sure_uzat(self, personel_adi, dakika):
+        """
+        Personelin aktif görevinin tahmini bitişini tek bir UPDATE ile uzatır.
+        Ad, önbellekteki isim indeksinden çözülür; tahmini bitişi olmayan görev şimdiden uzatılır.
+        :param personel_adi: Görevli personelin adı (yazım hataları tolere edilir).
+        :param dakika: Eklenecek süre (dakika).
+        :return: Güncellenen görevin sözlüğü (Personel, Arac, Gorev, Tahmini_bitis) veya aktif görev yoksa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Aktif_isler'):
+                    return None
+                indeks, _ = self._isim_indeksi(cursor, 'Aktif_isler', 'Personel')
+                gercek_personel = indeks.tam(personel_adi) or self._isim_cozumle(cursor, 'Aktif_isler', 'Personel', personel_adi)
+                if not gercek_personel:
+                    print(f"HATA: '{personel_adi}' için aktif görev bulunamadı!")
+                    return None
+                gorevler = self._sure_uzat(cursor, "Personel = ?", [gercek_personel], dakika)
+                baglanti.commit()
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Süre uzatılırken hata oluştu: {e}")
+            return None
+
+        self._uzatmalari_bildir(gorevler)
+        if not gorevler:
+            print(f"UYARI: '{gercek_personel}' için güncellenecek görev bulunamadı!")
+            return None
+        print(f"⏱️ '{gercek_personel}' görevi {int(dakika)} dakika uzatıldı.")
+        return gorevler[0]
+
+    def toplu_sure_uzat(self, dakika, arac_adi=None, sadece_gecikenler=False):
+        """
+        Birden çok aktif görevi tek bir UPDATE ile uzatır: bir araçtaki herkesi,
+        tahmini bitişi geçmiş tüm görevleri veya ikisinin kesişimini.
+        :param dakika: Eklenecek süre (dakika).
+        :param arac_adi: Yalnızca bu araçla yapılan görevler (yazım hataları tolere edilir).
+        :param sadece_gecikenler: Yalnızca tahmini bitişi geçmiş görevler.
+        :return: Güncellenen görevlerin sözlük listesi; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+        if not arac_adi and not sadece_gecikenler:
+            print("Toplu süre uzatma için araç veya 'sadece_gecikenler' verilmeli.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Aktif_isler'):
+                    return None
+                kosullar, degerler = [], []
+                if arac_adi:
+                    gercek_arac = self._isim_cozumle(cursor, 'Araclar', 'Arac', arac_adi)
+                    if not gercek_arac:
+                        print(f"❌ Araç bulunamadı: '{arac_adi}'")
+                        return None
+                    kosullar.append("Arac = ?")
+                    degerler.append(gercek_arac)
+                if sadece_gecikenler:
+                    kosullar.append("Tahmini_bitis < ?")
+                    degerler.append(datetime.now())
+                gorevler = self._sure_uzat(cursor, " AND ".join(kosullar), degerler, dakika)
+                baglanti.commit()
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Toplu süre uzatma geri alındı: {e}")
+            return None
+
+        self._uzatmalari_bildir(gorevler)
+        print(f"⏱️ {len(gorevler)} görev {int(dakika)} dakika uzatıldı.")
+        return gorevler
+
+    def rezervasyon_ekle(self, arac, personel, baslangic, bitis, aciklama=None):
+        """
+        'Rezervasyonlar' tablosuna planlanmış bir zaman aralığı ekler.
+        Adların gerçek adlar olduğu ve çakışma kontrolünün yapıldığı varsayılır.
+        :return: Yeni rezervasyonun kimliği; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Rezervasyonlar'):
+                    return None
+                cursor.execute(self.backend.ekle_dondur(
+                    'Rezervasyonlar', ['Arac', 'Personel', 'Baslangic', 'Bitis', 'Aciklama'], 'ID'),
+                    (arac, personel, baslangic, bitis, aciklama))
+                kimlik = cursor.fetchone()[0]
+                baglanti.commit()
+                self._tablolari_degisti('Rezervasyonlar')
+                return int(kimlik)
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Rezervasyon eklenirken hata oluştu: {e}")
+            return None
+
+    def rezervasyonlari_al(self, baslangic=None):
+        """
+        Bitişi verilen zamandan sonra olan rezervasyonları okur.
+        :return: [(ID, Arac, Personel, Baslangic, Bitis, Aciklama)] listesi; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Rezervasyonlar'):
+                    return None
+                cursor.execute("SELECT ID, Arac, Personel, Baslangic, Bitis, Aciklama FROM Rezervasyonlar "
+                               "WHERE Bitis > ? ORDER BY Baslangic", (baslangic or datetime.now(),))
+                return [tuple(row) for row in cursor.fetchall()]
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Rezervasyonlar okunurken hata oluştu: {e}")
+            return None
+
+    def rezervasyon_sil(self, kimlik):
+        """:return: Silinen satır sayısı; hata olursa None."""
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                cursor.execute("DELETE FROM Rezervasyonlar WHERE ID = ?", (kimlik,))
+                silinen = cursor.rowcount
+                baglanti.commit()
+                self._tablolari_degisti('Rezervasyonlar')
+                return silinen
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Rezervasyon silinirken hata oluştu: {e}")
+            return None
+
     def get_aktif_gorev(self, personel_adi):
         """
         'Aktif_isler' tablosundan belirli bir personelin aktif görevini alır
         :param personel_adi: Görevli personelin adı.
         :return: Görev bilgilerini içeren bir sözlük veya None.
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return None
 
 
         try:
-            cursor = self.connection.cursor()
-            
-            # Önce tabloda hiç kayıt var mı kontrol et
-            cursor.execute("SELECT COUNT(*) FROM Aktif_isler")
-            toplam_kayit = cursor.fetchone()[0]
-            
-            if toplam_kayit == 0:
-                return None
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
             
-            # Tüm aktif personelleri al
-            cursor.execute("SELECT Personel FROM Aktif_isler")
-            aktif_personeller = [row[0] for row in cursor.fetchall()]
+                # Önce tam eşleşme dene
+                sorgu = "SELECT * FROM Aktif_isler WHERE Personel = ?"
+                cursor.execute(sorgu, (personel_adi,))
+                sonuc = cursor.fetchone()
             
-            # Önce tam eşleşme dene
-            sorgu = "SELECT * FROM Aktif_isler WHERE Personel = ?"
-            cursor.execute(sorgu, (personel_adi,))
-            sonuc = cursor.fetchone()
+                gercek_personel = personel_adi
             
-            gercek_personel = personel_adi
-            
-            if not sonuc:
-                # Tam eşleşme yoksa, akıllı eşleştirme yap
-                print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
+                if not sonuc:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
                 
-                # Akıllı eşleştirme kullan
-                eslesme = self._smart_name_match(personel_adi, aktif_personeller)
+                    # Akıllı eşleştirme kullan (önbellekteki isim indeksinden)
+                    eslesme = self._isim_cozumle(cursor, 'Aktif_isler', 'Personel', personel_adi)
                 
-                if eslesme:
-                    gercek_personel = eslesme
-                    print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
-                    # Eşleşen personel ile tekrar sorgula
-                    cursor.execute(sorgu, (gercek_personel,))
-                    sonuc = cursor.fetchone()
+                    if eslesme:
+                        gercek_personel = eslesme
+                        print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
+                        # Eşleşen personel ile tekrar sorgula
+                        cursor.execute(sorgu, (gercek_personel,))
+                        sonuc = cursor.fetchone()
+                    else:
+                        return None
+            
+                if sonuc:
+                    sutunlar = [column[0] for column in cursor.description]
+                    gorev_dict = dict(zip(sutunlar, sonuc))
+                    return gorev_dict
                 else:
                     return None
-            
-            if sonuc:
-                sutunlar = [column[0] for column in cursor.description]
-                gorev_dict = dict(zip(sutunlar, sonuc))
-                return gorev_dict
-            else:
-                return None
                 
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             return None
 
     def aktif_gorev_sil(self, personel_adi):
@@ -444,50 +728,51 @@ class DatabaseManager:
         'Aktif_isler' tablosundan belirli bir personelin görevini siler.
         :param personel_adi: Görevli personelin adı.
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
         try:
-            cursor = self.connection.cursor()
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
             
-            # Önce tam eşleşme dene
-            kontrol_sorgu = "SELECT COUNT(*) FROM Aktif_isler WHERE Personel = ?"
-            cursor.execute(kontrol_sorgu, (personel_adi,))
-            kayit_sayisi = cursor.fetchone()[0]
+                # Önce tam eşleşme dene
+                kontrol_sorgu = "SELECT COUNT(*) FROM Aktif_isler WHERE Personel = ?"
+                cursor.execute(kontrol_sorgu, (personel_adi,))
+                kayit_sayisi = cursor.fetchone()[0]
             
-            gercek_personel = personel_adi
+                gercek_personel = personel_adi
             
-            if kayit_sayisi == 0:
-                # Tam eşleşme yoksa, akıllı eşleştirme yap
-                print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
-                
-                cursor.execute("SELECT Personel FROM Aktif_isler")
-                aktif_personeller = [row[0] for row in cursor.fetchall()]
+                if kayit_sayisi == 0:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
                 
-                # Akıllı eşleştirme kullan
-                eslesme = self._smart_name_match(personel_adi, aktif_personeller)
+                    # Akıllı eşleştirme kullan (önbellekteki isim indeksinden)
+                    eslesme = self._isim_cozumle(cursor, 'Aktif_isler', 'Personel', personel_adi)
                 
-                if eslesme:
-                    gercek_personel = eslesme
-                    print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
-                else:
-                    print(f"HATA: '{personel_adi}' için aktif görev bulunamadı!")
-                    print(f"Aktif görevli personeller: {aktif_personeller}")
-                    return
+                    if eslesme:
+                        gercek_personel = eslesme
+                        print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
+                    else:
+                        print(f"HATA: '{personel_adi}' için aktif görev bulunamadı!")
+                        return
             
-            # Silme işlemi
-            sorgu = "DELETE FROM Aktif_isler WHERE Personel = ?"
-            cursor.execute(sorgu, (gercek_personel,))
-            etkilenen_satir = cursor.rowcount
-            self.connection.commit()
+                # Silme işlemi
+                sorgu = "DELETE FROM Aktif_isler WHERE Personel = ?"
+                cursor.execute(sorgu, (gercek_personel,))
+                etkilenen_satir = cursor.rowcount
+                baglanti.commit()
+                self._tablolari_degisti('Aktif_isler')
+                self._isim_indeksini_gecersiz_kil('Aktif_isler')
             
-            if etkilenen_satir > 0:
-                print(f"'{gercek_personel}' için aktif görev başarıyla silindi. ({etkilenen_satir} satır silindi)")
-            else:
-                print(f"UYARI: '{gercek_personel}' için hiçbir satır silinmedi!")
+                if etkilenen_satir > 0:
+                    self._gorev_olayi('silindi', gercek_personel)
+                    print(f"'{gercek_personel}' için aktif görev başarıyla silindi. ({etkilenen_satir} satır silindi)")
+                else:
+                    print(f"UYARI: '{gercek_personel}' için hiçbir satır silinmedi!")
                 
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             print(f"Aktif görev silinirken hata oluştu: {e}")
 
     def operatoru_bosa_al(self, personel_adi):
@@ -495,66 +780,487 @@ class DatabaseManager:
         Operatörü boşa alır - durumunu 'Boşta' yapar ve aracını boşaltır.
         :param personel_adi: Operatörün adı.
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
         try:
-            cursor = self.connection.cursor()
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
             
-            # Önce personelin mevcut bilgilerini al
-            cursor.execute("SELECT Personel, Arac FROM Personeller WHERE Personel = ?", (personel_adi,))
-            personel_bilgisi = cursor.fetchone()
+                # Önce personelin mevcut bilgilerini al
+                cursor.execute("SELECT Personel, Arac FROM Personeller WHERE Personel = ?", (personel_adi,))
+                personel_bilgisi = cursor.fetchone()
             
-            gercek_personel = personel_adi
+                gercek_personel = personel_adi
             
-            if not personel_bilgisi:
-                # Tam eşleşme yoksa, akıllı eşleştirme yap
-                print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
+                if not personel_bilgisi:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
                 
-                cursor.execute("SELECT Personel FROM Personeller")
-                tum_personeller = [row[0] for row in cursor.fetchall()]
+                    # Akıllı eşleştirme kullan (önbellekteki isim indeksinden)
+                    eslesme = self._isim_cozumle(cursor, 'Personeller', 'Personel', personel_adi)
                 
-                # Akıllı eşleştirme kullan
-                eslesme = self._smart_name_match(personel_adi, tum_personeller)
+                    if eslesme:
+                        gercek_personel = eslesme
+                        print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
+                        # Eşleşen personel bilgilerini al
+                        cursor.execute("SELECT Personel, Arac FROM Personeller WHERE Personel = ?", (gercek_personel,))
+                        personel_bilgisi = cursor.fetchone()
+                    else:
+                        print(f"HATA: '{personel_adi}' adında personel bulunamadı!")
+                        return
+            
+                # Personelin kullandığı aracı al
+                mevcut_arac = personel_bilgisi[1] if personel_bilgisi and len(personel_bilgisi) > 1 else None
+            
+                # Personelin durumunu 'Boşta' yap ve aracını boşalt
+                cursor.execute("UPDATE Personeller SET Durum = ?, Arac = NULL WHERE Personel = ?", 
+                              ("Boşta", gercek_personel))
+                personel_etkilenen = cursor.rowcount
+            
+                # Eğer personelin aracı varsa, aracın durumunu da 'Boşta' yap
+                arac_etkilenen = 0
+                if mevcut_arac and mevcut_arac.strip():
+                    cursor.execute("UPDATE Araclar SET Durum = ? WHERE Arac = ?", 
+                                  ("Boşta", mevcut_arac))
+                    arac_etkilenen = cursor.rowcount
+            
+                baglanti.commit()
+                degisenler = [('Personeller', gercek_personel, {'Durum': 'Boşta', 'Arac': None})]
+                if mevcut_arac and mevcut_arac.strip():
+                    degisenler.append(('Araclar', mevcut_arac, {'Durum': 'Boşta'}))
+                self._tablolari_degisti('Personeller', 'Araclar', satirlar=degisenler)
+            
+                if personel_etkilenen > 0:
+                    mesaj = f"'{gercek_personel}' başarıyla boşa alındı."
+                    if arac_etkilenen > 0:
+                        mesaj += f" Aracı '{mevcut_arac}' da boşa alındı."
+                    print(mesaj)
+                else:
+                    print(f"UYARI: '{gercek_personel}' için hiçbir değişiklik yapılmadı!")
                 
-                if eslesme:
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Operatör boşa alınırken hata oluştu: {e}")
+
+    def gorev_tamamla(self, personel_adi, bitis_tarihi=None):
+        """
+        Personelin aktif görevini tek bir işlemde tamamlar: satırı 'Aktif_isler'den
+        'Tamamlanan_isler'e taşır, operatörü ve aracını boşa alır.
+        Ara adımda hata olursa hiçbir değişiklik kalıcı olmaz.
+        :param personel_adi: Görevli personelin adı.
+        :param bitis_tarihi: Bitiş zamanı (varsayılan: şimdi).
+        :return: Tamamlanan görevin sözlüğü veya aktif görev yoksa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        bitis_tarihi = bitis_tarihi or datetime.now()
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                
+                if not self._tablo_kontrol(cursor, 'Aktif_isler') or not self._tablo_kontrol(cursor, 'Tamamlanan_isler'):
+                    return None
+                
+                # 1. gidiş-dönüş: aktif görevi al
+                sorgu = "SELECT * FROM Aktif_isler WHERE Personel = ?"
+                cursor.execute(sorgu, (personel_adi,))
+                sonuc = cursor.fetchone()
+                gercek_personel = personel_adi
+                
+                if not sonuc:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
+                    eslesme = self._isim_cozumle(cursor, 'Aktif_isler', 'Personel', personel_adi)
+                    if not eslesme:
+                        return None
                     gercek_personel = eslesme
                     print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
-                    # Eşleşen personel bilgilerini al
-                    cursor.execute("SELECT Personel, Arac FROM Personeller WHERE Personel = ?", (gercek_personel,))
-                    personel_bilgisi = cursor.fetchone()
-                else:
-                    print(f"HATA: '{personel_adi}' adında personel bulunamadı!")
-                    return
-            
-            # Personelin kullandığı aracı al
-            mevcut_arac = personel_bilgisi[1] if personel_bilgisi and len(personel_bilgisi) > 1 else None
-            
-            # Personelin durumunu 'Boşta' yap ve aracını boşalt
-            cursor.execute("UPDATE Personeller SET Durum = ?, Arac = NULL WHERE Personel = ?", 
-                          ("Boşta", gercek_personel))
-            personel_etkilenen = cursor.rowcount
-            
-            # Eğer personelin aracı varsa, aracın durumunu da 'Boşta' yap
-            arac_etkilenen = 0
-            if mevcut_arac and mevcut_arac.strip():
-                cursor.execute("UPDATE Araclar SET Durum = ? WHERE Arac = ?", 
-                              ("Boşta", mevcut_arac))
-                arac_etkilenen = cursor.rowcount
-            
-            self.connection.commit()
-            
-            if personel_etkilenen > 0:
-                mesaj = f"'{gercek_personel}' başarıyla boşa alındı."
-                if arac_etkilenen > 0:
-                    mesaj += f" Aracı '{mevcut_arac}' da boşa alındı."
-                print(mesaj)
-            else:
-                print(f"UYARI: '{gercek_personel}' için hiçbir değişiklik yapılmadı!")
+                    cursor.execute(sorgu, (gercek_personel,))
+                    sonuc = cursor.fetchone()
+                    if not sonuc:
+                        return None
                 
-        except pyodbc.Error as e:
-            print(f"Operatör boşa alınırken hata oluştu: {e}")
+                gorev = dict(zip([column[0] for column in cursor.description], sonuc))
+                
+                # Her iki tabloda da bulunan, IDENTITY olmayan sütunlar doğrudan kopyalanır
+                hedef = set(self.katalog.sutunlar('Tamamlanan_isler')) - set(self.katalog.kimlik_sutunlari('Tamamlanan_isler'))
+                kopyalanacak = [sutun for sutun in self.katalog.sutunlar('Aktif_isler')
+                                if sutun in hedef
+                                and sutun not in self.katalog.kimlik_sutunlari('Aktif_isler')
+                                and sutun not in ('Bitis_tarihi', 'Durum')]
+                ek_sutunlar, ek_degerler = [], []
+                if 'Bitis_tarihi' in hedef:
+                    ek_sutunlar.append('Bitis_tarihi')
+                    ek_degerler.append(bitis_tarihi)
+                if 'Durum' in hedef:
+                    ek_sutunlar.append('Durum')
+                    ek_degerler.append('Tamamlandı')
+                
+                hedef_sutunlar = ', '.join(kopyalanacak + ek_sutunlar)
+                kaynak_sutunlar = ', '.join(kopyalanacak + ['?'] * len(ek_sutunlar))
+                
+                # Görev satırındaki adlar yazıldığı gibi kaydedilmiş olabilir ("ahmet", "vinç 1");
+                # boşa alınacak kayıtlar Personeller/Araclar'daki adlarıyla (önbellekteki indeksten) bulunur
+                kayitli_personel = self._isim_cozumle(cursor, 'Personeller', 'Personel', gercek_personel) or gercek_personel
+                kayitli_arac = gorev.get('Arac')
+                if kayitli_arac:
+                    kayitli_arac = self._isim_cozumle(cursor, 'Araclar', 'Arac', kayitli_arac) or kayitli_arac
+                
+                # 2. gidiş-dönüş: taşıma ve boşa alma tek toplu iş halinde
+                self.backend.toplu_calistir(cursor, [
+                    (f"INSERT INTO Tamamlanan_isler ({hedef_sutunlar}) "
+                     f"SELECT {kaynak_sutunlar} FROM Aktif_isler WHERE Personel = ?",
+                     ek_degerler + [gercek_personel]),
+                    ("DELETE FROM Aktif_isler WHERE Personel = ?", [gercek_personel]),
+                    # Araç hem görev kaydından hem de personelin üzerindeki araçtan bulunur
+                    ("UPDATE Araclar SET Durum = ? WHERE Arac = ? OR Arac IN "
+                     "(SELECT Arac FROM Personeller WHERE Personel = ? AND Arac IS NOT NULL)",
+                     ["Boşta", kayitli_arac, kayitli_personel]),
+                    ("UPDATE Personeller SET Durum = ?, Arac = NULL WHERE Personel = ?",
+                     ["Boşta", kayitli_personel]),
+                ])
+                baglanti.commit()
+                # Personelin üzerindeki araç da boşa alınır; aynalar bunu 'Arac': None değişikliğinden çıkarır
+                degisenler = [('Personeller', kayitli_personel, {'Durum': 'Boşta', 'Arac': None})]
+                if kayitli_arac:
+                    degisenler.append(('Araclar', kayitli_arac, {'Durum': 'Boşta'}))
+                self._tablolari_degisti('Aktif_isler', 'Tamamlanan_isler', 'Personeller', 'Araclar', satirlar=degisenler)
+                self._isim_indeksini_gecersiz_kil('Aktif_isler')
+                
+                gorev['Bitis_tarihi'] = bitis_tarihi
+                gorev['Durum'] = 'Tamamlandı'
+                self._gorev_olayi('tamamlandi', gercek_personel, gorev)
+                print(f"✅ '{gercek_personel}' görevi tamamlandı ve boşa alındı.")
+                return gorev
+                
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"❌ Görev tamamlanırken hata oluştu, işlem geri alındı: {e}")
+            return None
+
+    def durum_tablolari_al(self):
+        """
+        Personel ve araç durumlarını tek bağlantıda okur.
+        :return: ({personel: (durum, arac)}, {arac: durum}) veya hata durumunda (None, None).
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None, None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                cursor.execute("SELECT Personel, Durum, Arac FROM Personeller WHERE Personel IS NOT NULL")
+                personeller = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+                cursor.execute("SELECT Arac, Durum FROM Araclar WHERE Arac IS NOT NULL")
+                araclar = {row[0]: row[1] for row in cursor.fetchall()}
+                return personeller, araclar
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Durum tabloları okunurken hata oluştu: {e}")
+            return None, None
+
+    def degisiklik_izlemeyi_hazirla(self, tablolar):
+        """
+        Tablolar için değişiklik izlemeyi açar (SQL Server Change Tracking,
+        SQLite'ta tetikleyicili değişiklik günlüğü).
+        :param tablolar: {tablo: anahtar sütun}
+        :return: İzleme kullanılabiliyorsa True; aksi halde değişiklikler tam okumayla alınır.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return False
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                hazir = self.backend.izleme_hazirla(cursor, tablolar)
+                baglanti.commit()
+                self.katalog.gecersiz_kil()
+                return hazir
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Değişiklik izleme hazırlanırken hata oluştu: {e}")
+            return False
+
+    # IN (...) listesinde tek seferde gönderilecek en fazla anahtar
+    DEGISIKLIK_PARCA_BOYUTU = 500
+
+    def degisiklikleri_al(self, tablolar, surum=None):
+        """
+        Verilen filigrandan bu yana değişen satırları tek bağlantıda okur.
+        :param tablolar: {tablo: (sütun listesi, anahtar sütun)}; anahtar sütun listede olmalıdır.
+        :param surum: Önceki çağrının döndürdüğü sürüm; None ise tablolar tam okunur.
+        :return: (yeni sürüm, {tablo: (tam_okuma, satırlar, değişen anahtarlar)}) veya hata olursa None.
+            Değişiklik olmayan tablolar sözlükte yer almaz. İzleme yoksa sürüm None'dır ve
+            tüm tablolar tam okunur. Değişen anahtarlardan satırı dönmeyenler silinmiştir.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                # Filigran değişiklikler okunmadan önce alınır; arada gelenler bir sonraki
+                # çağrıda yeniden okunur ki bu da uygulamada zararsızdır
+                yeni_surum = self.backend.izleme_surumu(cursor)
+                sonuc = {}
+                for tablo, (sutunlar, anahtar) in tablolar.items():
+                    secim = f"SELECT {', '.join(f'[{sutun}]' for sutun in sutunlar)} FROM {tablo}"
+                    anahtarlar = None
+                    if surum is not None and yeni_surum is not None:
+                        anahtarlar = self.backend.degisen_anahtarlar(cursor, tablo, anahtar, surum)
+                    if anahtarlar is None:
+                        cursor.execute(secim)
+                        sonuc[tablo] = (True, [tuple(row) for row in cursor.fetchall()], None)
+                    elif anahtarlar:
+                        satirlar = []
+                        for i in range(0, len(anahtarlar), self.DEGISIKLIK_PARCA_BOYUTU):
+                            parca = anahtarlar[i:i + self.DEGISIKLIK_PARCA_BOYUTU]
+                            cursor.execute(f"{secim} WHERE [{anahtar}] IN ({', '.join('?' * len(parca))})", parca)
+                            satirlar.extend(tuple(row) for row in cursor.fetchall())
+                        sonuc[tablo] = (False, satirlar, anahtarlar)
+                if yeni_surum is not None:
+                    self.backend.gunlugu_buda(cursor)
+                baglanti.commit()
+                return yeni_surum, sonuc
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Değişiklikler okunurken hata oluştu: {e}")
+            return None
+
+    def _tamamlanan_kimlik_sutunu(self):
+        """'Tamamlanan_isler' tablosunun kimlik (IDENTITY) sütunu; katalogda yoksa 'ID'."""
+        return (self.katalog.kimlik_sutunlari('Tamamlanan_isler') or ['ID'])[0]
+
+    def arsivlenecek_tamamlananlar(self, kesim, satir_sayisi=50000):
+        """
+        'Tamamlanan_isler' tablosundan bitişi kesim zamanından önce olan en eski satırları okur.
+        :param kesim: Bu zamandan önce bitmiş işler arşivlenecektir.
+        :param satir_sayisi: Bir seferde okunacak en fazla satır.
+        :return: (satır sözlükleri, kimlik sütunu adı); hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Tamamlanan_isler', 'Bitis_tarihi'):
+                    return None
+                kimlik = self._tamamlanan_kimlik_sutunu()
+                sorgu = f"SELECT * FROM Tamamlanan_isler WHERE Bitis_tarihi < ? ORDER BY Bitis_tarihi, {kimlik}"
+                cursor.execute(self.backend.sinirla(sorgu, satir_sayisi), (kesim,))
+                sutunlar = [column[0] for column in cursor.description]
+                return [dict(zip(sutunlar, row)) for row in cursor.fetchall()], kimlik
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Arşivlenecek işler okunurken hata oluştu: {e}")
+            return None
+
+    def tamamlananlari_sil(self, kimlikler):
+        """
+        Arşive taşınmış satırları 'Tamamlanan_isler'den tek işlemde siler.
+        :param kimlikler: Silinecek satırların kimlik değerleri.
+        :return: Silinen satır sayısı; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+        if not kimlikler:
+            return 0
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Tamamlanan_isler'):
+                    return None
+                kimlik = self._tamamlanan_kimlik_sutunu()
+                self.backend.coklu_calistir(cursor, f"DELETE FROM Tamamlanan_isler WHERE {kimlik} = ?",
+                                            [(deger,) for deger in kimlikler])
+                baglanti.commit()
+                self._tablolari_degisti('Tamamlanan_isler')
+                return len(kimlikler)
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Arşivlenen işler silinirken hata oluştu: {e}")
+            return None
+
+    def tamamlanan_isler_sayfasi(self, baslangic=None, bitis=None, personel=None, arac=None, durum=None,
+                                 sayfa_boyutu=50, imlec=None):
+        """
+        'Tamamlanan_isler' tablosundan filtrelenmiş bir sayfa okur (en yeni bitiş önce).
+        Sayfalar OFFSET yerine önceki sayfanın son satırından (Bitis_tarihi, ID) devam
+        eder; böylece geçmiş büyüdükçe sayfa okuma süresi artmaz. Toplam sayı hesaplanmaz.
+        :param baslangic: Bu zamandan (dahil) sonra bitenler.
+        :param bitis: Bu zamandan (hariç) önce bitenler.
+        :param personel: Personel adı (tam eşleşme).
+        :param arac: Araç adı (tam eşleşme).
+        :param durum: Durum değeri (tam eşleşme).
+        :param imlec: Önceki çağrının döndürdüğü devam imleci; None ise ilk sayfa.
+        :return: (satır sözlükleri, sonraki sayfanın imleci veya son sayfaysa None); hata olursa ([], None).
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return [], None
+
+        kosullar, degerler = [], []
+        for sutun, islec, deger in (("Bitis_tarihi", ">=", baslangic), ("Bitis_tarihi", "<", bitis),
+                                    ("Personel", "=", personel), ("Arac", "=", arac), ("Durum", "=", durum)):
+            if deger is not None:
+                kosullar.append(f"{sutun} {islec} ?")
+                degerler.append(deger)
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                if not self._tablo_kontrol(cursor, 'Tamamlanan_isler', 'Bitis_tarihi'):
+                    return [], None
+                kimlik = self._tamamlanan_kimlik_sutunu()
+
+                if imlec is not None:
+                    son_tarih, son_kimlik = imlec
+                    # NULL bitiş tarihleri azalan sıralamada en sona düşer
+                    if son_tarih is None:
+                        kosullar.append(f"(Bitis_tarihi IS NULL AND {kimlik} < ?)")
+                        degerler.append(son_kimlik)
+                    else:
+                        kosullar.append(f"(Bitis_tarihi < ? OR (Bitis_tarihi = ? AND {kimlik} < ?) OR Bitis_tarihi IS NULL)")
+                        degerler.extend([son_tarih, son_tarih, son_kimlik])
+
+                sorgu = "SELECT * FROM Tamamlanan_isler"
+                if kosullar:
+                    sorgu += " WHERE " + " AND ".join(kosullar)
+                sorgu += f" ORDER BY Bitis_tarihi DESC, {kimlik} DESC"
+                # Bir fazla satır okunarak sonraki sayfanın varlığı anlaşılır
+                cursor.execute(self.backend.sinirla(sorgu, sayfa_boyutu + 1), degerler)
+                sutunlar = [column[0] for column in cursor.description]
+                satirlar = [dict(zip(sutunlar, row)) for row in cursor.fetchall()]
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Tamamlanan işler okunurken hata oluştu: {e}")
+            return [], None
+
+        if len(satirlar) <= sayfa_boyutu:
+            return satirlar, None
+        satirlar = satirlar[:sayfa_boyutu]
+        return satirlar, (satirlar[-1]["Bitis_tarihi"], satirlar[-1][kimlik])
+
+    # Kullanım analizlerinin okuduğu sütunlar; tabloda olmayanlar NULL döner
+    ANALIZ_SUTUNLARI = ['Personel', 'Arac', 'Durum', 'Baslangic_tarihi', 'Tahmini_bitis', 'Bitis_tarihi']
+
+    def analiz_satirlari_al(self, baslangic=None, bitis=None):
+        """
+        Kullanım analizi için işlerin zaman bilgilerini tek bağlantıda okur.
+        Tamamlanan işlerden aralıkla kesişenler, aktif işlerin hepsi alınır.
+        :return: {"Tamamlanan_isler": satırlar, "Aktif_isler": satırlar} (satırlar ANALIZ_SUTUNLARI
+            sırasında demetler); hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                sonuc = {}
+                for tablo in ('Tamamlanan_isler', 'Aktif_isler'):
+                    if not self._tablo_kontrol(cursor, tablo):
+                        return None
+                    mevcut = set(self.katalog.sutunlar(tablo))
+                    secim = ', '.join(sutun if sutun in mevcut else f"NULL AS {sutun}" for sutun in self.ANALIZ_SUTUNLARI)
+                    kosullar, degerler = [], []
+                    if tablo == 'Tamamlanan_isler':
+                        if baslangic is not None:
+                            kosullar.append("Bitis_tarihi >= ?")
+                            degerler.append(baslangic)
+                        if bitis is not None and 'Baslangic_tarihi' in mevcut:
+                            # Başlangıcı bilinmeyen eski satırlar da okunur ki analiz atılanları bildirebilsin
+                            kosullar.append("(Baslangic_tarihi < ? OR (Baslangic_tarihi IS NULL AND Bitis_tarihi < ?))")
+                            degerler.extend([bitis, bitis])
+                        elif bitis is not None:
+                            kosullar.append("Bitis_tarihi < ?")
+                            degerler.append(bitis)
+                    sorgu = f"SELECT {secim} FROM {tablo}"
+                    if kosullar:
+                        sorgu += " WHERE " + " AND ".join(kosullar)
+                    cursor.execute(sorgu, degerler)
+                    sonuc[tablo] = [tuple(row) for row in cursor.fetchall()]
+                return sonuc
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"Analiz verisi okunurken hata oluştu: {e}")
+            return None
+
+    def toplu_gorev_ata(self, atamalar):
+        """
+        Birden çok yeni görevi tek bir işlemde ekler: 'Aktif_isler'e satırları yazar,
+        personelleri ve araçları 'Aktif' yapar. İfadeler executemany ile gönderilir;
+        herhangi biri başarısız olursa hiçbir atama kalıcı olmaz.
+        :param atamalar: {"Personel", "Arac", "Gorev", "Tahmini_bitis"} sözlüklerinin listesi.
+            Adların veritabanındaki gerçek adlar olduğu varsayılır.
+        :return: Eklenen görev sayısı; hata olursa None.
+        """
+        if not self.havuz:
+            print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
+            return None
+        if not atamalar:
+            return 0
+
+        try:
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
+                self.katalog.hazirla(cursor)
+                if self.katalog.sutun_var_mi('Aktif_isler', 'Baslangic_tarihi'):
+                    baslangic = datetime.now()
+                    self.backend.coklu_calistir(
+                        cursor,
+                        "INSERT INTO Aktif_isler (Personel, Arac, Gorev, Baslangic_tarihi, Tahmini_bitis, Durum) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(a["Personel"], a.get("Arac"), a["Gorev"], baslangic, a.get("Tahmini_bitis"), "Aktif")
+                         for a in atamalar])
+                else:
+                    self.backend.coklu_calistir(
+                        cursor,
+                        "INSERT INTO Aktif_isler (Personel, Arac, Gorev, Tahmini_bitis, Durum) VALUES (?, ?, ?, ?, ?)",
+                        [(a["Personel"], a.get("Arac"), a["Gorev"], a.get("Tahmini_bitis"), "Aktif") for a in atamalar])
+                self.backend.coklu_calistir(
+                    cursor,
+                    "UPDATE Personeller SET Durum = ?, Arac = ? WHERE Personel = ?",
+                    [("Aktif", a["Arac"], a["Personel"]) for a in atamalar if a.get("Arac")])
+                self.backend.coklu_calistir(
+                    cursor,
+                    "UPDATE Personeller SET Durum = ? WHERE Personel = ?",
+                    [("Aktif", a["Personel"]) for a in atamalar if not a.get("Arac")])
+                self.backend.coklu_calistir(
+                    cursor,
+                    "UPDATE Araclar SET Durum = ? WHERE Arac = ?",
+                    [("Aktif", a["Arac"]) for a in atamalar if a.get("Arac")])
+                baglanti.commit()
+                degisenler = []
+                for a in atamalar:
+                    if a.get("Arac"):
+                        degisenler.append(('Personeller', a["Personel"], {'Durum': 'Aktif', 'Arac': a["Arac"]}))
+                        degisenler.append(('Araclar', a["Arac"], {'Durum': 'Aktif'}))
+                    else:
+                        degisenler.append(('Personeller', a["Personel"], {'Durum': 'Aktif'}))
+                self._tablolari_degisti('Aktif_isler', 'Personeller', 'Araclar', satirlar=degisenler)
+                for a in atamalar:
+                    self._isim_indeksine_ekle('Aktif_isler', 'Personel', a["Personel"])
+                    self._gorev_olayi('eklendi', a["Personel"], dict(a, Durum="Aktif"))
+                print(f"✅ {len(atamalar)} görev toplu olarak eklendi.")
+                return len(atamalar)
+        except self._db_hatalari as e:
+            hata_bildir()
+            print(f"❌ Toplu görev ataması geri alındı: {e}")
+            return None
 
     def operatoru_aktif_yap(self, personel_adi, arac_adi=None):
         """
@@ -562,62 +1268,72 @@ class DatabaseManager:
         :param personel_adi: Operatörün adı.
         :param arac_adi: Atanacak aracın adı (opsiyonel).
         """
-        if not self.connection:
+        if not self.havuz:
             print("Veritabanına bağlantı kurulmamış. Önce connect() metodunu çağırın.")
             return
 
         try:
-            cursor = self.connection.cursor()
+            with self._baglanti() as baglanti:
+                cursor = baglanti.cursor()
             
-            # Önce personeli bul
-            cursor.execute("SELECT Personel FROM Personeller WHERE Personel = ?", (personel_adi,))
-            personel_var = cursor.fetchone()
+                # Önce personeli bul
+                cursor.execute("SELECT Personel FROM Personeller WHERE Personel = ?", (personel_adi,))
+                personel_var = cursor.fetchone()
             
-            gercek_personel = personel_adi
+                gercek_personel = personel_adi
             
-            if not personel_var:
-                # Tam eşleşme yoksa, akıllı eşleştirme yap
-                print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
-                
-                cursor.execute("SELECT Personel FROM Personeller")
-                tum_personeller = [row[0] for row in cursor.fetchall()]
+                if not personel_var:
+                    # Tam eşleşme yoksa, akıllı eşleştirme yap
+                    print(f"'{personel_adi}' tam eşleşme bulunamadı, akıllı arama yapılıyor...")
                 
-                # Akıllı eşleştirme kullan
-                eslesme = self._smart_name_match(personel_adi, tum_personeller)
+                    # Akıllı eşleştirme kullan (önbellekteki isim indeksinden)
+                    eslesme = self._isim_cozumle(cursor, 'Personeller', 'Personel', personel_adi)
                 
-                if eslesme:
-                    gercek_personel = eslesme
-                    print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
+                    if eslesme:
+                        gercek_personel = eslesme
+                        print(f"Akıllı eşleşme bulundu: '{personel_adi}' -> '{gercek_personel}'")
+                    else:
+                        print(f"HATA: '{personel_adi}' adında personel bulunamadı!")
+                        return
+            
+                # Araç da Araclar'daki adıyla yazılır (ör. "vinç 1" -> "Vinç 1")
+                if arac_adi:
+                    arac_adi = self._isim_cozumle(cursor, 'Araclar', 'Arac', arac_adi) or arac_adi
+            
+                # Personelin durumunu 'Aktif' yap
+                if arac_adi:
+                    cursor.execute("UPDATE Personeller SET Durum = ?, Arac = ? WHERE Personel = ?", 
+                                  ("Aktif", arac_adi, gercek_personel))
+                    # Aracın durumunu da 'Aktif' yap
+                    cursor.execute("UPDATE Araclar SET Durum = ? WHERE Arac = ?", 
+                                  ("Aktif", arac_adi))
                 else:
-                    print(f"HATA: '{personel_adi}' adında personel bulunamadı!")
-                    return
+                    cursor.execute("UPDATE Personeller SET Durum = ? WHERE Personel = ?", 
+                                  ("Aktif", gercek_personel))
             
-            # Personelin durumunu 'Aktif' yap
-            if arac_adi:
-                cursor.execute("UPDATE Personeller SET Durum = ?, Arac = ? WHERE Personel = ?", 
-                              ("Aktif", arac_adi, gercek_personel))
-                # Aracın durumunu da 'Aktif' yap
-                cursor.execute("UPDATE Araclar SET Durum = ? WHERE Arac = ?", 
-                              ("Aktif", arac_adi))
-            else:
-                cursor.execute("UPDATE Personeller SET Durum = ? WHERE Personel = ?", 
-                              ("Aktif", gercek_personel))
-            
-            etkilenen_satir = cursor.rowcount
-            self.connection.commit()
-            
-            if etkilenen_satir > 0:
-                mesaj = f"'{gercek_personel}' başarıyla aktif yapıldı."
+                etkilenen_satir = cursor.rowcount
+                baglanti.commit()
                 if arac_adi:
-                    mesaj += f" Aracı: '{arac_adi}'"
-                print(mesaj)
-            else:
-                print(f"UYARI: '{gercek_personel}' için hiçbir değişiklik yapılmadı!")
+                    degisenler = [('Personeller', gercek_personel, {'Durum': 'Aktif', 'Arac': arac_adi}),
+                                  ('Araclar', arac_adi, {'Durum': 'Aktif'})]
+                else:
+                    degisenler = [('Personeller', gercek_personel, {'Durum': 'Aktif'})]
+                self._tablolari_degisti('Personeller', 'Araclar' if arac_adi else None, satirlar=degisenler)
+            
+                if etkilenen_satir > 0:
+                    mesaj = f"'{gercek_personel}' başarıyla aktif yapıldı."
+                    if arac_adi:
+                        mesaj += f" Aracı: '{arac_adi}'"
+                    print(mesaj)
+                else:
+                    print(f"UYARI: '{gercek_personel}' için hiçbir değişiklik yapılmadı!")
                 
-        except pyodbc.Error as e:
+        except self._db_hatalari as e:
+            hata_bildir()
             print(f"Operatör aktif yapılırken hata oluştu: {e}")
 
     def close(self):
-        if self.connection:
-            self.connection.close()
+        if self.havuz:
+            self.havuz.kapat()
+            self.havuz = None
             print("Veritabanı bağlantısı kapatıldı.")
@@ -0,0 +1,183 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime
+
+
+class BitisZamanlayici:
+    """
+    Aktif görevlerin tahmini bitiş zamanlarını bir min-yığında (heap) tutar ve
+    süresi dolan görevler için gecikme geri çağırmalarını tam zamanında çalıştırır.
+    Görevler bir kez 'Aktif_isler'den yüklenir; sonrasında DatabaseManager'ın görev
+    olaylarıyla (eklendi/uzatildi/tamamlandi/silindi) güncellenir. Her değişiklik O(log n)'dir
+    ve tabloyu periyodik taramak gerekmez.
+
+    Güncellenen veya kaldırılan görevlerin eski yığın kayıtları hemen silinmez;
+    sıra numarası güncel kayıtla eşleşmeyenler yığının tepesine geldiklerinde atılır.
+    """
+
+    def __init__(self, db_manager=None, saat=datetime.now):
+        """
+        :param db_manager: Görev olaylarına abone olunacak DatabaseManager (isteğe bağlı).
+        :param saat: Şimdiki zamanı veren fonksiyon.
+        """
+        self.db_manager = db_manager
+        self.saat = saat
+        self._yigin = []             # (bitis, sira, personel)
+        self._gorevler = {}          # personel -> (bitis, sira, gorev)
+        self._gecikenler = {}        # personel -> (bitis, gorev); tamamlanana kadar tutulur
+        self._sira = itertools.count()
+        self._geri_cagirmalar = []
+        self._kosul = threading.Condition()
+        self._is_parcacigi = None
+        self._calisiyor = False
+        if db_manager is not None:
+            db_manager.gorev_dinleyicisi_ekle(self._gorev_olayi)
+
+    def geri_cagirma_ekle(self, fonksiyon):
+        """Süresi dolan her görev için fonksiyon(personel, tahmini_bitis, gorev) çağrılır."""
+        self._geri_cagirmalar.append(fonksiyon)
+
+    def yukle(self):
+        """
+        Aktif görevleri veritabanından okuyup yığını baştan kurar.
+        :return: Yüklenen görev sayısı; okunamazsa None.
+        """
+        satirlar = self.db_manager.aktif_gorev_bitisleri()
+        if satirlar is None:
+            return None
+        with self._kosul:
+            self._yigin, self._gorevler, self._gecikenler = [], {}, {}
+            for personel, arac, gorev, bitis in satirlar:
+                if personel and bitis:
+                    sira = next(self._sira)
+                    self._gorevler[personel] = (bitis, sira, {"Personel": personel, "Arac": arac,
+                                                              "Gorev": gorev, "Tahmini_bitis": bitis})
+                    self._yigin.append((bitis, sira, personel))
+            heapq.heapify(self._yigin)
+            self._kosul.notify()
+        return len(self._gorevler)
+
+    def ekle(self, personel, bitis, gorev=None):
+        """Görevin bitiş zamanını ekler veya günceller (süre uzatma dahil)."""
+        if not personel:
+            return
+        if isinstance(bitis, str):
+            bitis = datetime.fromisoformat(bitis)
+        with self._kosul:
+            if not bitis:
+                self._kaldir(personel)
+                return
+            sira = next(self._sira)
+            self._gorevler[personel] = (bitis, sira, dict(gorev or {}, Personel=personel, Tahmini_bitis=bitis))
+            self._gecikenler.pop(personel, None)
+            heapq.heappush(self._yigin, (bitis, sira, personel))
+            self._yigini_sikistir()
+            # Yeni kayıt en erken bitişse bekleyen iş parçacığı uyandırılır
+            if self._yigin[0][1] == sira:
+                self._kosul.notify()
+
+    def kaldir(self, personel):
+        """Görevi takipten çıkarır (tamamlandı veya silindi)."""
+        with self._kosul:
+            self._kaldir(personel)
+
+    def _kaldir(self, personel):
+        self._gorevler.pop(personel, None)
+        self._gecikenler.pop(personel, None)
+        self._yigini_sikistir()
+
+    def _yigini_sikistir(self):
+        """Geçersiz kayıtlar yığının yarısından fazlasıysa yığını yeniden kurar."""
+        if len(self._yigin) > 64 and len(self._yigin) > 2 * len(self._gorevler):
+            self._yigin = [(bitis, sira, personel) for personel, (bitis, sira, _) in self._gorevler.items()]
+            heapq.heapify(self._yigin)
+
+    def _gorev_olayi(self, olay, personel, gorev):
+        if olay in ('eklendi', 'uzatildi'):
+            self.ekle(personel, gorev.get('Tahmini_bitis'), gorev)
+        elif olay in ('tamamlandi', 'silindi'):
+            self.kaldir(personel)
+
+    def sonraki_bitis(self):
+        """En erken bekleyen bitiş zamanı (yoksa None)."""
+        with self._kosul:
+            self._gecersizleri_at()
+            return self._yigin[0][0] if self._yigin else None
+
+    def _gecersizleri_at(self):
+        while self._yigin:
+            bitis, sira, personel = self._yigin[0]
+            kayit = self._gorevler.get(personel)
+            if kayit is not None and kayit[1] == sira:
+                return
+            heapq.heappop(self._yigin)
+
+    def suresi_dolanlari_al(self, simdi=None):
+        """
+        Bitiş zamanı geçmiş görevleri yığından çıkarır ve gecikenler listesine alır.
+        :return: [(personel, tahmini_bitis, gorev)] - bitiş sırasına göre.
+        """
+        simdi = simdi or self.saat()
+        dolanlar = []
+        with self._kosul:
+            while True:
+                self._gecersizleri_at()
+                if not self._yigin or self._yigin[0][0] > simdi:
+                    break
+                bitis, _, personel = heapq.heappop(self._yigin)
+                _, _, gorev = self._gorevler.pop(personel)
+                self._gecikenler[personel] = (bitis, gorev)
+                dolanlar.append((personel, bitis, gorev))
+        return dolanlar
+
+    def gecikenler(self):
+        """Süresi dolmuş ama henüz tamamlanmamış görevler: {personel: (tahmini_bitis, gorev)}."""
+        with self._kosul:
+            return dict(self._gecikenler)
+
+    def isle(self, simdi=None):
+        """Süresi dolan görevler için geri çağırmaları çalıştırır; işlenen görev sayısını döndürür."""
+        dolanlar = self.suresi_dolanlari_al(simdi)
+        for personel, bitis, gorev in dolanlar:
+            for fonksiyon in list(self._geri_cagirmalar):
+                try:
+                    fonksiyon(personel, bitis, gorev)
+                except Exception as e:
+                    print(f"Gecikme geri çağırma hatası ({personel}): {e}")
+        return len(dolanlar)
+
+    def baslat(self):
+        """Bitiş zamanlarını bekleyen arka plan iş parçacığını başlatır."""
+        with self._kosul:
+            if self._calisiyor:
+                return
+            self._calisiyor = True
+        self._is_parcacigi = threading.Thread(target=self._dongu, name="BitisZamanlayici", daemon=True)
+        self._is_parcacigi.start()
+
+    def durdur(self):
+        with self._kosul:
+            self._calisiyor = False
+            self._kosul.notify()
+        if self._is_parcacigi is not None:
+            self._is_parcacigi.join()
+            self._is_parcacigi = None
+
+    # Saat ileri/geri alınırsa veya bitiş çok uzaksa en geç bu kadar saniyede bir yeniden bakılır
+    EN_UZUN_BEKLEME = 60
+
+    def _dongu(self):
+        while True:
+            with self._kosul:
+                if not self._calisiyor:
+                    return
+                self._gecersizleri_at()
+                if self._yigin:
+                    bekleme = (self._yigin[0][0] - self.saat()).total_seconds()
+                else:
+                    bekleme = self.EN_UZUN_BEKLEME
+                if bekleme > 0:
+                    self._kosul.wait(min(bekleme, self.EN_UZUN_BEKLEME))
+                    continue
+            self.isle()
@@ -0,0 +1,230 @@
+from datetime import datetime, timedelta
+import numpy as np
+from reservation import ACIK_UC, arac_turu
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy isteğe bağlıdır; yoksa aşağıdaki NumPy uygulaması kullanılır
+    linear_sum_assignment = None
+
+# Uygun olmayan eşleşmelerin maliyeti; sonuçtan ayıklanır
+UYGUN_DEGIL = 1e9
+# Boşluk (bir sonraki meşguliyete kalan süre) bu ufukta kırpılır
+UFUK = timedelta(hours=24)
+
+
+def _macar(maliyet):
+    """
+    Satır sayısı sütun sayısından fazla olmayan matris için Macar algoritması
+    (potansiyelli kısa artırma yolu). Her satır için yol aranırken tüm sütunlar
+    NumPy ile birlikte güncellenir; Python döngüsü yalnızca yol adımlarındadır.
+    :return: satir -> sütun dizisi.
+    """
+    n, m = maliyet.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)      # sütuna atanmış satır (1 tabanlı, 0: boş)
+    yol = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        kullanilan = np.zeros(m + 1, dtype=bool)
+        while True:
+            kullanilan[j0] = True
+            i0 = p[j0]
+            aday = maliyet[i0 - 1] - u[i0] - v[1:]
+            serbest = ~kullanilan[1:]
+            iyilesen = serbest & (aday < minv[1:])
+            minv[1:][iyilesen] = aday[iyilesen]
+            yol[1:][iyilesen] = j0
+            bekleyen = np.where(serbest, minv[1:], np.inf)
+            delta = bekleyen.min()
+            # Eşit maliyetlerde atanmamış sütun tercih edilir; yoksa yol atanmış satırlar üzerinden uzar
+            enler = bekleyen == delta
+            bos_enler = np.flatnonzero(enler & (p[1:] == 0))
+            j1 = int(bos_enler[0] if len(bos_enler) else np.flatnonzero(enler)[0]) + 1
+            u[p[kullanilan]] += delta
+            v[kullanilan] -= delta
+            minv[~kullanilan] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = yol[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    satir_sutun = np.empty(n, dtype=np.int64)
+    atanan = np.nonzero(p[1:])[0]
+    satir_sutun[p[1:][atanan] - 1] = atanan
+    return satir_sutun
+
+
+def en_ucuz_eslesme(maliyet):
+    """
+    Dikdörtgen maliyet matrisinde toplam maliyeti en küçük eşleşme
+    (scipy.optimize.linear_sum_assignment ile aynı sözleşme).
+    :return: (satırlar, sütunlar) dizileri.
+    """
+    maliyet = np.asarray(maliyet, dtype=float)
+    if maliyet.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(maliyet)
+    if maliyet.shape[0] > maliyet.shape[1]:
+        sutunlar, satirlar = en_ucuz_eslesme(maliyet.T)
+        sira = np.argsort(satirlar)
+        return satirlar[sira], sutunlar[sira]
+    return np.arange(maliyet.shape[0]), _macar(maliyet)
+
+
+def _sure(deger):
+    """timedelta veya dakika."""
+    return deger if isinstance(deger, timedelta) else timedelta(minutes=float(deger))
+
+
+class GorevDagitici:
+    """
+    Bekleyen görevleri boştaki araç ve operatörlere toplu atar.
+    Önce her görev, türü uyan ve görev süresince boş kalacak araçlardan bir sonraki
+    meşguliyetine en az boşluk kalanına eşlenir (uzun boşluklar uzun işlere kalır);
+    ardından her (görev, araç) çifti, görev süresince boş olan operatörlerden o araç
+    türünde en çok iş tamamlamış olanlara eşlenir. İki aşama da NumPy maliyet
+    matrisleri üzerinde en küçük maliyetli eşleşmeyle çözülür.
+    """
+
+    def __init__(self, db_manager, is_yoneticisi=None, defter=None, ayna=None, saat=datetime.now):
+        """
+        :param db_manager: Bağlanmış DatabaseManager örneği.
+        :param is_yoneticisi: Atamaları uygulayacak IsYoneticisi (uygula() için gerekli).
+        :param defter: Verilirse aktif görev ve rezervasyonlar boşluk hesabında kullanılan RezervasyonDefteri.
+        :param ayna: Verilirse boştaki personel/araçlar veritabanı yerine bu FiloAynasi'ndan okunur.
+        """
+        self.db_manager = db_manager
+        self.is_yoneticisi = is_yoneticisi
+        self.defter = defter
+        self.ayna = ayna
+        self.saat = saat
+        self._deneyim = (None, {})       # (Tamamlanan_isler sürümü, {(personel, tür): adet})
+
+    def bostaki_kaynaklar(self):
+        """:return: (boştaki personeller, boştaki araçlar); okunamazsa (None, None)."""
+        if self.ayna is not None:
+            return self.ayna.bostaki_personeller(), self.ayna.bostaki_araclar()
+        personeller, araclar = self.db_manager.durum_tablolari_al()
+        if personeller is None:
+            return None, None
+        return ([ad for ad, (durum, _) in personeller.items() if durum == 'Boşta'],
+                [ad for ad, durum in araclar.items() if durum == 'Boşta'])
+
+    def deneyim(self):
+        """{(personel, araç türü): tamamlanan iş sayısı}; tablo değişene kadar önbellekten."""
+        surum = self.db_manager.tablo_surumu('Tamamlanan_isler')
+        if self._deneyim[0] != surum:
+            sayilar = {}
+            for personel, arac, adet in self.db_manager.personel_arac_deneyimi() or []:
+                anahtar = (personel, arac_turu(arac))
+                sayilar[anahtar] = sayilar.get(anahtar, 0) + adet
+            self._deneyim = (surum, sayilar)
+        return self._deneyim[1]
+
+    def _bosluklar(self, adlar, simdi, arac=True):
+        """Her kaynağın şimdiden itibaren kesintisiz boş kalacağı süre (saat, UFUK ile kırpılmış)."""
+        ufuk = UFUK.total_seconds() / 3600
+        if self.defter is None:
+            return np.full(len(adlar), ufuk)
+        bosluk = np.empty(len(adlar))
+        for i, ad in enumerate(adlar):
+            son = self.defter.bos_kalacagi_zaman(arac=ad, bas=simdi) if arac else \
+                self.defter.bos_kalacagi_zaman(personel=ad, bas=simdi)
+            bosluk[i] = ufuk if son == ACIK_UC else min((son - simdi).total_seconds() / 3600, ufuk)
+        return bosluk
+
+    def planla(self, gorevler, personeller=None, araclar=None):
+        """
+        En küçük maliyetli atamayı hesaplar; veritabanına yazmaz.
+        :param gorevler: {"Gorev", "Arac_turu", "Sure"} sözlükleri; Sure timedelta veya dakika,
+            Arac_turu boşsa görev araçsız atanır.
+        :param personeller: Aday operatörler (varsayılan: boştakiler).
+        :param araclar: Aday araçlar (varsayılan: boştakiler).
+        :return: (atamalar, atanamayanlar). Atamalar {"Gorev", "Personel", "Arac", "Tahmini_bitis", "Maliyet"}
+            sözlükleri, atanamayanlar giriş sözlükleridir; kaynaklar okunamazsa (None, None).
+        """
+        if personeller is None or araclar is None:
+            bostaki_personeller, bostaki_araclar = self.bostaki_kaynaklar()
+            if bostaki_personeller is None:
+                return None, None
+            personeller = bostaki_personeller if personeller is None else personeller
+            araclar = bostaki_araclar if araclar is None else araclar
+        personeller, araclar = list(personeller), list(araclar)
+        simdi = self.saat()
+        ufuk = UFUK.total_seconds() / 3600
+        sureler = np.array([_sure(g["Sure"]).total_seconds() / 3600 for g in gorevler])
+        turler = [arac_turu(g.get("Arac_turu")) for g in gorevler]
+
+        # 1. Görev x araç: tür uymalı ve araç görev boyunca boş kalmalı; kalan boşluk ne kadar azsa o kadar iyi
+        tur_kodlari = {tur: kod for kod, tur in enumerate(sorted(set(turler) | {arac_turu(a) for a in araclar}))}
+        gorev_turu = np.array([tur_kodlari[t] for t in turler], dtype=np.int64)
+        arac_tur_kodu = np.array([tur_kodlari[arac_turu(a)] for a in araclar], dtype=np.int64)
+        arac_boslugu = self._bosluklar(araclar, simdi)
+        aracli = np.array([bool(t) for t in turler], dtype=bool)
+        arac_secimi = np.full(len(gorevler), -1, dtype=np.int64)
+        arac_maliyeti = np.zeros(len(gorevler))
+        gorev_sira = np.nonzero(aracli)[0]
+        if len(gorev_sira) and len(araclar):
+            kalan = arac_boslugu[None, :] - sureler[gorev_sira, None]
+            uygun = (gorev_turu[gorev_sira, None] == arac_tur_kodu[None, :]) & (kalan >= 0)
+            maliyet = np.where(uygun, kalan / ufuk, UYGUN_DEGIL)
+            satirlar, sutunlar = en_ucuz_eslesme(maliyet)
+            gecerli = maliyet[satirlar, sutunlar] < UYGUN_DEGIL
+            arac_secimi[gorev_sira[satirlar[gecerli]]] = sutunlar[gecerli]
+            arac_maliyeti[gorev_sira[satirlar[gecerli]]] = maliyet[satirlar[gecerli], sutunlar[gecerli]]
+
+        # 2. (Görev, araç) x operatör: operatör görev boyunca boş olmalı; o türdeki deneyimi arttıkça maliyet düşer
+        atanabilir = np.nonzero(~aracli | (arac_secimi >= 0))[0]
+        personel_secimi = np.full(len(gorevler), -1, dtype=np.int64)
+        personel_maliyeti = np.zeros(len(gorevler))
+        if len(atanabilir) and len(personeller):
+            deneyim = self.deneyim()
+            tur_listesi = sorted(tur_kodlari, key=tur_kodlari.get)
+            deneyim_matrisi = np.array([[deneyim.get((p, t), 0) for t in tur_listesi] for p in personeller],
+                                       dtype=float).reshape(len(personeller), len(tur_listesi))
+            hedef_tur = np.where(aracli[atanabilir], gorev_turu[atanabilir], -1)
+            secilen_deneyim = np.where(hedef_tur[:, None] >= 0, deneyim_matrisi.T[np.maximum(hedef_tur, 0)], 0.0)
+            kalan = self._bosluklar(personeller, simdi, arac=False)[None, :] - sureler[atanabilir, None]
+            maliyet = np.where(kalan >= 0, 1.0 / (1.0 + secilen_deneyim) + 0.1 * kalan / ufuk, UYGUN_DEGIL)
+            satirlar, sutunlar = en_ucuz_eslesme(maliyet)
+            gecerli = maliyet[satirlar, sutunlar] < UYGUN_DEGIL
+            personel_secimi[atanabilir[satirlar[gecerli]]] = sutunlar[gecerli]
+            personel_maliyeti[atanabilir[satirlar[gecerli]]] = maliyet[satirlar[gecerli], sutunlar[gecerli]]
+
+        atamalar, atanamayanlar = [], []
+        for i, gorev in enumerate(gorevler):
+            if personel_secimi[i] < 0:
+                atanamayanlar.append(gorev)
+                continue
+            atamalar.append({
+                "Gorev": gorev["Gorev"],
+                "Personel": personeller[personel_secimi[i]],
+                "Arac": araclar[arac_secimi[i]] if arac_secimi[i] >= 0 else None,
+                "Tahmini_bitis": simdi + _sure(gorev["Sure"]),
+                "Maliyet": round(float(arac_maliyeti[i] + personel_maliyeti[i]), 4),
+            })
+        return atamalar, atanamayanlar
+
+    def uygula(self, atamalar):
+        """
+        Planı IsYoneticisi.is_ekle ile tek tek uygular; başarılı atamalarda operatör aktif yapılır.
+        :return: Her atama için {"Gorev", "Personel", "Arac", "Sonuç"} sözlüklerinin listesi.
+        """
+        if self.is_yoneticisi is None:
+            raise ValueError("Atamaları uygulamak için IsYoneticisi gerekli.")
+        rapor = []
+        for atama in atamalar:
+            basarili = self.is_yoneticisi.is_ekle(atama["Personel"], atama["Arac"], atama["Gorev"],
+                                                  atama["Tahmini_bitis"])
+            if basarili:
+                self.db_manager.operatoru_aktif_yap(atama["Personel"], atama["Arac"])
+            rapor.append({"Gorev": atama["Gorev"], "Personel": atama["Personel"], "Arac": atama["Arac"],
+                          "Sonuç": "eklendi" if basarili else "reddedildi"})
+        return rapor
@@ -0,0 +1,285 @@
+import threading
+import time
+import pandas as pd
+
+
+class DurumKaydi:
+    """Tek bir araç veya operatörün durumu."""
+    __slots__ = ("ad", "durum", "arac")
+
+    def __init__(self, ad, durum, arac=None):
+        self.ad = ad
+        self.durum = durum
+        self.arac = arac
+
+
+# durum_ata'da aracın değiştirilmeyeceğini belirtir (None "aracı bırak" anlamına gelir)
+DEGISMEZ = object()
+
+
+class DurumDeposu:
+    """
+    Gerçek adla anahtarlanan __slots__ kayıtlarından oluşan durum deposu.
+    Duruma ve atanmış araca göre ikincil indeksler tutulur: durum geçişleri,
+    "boştaki tüm araçlar" ve "bu aracı kim kullanıyor" soruları tabloyu
+    taramadan O(1) yanıtlanır. Arayüz için DataFrame yalnızca istendiğinde
+    kurulur ve depo değişene kadar aynı nesne döndürülür.
+
+    İndeks kovaları boşalınca silinmez; durumdakiler()/araci_kullananlar()
+    görünümleri böylece sonraki eklemeleri de görür.
+    """
+
+    def __init__(self, adlar=(), varsayilan_durum="boşta"):
+        self.varsayilan_durum = varsayilan_durum
+        self._kayitlar = {}          # ad -> DurumKaydi
+        self._durum_indeksi = {}     # durum -> {ad: None} (ekleme sırasını koruyan küme)
+        self._arac_indeksi = {}      # arac -> {ad: None}
+        self._surum = 0
+        self._tablo = None           # (sürüm, sütun adları, DataFrame)
+        for ad in adlar:
+            self.ekle(ad)
+
+    def __len__(self):
+        return len(self._kayitlar)
+
+    def __contains__(self, ad):
+        return ad in self._kayitlar
+
+    def __iter__(self):
+        """Kayıtlar (ekleme sırasıyla)."""
+        return iter(self._kayitlar.values())
+
+    def kayit(self, ad):
+        """Adın kaydı (yoksa None)."""
+        return self._kayitlar.get(ad)
+
+    def durum(self, ad):
+        kayit = self._kayitlar.get(ad)
+        return kayit.durum if kayit else None
+
+    def arac(self, ad):
+        kayit = self._kayitlar.get(ad)
+        return kayit.arac if kayit else None
+
+    def ekle(self, ad, durum=None, arac=None):
+        """Yeni kayıt ekler; ad zaten varsa durumunu günceller."""
+        if ad in self._kayitlar:
+            self.durum_ata(ad, durum or self.varsayilan_durum, arac)
+            return
+        kayit = DurumKaydi(ad, durum or self.varsayilan_durum, arac)
+        self._kayitlar[ad] = kayit
+        self._durum_indeksi.setdefault(kayit.durum, {})[ad] = None
+        if arac is not None:
+            self._arac_indeksi.setdefault(arac, {})[ad] = None
+        self._surum += 1
+
+    def kaldir(self, ad):
+        kayit = self._kayitlar.pop(ad, None)
+        if kayit is None:
+            return
+        self._indeksten_cikar(self._durum_indeksi, kayit.durum, ad)
+        self._indeksten_cikar(self._arac_indeksi, kayit.arac, ad)
+        self._surum += 1
+
+    @staticmethod
+    def _indeksten_cikar(indeks, deger, ad):
+        adlar = indeks.get(deger)
+        if adlar is not None:
+            adlar.pop(ad, None)
+
+    def durum_ata(self, ad, durum, arac=DEGISMEZ):
+        """
+        Kaydın durumunu (ve istenirse aracını) değiştirir.
+        :param arac: Yeni araç; None aracı bırakır, verilmezse araç değişmez.
+        :return: Kaydın eski aracı; ad depoda yoksa None.
+        """
+        kayit = self._kayitlar.get(ad)
+        if kayit is None:
+            return None
+        eski_arac = kayit.arac
+        if kayit.durum != durum:
+            self._indeksten_cikar(self._durum_indeksi, kayit.durum, ad)
+            self._durum_indeksi.setdefault(durum, {})[ad] = None
+            kayit.durum = durum
+        if arac is not DEGISMEZ and arac != eski_arac:
+            self._indeksten_cikar(self._arac_indeksi, eski_arac, ad)
+            if arac is not None:
+                self._arac_indeksi.setdefault(arac, {})[ad] = None
+            kayit.arac = arac
+        self._surum += 1
+        return eski_arac
+
+    def durumdakiler(self, durum):
+        """Bu durumdaki adlar; kopyalanmayan, depoyla birlikte güncellenen bir görünüm."""
+        return self._durum_indeksi.setdefault(durum, {}).keys()
+
+    def sayi(self, durum):
+        return len(self._durum_indeksi.get(durum, ()))
+
+    def araci_kullananlar(self, arac):
+        """Bu aracın atandığı adlar (depoyla birlikte güncellenen görünüm)."""
+        return self._arac_indeksi.setdefault(arac, {}).keys()
+
+    def tablo(self, ad_sutunu="Ad", durum_sutunu="Durum", arac_sutunu=None):
+        """
+        Kayıtları DataFrame olarak döndürür. Tablo yalnızca istendiğinde kurulur ve
+        depo değişmedikçe aynı nesne döndürülür; çağıran değiştirmemelidir.
+        :param arac_sutunu: Verilirse araç sütunu da eklenir.
+        """
+        sutunlar = (ad_sutunu, durum_sutunu, arac_sutunu)
+        if self._tablo is None or self._tablo[0] != self._surum or self._tablo[1] != sutunlar:
+            kayitlar = self._kayitlar.values()
+            veri = {ad_sutunu: [k.ad for k in kayitlar], durum_sutunu: [k.durum for k in kayitlar]}
+            if arac_sutunu:
+                veri[arac_sutunu] = [k.arac for k in kayitlar]
+            self._tablo = (self._surum, sutunlar, pd.DataFrame(veri))
+        return self._tablo[2]
+
+
+class FiloAynasi:
+    """
+    'Personeller' ve 'Araclar' tablolarının bellekteki aynası.
+    Bir kez veritabanından doldurulur; DatabaseManager üzerinden yapılan her
+    yazma, yazma dinleyicisiyle hemen belleğe uygulanır. Ayrıntısı bilinmeyen
+    yazmalardan sonra ve mutabakat aralığı dolduğunda tablolar yeniden okunup
+    bellekle karşılaştırılır. Müsaitlik kontrolleri ve durum listeleri sorgu
+    göndermeden bellekten yanıtlanır.
+    """
+
+    TABLOLAR = ('Personeller', 'Araclar')
+
+    def __init__(self, db_manager, mutabakat_araligi=300):
+        """
+        :param db_manager: Bağlanmış DatabaseManager örneği.
+        :param mutabakat_araligi: Başka süreçlerin yazmalarını yakalamak için tabloların
+            en geç kaç saniyede bir yeniden okunacağı.
+        """
+        self.db_manager = db_manager
+        self.mutabakat_araligi = mutabakat_araligi
+        self.personeller = DurumDeposu(varsayilan_durum='Boşta')
+        self.araclar = DurumDeposu(varsayilan_durum='Boşta')
+        self._kilit = threading.RLock()
+        self._kirli = True
+        self._son_mutabakat = 0.0
+        self.son_fark = 0            # son mutabakatta düzeltilen kayıt sayısı
+        db_manager.yazma_dinleyicisi_ekle(self._yazildi)
+
+    def _yazildi(self, tablolar, satirlar):
+        with self._kilit:
+            if satirlar is None:
+                if any(tablo in self.TABLOLAR for tablo in tablolar):
+                    self._kirli = True
+                return
+            for tablo, ad, degisiklik in satirlar:
+                if tablo == 'Personeller':
+                    self._personele_uygula(ad, degisiklik)
+                elif tablo == 'Araclar':
+                    self._araca_uygula(ad, degisiklik)
+
+    def _personele_uygula(self, ad, degisiklik):
+        if ad not in self.personeller:
+            # Bellekte olmayan ad: bir sonraki mutabakatta veritabanından okunur
+            self._kirli = True
+            return
+        eski_arac = self.personeller.durum_ata(ad, degisiklik.get('Durum', self.personeller.durum(ad)),
+                                               degisiklik.get('Arac', DEGISMEZ))
+        # Veritabanı, personelin aracını bırakırken aracı da boşa alır
+        if 'Arac' in degisiklik and degisiklik['Arac'] is None and eski_arac:
+            self.araclar.durum_ata(eski_arac, 'Boşta')
+
+    def _araca_uygula(self, ad, degisiklik):
+        if ad not in self.araclar:
+            self._kirli = True
+            return
+        if 'Durum' in degisiklik:
+            self.araclar.durum_ata(ad, degisiklik['Durum'])
+
+    def mutabakat(self):
+        """
+        Tabloları okuyup bellekteki durumu veritabanıyla eşitler.
+        :return: Düzeltilen kayıt sayısı; okunamazsa None.
+        """
+        personeller, araclar = self.db_manager.durum_tablolari_al()
+        if personeller is None:
+            return None
+        with self._kilit:
+            fark = self._esitle(self.personeller, personeller) + \
+                   self._esitle(self.araclar, {ad: (durum, DEGISMEZ) for ad, durum in araclar.items()})
+            self._kirli = False
+            self._son_mutabakat = time.monotonic()
+            self.son_fark = fark
+        return fark
+
+    @staticmethod
+    def _esitle(depo, satirlar):
+        fark = 0
+        for ad in [kayit.ad for kayit in depo if kayit.ad not in satirlar]:
+            depo.kaldir(ad)
+            fark += 1
+        for ad, (durum, arac) in satirlar.items():
+            kayit = depo.kayit(ad)
+            if kayit is None:
+                depo.ekle(ad, durum, None if arac is DEGISMEZ else arac)
+                fark += 1
+            elif kayit.durum != durum or (arac is not DEGISMEZ and kayit.arac != arac):
+                depo.durum_ata(ad, durum, arac)
+                fark += 1
+        return fark
+
+    def _guncel_tut(self):
+        if self._kirli or time.monotonic() - self._son_mutabakat >= self.mutabakat_araligi:
+            self.mutabakat()
+
+    def personel_musait(self, ad):
+        """Personel kayıtlı ve boştaysa True."""
+        with self._kilit:
+            self._guncel_tut()
+            return self.personeller.durum(ad) == 'Boşta'
+
+    def arac_musait(self, ad):
+        """Araç kayıtlı ve boştaysa True."""
+        with self._kilit:
+            self._guncel_tut()
+            return self.araclar.durum(ad) == 'Boşta'
+
+    def bostaki_araclar(self):
+        with self._kilit:
+            self._guncel_tut()
+            return list(self.araclar.durumdakiler('Boşta'))
+
+    def bostaki_personeller(self):
+        with self._kilit:
+            self._guncel_tut()
+            return list(self.personeller.durumdakiler('Boşta'))
+
+    def personel_adlari(self):
+        """Bellekteki tüm personel adları (sıralı)."""
+        with self._kilit:
+            self._guncel_tut()
+            return sorted(kayit.ad for kayit in self.personeller)
+
+    def araci_kullanan(self, arac):
+        """Aracın atandığı personel (yoksa None)."""
+        with self._kilit:
+            self._guncel_tut()
+            return next(iter(self.personeller.araci_kullananlar(arac)), None)
+
+    def durum_tablolari(self):
+        """DatabaseManager.durum_tablolari_al ile aynı biçimde, bellekten: ({personel: (durum, arac)}, {arac: durum})."""
+        with self._kilit:
+            self._guncel_tut()
+            if not self._son_mutabakat:
+                # Hiç doldurulamadıysa boş listeler yerine okuma hatası bildirilir
+                return None, None
+            return ({k.ad: (k.durum, k.arac) for k in self.personeller},
+                    {k.ad: k.durum for k in self.araclar})
+
+    def personel_tablosu(self):
+        with self._kilit:
+            self._guncel_tut()
+            return self.personeller.tablo('Personel', 'Durum', 'Arac')
+
+    def arac_tablosu(self):
+        with self._kilit:
+            self._guncel_tut()
+            return self.araclar.tablo('Arac', 'Durum')
@@ -1,10 +1,66 @@
+from datetime import datetime, timedelta
 from database_manager import DatabaseManager
+from reservation import ACIK_UC
+
+def sure_timedelta(sure_bilgisi):
+    """
+    {'value': 2, 'unit': 'saat'} biçimindeki süreyi timedelta'ya çevirir.
+    Süre eksik veya anlaşılamıyorsa None döndürür.
+    """
+    if not sure_bilgisi or 'value' not in sure_bilgisi or 'unit' not in sure_bilgisi:
+        return None
+    try:
+        deger = int(sure_bilgisi['value'])
+        birim = sure_bilgisi['unit'].lower()
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if 'saat' in birim:
+        return timedelta(hours=deger)
+    elif 'gün' in birim:
+        return timedelta(days=deger)
+    elif 'dakika' in birim:
+        return timedelta(minutes=deger)
+    return None
+
+def bitis_zamani_hesapla(sure_bilgisi, baslangic=None):
+    """Başlangıç zamanına (varsayılan: şimdi) süreyi ekleyerek tahmini bitişi döndürür."""
+    sure = sure_timedelta(sure_bilgisi)
+    if sure is None:
+        return None
+    return (baslangic or datetime.now()) + sure
 
 class IsYoneticisi:
     """Aktif görevleri veritabanında yönetir."""
-    def __init__(self, db_manager: DatabaseManager):
-        """DatabaseManager örneği ile başlatılır."""
+    def __init__(self, db_manager: DatabaseManager, defter=None):
+        """
+        DatabaseManager örneği ile başlatılır.
+        :param defter: Verilirse her atamada çakışma kontrolü yapılan RezervasyonDefteri.
+        """
         self.db_manager = db_manager
+        self.defter = defter
+        # Son reddedilen atamanın çakışmaları ve önerileri (RezervasyonDefteri.rezerve_et biçiminde)
+        self.son_cakisma = None
+
+    def _cakisma_kontrol_et(self, kisi, gercek_arac, bitis_tarihi):
+        """
+        Görevli veya araç şimdiden tahmini bitişe kadar meşgulse False döndürür.
+        :param kisi: Personeller'deki adıyla görevli.
+        :param gercek_arac: Araclar'daki adıyla araç (veya None).
+        """
+        self.son_cakisma = None
+        if self.defter is None:
+            return True
+        simdi = datetime.now()
+        bitis = bitis_tarihi or ACIK_UC
+        cakismalar = self.defter.cakismalar(gercek_arac, kisi, simdi, bitis)
+        if not cakismalar:
+            return True
+        self.son_cakisma = {"cakismalar": cakismalar,
+                            "alternatifler": self.defter.alternatifler(gercek_arac, kisi, simdi, bitis)}
+        for cakisma in cakismalar:
+            print(f"❌ Çakışma ({cakisma['Neden']}): {cakisma['Personel'] or '-'} / {cakisma['Arac'] or '-'} "
+                  f"{cakisma['Baslangic']:%d.%m %H:%M} - {cakisma['Aciklama'] or ''}")
+        return False
 
     def _arac_kontrol_et(self, arac_adi):
         """Veritabanında araç bulunup bulunmadığını kontrol eder."""
@@ -12,14 +68,8 @@ class IsYoneticisi:
             return True  # Eğer araç adı boşsa kontrolü geç
             
         try:
-            # Veritabanından tüm araçları al
-            araclar = self.db_manager.arac_listesi_al()
-            
-            if not araclar:
-                return True  # Araç listesi alınamazsa kontrolü geç, sistemi bozma
-                
-            # Basit kontrol - mevcut sistemin akıllı eşleştirmesini kullan
-            eslesme = self.db_manager._smart_name_match(arac_adi, araclar)
+            # Araçlar tablosunun isim indeksinden ara (tüm listeyi çekmeden)
+            eslesme = self.db_manager.arac_bul(arac_adi)
             
             if eslesme:
                 return True
@@ -31,22 +81,34 @@ class IsYoneticisi:
             return True  # Hata durumunda sistemi bozma, kontrolü geç
 
     def is_ekle(self, gorevli, arac, gorev, bitis_tarihi):
-        """Veritabanına yeni bir iş ekler."""
+        """
+        Veritabanına yeni bir iş ekler.
+        Görevli ve araç adları bir kez çözülür; kayıt ve çakışma kontrolü aynı (kayıtlı) adları kullanır.
+        """
         if gorevli and gorev:
             # Araç kontrolü yap
             if arac and not self._arac_kontrol_et(arac):
                 print(f"❌ HATA: '{arac}' araç veritabanında bulunamadı. Görev eklenmedi.")
                 return False
+            try:
+                kisi = self.db_manager.personel_bul(gorevli) or gorevli
+                gercek_arac = (self.db_manager.arac_bul(arac) or arac) if arac else None
+            except Exception as e:
+                print(f"Görev eklenirken hata oluştu: {e}")
+                return False
+            if not self._cakisma_kontrol_et(kisi, gercek_arac, bitis_tarihi):
+                print(f"❌ HATA: '{kisi}' / '{gercek_arac}' bu aralıkta meşgul. Görev eklenmedi.")
+                return False
                 
             try:
                 self.db_manager.aktif_gorev_ekle({
-                    "Personel": gorevli,
-                    "Arac": arac,
+                    "Personel": kisi,
+                    "Arac": gercek_arac,
                     "Gorev": gorev,
                     "Tahmini_bitis": bitis_tarihi.strftime('%Y-%m-%d %H:%M:%S') if bitis_tarihi else None,
                     "Durum": "Aktif"
                 })
-                print(f"'{gorevli}' için görev başarıyla eklendi.")
+                print(f"'{kisi}' için görev başarıyla eklendi.")
                 return True
             except Exception as e:
                 print(f"Görev eklenirken hata oluştu: {e}")
@@ -62,26 +124,36 @@ class IsYoneticisi:
             print(f"Görev tamamlanırken hata oluştu: {e}")
 
     def süre_uzat(self, gorevli, sure_bilgisi):
-        """Verilen görevlinin işinin bitiş süresini uzatır."""
+        """
+        Verilen görevlinin işinin bitiş süresini uzatır (tek UPDATE).
+        :return: (başarılı mı, mesaj)
+        """
+        sure = sure_timedelta(sure_bilgisi)
+        if sure is None:
+            return False, "Süre bilgisi anlaşılamadı."
         try:
-            # Süre uzatma işlemi için veritabanında ilgili kaydı güncelle
-            mevcut_bitis = self.db_manager.get_bitis_tarihi(gorevli)  # Bu metodun DatabaseManager'da tanımlı olduğunu varsayıyoruz
-            if not mevcut_bitis:
+            gorev = self.db_manager.sure_uzat(gorevli, sure.total_seconds() // 60)
+            if not gorev:
                 return False, f"'{gorevli}' için aktif bir iş bulunamadı."
+            return True, (f"'{gorev['Personel']}' görevinin süresi uzatıldı. "
+                          f"Yeni bitiş: {gorev['Tahmini_bitis']:%d.%m.%Y %H:%M}")
+        except Exception as e:
+            return False, f"Hata: {e}"
 
-            from datetime import timedelta
-            deger = int(sure_bilgisi['value'])
-            birim = sure_bilgisi['unit'].lower()
-            eklenecek_sure = timedelta()
-            if 'saat' in birim:
-                eklenecek_sure = timedelta(hours=deger)
-            elif 'gün' in birim:
-                eklenecek_sure = timedelta(days=deger)
-            elif 'dakika' in birim:
-                eklenecek_sure = timedelta(minutes=deger)
-
-            yeni_bitis = mevcut_bitis + eklenecek_sure
-            self.db_manager.update_bitis_tarihi(gorevli, yeni_bitis)  # Bu metodun DatabaseManager'da tanımlı olduğunu varsayıyoruz
-            return True, f"'{gorevli}' görevinin süresi başarıyla uzatıldı."
+    def toplu_süre_uzat(self, sure_bilgisi, arac=None, sadece_gecikenler=False):
+        """
+        Bir araçtaki tüm görevlerin ve/veya süresi geçmiş tüm görevlerin bitişini tek ifadede uzatır.
+        :return: (başarılı mı, mesaj)
+        """
+        sure = sure_timedelta(sure_bilgisi)
+        if sure is None:
+            return False, "Süre bilgisi anlaşılamadı."
+        try:
+            gorevler = self.db_manager.toplu_sure_uzat(sure.total_seconds() // 60, arac, sadece_gecikenler)
+            if gorevler is None:
+                return False, "Süreler uzatılamadı."
+            if not gorevler:
+                return False, "Uzatılacak görev bulunamadı."
+            return True, f"{len(gorevler)} görevin süresi uzatıldı: " + ", ".join(g['Personel'] for g in gorevler)
         except Exception as e:
             return False, f"Hata: {e}"
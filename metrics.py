@@ -0,0 +1,262 @@
+import bisect
+import inspect
+import os
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Varsayılan gecikme kovaları (saniye)
+SURE_KOVALARI = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _kacis(deger):
+    return str(deger).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _etiket_metni(adlar, degerler, ek=""):
+    parcalar = [f'{ad}="{_kacis(deger)}"' for ad, deger in zip(adlar, degerler)]
+    if ek:
+        parcalar.append(ek)
+    return "{" + ",".join(parcalar) + "}" if parcalar else ""
+
+
+def _sayi(deger):
+    return repr(float(deger)) if isinstance(deger, float) else str(deger)
+
+
+class Sayac:
+    """Yalnızca artan sayaç. Etiket değerleri artir() çağrısında sırayla verilir."""
+    tur = "counter"
+
+    def __init__(self, ad, aciklama, etiketler=()):
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiketler = tuple(etiketler)
+        self._degerler = {}
+        self._kilit = threading.Lock()
+
+    def artir(self, *etiket_degerleri, miktar=1):
+        with self._kilit:
+            self._degerler[etiket_degerleri] = self._degerler.get(etiket_degerleri, 0) + miktar
+
+    def deger(self, *etiket_degerleri):
+        return self._degerler.get(etiket_degerleri, 0)
+
+    def satirlar(self):
+        with self._kilit:
+            degerler = sorted(self._degerler.items())
+        for etiket_degerleri, sayi in degerler:
+            yield f"{self.ad}{_etiket_metni(self.etiketler, etiket_degerleri)} {_sayi(sayi)}"
+
+
+class Histogram:
+    """
+    Sabit kovalı histogram. Gözlem yalnızca tek bir kovayı artırır; Prometheus'un
+    beklediği birikimli kova sayıları okuma (scrape) sırasında hesaplanır.
+    """
+    tur = "histogram"
+
+    def __init__(self, ad, aciklama, etiketler=(), kovalar=SURE_KOVALARI):
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiketler = tuple(etiketler)
+        self.kovalar = tuple(kovalar)
+        self._degerler = {}          # etiket değerleri -> [kova sayıları (+Inf dahil), toplam, adet]
+        self._kilit = threading.Lock()
+
+    def gozlemle(self, deger, *etiket_degerleri):
+        kova = bisect.bisect_left(self.kovalar, deger)
+        with self._kilit:
+            kayit = self._degerler.get(etiket_degerleri)
+            if kayit is None:
+                kayit = self._degerler[etiket_degerleri] = [[0] * (len(self.kovalar) + 1), 0.0, 0]
+            kayit[0][kova] += 1
+            kayit[1] += deger
+            kayit[2] += 1
+
+    def satirlar(self):
+        with self._kilit:
+            degerler = sorted((e, (list(k[0]), k[1], k[2])) for e, k in self._degerler.items())
+        for etiket_degerleri, (kovalar, toplam, adet) in degerler:
+            birikimli = 0
+            for sinir, sayi in zip(self.kovalar + ("+Inf",), kovalar):
+                birikimli += sayi
+                le = 'le="+Inf"' if sinir == "+Inf" else f'le="{float(sinir)!r}"'
+                yield f"{self.ad}_bucket{_etiket_metni(self.etiketler, etiket_degerleri, le)} {birikimli}"
+            yield f"{self.ad}_sum{_etiket_metni(self.etiketler, etiket_degerleri)} {toplam!r}"
+            yield f"{self.ad}_count{_etiket_metni(self.etiketler, etiket_degerleri)} {adet}"
+
+
+class MetrikKaydi:
+    """Süreçteki metrikler ve okuma anında değer üreten toplayıcılar."""
+
+    def __init__(self):
+        self._metrikler = {}
+        self._toplayicilar = []
+        self._kilit = threading.Lock()
+
+    def _kaydet(self, sinif, ad, *args, **kwargs):
+        with self._kilit:
+            metrik = self._metrikler.get(ad)
+            if metrik is None:
+                metrik = self._metrikler[ad] = sinif(ad, *args, **kwargs)
+            return metrik
+
+    def sayac(self, ad, aciklama, etiketler=()):
+        return self._kaydet(Sayac, ad, aciklama, etiketler)
+
+    def histogram(self, ad, aciklama, etiketler=(), kovalar=SURE_KOVALARI):
+        return self._kaydet(Histogram, ad, aciklama, etiketler, kovalar)
+
+    def toplayici_ekle(self, fonksiyon):
+        """
+        Yalnızca okuma sırasında çağrılan değer kaynağı ekler (sıcak yola maliyeti yoktur).
+        fonksiyon() -> [(ad, tür, açıklama, [({etiket: değer}, sayı)])]
+        """
+        self._toplayicilar.append(fonksiyon)
+
+    def metin(self):
+        """Prometheus metin biçimi (0.0.4)."""
+        satirlar = []
+        with self._kilit:
+            metrikler = list(self._metrikler.values())
+        for metrik in metrikler:
+            satirlar.append(f"# HELP {metrik.ad} {metrik.aciklama}")
+            satirlar.append(f"# TYPE {metrik.ad} {metrik.tur}")
+            satirlar.extend(metrik.satirlar())
+        for toplayici in list(self._toplayicilar):
+            try:
+                olcumler = toplayici()
+            except Exception as e:
+                print(f"Metrik toplayıcı hatası: {e}")
+                continue
+            for ad, tur, aciklama, ornekler in olcumler:
+                satirlar.append(f"# HELP {ad} {aciklama}")
+                satirlar.append(f"# TYPE {ad} {tur}")
+                for etiketler, deger in ornekler:
+                    satirlar.append(f"{ad}{_etiket_metni(etiketler.keys(), etiketler.values())} {_sayi(deger)}")
+        return "\n".join(satirlar) + "\n"
+
+
+KAYIT = MetrikKaydi()
+
+DB_CAGRI = KAYIT.sayac("arac_takip_db_cagri_toplam", "DatabaseManager metot çağrıları", ("metot", "sonuc"))
+DB_SURE = KAYIT.histogram("arac_takip_db_cagri_suresi_saniye", "DatabaseManager metot süresi", ("metot",))
+OLLAMA_ISTEK = KAYIT.sayac("arac_takip_ollama_istek_toplam", "Ollama /api/generate istekleri",
+                           ("model", "istemci", "sonuc"))
+OLLAMA_SURE = KAYIT.histogram("arac_takip_ollama_istek_suresi_saniye", "Ollama istek süresi", ("model", "istemci"))
+ANALIZ_ONBELLEGI = KAYIT.sayac("arac_takip_analiz_onbellegi_toplam", "Analiz önbelleği sorguları", ("sonuc",))
+ANALIZ_YOLU = KAYIT.sayac("arac_takip_analiz_toplam", "Komut analizleri (izlenen yola göre)", ("yol",))
+ISIM_ESLESME = KAYIT.sayac("arac_takip_isim_eslesme_toplam",
+                           "İsim indeksinden ad çözümleri (tam, bulanık/akıllı eşleşme, bulunamadı)", ("tablo", "sonuc"))
+ISIM_INDEKSI_KURULUM = KAYIT.sayac("arac_takip_isim_indeksi_kurulum_toplam",
+                                   "İsim indeksinin veritabanından (yeniden) kurulması", ("tablo",))
+
+
+_cagri_durumu = threading.local()
+
+
+def hata_bildir():
+    """
+    Hatayı kendisi yakalayıp None/False döndüren ölçülen metotlar bunu except bloğunda
+    çağırır; çağrı istisna fırlatmasa da 'hata' olarak sayılır.
+    """
+    _cagri_durumu.hata = True
+
+
+def metriklerle_olc(sinif):
+    """
+    Sınıfın herkese açık metotlarını çağrı sayacı ve süre histogramıyla sarar.
+    METRIKLER=0 ise sınıf değiştirilmez.
+    """
+    if os.getenv("METRIKLER", "1") == "0":
+        return sinif
+    for ad, fonksiyon in list(vars(sinif).items()):
+        if ad.startswith("_") or not inspect.isfunction(fonksiyon):
+            continue
+        setattr(sinif, ad, _olculen(ad, fonksiyon))
+    return sinif
+
+
+def _olculen(ad, fonksiyon):
+    @wraps(fonksiyon)
+    def sarici(*args, **kwargs):
+        baslangic = time.perf_counter()
+        # İç içe ölçülen çağrılar dıştakinin hata bildirimini ezmesin
+        onceki = getattr(_cagri_durumu, "hata", False)
+        _cagri_durumu.hata = False
+        sonuc = "hata"
+        try:
+            deger = fonksiyon(*args, **kwargs)
+            if not _cagri_durumu.hata:
+                sonuc = "tamam"
+            return deger
+        finally:
+            _cagri_durumu.hata = onceki
+            DB_SURE.gozlemle(time.perf_counter() - baslangic, ad)
+            DB_CAGRI.artir(ad, sonuc)
+    return sarici
+
+
+def havuz_metrikleri(db_manager):
+    """Toplayıcı: DatabaseManager'ın bağlantı havuzu doluluğu (okuma anında okunur)."""
+    havuz = db_manager.havuz
+    if havuz is None:
+        return []
+    istatistik = havuz.istatistik()
+    return [("arac_takip_db_havuz_baglanti", "gauge", "Bağlantı havuzundaki bağlantı sayıları",
+             [({"durum": durum}, istatistik[durum]) for durum in ("acik", "bosta", "max")])]
+
+
+class MetrikSunucusu:
+    """Metrikleri /metrics adresinden Prometheus metin biçiminde sunan yerel HTTP sunucusu."""
+
+    def __init__(self, port=9464, host="127.0.0.1", kayit=KAYIT):
+        kayit_ = kayit
+
+        class Isleyici(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                govde = kayit_.metin().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(govde)))
+                self.end_headers()
+                self.wfile.write(govde)
+
+        self._sunucu = ThreadingHTTPServer((host, port), Isleyici)
+        self._sunucu.daemon_threads = True
+        self._is_parcacigi = threading.Thread(target=self._sunucu.serve_forever, name="MetrikSunucusu", daemon=True)
+
+    @property
+    def adres(self):
+        host, port = self._sunucu.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def baslat(self):
+        self._is_parcacigi.start()
+        return self
+
+    def durdur(self):
+        self._sunucu.shutdown()
+        self._sunucu.server_close()
+
+
+def metrik_sunucusunu_baslat():
+    """METRIK_PORTU ayarlıysa sunucuyu başlatır (METRIK_HOST varsayılanı 127.0.0.1); değilse None döner."""
+    port = os.getenv("METRIK_PORTU")
+    if not port:
+        return None
+    try:
+        sunucu = MetrikSunucusu(int(port), os.getenv("METRIK_HOST", "127.0.0.1")).baslat()
+    except (OSError, ValueError) as e:
+        print(f"Metrik sunucusu başlatılamadı: {e}")
+        return None
+    print(f"Metrikler: {sunucu.adres}")
+    return sunucu
@@ -0,0 +1,168 @@
+from functools import lru_cache
+
+# Türkçe karakter dönüşümleri; 'İ'.lower() sonucu oluşan birleşik nokta (U+0307) silinir
+_TURKCE_TABLO = str.maketrans({
+    'ç': 'c', 'Ç': 'c',
+    'ğ': 'g', 'Ğ': 'g',
+    'ı': 'i', 'I': 'i', 'İ': 'i', '\u0307': None,
+    'ö': 'o', 'Ö': 'o',
+    'ş': 's', 'Ş': 's',
+    'ü': 'u', 'Ü': 'u',
+})
+
+
+@lru_cache(maxsize=65536)
+def isim_normalize(isim):
+    """İsmi normalize eder - Türkçe karakterleri düzeltir, fazla boşlukları temizler."""
+    if not isim:
+        return ""
+    return ' '.join(isim.split()).translate(_TURKCE_TABLO).lower()
+
+
+def _trigramlar(metin):
+    """Kenarları boşlukla doldurulmuş metnin karakter 3-gramları."""
+    dolgulu = f" {metin} "
+    return {dolgulu[i:i + 3] for i in range(len(dolgulu) - 2)}
+
+
+def eslesme_skoru(aranan_norm, mevcut_norm):
+    """
+    DatabaseManager'ın eski akıllı eşleştirmesiyle aynı puanlama:
+    kelime bazında tam (1) / kısmi (0.7) eşleşme yüzdesi, tüm metin
+    birbirini içeriyorsa +20. Normalize hali aynı olan adlar 200 puan alır.
+    """
+    if aranan_norm == mevcut_norm:
+        return 200
+    aranan_kelimeler = aranan_norm.split()
+    mevcut_kelimeler = mevcut_norm.split()
+    skor = 0
+    if aranan_kelimeler and len(aranan_kelimeler) <= len(mevcut_kelimeler):
+        eslesme_sayisi = 0
+        for aranan_kelime in aranan_kelimeler:
+            for mevcut_kelime in mevcut_kelimeler:
+                if aranan_kelime == mevcut_kelime:
+                    eslesme_sayisi += 1
+                    break
+                elif len(aranan_kelime) >= 3 and (aranan_kelime in mevcut_kelime or mevcut_kelime in aranan_kelime):
+                    eslesme_sayisi += 0.7
+                    break
+        skor = (eslesme_sayisi / len(aranan_kelimeler)) * 100
+    if aranan_norm in mevcut_norm or mevcut_norm in aranan_norm:
+        skor += 20
+    return skor
+
+
+class IsimIndeksi:
+    """
+    Personel/araç adları için önceden kurulmuş arama indeksi.
+    Normalize edilmiş tam adlar, kelime -> isim ters indeksi ve karakter
+    3-gram indeksleri tutulur; böylece her aramada tüm liste taranmaz,
+    yalnızca en az bir kelimesi eşleşebilecek adaylar puanlanır.
+    """
+
+    def __init__(self, isimler=()):
+        self._isimler = []        # sıra numarası -> orijinal ad (silinenler None)
+        self._normlar = []
+        self._tam = {}            # normalize ad -> ilk sıra numarası
+        self._kelime_indeksi = {}  # kelime -> {sıra numarası}
+        self._kelime_trigram = {}  # 3-gram -> {kelime} (kelime içinde alt dizi araması için)
+        for isim in isimler:
+            self.ekle(isim)
+
+    def __len__(self):
+        return len(self._tam)
+
+    def __contains__(self, isim):
+        return isim_normalize(isim) in self._tam
+
+    def isimler(self):
+        """İndeksteki adlar (ekleme sırasıyla)."""
+        return [isim for isim in self._isimler if isim is not None]
+
+    def ekle(self, isim):
+        """İndekse yeni bir ad ekler; aynı normalize ad zaten varsa bir şey yapmaz."""
+        if not isim:
+            return
+        norm = isim_normalize(isim)
+        if norm in self._tam:
+            return
+        sira = len(self._isimler)
+        self._isimler.append(isim)
+        self._normlar.append(norm)
+        self._tam[norm] = sira
+        for kelime in norm.split():
+            if kelime not in self._kelime_indeksi:
+                self._kelime_indeksi[kelime] = set()
+                for trigram in _trigramlar(kelime):
+                    self._kelime_trigram.setdefault(trigram, set()).add(kelime)
+            self._kelime_indeksi[kelime].add(sira)
+
+    def kaldir(self, isim):
+        """Adı indeksten çıkarır."""
+        norm = isim_normalize(isim)
+        sira = self._tam.pop(norm, None)
+        if sira is None:
+            return
+        self._isimler[sira] = None
+        for kelime in norm.split():
+            self._kelime_indeksi.get(kelime, set()).discard(sira)
+
+    def tam(self, aranan):
+        """Normalize edilmiş hali birebir aynı olan adı döndürür."""
+        sira = self._tam.get(isim_normalize(aranan))
+        return self._isimler[sira] if sira is not None else None
+
+    def _kelime_adaylari(self, aranan_kelime):
+        """Aranan kelimeyle eşit, onu içeren veya onun içinde geçen indeks kelimeleri."""
+        adaylar = set()
+        if aranan_kelime in self._kelime_indeksi:
+            adaylar.add(aranan_kelime)
+        if len(aranan_kelime) >= 3:
+            # Aranan kelimeyi içeren kelimeler tüm 3-gramlarını paylaşmak zorundadır
+            trigramlar = [t for t in _trigramlar(aranan_kelime) if t[0] != ' ' and t[-1] != ' ']
+            kumeler = sorted((self._kelime_trigram.get(t, set()) for t in trigramlar), key=len)
+            if kumeler:
+                kesisim = set(kumeler[0])
+                for kume in kumeler[1:]:
+                    kesisim &= kume
+                    if not kesisim:
+                        break
+                adaylar.update(k for k in kesisim if aranan_kelime in k)
+            # Aranan kelimenin içinde geçen kelimeler: tüm alt dizileri sözlükte ara
+            uzunluk = len(aranan_kelime)
+            for i in range(uzunluk):
+                for j in range(i + 1, uzunluk + 1):
+                    alt = aranan_kelime[i:j]
+                    if alt in self._kelime_indeksi:
+                        adaylar.add(alt)
+        return adaylar
+
+    def ara(self, aranan, limit=5, esik=60):
+        """
+        Adayları puanlayarak döndürür.
+        :return: (ad, skor) listesi, skora göre azalan; eşitlikte ekleme sırası korunur.
+        """
+        aranan_norm = isim_normalize(aranan)
+        if not aranan_norm:
+            return []
+        sira = self._tam.get(aranan_norm)
+        if sira is not None:
+            return [(self._isimler[sira], 200)]
+
+        aday_siralari = set()
+        for kelime in set(aranan_norm.split()):
+            for aday_kelime in self._kelime_adaylari(kelime):
+                aday_siralari |= self._kelime_indeksi[aday_kelime]
+
+        sonuclar = []
+        for sira in aday_siralari:
+            skor = eslesme_skoru(aranan_norm, self._normlar[sira])
+            if skor >= esik:
+                sonuclar.append((-skor, sira))
+        sonuclar.sort()
+        return [(self._isimler[sira], -skor) for skor, sira in sonuclar[:limit]]
+
+    def en_iyi(self, aranan, esik=60):
+        """En yüksek puanlı adı veya eşiği geçen aday yoksa None döndürür."""
+        sonuc = self.ara(aranan, limit=1, esik=esik)
+        return sonuc[0][0] if sonuc else None
@@ -1,39 +1,305 @@
 from pdb import main
 import requests
 import json
+import os
+import threading
+import time
+from collections import Counter
+from requests.adapters import HTTPAdapter
+from analysis_cache import AnalizOnbellegi
+from command_trace import komut_izine_yaz
+from metrics import ANALIZ_ONBELLEGI, ANALIZ_YOLU, OLLAMA_ISTEK, OLLAMA_SURE
+from rule_parser import KuralAyristirici
 
 # Ollama sunucu URL'si (varsayılan olarak localhost:11434)
 OLLAMA_BASE_URL = "http://localhost:11434"
 
+# Prompt metinleri değiştiğinde artırılır; eski önbellek kayıtları böylece kullanılmaz
+PROMPT_SURUMU = 1
+
+class JsonTamamlayici:
+    """
+    Akış halinde gelen metin parçalarını biriktirir ve ilk tam JSON nesnesi
+    kapandığı anda bunu bildirir. Karakter dizileri ve kaçış karakterleri
+    içindeki süslü parantezler sayılmaz.
+    """
+
+    def __init__(self):
+        self.parcalar = []
+        self._derinlik = 0
+        self._basladi = False
+        self._dizi_icinde = False
+        self._kacis = False
+        self.tamamlandi = False
+
+    def ekle(self, parca):
+        """Yeni parçayı ekler; JSON nesnesi tamamlandıysa True döndürür."""
+        if self.tamamlandi:
+            return True
+        for i, karakter in enumerate(parca):
+            if self._dizi_icinde:
+                if self._kacis:
+                    self._kacis = False
+                elif karakter == "\\":
+                    self._kacis = True
+                elif karakter == '"':
+                    self._dizi_icinde = False
+            elif karakter == '"':
+                self._dizi_icinde = self._basladi
+            elif karakter == "{":
+                self._basladi = True
+                self._derinlik += 1
+            elif karakter == "}" and self._basladi:
+                self._derinlik -= 1
+                if self._derinlik == 0:
+                    self.parcalar.append(parca[:i + 1])
+                    self.tamamlandi = True
+                    return True
+        self.parcalar.append(parca)
+        return False
+
+    def metin(self):
+        return "".join(self.parcalar)
+
+
+class OllamaIstemcisi:
+    """
+    Ollama API için yeniden kullanılabilir istemci.
+    Kalıcı bir requests.Session ve bağlantı havuzu kullanır, böylece ardışık
+    isteklerde TCP bağlantısı yeniden kurulmaz. Akış modunda ilk tam JSON
+    nesnesi okunduğu anda bağlantı kapatılır ve model üretimi kesilir.
+    """
+
+    def __init__(self, base_url=None, havuz_boyutu=10, baglanti_zaman_asimi=3.05,
+                 okuma_zaman_asimi=30, keep_alive="10m"):
+        """
+        :param base_url: Ollama sunucu adresi (varsayılan: OLLAMA_BASE_URL).
+        :param havuz_boyutu: Aynı anda açık tutulacak en fazla HTTP bağlantısı.
+        :param baglanti_zaman_asimi: TCP bağlantısı için zaman aşımı (saniye).
+        :param okuma_zaman_asimi: Yanıt beklerken zaman aşımı (saniye).
+        :param keep_alive: Modelin sunucuda bellekte tutulacağı süre.
+        """
+        self.base_url = base_url or OLLAMA_BASE_URL
+        self.baglanti_zaman_asimi = baglanti_zaman_asimi
+        self.okuma_zaman_asimi = okuma_zaman_asimi
+        self.keep_alive = keep_alive
+        self.oturum = requests.Session()
+        adaptor = HTTPAdapter(pool_connections=1, pool_maxsize=havuz_boyutu)
+        self.oturum.mount("http://", adaptor)
+        self.oturum.mount("https://", adaptor)
+
+    def uret(self, prompt, model="qwen2.5vl:3b", stream=True, format="json", zaman_asimi=None):
+        """
+        /api/generate çağrısı yapar ve üretilen metni döndürür.
+        :param stream: True ise yanıt parça parça okunur ve ilk tam JSON nesnesinde durulur.
+        :param format: Ollama 'format' alanı; "json" değilse akış sonuna kadar okunur.
+        :param zaman_asimi: Bu çağrı için okuma zaman aşımı (saniye); verilmezse varsayılan.
+        """
+        baslangic = time.perf_counter()
+        sonuc = "hata"
+        try:
+            metin = self._uret(prompt, model, stream, format, zaman_asimi)
+            sonuc = "tamam"
+            return metin
+        finally:
+            OLLAMA_SURE.gozlemle(time.perf_counter() - baslangic, model, "senkron")
+            OLLAMA_ISTEK.artir(model, "senkron", sonuc)
+
+    def _uret(self, prompt, model, stream, format, zaman_asimi):
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "format": format,
+            "keep_alive": self.keep_alive,
+        }
+        zaman_asimi = (self.baglanti_zaman_asimi, zaman_asimi or self.okuma_zaman_asimi)
+        url = f"{self.base_url}/api/generate"
+
+        if not stream:
+            response = self.oturum.post(url, json=payload, timeout=zaman_asimi)
+            response.raise_for_status()
+            return response.json()["response"]
+
+        toplayici = JsonTamamlayici()
+        with self.oturum.post(url, json=payload, timeout=zaman_asimi, stream=True) as response:
+            response.raise_for_status()
+            for satir in response.iter_lines():
+                if not satir:
+                    continue
+                parca = json.loads(satir)
+                if format == "json" and toplayici.ekle(parca.get("response", "")):
+                    # JSON tamamlandı; kalan üretimi beklemeden bağlantıyı kapat
+                    break
+                if format != "json":
+                    toplayici.parcalar.append(parca.get("response", ""))
+                if parca.get("done"):
+                    break
+        return toplayici.metin()
+
+    def kapat(self):
+        self.oturum.close()
+
+
+_varsayilan_istemci = None
+_istemci_kilidi = threading.Lock()
+
+def varsayilan_istemci():
+    """Süreç genelinde paylaşılan Ollama istemcisini döndürür."""
+    global _varsayilan_istemci
+    with _istemci_kilidi:
+        if _varsayilan_istemci is None:
+            _varsayilan_istemci = OllamaIstemcisi(OLLAMA_BASE_URL)
+        return _varsayilan_istemci
+
 def ollama_yapilandir(base_url=None):
     """Ollama sunucu URL'sini yapılandırır."""
     global OLLAMA_BASE_URL
     if base_url:
         OLLAMA_BASE_URL = base_url
+        varsayilan_istemci().base_url = base_url
 
-def ollama_istek_gonder(prompt, model="qwen2.5vl:3b"):
+def ollama_istek_gonder(prompt, model="qwen2.5vl:3b", stream=True, zaman_asimi=None):
     """Ollama API'sine istek gönderir ve yanıtı döndürür."""
-    url = f"{OLLAMA_BASE_URL}/api/generate"
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-        "format": "json"
-    }
-    
     try:
-        response = requests.post(url, json=payload, timeout=30)
-        response.raise_for_status()
-        return response.json()["response"]
-    except requests.exceptions.RequestException as e:
+        return varsayilan_istemci().uret(prompt, model, stream=stream, zaman_asimi=zaman_asimi)
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"Ollama API hatası: {e}")
         return None
 
+_analiz_onbellegi = None
+_onbellek_hazir = False
+
+def analiz_onbellegi():
+    """
+    Süreç genelindeki analiz önbelleğini döndürür.
+    ANALIZ_ONBELLEK_DOSYASI ortam değişkeni kayıt dosyasını belirler;
+    ANALIZ_ONBELLEK=0 ise önbellek kapalıdır ve None döner.
+    """
+    global _analiz_onbellegi, _onbellek_hazir
+    with _istemci_kilidi:
+        if not _onbellek_hazir:
+            if os.getenv("ANALIZ_ONBELLEK", "1") != "0":
+                _analiz_onbellegi = AnalizOnbellegi(os.getenv("ANALIZ_ONBELLEK_DOSYASI", "analiz_onbellegi.json"))
+            _onbellek_hazir = True
+        return _analiz_onbellegi
+
+def analiz_onbellegini_ayarla(onbellek):
+    """Önbelleği değiştirir (ör. testlerde AnalizOnbellegi() ya da kapatmak için None)."""
+    global _analiz_onbellegi, _onbellek_hazir
+    with _istemci_kilidi:
+        _analiz_onbellegi = onbellek
+        _onbellek_hazir = True
+
+_kural_ayristirici = None
+# Sözlüğün okunduğu DatabaseManager ve okunduğu andaki (Personeller, Araclar) tablo sürümleri
+_kural_kaynagi = None
+# Her sonucun hangi yoldan geldiği: kural, anahtar_kelime, llm, onbellek, basarisiz
+_yol_sayaci = Counter()
+
+def kural_sozlugu_ayarla(personeller, araclar):
+    """
+    Kural tabanlı ayrıştırıcının kullanacağı personel ve araç listelerini ayarlar.
+    Ayarlanmazsa tüm yeni görev ve süre uzatma komutları LLM'e gider.
+    """
+    global _kural_ayristirici
+    _kural_ayristirici = KuralAyristirici(personeller, araclar)
+
+def kural_sozlugu_baglan(db_manager):
+    """
+    Sözlüğü db_manager'ın personel ve araç listelerinden kurar; 'Personeller' veya
+    'Araclar' tablosunun sürümü (DatabaseManager.tablo_surumu) değiştikçe bir sonraki
+    analizde listeleri yeniden okur.
+    """
+    global _kural_kaynagi
+    _kural_kaynagi = (db_manager, None)
+    _kural_sozlugunu_tazele()
+
+def _kural_sozlugunu_tazele():
+    global _kural_kaynagi
+    kaynak = _kural_kaynagi
+    if kaynak is None:
+        return
+    db_manager, surum = kaynak
+    # Sürüm listelerden önce okunur; okuma sırasında gelen yazma bir sonraki analizde yeniden okutur
+    yeni_surum = (db_manager.tablo_surumu('Personeller'), db_manager.tablo_surumu('Araclar'))
+    if yeni_surum == surum:
+        return
+    personeller, araclar = db_manager.personel_listesi_al(), db_manager.arac_listesi_al()
+    if not personeller and not araclar:
+        return  # Okunamadı; eski sözlük kalır, sonraki analizde yeniden denenir
+    kural_sozlugu_ayarla(personeller, araclar)
+    _kural_kaynagi = (db_manager, yeni_surum)
+
+def ayristirma_istatistikleri():
+    """Yol bazında sonuç sayılarını ve LLM'e gitmeden çözülen komut oranını döndürür."""
+    with _istemci_kilidi:
+        sayilar = dict(_yol_sayaci)
+    toplam = sum(sayilar.values())
+    llm_disi = toplam - sayilar.get("llm", 0) - sayilar.get("basarisiz", 0)
+    return {"yollar": sayilar, "toplam": toplam, "llm_disi_oran": llm_disi / toplam if toplam else 0.0}
+
+def analiz_onbellekten_al(metin, model):
+    """Önbellekte geçerli bir sonuç varsa 'kaynak' alanı 'onbellek' olarak döndürür."""
+    onbellek = analiz_onbellegi()
+    if onbellek is None:
+        return None
+    sonuc = onbellek.al(metin, model, PROMPT_SURUMU)
+    ANALIZ_ONBELLEGI.artir("iska" if sonuc is None else "isabet")
+    if sonuc is not None:
+        sonuc["kaynak"] = "onbellek"
+    return sonuc
+
+def analiz_onbellege_koy(metin, model, sonuc):
+    """Yalnızca pahalı LLM sonuçlarını önbelleğe alır."""
+    onbellek = analiz_onbellegi()
+    if onbellek is not None and sonuc and sonuc.get("kaynak") == "llm":
+        onbellek.koy(metin, model, PROMPT_SURUMU, sonuc)
+
+def analiz_yolunu_kaydet(sonuc):
+    """Sonucun hangi yoldan geldiğini istatistiklere işler."""
+    yol = sonuc.get("kaynak") if sonuc else "basarisiz"
+    with _istemci_kilidi:
+        _yol_sayaci[yol] += 1
+    ANALIZ_YOLU.artir(yol)
+
 def metin_analiz_et(metin, model="qwen2.5vl:3b"):
-    """Verilen metni Ollama API kullanarak analiz eder ve görev türünü belirler."""
+    """
+    Verilen metni analiz eder ve görev türünü belirler.
+    Aynı (normalize) metin daha önce LLM ile analiz edildiyse sonuç önbellekten
+    döner; kural tabanlı ayrıştırıcı metni tam çözebiliyorsa da LLM çağrılmaz.
+    Sonuçtaki 'kaynak' alanı izlenen yolu belirtir.
+    KOMUT_IZI_DOSYASI ayarlıysa metin ve sonuç komut izine yazılır.
+    """
+    baslangic = time.perf_counter()
+    sonuc = analiz_onbellekten_al(metin, model)
+    if sonuc is None:
+        sonuc, istek = yerel_analiz(metin)
+        if istek is not None:
+            prompt, komut_turu = istek
+            sonuc = llm_yanitini_coz(ollama_istek_gonder(prompt, model), komut_turu)
+            analiz_onbellege_koy(metin, model, sonuc)
+    analiz_yolunu_kaydet(sonuc)
+    komut_izine_yaz(metin, sonuc, time.perf_counter() - baslangic)
+    return sonuc
+
+def yerel_analiz(metin):
+    """
+    Metni LLM'e gitmeden çözmeyi dener (kural tabanlı ayrıştırıcı, anahtar kelimeler).
+    :return: (sonuç, None) veya çözülemediyse (None, (prompt, komut_turu)) -
+             prompt LLM'e gönderilir, yanıtı llm_yanitini_coz ile ayrıştırılır.
+    """
     
     print(f"DEBUG: Analiz edilen metin: '{metin}'")
     
+    # Önce personel/araç listeleriyle kural tabanlı ayrıştırmayı dene
+    _kural_sozlugunu_tazele()
+    if _kural_ayristirici is not None:
+        sonuc, _ = _kural_ayristirici.ayristir(metin)
+        if sonuc:
+            sonuc["kaynak"] = "kural"
+            return sonuc, None
+    
     # Önce basit kelime kontrolü yapalım
     metin_lower = metin.lower()
     
@@ -78,8 +344,9 @@ def metin_analiz_et(metin, model="qwen2.5vl:3b"):
             
             return {
                 "komut_turu": "gorev_bitti",
-                "person": isim
-            }
+                "person": isim,
+                "kaynak": "anahtar_kelime"
+            }, None
     
     # Süre uzatma kontrolü
     uzatma_kelimeleri = ['uzat', 'ekle', 'daha', 'artır', 'uzatma']
@@ -97,17 +364,7 @@ def metin_analiz_et(metin, model="qwen2.5vl:3b"):
                 "unit": "saat/gün/dakika"
             }}
             }}"""
-        
-        try:
-            yanit = ollama_istek_gonder(prompt, model)
-            if yanit:
-                cleaned_response = yanit.strip().replace("```json", "").replace("```", "").strip()
-                parsed_data = json.loads(cleaned_response)
-                parsed_data["komut_turu"] = "sure_uzatma"
-                return parsed_data
-        except Exception as e:
-            print(f"Süre uzatma analizi hatası: {e}")
-            return None
+        return None, (prompt, "sure_uzatma")
     
     # Yeni görev için Ollama'ya sor
     prompt = f"""Bu metin yeni bir görev ataması. Bilgileri dikkatli şekilde çıkar:
@@ -139,21 +396,22 @@ def metin_analiz_et(metin, model="qwen2.5vl:3b"):
                 }},
                 "vehicle": "TEK araç adı (örnek: vinç 1) veya null"
                 }}"""
-    
+    return None, (prompt, "yeni_gorev")
+
+def llm_yanitini_coz(yanit, komut_turu):
+    """LLM yanıtındaki JSON'u ayrıştırır; yanıt yoksa veya bozuksa None döndürür."""
+    print("yanıt:", yanit)
+    if not yanit:
+        return None
     try:
-        yanit = ollama_istek_gonder(prompt, model)
-        print("yanıt:",yanit)
-        if not yanit:
-            return None
-            
         # JSON yanıtını temizle
         cleaned_response = yanit.strip().replace("```json", "").replace("```", "").strip()
         parsed_data = json.loads(cleaned_response)
-        parsed_data["komut_turu"] = "yeni_gorev"
+        parsed_data["komut_turu"] = komut_turu
+        parsed_data["kaynak"] = "llm"
         return parsed_data
-        
-    except Exception as hata:
-        print(f"API Hatası veya JSON ayrıştırma hatası: {hata}")
+    except (ValueError, TypeError) as hata:
+        print(f"JSON ayrıştırma hatası ({komut_turu}): {hata}")
         return None
 
 # Geriye dönük uyumluluk için eski isimleri koruyalım
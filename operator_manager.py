@@ -1,27 +1,37 @@
-import pandas as pd
 from thefuzz import process
+from name_index import IsimIndeksi
+from fleet_store import DurumDeposu
 
 class OperatorYoneticisi:
     """Operatörlerin listesini ve durumlarını (aktif/boşta) yönetir."""
     def __init__(self, operator_adlari, db_manager=None):
-        """Başlangıç operatör listesi ile DataFrame'i oluşturur."""
+        """Başlangıç operatör listesi ile durum deposunu oluşturur."""
         self.operatorler = operator_adlari
         self.db_manager = db_manager
-        self.df_kisiler = pd.DataFrame({
-            'Operatör': self.operatorler,
-            'Durum': ['boşta'] * len(self.operatorler),
-            'Kullandığı Araç': [None] * len(self.operatorler)
-        })
+        self._indeks = IsimIndeksi(self.operatorler)
+        self._depo = DurumDeposu(self.operatorler, varsayilan_durum='boşta')
 
     def durum_df_al(self):
-        """Operatör durumlarını içeren DataFrame'i döndürür."""
-        return self.df_kisiler
+        """Operatör durumlarını içeren DataFrame'i döndürür (yalnızca değişiklik olduysa yeniden kurulur)."""
+        return self._depo.tablo('Operatör', 'Durum', 'Kullandığı Araç')
+
+    def bostaki_operatorler(self):
+        """Boşta olan operatörlerin adları."""
+        return list(self._depo.durumdakiler('boşta'))
+
+    def araci_kullanan(self, arac_adi):
+        """Aracın atandığı operatörün adı (yoksa None)."""
+        return next(iter(self._depo.araci_kullananlar(arac_adi)), None)
 
     def operator_bul(self, isim):
         """Verilen isme en çok benzeyen operatörü bulur (yazım hatalarını tolere eder)."""
         if not isim:
             return None
-        # thefuzz kütüphanesi ile %80 ve üzeri benzerlikte olan en iyi eşleşmeyi bulur.
+        tam = self._indeks.tam(isim)
+        if tam:
+            return tam
+        # thefuzz ile tüm listede %70 ve üzeri benzerlikte olan en iyi eşleşmeyi bul. Ön eleme yapılmaz:
+        # thefuzz'un kısmi oranları az 3-gram paylaşan adlara da yüksek puan verebilir.
         eslesme = process.extractOne(isim, self.operatorler, score_cutoff=70)
         return eslesme[0] if eslesme else None
 
@@ -31,11 +41,8 @@ class OperatorYoneticisi:
             return True  # Eğer db_manager yoksa ya da araç adı boşsa kontrolü geç
             
         try:
-            # Veritabanından tüm araçları al
-            araclar = self.db_manager.arac_listesi_al()
-            
-            # Mevcut sistemin akıllı eşleştirmesini kullan
-            eslesme = self.db_manager._smart_name_match(arac_adi, araclar)
+            # Araçlar tablosunun isim indeksinden ara (tüm listeyi çekmeden)
+            eslesme = self.db_manager.arac_bul(arac_adi)
             
             if eslesme:
                 return True
@@ -56,8 +63,7 @@ class OperatorYoneticisi:
         eslesen_kisi = self.operator_bul(kisi_adi)
         if eslesen_kisi:
             print(f"\nDEBUG: Operatör bulunuyor: {eslesen_kisi}...")
-            self.df_kisiler.loc[self.df_kisiler['Operatör'] == eslesen_kisi, 'Durum'] = 'aktif'
-            self.df_kisiler.loc[self.df_kisiler['Operatör'] == eslesen_kisi, 'Kullandığı Araç'] = arac_adi
+            self._depo.durum_ata(eslesen_kisi, 'aktif', arac_adi)
             print(f"\n'{eslesen_kisi}' adlı operatöre görev atandı.")
             return True
         else:
@@ -72,12 +78,8 @@ class OperatorYoneticisi:
         eslesen_kisi = self.operator_bul(olasi_isim)
         print(f"eslesen kisi: {eslesen_kisi}")
         if eslesen_kisi:
-            # Operatörün kullandığı aracı al
-            kullanilan_arac_sorgu = self.df_kisiler['Operatör'] == eslesen_kisi
-            kullanilan_arac = self.df_kisiler.loc[kullanilan_arac_sorgu, 'Kullandığı Araç'].iloc[0]
-            
-            # Operatörün durumunu ve araç bilgisini sıfırla
-            self.df_kisiler.loc[kullanilan_arac_sorgu, ['Durum', 'Kullandığı Araç']] = ['boşta', None]
+            # Operatörün durumunu ve araç bilgisini sıfırla; kullandığı araç geri döner
+            kullanilan_arac = self._depo.durum_ata(eslesen_kisi, 'boşta', None)
             
             print(f"\n'{eslesen_kisi}' adlı operatörün durumu 'boşta' olarak güncellendi.")
             return kullanilan_arac, eslesen_kisi # Kullandığı aracın ve operatörün adını döndür
@@ -90,8 +92,7 @@ class OperatorYoneticisi:
         if kisi_adi:
             eslesen_kisi = self.operator_bul(kisi_adi)
             if eslesen_kisi:
-                durum = self.df_kisiler.loc[self.df_kisiler['Operatör'] == eslesen_kisi, 'Durum'].iloc[0]
-                if durum != 'boşta':
+                if self._depo.durum(eslesen_kisi) != 'boşta':
                     return False, f"'{kisi_adi}' şu anda meşgul."
         if arac_adi and arac_yoneticisi:
             if not arac_yoneticisi.is_arac_musait(arac_adi):
@@ -0,0 +1,376 @@
+import itertools
+import random
+import threading
+from datetime import datetime, timedelta
+from name_index import isim_normalize
+
+# Tahmini bitişi olmayan aktif görevler bitirilene kadar meşgul sayılır
+ACIK_UC = datetime.max
+
+
+class _Dugum:
+    __slots__ = ("anahtar", "bit", "kimlik", "oncelik", "sol", "sag", "en_gec")
+
+    def __init__(self, anahtar, bit, kimlik):
+        self.anahtar = anahtar          # (başlangıç, sıra) - aynı başlangıçlı aralıklar da ayrışır
+        self.bit = bit
+        self.kimlik = kimlik
+        self.oncelik = random.random()
+        self.sol = None
+        self.sag = None
+        self.en_gec = bit               # alt ağaçtaki en geç bitiş
+
+
+def _guncelle(dugum):
+    en_gec = dugum.bit
+    if dugum.sol is not None and dugum.sol.en_gec > en_gec:
+        en_gec = dugum.sol.en_gec
+    if dugum.sag is not None and dugum.sag.en_gec > en_gec:
+        en_gec = dugum.sag.en_gec
+    dugum.en_gec = en_gec
+
+
+def _bol(dugum, anahtar):
+    """Ağacı (< anahtar, >= anahtar) olarak ikiye böler."""
+    if dugum is None:
+        return None, None
+    if dugum.anahtar < anahtar:
+        dugum.sag, sag = _bol(dugum.sag, anahtar)
+        _guncelle(dugum)
+        return dugum, sag
+    sol, dugum.sol = _bol(dugum.sol, anahtar)
+    _guncelle(dugum)
+    return sol, dugum
+
+
+def _birlestir(sol, sag):
+    if sol is None:
+        return sag
+    if sag is None:
+        return sol
+    if sol.oncelik > sag.oncelik:
+        sol.sag = _birlestir(sol.sag, sag)
+        _guncelle(sol)
+        return sol
+    sag.sol = _birlestir(sol, sag.sol)
+    _guncelle(sag)
+    return sag
+
+
+class AralikAgaci:
+    """
+    [başlangıç, bitiş) aralıkları için aralık ağacı: başlangıca göre sıralı bir
+    treap, her düğümde alt ağacın en geç bitişini tutar. Ekleme ve silme beklenen
+    O(log n), bir aralıkla kesişen k kaydı bulmak O(log n + k) sürer.
+    """
+
+    def __init__(self):
+        self._kok = None
+        self._anahtarlar = {}           # kimlik -> düğüm anahtarı
+        self._sira = itertools.count()
+
+    def __len__(self):
+        return len(self._anahtarlar)
+
+    def __contains__(self, kimlik):
+        return kimlik in self._anahtarlar
+
+    def ekle(self, bas, bit, kimlik):
+        """Aralığı ekler; aynı kimlikli aralık varsa yerine geçer."""
+        self.sil(kimlik)
+        dugum = _Dugum((bas, next(self._sira)), bit, kimlik)
+        sol, sag = _bol(self._kok, dugum.anahtar)
+        self._kok = _birlestir(_birlestir(sol, dugum), sag)
+        self._anahtarlar[kimlik] = dugum.anahtar
+
+    def sil(self, kimlik):
+        anahtar = self._anahtarlar.pop(kimlik, None)
+        if anahtar is None:
+            return False
+        sol, sag = _bol(self._kok, anahtar)
+        # sag'ın en küçük anahtarı silinecek düğümdür
+        _, sag = _bol(sag, (anahtar[0], anahtar[1] + 1))
+        self._kok = _birlestir(sol, sag)
+        return True
+
+    def kesisenler(self, bas, bit):
+        """[bas, bit) ile kesişen aralıklar: (başlangıç, bitiş, kimlik) listesi, başlangıç sırasıyla."""
+        sonuc = []
+        ziyaret = []
+        # Sıralı (in-order) gezinti; en geç bitişi bas'tan önce olan alt ağaçlar
+        # ve başlangıcı bit'ten sonra olan sağ kollar atlanır
+        dugum = self._kok
+        while ziyaret or dugum is not None:
+            if dugum is not None:
+                if dugum.en_gec <= bas:
+                    dugum = None
+                    continue
+                ziyaret.append(dugum)
+                dugum = dugum.sol
+                continue
+            dugum = ziyaret.pop()
+            if dugum.anahtar[0] >= bit:
+                break
+            if dugum.bit > bas:
+                sonuc.append((dugum.anahtar[0], dugum.bit, dugum.kimlik))
+            dugum = dugum.sag
+        return sonuc
+
+    def sonrakiler(self, bas):
+        """bas'tan sonra biten aralıkları başlangıç sırasıyla üretir."""
+        ziyaret = []
+        dugum = self._kok
+        while ziyaret or dugum is not None:
+            if dugum is not None:
+                if dugum.en_gec <= bas:
+                    dugum = None
+                    continue
+                ziyaret.append(dugum)
+                dugum = dugum.sol
+                continue
+            dugum = ziyaret.pop()
+            if dugum.bit > bas:
+                yield dugum.anahtar[0], dugum.bit, dugum.kimlik
+            dugum = dugum.sag
+
+
+def arac_turu(arac):
+    """'Vinç 1' -> 'vinc' (rule_parser ile aynı tür çıkarımı)."""
+    kelimeler = isim_normalize(arac or "").split()
+    return kelimeler[0] if kelimeler else ""
+
+
+class RezervasyonDefteri:
+    """
+    Araç ve operatör başına planlanmış zaman aralıklarını aralık ağaçlarında tutar.
+    Aktif görevler [başlangıç, Tahmini_bitis) olarak, ileri tarihli rezervasyonlar
+    'Rezervasyonlar' tablosundan yüklenir; sonrasında DatabaseManager'ın görev
+    olaylarıyla güncel tutulur. Her atamada çakışma kontrolü buradan yapılır.
+
+    Tahmini bitişi geçmiş aktif görev, bitirilene kadar şimdi başlayan istekleri
+    engeller; ileri tarihli istekleri engellemez.
+    """
+
+    # Bu süre içinde başlayan istekler "şimdi" başlıyor sayılır
+    SIMDI_PAYI = timedelta(minutes=1)
+
+    def __init__(self, db_manager=None, araclar=(), saat=datetime.now):
+        """
+        :param db_manager: Yükleme, kalıcı rezervasyon ve görev olayları için DatabaseManager (isteğe bağlı).
+        :param araclar: Alternatif önerilerinde kullanılacak araç adları (yukle() veritabanından doldurur).
+        """
+        self.db_manager = db_manager
+        self.saat = saat
+        self.araclar = list(araclar)
+        self._agaclar = {}              # ("arac" | "personel", ad) -> AralikAgaci
+        self._aktif = {}                # ("arac" | "personel", ad) -> {aktif görev kimliği}
+        self._kayitlar = {}             # kimlik -> (arac, personel, bas, bit, aciklama)
+        self._kilit = threading.RLock()
+        if db_manager is not None:
+            db_manager.gorev_dinleyicisi_ekle(self._gorev_olayi)
+
+    def yukle(self):
+        """
+        Aktif görevleri ve ileri tarihli rezervasyonları veritabanından okuyup ağaçları kurar.
+        :return: Yüklenen aralık sayısı; okunamazsa None.
+        """
+        simdi = self.saat()
+        gorevler = self.db_manager.aktif_gorev_bitisleri()
+        rezervasyonlar = self.db_manager.rezervasyonlari_al(simdi)
+        araclar = self.db_manager.arac_listesi_al()
+        if gorevler is None or rezervasyonlar is None:
+            return None
+        with self._kilit:
+            self._agaclar, self._aktif, self._kayitlar = {}, {}, {}
+            if araclar:
+                self.araclar = list(araclar)
+            for personel, arac, _, bitis in gorevler:
+                if personel:
+                    self._ekle(("gorev", personel), arac, personel, simdi, _tarih(bitis) or ACIK_UC, "Aktif görev")
+            for kimlik, arac, personel, bas, bit, aciklama in rezervasyonlar:
+                self._ekle(("rezervasyon", kimlik), arac, personel, _tarih(bas), _tarih(bit), aciklama)
+            return len(self._kayitlar)
+
+    @staticmethod
+    def _anahtarlar(arac, personel):
+        return [anahtar for anahtar in (("arac", arac), ("personel", personel)) if anahtar[1]]
+
+    def _ekle(self, kimlik, arac, personel, bas, bit, aciklama=None):
+        self._cikar(kimlik)
+        self._kayitlar[kimlik] = (arac, personel, bas, bit, aciklama)
+        for anahtar in self._anahtarlar(arac, personel):
+            self._agaclar.setdefault(anahtar, AralikAgaci()).ekle(bas, bit, kimlik)
+            if kimlik[0] == "gorev":
+                self._aktif.setdefault(anahtar, set()).add(kimlik)
+
+    def _cikar(self, kimlik):
+        kayit = self._kayitlar.pop(kimlik, None)
+        if kayit is None:
+            return
+        for anahtar in self._anahtarlar(kayit[0], kayit[1]):
+            self._agaclar[anahtar].sil(kimlik)
+            self._aktif.get(anahtar, set()).discard(kimlik)
+
+    def _gorev_olayi(self, olay, personel, gorev):
+        kimlik = ("gorev", personel)
+        with self._kilit:
+            if olay == 'eklendi':
+                self._ekle(kimlik, gorev.get('Arac'), personel, _tarih(gorev.get('Baslangic_tarihi')) or self.saat(),
+                           _tarih(gorev.get('Tahmini_bitis')) or ACIK_UC, "Aktif görev")
+            elif olay == 'uzatildi' and kimlik in self._kayitlar:
+                arac, _, bas, _, aciklama = self._kayitlar[kimlik]
+                self._ekle(kimlik, arac, personel, bas, _tarih(gorev.get('Tahmini_bitis')) or ACIK_UC, aciklama)
+            elif olay in ('tamamlandi', 'silindi'):
+                self._cikar(kimlik)
+
+    def _kesisenler(self, anahtar, bas, bit):
+        """Ağaçtaki kesişen kimlikler; şimdi başlayan isteklerde süresi geçmiş aktif görevler de dahil."""
+        agac = self._agaclar.get(anahtar)
+        if agac is None:
+            return []
+        kimlikler = [kimlik for _, _, kimlik in agac.kesisenler(bas, bit)]
+        if bas <= self.saat() + self.SIMDI_PAYI:
+            # Şimdi başlayan istekle kesişmeyen aktif görev, bitişi geçmiş ama bitirilmemiş görevdir
+            kimlikler += [kimlik for kimlik in self._aktif.get(anahtar, ()) if kimlik not in kimlikler]
+        return kimlikler
+
+    def cakismalar(self, arac, personel, bas, bit, haric=()):
+        """
+        İstenen aralıkla çakışan kayıtlar.
+        :param haric: Yok sayılacak kimlikler.
+        :return: [{"Kimlik", "Arac", "Personel", "Baslangic", "Bitis", "Aciklama", "Neden"}], başlangıç sırasıyla.
+        """
+        with self._kilit:
+            bulunan = {}
+            for anahtar in self._anahtarlar(arac, personel):
+                for kimlik in self._kesisenler(anahtar, bas, bit):
+                    if kimlik in haric or kimlik in bulunan:
+                        continue
+                    k_arac, k_personel, k_bas, k_bit, aciklama = self._kayitlar[kimlik]
+                    # Kişinin kendi rezervasyonunu aynı araçla kullanması çakışma değildir
+                    if kimlik[0] == "rezervasyon" and k_arac == arac and k_personel == personel:
+                        continue
+                    bulunan[kimlik] = {"Kimlik": kimlik, "Arac": k_arac, "Personel": k_personel,
+                                       "Baslangic": k_bas, "Bitis": k_bit, "Aciklama": aciklama,
+                                       "Neden": "araç" if anahtar[0] == "arac" else "personel"}
+            return sorted(bulunan.values(), key=lambda c: c["Baslangic"])
+
+    def _ilk_bosluk(self, anahtar, bas, sure):
+        """bas'tan sonra en az 'sure' uzunluğundaki ilk boşluğun başlangıcı (hiç yoksa None)."""
+        imlec = bas
+        simdi = self.saat()
+        if bas <= simdi + self.SIMDI_PAYI and self._aktif.get(anahtar):
+            # Aktif görev bitirilene kadar şimdiden başlanamaz
+            imlec = max(imlec, simdi + self.SIMDI_PAYI)
+        agac = self._agaclar.get(anahtar)
+        if agac is None:
+            return imlec
+        for a_bas, a_bit, _ in agac.sonrakiler(imlec):
+            if a_bas - imlec >= sure:
+                return imlec
+            imlec = max(imlec, a_bit)
+            if imlec == ACIK_UC:
+                return None
+        return imlec
+
+    def sonraki_bos_aralik(self, sure, tur=None, araclar=None, bas=None, personel=None):
+        """
+        Türdeki (ör. "vinç") veya verilen araçlardan en erken boşalanı bulur.
+        :param sure: timedelta.
+        :param personel: Verilirse operatörün de aynı aralıkta boş olması gerekir.
+        :return: (araç, başlangıç) veya uygun araç yoksa None.
+        """
+        bas = bas or self.saat()
+        with self._kilit:
+            if araclar:
+                adaylar = list(araclar)
+            else:
+                adaylar = [a for a in self.araclar if tur is None or arac_turu(a) == arac_turu(tur)]
+            en_iyi = None
+            for arac in adaylar:
+                zaman = bas
+                # Araç ve operatörün ortak boşluğu bulunana kadar iki takvim arasında ilerlenir
+                while zaman is not None:
+                    arac_zamani = self._ilk_bosluk(("arac", arac), zaman, sure)
+                    if arac_zamani is None or not personel:
+                        zaman = arac_zamani
+                        break
+                    kisi_zamani = self._ilk_bosluk(("personel", personel), arac_zamani, sure)
+                    if kisi_zamani is None or kisi_zamani == arac_zamani:
+                        zaman = kisi_zamani
+                        break
+                    zaman = kisi_zamani
+                if zaman is not None and (en_iyi is None or zaman < en_iyi[1]):
+                    en_iyi = (arac, zaman)
+            return en_iyi
+
+    def bos_kalacagi_zaman(self, arac=None, personel=None, bas=None):
+        """
+        Araç veya personelin bas'tan itibaren kesintisiz boş kalacağı son an.
+        :return: Şimdi meşgulse bas, hiç kaydı yoksa ACIK_UC.
+        """
+        bas = bas or self.saat()
+        anahtar = ("arac", arac) if arac else ("personel", personel)
+        with self._kilit:
+            if bas <= self.saat() + self.SIMDI_PAYI and self._aktif.get(anahtar):
+                return bas
+            agac = self._agaclar.get(anahtar)
+            ilk = next(agac.sonrakiler(bas), None) if agac is not None else None
+            return ACIK_UC if ilk is None else max(bas, ilk[0])
+
+    def alternatifler(self, arac, personel, bas, bit, limit=3):
+        """
+        Çakışan bir istek için öneriler: aynı türden o aralıkta boş araçlar ve
+        istenen aracın (operatörüyle birlikte) ilk boş zamanı.
+        :return: {"araclar": [araç adları], "ilk_bos": başlangıç veya None}
+        """
+        with self._kilit:
+            if not arac:
+                ilk = self._ilk_bosluk(("personel", personel), bas, bit - bas)
+                return {"araclar": [], "ilk_bos": ilk}
+            ayni_tur = [a for a in self.araclar if a != arac and arac_turu(a) == arac_turu(arac)]
+            bos_araclar = [a for a in ayni_tur if not self.cakismalar(a, personel, bas, bit)][:limit]
+            ilk = self.sonraki_bos_aralik(bit - bas, araclar=[arac], bas=bas, personel=personel)
+            return {"araclar": bos_araclar, "ilk_bos": ilk[1] if ilk else None}
+
+    def rezerve_et(self, arac, personel, bas, bit, aciklama=None):
+        """
+        Çakışma yoksa aralığı kaydeder (db_manager varsa 'Rezervasyonlar' tablosuna da).
+        :return: (kimlik, None) veya (None, {"cakismalar": [...], "alternatifler": {...}, "hata": mesaj})
+        """
+        if not bit > bas:
+            return None, {"cakismalar": [], "alternatifler": {}, "hata": "Bitiş başlangıçtan sonra olmalı."}
+        with self._kilit:
+            cakismalar = self.cakismalar(arac, personel, bas, bit)
+            if cakismalar:
+                return None, {"cakismalar": cakismalar, "alternatifler": self.alternatifler(arac, personel, bas, bit),
+                              "hata": "Seçilen aralık dolu."}
+            if self.db_manager is not None:
+                kimlik = self.db_manager.rezervasyon_ekle(arac, personel, bas, bit, aciklama)
+                if kimlik is None:
+                    return None, {"cakismalar": [], "alternatifler": {}, "hata": "Rezervasyon kaydedilemedi."}
+            else:
+                kimlik = max([k[1] for k in self._kayitlar if k[0] == "rezervasyon"], default=0) + 1
+            self._ekle(("rezervasyon", kimlik), arac, personel, bas, bit, aciklama)
+            return kimlik, None
+
+    def iptal_et(self, kimlik):
+        """Rezervasyonu siler. :return: Başarılı mı."""
+        with self._kilit:
+            if self.db_manager is not None and self.db_manager.rezervasyon_sil(kimlik) is None:
+                return False
+            self._cikar(("rezervasyon", kimlik))
+            return True
+
+    def rezervasyonlar(self, arac=None):
+        """Bellekteki rezervasyonlar ve aktif görevler, başlangıç sırasıyla."""
+        with self._kilit:
+            return sorted(({"Kimlik": kimlik, "Arac": a, "Personel": p, "Baslangic": b, "Bitis": e, "Aciklama": ac}
+                           for kimlik, (a, p, b, e, ac) in self._kayitlar.items() if arac is None or a == arac),
+                          key=lambda k: k["Baslangic"])
+
+
+def _tarih(deger):
+    if isinstance(deger, str):
+        return datetime.fromisoformat(deger)
+    return deger
@@ -0,0 +1,227 @@
+import re
+from name_index import IsimIndeksi, isim_normalize
+
+# Komut türü anahtar kelimeleri (normalize edilmiş). Alt dize olarak değil, kelimenin başında
+# aranır: "bekleyecek" içindeki "ekle" veya "etiket ekleme" uzatma sayılmaz.
+BITTI_KELIMELERI = ['bitti', 'tamamlandi', 'bitirdi', 'tamamladi', 'bitmis', 'tamamlanmis']
+UZATMA_KELIMELERI = ['uzat', 'artir']
+# Tek başına çok genel; yalnızca bir sürenin hemen yanında uzatma sayılır ("2 saat daha", "30 dk ekle")
+SURE_YANI_KELIMELERI = {'daha', 'ekle', 'ekleyin', 'ilave'}
+# Uzatma komutunda görev ifadesi sayılmayan kelimeler ("görevini 1 saat uzat")
+UZATMA_DOLGU_KELIMELERI = {'gorev', 'gorevi', 'gorevini', 'is', 'isi', 'isini', 'suresi', 'suresini', 'lutfen'}
+
+# Süre dilbilgisi
+SAYI_KELIMELERI = {
+    'bir': 1, 'iki': 2, 'uc': 3, 'dort': 4, 'bes': 5, 'alti': 6, 'yedi': 7, 'sekiz': 8, 'dokuz': 9,
+    'on': 10, 'yirmi': 20, 'otuz': 30, 'kirk': 40, 'elli': 50, 'altmis': 60, 'yetmis': 70,
+    'seksen': 80, 'doksan': 90, 'yarim': 0.5,
+}
+# (kök, dakika karşılığı) - "saatlik", "dakikada", "gunluk" gibi ekli haller köke göre tanınır
+SURE_BIRIMLERI = [('dakika', 1), ('dak', 1), ('dk', 1), ('saat', 60), ('gun', 1440), ('hafta', 10080)]
+TAM_BIRIMLER = {'sa': 60}
+_SAYI_BIRIM = re.compile(r'^(\d+(?:[.,]\d+)?)([a-z]*)$')
+
+# Görev açıklamasından atılan dolgu kelimeleri
+DOLGU_KELIMELERI = {'icin', 'boyunca', 'sure', 'sureyle', 'suresince', 've'}
+
+_NOKTALAMA = '.,!?;:"()[]{}'
+
+
+def _birim_dakika(kelime):
+    """Kelime bir süre birimiyse dakika karşılığını döndürür."""
+    if not kelime:
+        return None
+    if kelime in TAM_BIRIMLER:
+        return TAM_BIRIMLER[kelime]
+    for kok, dakika in SURE_BIRIMLERI:
+        if kelime.startswith(kok):
+            return dakika
+    return None
+
+
+def _kelime_var(normlar, kokler):
+    """Kelimelerden biri köklerden biriyle başlıyor mu."""
+    return any(norm.startswith(kok) for norm in normlar for kok in kokler)
+
+
+def sure_sozlugu(dakika):
+    """Toplam dakikayı uygulamanın beklediği {'value', 'unit'} biçimine çevirir."""
+    dakika = int(round(dakika))
+    if dakika and dakika % 1440 == 0:
+        return {"value": dakika // 1440, "unit": "gün"}
+    if dakika and dakika % 60 == 0:
+        return {"value": dakika // 60, "unit": "saat"}
+    return {"value": dakika, "unit": "dakika"}
+
+
+class KuralAyristirici:
+    """
+    Canlı personel ve araç listelerini sözlük (gazetteer) olarak kullanan
+    kural tabanlı komut ayrıştırıcı. Kişi ve araç adları listeden bulunur,
+    süre "2 saat", "yarım gün", "45 dk", "bir buçuk saat" gibi kalıplardan
+    çıkarılır, birden çok araç varsa "ile" kelimesinden önceki seçilir.
+    Sonuçtan emin değilse None döner ve karar LLM'e bırakılır.
+    """
+
+    MAX_ISIM_KELIME = 4
+
+    def __init__(self, personeller=(), araclar=()):
+        self.personel_indeksi = IsimIndeksi(personeller)
+        self.arac_indeksi = IsimIndeksi(araclar)
+        # Araç türleri listeden türetilir: "Vinç 1" -> "vinc"
+        self.arac_turleri = {isim_normalize(a).split()[0] for a in self.arac_indeksi.isimler()
+                             if isim_normalize(a).split() and isim_normalize(a).split()[0].isalpha()}
+
+    def _kelimeler(self, metin):
+        """(orijinal, normalize) kelime çiftleri; kesme işaretli ekler (Baydemir'e) atılır."""
+        sonuc = []
+        for kelime in metin.split():
+            temiz = kelime.strip(_NOKTALAMA)
+            kok = re.split("['’]", temiz)[0]
+            if kok:
+                sonuc.append((temiz, isim_normalize(kok)))
+        return sonuc
+
+    def _aralik_bul(self, normlar, kullanilan, indeks, bulanik=False):
+        """
+        Listede geçen adların (başlangıç, bitiş, ad) aralıklarını bulur.
+        Önce en uzun tam eşleşmeler, bulanik=True ise en az iki kelimelik
+        ve tek bir adayı açıkça öne çıkan yakın eşleşmeler de alınır.
+        """
+        bulunanlar = []
+        i = 0
+        while i < len(normlar):
+            eslesme = None
+            for uzunluk in range(min(self.MAX_ISIM_KELIME, len(normlar) - i), 0, -1):
+                if any(j in kullanilan for j in range(i, i + uzunluk)):
+                    continue
+                parca = ' '.join(normlar[i:i + uzunluk])
+                ad = indeks.tam(parca)
+                if ad is None and bulanik and uzunluk >= 2:
+                    adaylar = indeks.ara(parca, limit=2, esik=100)
+                    if adaylar and (len(adaylar) == 1 or adaylar[1][1] < adaylar[0][1]):
+                        ad = adaylar[0][0]
+                if ad is not None:
+                    eslesme = (i, i + uzunluk, ad)
+                    break
+            if eslesme:
+                bulunanlar.append(eslesme)
+                kullanilan.update(range(eslesme[0], eslesme[1]))
+                i = eslesme[1]
+            else:
+                i += 1
+        return bulunanlar
+
+    def _sure_bul(self, normlar, kullanilan):
+        """Süre ifadelerini bulur, toplam dakikayı döndürür ve kullanılan kelimeleri işaretler."""
+        toplam = 0
+        bulundu = False
+        i = 0
+        while i < len(normlar):
+            if i in kullanilan:
+                i += 1
+                continue
+            kelime = normlar[i]
+            deger, j, birim = None, i + 1, None
+
+            eslesme = _SAYI_BIRIM.match(kelime)
+            if eslesme:
+                deger = float(eslesme.group(1).replace(',', '.'))
+                birim = _birim_dakika(eslesme.group(2))
+            elif kelime in SAYI_KELIMELERI:
+                deger = SAYI_KELIMELERI[kelime]
+                # "on beş" gibi bileşik sayılar
+                if deger >= 10 and j < len(normlar) and normlar[j] in SAYI_KELIMELERI and SAYI_KELIMELERI[normlar[j]] < 10:
+                    deger += SAYI_KELIMELERI[normlar[j]]
+                    j += 1
+
+            if deger is not None and birim is None:
+                if j < len(normlar) and normlar[j] == 'bucuk':
+                    deger += 0.5
+                    j += 1
+                if j < len(normlar):
+                    birim = _birim_dakika(normlar[j])
+                    if birim:
+                        j += 1
+                # "saat buçuk" (ör. "iki saat buçuk")
+                if birim and j < len(normlar) and normlar[j] == 'bucuk':
+                    deger += 0.5
+                    j += 1
+
+            if deger is not None and birim:
+                toplam += deger * birim
+                bulundu = True
+                kullanilan.update(range(i, j))
+                i = j
+            else:
+                i += 1
+        return toplam if bulundu else None
+
+    def ayristir(self, metin):
+        """
+        Metni kurallarla ayrıştırmayı dener.
+        :return: (sonuç sözlüğü veya None, açıklama). None ise metin belirsizdir.
+        """
+        kelimeler = self._kelimeler(metin or "")
+        if not kelimeler:
+            return None, "boş metin"
+        normlar = [norm for _, norm in kelimeler]
+        kullanilan = set()
+
+        kisiler = self._aralik_bul(normlar, kullanilan, self.personel_indeksi, bulanik=True)
+        if len({ad for _, _, ad in kisiler}) != 1:
+            return None, f"{len(kisiler)} kişi bulundu"
+        kisi = kisiler[0][2]
+
+        if _kelime_var(normlar, BITTI_KELIMELERI):
+            return {"komut_turu": 'gorev_bitti', "person": kisi}, "kural"
+
+        araclar = self._aralik_bul(normlar, kullanilan, self.arac_indeksi)
+        sure_oncesi = set(kullanilan)
+        sure = self._sure_bul(normlar, kullanilan)
+        sure_kelimeleri = kullanilan - sure_oncesi
+
+        uzatma = [i for i, norm in enumerate(normlar) if i not in kullanilan and (
+            _kelime_var([norm], UZATMA_KELIMELERI)
+            or (norm in SURE_YANI_KELIMELERI and (i - 1 in sure_kelimeleri or i + 1 in sure_kelimeleri)))]
+        if uzatma:
+            if not sure:
+                return None, "süre bulunamadı"
+            kullanilan.update(uzatma)
+            kalan = [normlar[i] for i in range(len(normlar)) if i not in kullanilan
+                     and normlar[i] not in DOLGU_KELIMELERI and normlar[i] not in UZATMA_DOLGU_KELIMELERI]
+            # Araç veya görev ifadesi de geçiyorsa yeni görev olabilir; karar LLM'e bırakılır
+            if araclar or kalan:
+                return None, "uzatma kelimesi araç/görev ifadesiyle birlikte"
+            return {"komut_turu": 'sure_uzatma', "person": kisi, "duration": sure_sozlugu(sure)}, "kural"
+        komut_turu = 'yeni_gorev'
+
+        # Listede olmayan bir araç türü geçiyorsa (ör. "vinç 7") karar LLM'e bırakılır
+        arac_turu_kaldi = any(normlar[i] in self.arac_turleri for i in range(len(normlar)) if i not in kullanilan)
+        if arac_turu_kaldi:
+            return None, "tanınmayan araç"
+
+        arac = None
+        if araclar:
+            arac = araclar[0][2]
+            for baslangic, bitis, ad in araclar:
+                if bitis < len(normlar) and normlar[bitis] == 'ile':
+                    arac = ad
+                    kullanilan.add(bitis)
+                    break
+
+        gorev_kelimeleri = [kelimeler[i][0] for i in range(len(kelimeler))
+                            if i not in kullanilan and normlar[i] not in DOLGU_KELIMELERI and normlar[i] != 'ile']
+        if any(any(c.isdigit() for c in k) for k in gorev_kelimeleri):
+            return None, "yorumlanamayan sayı"
+        gorev = ' '.join(gorev_kelimeleri)
+        if not gorev:
+            return None, "görev açıklaması yok"
+
+        return {
+            "komut_turu": komut_turu,
+            "person": kisi,
+            "task": gorev,
+            "duration": sure_sozlugu(sure) if sure else None,
+            "vehicle": arac,
+        }, "kural"
@@ -0,0 +1,66 @@
+import threading
+from collections import namedtuple
+
+# Tek bir sütunun katalog bilgisi
+Sutun = namedtuple("Sutun", ["ad", "tur", "bos_olabilir", "kimlik"])
+
+
+class SemaKatalogu:
+    """
+    Veritabanı şemasını (tablolar, sütunlar, tipler, IDENTITY sütunları) bir kez
+    yükleyip bellekte tutar. Her yazma işleminde sys.tables / INFORMATION_SCHEMA
+    sorgulamak yerine bu katalog kullanılır; şema değişirse gecersiz_kil() çağrılır.
+    """
+
+    def __init__(self, backend):
+        """:param backend: katalog_sorgula(cursor) metodunu sağlayan arka uç."""
+        self.backend = backend
+        self._tablolar = None
+        self._kilit = threading.Lock()
+
+    @property
+    def yuklu(self):
+        """Katalog bellekte mi?"""
+        return self._tablolar is not None
+
+    def yukle(self, cursor):
+        """Şemayı tek seferde okuyup kataloğu doldurur."""
+        tablolar = {}
+        for tablo, sutun, tur, bos_olabilir, kimlik in self.backend.katalog_sorgula(cursor):
+            tablolar.setdefault(tablo, []).append(
+                Sutun(sutun, (tur or "").lower(), bool(bos_olabilir), bool(kimlik))
+            )
+        with self._kilit:
+            self._tablolar = tablolar
+
+    def hazirla(self, cursor):
+        """Katalog yüklü değilse yükler."""
+        if not self.yuklu:
+            self.yukle(cursor)
+
+    def gecersiz_kil(self):
+        """Kataloğu siler; bir sonraki erişimde yeniden yüklenir."""
+        with self._kilit:
+            self._tablolar = None
+
+    def tablolar(self):
+        """Bilinen tablo adlarının listesi."""
+        return list(self._tablolar or {})
+
+    def tablo_var_mi(self, tablo):
+        return tablo in (self._tablolar or {})
+
+    def sutunlar(self, tablo):
+        """Tablonun sütun adlarını sıralı olarak döndürür."""
+        return [s.ad for s in (self._tablolar or {}).get(tablo, [])]
+
+    def sutun_bilgileri(self, tablo):
+        """Tablonun Sutun kayıtlarını döndürür."""
+        return list((self._tablolar or {}).get(tablo, []))
+
+    def sutun_var_mi(self, tablo, sutun):
+        return sutun in self.sutunlar(tablo)
+
+    def kimlik_sutunlari(self, tablo):
+        """Tablodaki IDENTITY (otomatik artan) sütunların adları."""
+        return [s.ad for s in (self._tablolar or {}).get(tablo, []) if s.kimlik]
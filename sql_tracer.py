@@ -0,0 +1,321 @@
+import contextvars
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+
+# Şu anki kullanıcı komutunun izi (asenkron görevler ve iş parçacıkları arasında karışmaz)
+_aktif_iz = contextvars.ContextVar("sql_komut_izi", default=None)
+
+# Katalog/şema keşfi için yapılan sorgular
+SEMA_SORGUSU = re.compile(r"INFORMATION_SCHEMA|sqlite_master|sqlite_schema|\bPRAGMA\b|"
+                          r"\bsys\.(?:tables|columns|objects|identity_columns)\b|OBJECT_ID\s*\(", re.I)
+_SECIM = re.compile(r"^SELECT\s+(?:DISTINCT\s+)?(?:TOP\s*\(?\d+\)?\s+)?(?P<liste>.+?)\s+FROM\s+\[?(?P<tablo>\w+)\]?"
+                    r"(?P<kosul>.*)$", re.I | re.S)
+_SIRALAMA = re.compile(r"\b(?:ORDER\s+BY|GROUP\s+BY|LIMIT)\b", re.I)
+_PARAMETRE_LISTESI = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def ifade_kalibi(sql):
+    """Boşlukları sadeleştirir ve 'IN (?, ?, ?)' listelerini tek kalıba indirir."""
+    return _PARAMETRE_LISTESI.sub("?, …", " ".join(str(sql).split()))
+
+
+def parametre_sekli(parametreler):
+    """Parametrelerin değerleri yerine türleri: '(str, int)'."""
+    if parametreler is None:
+        return "()"
+    if not isinstance(parametreler, (tuple, list)):
+        parametreler = (parametreler,)
+    return "(" + ", ".join(type(p).__name__ for p in parametreler) + ")"
+
+
+class KomutSqlIzi:
+    """Tek bir kullanıcı komutunun (ör. 'gorev_bitti') çalıştırdığı ifadeler."""
+
+    def __init__(self, ad, acik=True):
+        """:param acik: Komut kullanıcı tarafından başlatıldıysa True; komut dışı bağlantılar için False."""
+        self.ad = ad
+        self.acik = acik
+        self.ifadeler = []
+        self.commit = 0
+        self.rollback = 0
+        self.hata = False
+        self.sure_ms = None
+        self._baslangic = time.perf_counter()
+
+    def ifade_ekle(self, sql, parametre, sure, satir, metot):
+        sql = ifade_kalibi(sql)
+        kayit = {"sql": sql, "parametre": parametre, "sure_ms": sure * 1000, "satir": satir, "metot": metot,
+                 "sema": bool(SEMA_SORGUSU.search(sql))}
+        self.ifadeler.append(kayit)
+        return kayit
+
+    def bitir(self):
+        self.sure_ms = (time.perf_counter() - self._baslangic) * 1000
+
+    @property
+    def sql_ms(self):
+        return sum(ifade["sure_ms"] for ifade in self.ifadeler)
+
+    @property
+    def sema_sorgusu(self):
+        return sum(1 for ifade in self.ifadeler if ifade["sema"])
+
+    def ozet_satiri(self):
+        """'gorev_bitti: 13 ifade, 3 commit, 41 ms'"""
+        return f"{self.ad}: {len(self.ifadeler)} ifade, {self.commit} commit, {self.sure_ms or 0:.0f} ms"
+
+    def bulgular(self):
+        """
+        Gereksiz gidiş-dönüşleri işaretler.
+        :return: (tür, mesaj) listesi. Mesajlarda parametre değerleri yer almaz, böylece
+            aynı kalıp farklı komutlarda tek satırda toplanır.
+        """
+        bulgular = []
+        sema = [ifade for ifade in self.ifadeler if ifade["sema"]]
+        if len(sema) > 1:
+            bulgular.append(("sema_sorgusu", f"{len(sema)} şema sorgusu "
+                                             f"({', '.join(sorted({i['metot'] for i in sema}))})"))
+
+        tekrarlar = Counter((ifade["sql"], ifade["parametre"]) for ifade in self.ifadeler if not ifade["sema"])
+        for (sql, parametre), adet in tekrarlar.items():
+            if adet > 1:
+                bulgular.append(("tekrarlanan_ifade", f"{adet} kez aynı ifade: {sql} {parametre}"))
+
+        # Aynı tablo ve koşul için ayrı ayrı yapılan okumalar (ör. COUNT(*) → SELECT Personel → SELECT *)
+        okumalar = {}
+        for ifade in self.ifadeler:
+            eslesme = _SECIM.match(ifade["sql"])
+            if not eslesme or ifade["sema"]:
+                continue
+            kosul = _SIRALAMA.split(eslesme.group("kosul"))[0].strip()
+            listeler = okumalar.setdefault((eslesme.group("tablo"), kosul), [])
+            if eslesme.group("liste") not in listeler:
+                listeler.append(eslesme.group("liste"))
+        for (tablo, kosul), listeler in okumalar.items():
+            if len(listeler) > 1 and kosul:
+                bulgular.append(("ayri_okuma", f"{tablo} {kosul}: {len(listeler)} ayrı okuma "
+                                               f"({' → '.join(listeler)})"))
+
+        if self.commit > 1:
+            bulgular.append(("coklu_commit", f"{self.commit} commit (tek işlemde birleştirilebilir)"))
+        return bulgular
+
+
+class _IzliCursor:
+    """Sürücü imlecini sarar; her ifadenin süresini, parametre şeklini ve satır sayısını kaydeder."""
+
+    def __init__(self, cursor, baglanti):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_baglanti", baglanti)
+        object.__setattr__(self, "_son", None)
+
+    def __getattr__(self, ad):
+        return getattr(self._cursor, ad)
+
+    def __setattr__(self, ad, deger):
+        # ör. SqlServerBackend'in ayarladığı fast_executemany
+        setattr(self._cursor, ad, deger)
+
+    def __iter__(self):
+        for satir in self._cursor:
+            self._okundu(1)
+            yield satir
+
+    def _calistir(self, fonksiyon, sql, parametreler, sekil):
+        baslangic = time.perf_counter()
+        try:
+            fonksiyon(sql, *parametreler)
+        finally:
+            sure = time.perf_counter() - baslangic
+            satir = getattr(self._cursor, "rowcount", -1)
+            kayit = self._baglanti._komut_izi.ifade_ekle(sql, sekil, sure, satir if satir >= 0 else 0,
+                                                         self._baglanti._metot)
+            object.__setattr__(self, "_son", kayit)
+        return self
+
+    def execute(self, sql, *parametreler):
+        sekil = parametre_sekli(parametreler[0] if len(parametreler) == 1 else parametreler or None)
+        return self._calistir(self._cursor.execute, sql, parametreler, sekil)
+
+    def executemany(self, sql, satirlar):
+        satirlar = list(satirlar)
+        sekil = f"{len(satirlar)}×{parametre_sekli(satirlar[0]) if satirlar else '()'}"
+        return self._calistir(self._cursor.executemany, sql, (satirlar,), sekil)
+
+    def _okundu(self, adet, sure=0.0):
+        if self._son is not None:
+            self._son["satir"] += adet
+            self._son["sure_ms"] += sure * 1000
+
+    def fetchone(self):
+        baslangic = time.perf_counter()
+        satir = self._cursor.fetchone()
+        self._okundu(0 if satir is None else 1, time.perf_counter() - baslangic)
+        return satir
+
+    def fetchall(self):
+        baslangic = time.perf_counter()
+        satirlar = self._cursor.fetchall()
+        self._okundu(len(satirlar), time.perf_counter() - baslangic)
+        return satirlar
+
+    def fetchmany(self, *args):
+        baslangic = time.perf_counter()
+        satirlar = self._cursor.fetchmany(*args)
+        self._okundu(len(satirlar), time.perf_counter() - baslangic)
+        return satirlar
+
+
+class _IzliBaglanti:
+    """Havuzdan alınan bağlantıyı sarar; commit ve rollback'leri komut izine sayar."""
+
+    def __init__(self, baglanti, iz, metot):
+        self._baglanti = baglanti
+        self._komut_izi = iz
+        self._metot = metot
+
+    def __getattr__(self, ad):
+        return getattr(self._baglanti, ad)
+
+    def cursor(self):
+        return _IzliCursor(self._baglanti.cursor(), self)
+
+    def commit(self):
+        self._baglanti.commit()
+        self._komut_izi.commit += 1
+
+    def rollback(self):
+        self._baglanti.rollback()
+        self._komut_izi.rollback += 1
+
+
+class SqlIzleyici:
+    """
+    DatabaseManager'ın çalıştırdığı her ifadeyi, onu tetikleyen kullanıcı komutuna göre
+    gruplayarak kaydeder. Komut dışında açılan bağlantılar '(metot adı)' adlı ayrı izlere düşer.
+    Ölçüm amaçlıdır; DatabaseManager.sql_izleyici ayarlı değilse hiçbir sarma yapılmaz.
+    """
+
+    def __init__(self, son=200, yazdir=True):
+        """
+        :param son: Bellekte tutulacak son komut izi sayısı.
+        :param yazdir: True ise her kullanıcı komutu bittiğinde özet ve bulgular yazdırılır.
+        """
+        self.son_izler = deque(maxlen=son)
+        self.yazdir = yazdir
+        self._toplamlar = {}
+        self._kilit = threading.Lock()
+
+    @contextmanager
+    def komut(self, ad):
+        """
+        Blok içinde (ve bloktan başlatılan asenkron görevlerde) çalışan ifadeleri 'ad' komutuna yazar.
+        İç içe çağrılarda dıştaki komut geçerli kalır.
+        """
+        mevcut = _aktif_iz.get()
+        if mevcut is not None:
+            yield mevcut
+            return
+        iz = KomutSqlIzi(ad)
+        belirtec = _aktif_iz.set(iz)
+        try:
+            yield iz
+        except BaseException:
+            iz.hata = True
+            raise
+        finally:
+            _aktif_iz.reset(belirtec)
+            self._kapat(iz)
+
+    @contextmanager
+    def baglanti(self, havuz_baglantisi, metot):
+        """
+        Havuzun baglanti() context manager'ını izlenen bağlantıyla sarar.
+        :param metot: Bağlantıyı alan DatabaseManager metodu (ifadelerin kaynağı olarak kaydedilir).
+        """
+        iz = _aktif_iz.get()
+        belirtec = None
+        if iz is None:
+            iz = KomutSqlIzi(f"({metot})", acik=False)
+            belirtec = _aktif_iz.set(iz)
+        try:
+            with havuz_baglantisi as baglanti:
+                yield _IzliBaglanti(baglanti, iz, metot)
+        except BaseException:
+            iz.hata = True
+            raise
+        finally:
+            if belirtec is not None:
+                _aktif_iz.reset(belirtec)
+                self._kapat(iz)
+
+    def _kapat(self, iz):
+        iz.bitir()
+        bulgular = iz.bulgular()
+        with self._kilit:
+            self.son_izler.append(iz)
+            toplam = self._toplamlar.get(iz.ad)
+            if toplam is None:
+                toplam = self._toplamlar[iz.ad] = {"adet": 0, "ifade": 0, "commit": 0, "sure_ms": 0.0,
+                                                   "sql_ms": 0.0, "sema_sorgusu": 0, "bulgular": Counter()}
+            toplam["adet"] += 1
+            toplam["ifade"] += len(iz.ifadeler)
+            toplam["commit"] += iz.commit
+            toplam["sure_ms"] += iz.sure_ms
+            toplam["sql_ms"] += iz.sql_ms
+            toplam["sema_sorgusu"] += iz.sema_sorgusu
+            toplam["bulgular"].update(mesaj for _, mesaj in bulgular)
+        if self.yazdir and iz.acik:
+            print(f"SQL: {iz.ozet_satiri()}")
+            for _, mesaj in bulgular:
+                print(f"  ! {mesaj}")
+
+    def ozet(self, komut_disi=True):
+        """
+        Komut adı bazında komut başına ortalamalar.
+        :param komut_disi: False ise '(metot)' adlı komut dışı izler atlanır.
+        :return: {ad: {"adet", "ifade", "commit", "sure_ms", "sql_ms", "sema_sorgusu", "bulgular"}}
+        """
+        with self._kilit:
+            toplamlar = {ad: dict(t, bulgular=Counter(t["bulgular"])) for ad, t in self._toplamlar.items()}
+        ozet = {}
+        for ad in sorted(toplamlar, key=lambda a: (a.startswith("("), a)):
+            if not komut_disi and ad.startswith("("):
+                continue
+            t = toplamlar[ad]
+            adet = t["adet"]
+            ozet[ad] = {
+                "adet": adet,
+                "ifade": round(t["ifade"] / adet, 2),
+                "commit": round(t["commit"] / adet, 2),
+                "sure_ms": round(t["sure_ms"] / adet, 3),
+                "sql_ms": round(t["sql_ms"] / adet, 3),
+                "sema_sorgusu": round(t["sema_sorgusu"] / adet, 2),
+                # Bulgunun görüldüğü komut sayısı
+                "bulgular": dict(t["bulgular"].most_common()),
+            }
+        return ozet
+
+    def rapor(self, komut_disi=False, bulgu_sayisi=5):
+        """Okunabilir rapor: 'gorev_bitti: 13 ifade, 3 commit, 41 ms (ortalama, 25 komut)' ve sık bulgular."""
+        satirlar = []
+        for ad, s in self.ozet(komut_disi).items():
+            satirlar.append(f"{ad}: {s['ifade']:g} ifade, {s['commit']:g} commit, {s['sure_ms']:.0f} ms "
+                            f"(ortalama, {s['adet']} komut)")
+            for mesaj, adet in list(s["bulgular"].items())[:bulgu_sayisi]:
+                satirlar.append(f"  ! {mesaj} [{adet}/{s['adet']}]")
+        return "\n".join(satirlar)
+
+    def sifirla(self):
+        with self._kilit:
+            self.son_izler.clear()
+            self._toplamlar.clear()
+
+
+def sql_komutu(db_manager, ad):
+    """İzleme açıksa 'ad' komutunun bloğunu izleyen context manager; kapalıysa etkisiz."""
+    izleyici = getattr(db_manager, "sql_izleyici", None)
+    return izleyici.komut(ad) if izleyici is not None else nullcontext()
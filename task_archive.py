@@ -0,0 +1,203 @@
+import os
+from datetime import datetime, timedelta
+import pandas as pd
+from database_backends import backend_olustur
+from database_manager import DatabaseManager
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Arşiv isteğe bağlıdır; uygulamanın geri kalanı pyarrow olmadan çalışır
+    pa = None
+
+
+def _pyarrow_gerekli():
+    if pa is None:
+        raise RuntimeError("Görev arşivi için pyarrow kurulu olmalı.")
+
+
+def _sutun_tipi(sutun):
+    """Bilinen sütunların Arrow tipi; diğerleri veriden çıkarılır (None)."""
+    return {
+        "ID": pa.int64(),
+        "Personel": pa.string(),
+        "Arac": pa.string(),
+        "Gorev": pa.string(),
+        "Durum": pa.string(),
+        "Baslangic_tarihi": pa.timestamp("us"),
+        "Tahmini_bitis": pa.timestamp("us"),
+        "Bitis_tarihi": pa.timestamp("us"),
+    }.get(sutun)
+
+
+class GorevArsivi:
+    """
+    'Tamamlanan_isler' için aylık bölümlenmiş Parquet arşivi.
+    Saklama süresini aşan satırlar dizin/yil=YYYY/ay=MM/ altındaki parça dosyalarına
+    taşınır ve canlı tablodan silinir; böylece canlı tablo küçük kalır. Her taşıma
+    parçası ayın dizinine yeni bir dosya olarak eklenir, mevcut dosyalar yeniden
+    yazılmaz. Sorgular yalnızca tarih aralığına düşen ayların dosyalarını ve istenen
+    sütunları okur. Dosyalar (Arac, Bitis_tarihi) sırasıyla yazıldığından araç ve
+    tarih filtreleri satır grubu istatistikleriyle ayrıca daraltılır.
+    """
+
+    SATIR_GRUBU = 65536
+
+    def __init__(self, dizin="arsiv", saklama_gun=180, db_manager=None):
+        """
+        :param dizin: Arşiv kök dizini.
+        :param saklama_gun: Bu kadar günden eski bitmiş işler arşive taşınır.
+        :param db_manager: Taşıma (sikistir) için bağlanmış DatabaseManager; yalnızca sorgu için gerekmez.
+        """
+        self.dizin = dizin
+        self.saklama_gun = saklama_gun
+        self.db_manager = db_manager
+
+    def _ay_dizini(self, yil, ay):
+        return os.path.join(self.dizin, f"yil={yil:04d}", f"ay={ay:02d}")
+
+    def _ay_dosyalari(self, yil, ay):
+        """Ayın parça dosyaları (eski sürümlerin tek 'tamamlanan.parquet' dosyası dahil)."""
+        dizin = self._ay_dizini(yil, ay)
+        if not os.path.isdir(dizin):
+            return []
+        return sorted(os.path.join(dizin, ad) for ad in os.listdir(dizin) if ad.endswith(".parquet"))
+
+    def aylar(self):
+        """Arşivde bulunan (yıl, ay) çiftleri, sıralı."""
+        sonuc = []
+        if not os.path.isdir(self.dizin):
+            return sonuc
+        for yil_dizini in os.listdir(self.dizin):
+            if not yil_dizini.startswith("yil="):
+                continue
+            for ay_dizini in os.listdir(os.path.join(self.dizin, yil_dizini)):
+                if ay_dizini.startswith("ay="):
+                    yil, ay = int(yil_dizini[4:]), int(ay_dizini[3:])
+                    if self._ay_dosyalari(yil, ay):
+                        sonuc.append((yil, ay))
+        return sorted(sonuc)
+
+    def _arsivdeki_kimlikler(self, yil, ay, kimlik):
+        """Ayın dosyalarındaki kimlik değerleri (yalnızca kimlik sütunu okunur)."""
+        kimlikler = set()
+        for dosya in self._ay_dosyalari(yil, ay):
+            kimlikler.update(pq.read_table(dosya, columns=[kimlik])[kimlik].to_pylist())
+        return kimlikler
+
+    def _parca_yaz(self, yil, ay, satirlar, dosya_adi):
+        """Satırları ayın dizinine yeni bir parça dosyası olarak atomik yazar."""
+        sutunlar = list(satirlar[0])
+        tablo = pa.table({sutun: pa.array([satir[sutun] for satir in satirlar], type=_sutun_tipi(sutun))
+                          for sutun in sutunlar})
+        tablo = tablo.sort_by([("Arac", "ascending"), ("Bitis_tarihi", "ascending")])
+
+        dosya = os.path.join(self._ay_dizini(yil, ay), dosya_adi)
+        os.makedirs(os.path.dirname(dosya), exist_ok=True)
+        # .tmp uzantılı yarım dosyalar sorgulara girmez
+        gecici = f"{dosya}.{os.getpid()}.tmp"
+        pq.write_table(tablo, gecici, row_group_size=self.SATIR_GRUBU, compression="zstd")
+        os.replace(gecici, dosya)
+
+    def sikistir(self, simdi=None, parca_boyutu=50000):
+        """
+        Saklama süresini aşan tamamlanmış işleri arşive taşır.
+        Her parça önce ay dizinlerine yeni dosya olarak yazılır, ardından canlı tablodan
+        silinir; mevcut arşiv dosyaları okunup yeniden yazılmaz. Silme başarısız olmuş
+        bir taşıma tekrarlandığında arşivde zaten bulunan kimlikler yeniden yazılmaz.
+        :param simdi: Kesim zamanının hesaplanacağı an (varsayılan: şimdi).
+        :param parca_boyutu: Bir seferde taşınacak en fazla satır.
+        :return: {"tasinan": satır sayısı, "aylar": güncellenen (yıl, ay) listesi}
+        """
+        _pyarrow_gerekli()
+        if self.db_manager is None:
+            raise RuntimeError("Arşive taşımak için DatabaseManager verilmeli.")
+        kesim = (simdi or datetime.now()) - timedelta(days=self.saklama_gun)
+
+        tasinan, guncellenen = 0, set()
+        calisma = f"{datetime.now():%Y%m%d%H%M%S}-{os.getpid()}"
+        arsivdekiler = {}            # (yıl, ay) -> arşivdeki kimlikler; ay başına bir kez okunur
+        parca_no = 0
+        while True:
+            sonuc = self.db_manager.arsivlenecek_tamamlananlar(kesim, parca_boyutu)
+            if not sonuc or not sonuc[0]:
+                break
+            satirlar, kimlik = sonuc
+
+            aylara_gore = {}
+            for satir in satirlar:
+                tarih = satir["Bitis_tarihi"]
+                aylara_gore.setdefault((tarih.year, tarih.month), []).append(satir)
+            for (yil, ay), ay_satirlari in aylara_gore.items():
+                if (yil, ay) not in arsivdekiler:
+                    arsivdekiler[(yil, ay)] = self._arsivdeki_kimlikler(yil, ay, kimlik)
+                mevcut = arsivdekiler[(yil, ay)]
+                yeni = [satir for satir in ay_satirlari if satir[kimlik] not in mevcut]
+                if yeni:
+                    self._parca_yaz(yil, ay, yeni, f"parca-{calisma}-{parca_no:05d}.parquet")
+                    mevcut.update(satir[kimlik] for satir in yeni)
+                    guncellenen.add((yil, ay))
+            parca_no += 1
+
+            silinen = self.db_manager.tamamlananlari_sil([satir[kimlik] for satir in satirlar])
+            if silinen is None:
+                # Satırlar arşivde; bir sonraki çalıştırmada yeniden denenir
+                break
+            tasinan += silinen
+            print(f"Arşive taşındı: {silinen} satır ({len(aylara_gore)} ay)")
+            if len(satirlar) < parca_boyutu:
+                break
+        return {"tasinan": tasinan, "aylar": sorted(guncellenen)}
+
+    def _dosyalar(self, baslangic, bitis):
+        """Tarih aralığıyla kesişen ayların dosyaları."""
+        dosyalar = []
+        for yil, ay in self.aylar():
+            ay_basi = datetime(yil, ay, 1)
+            sonraki_ay = datetime(yil + ay // 12, ay % 12 + 1, 1)
+            if (bitis is None or ay_basi < bitis) and (baslangic is None or sonraki_ay > baslangic):
+                dosyalar.extend(self._ay_dosyalari(yil, ay))
+        return dosyalar
+
+    def sorgula(self, baslangic=None, bitis=None, personel=None, arac=None, durum=None, sutunlar=None):
+        """
+        Arşivden filtreli okuma yapar.
+        Örnek: 2025'te vinç 1 ile yapılan işler ->
+            sorgula(datetime(2025, 1, 1), datetime(2026, 1, 1), arac="Vinç 1")
+        :param baslangic: Bu zamandan (dahil) sonra bitenler.
+        :param bitis: Bu zamandan (hariç) önce bitenler.
+        :param sutunlar: Okunacak sütunlar (varsayılan: hepsi).
+        :return: pandas DataFrame.
+        """
+        _pyarrow_gerekli()
+        dosyalar = self._dosyalar(baslangic, bitis)
+        if not dosyalar:
+            return pd.DataFrame(columns=sutunlar or [])
+
+        kosul = None
+        for alan, deger, karsilastir in (("Bitis_tarihi", baslangic, lambda a, d: a >= d),
+                                         ("Bitis_tarihi", bitis, lambda a, d: a < d),
+                                         ("Personel", personel, lambda a, d: a == d),
+                                         ("Arac", arac, lambda a, d: a == d),
+                                         ("Durum", durum, lambda a, d: a == d)):
+            if deger is not None:
+                ifade = karsilastir(ds.field(alan), deger)
+                kosul = ifade if kosul is None else kosul & ifade
+
+        # Eski ay dosyalarında sonradan eklenen sütunlar olmayabilir
+        sema = pa.unify_schemas([pq.read_schema(dosya) for dosya in dosyalar])
+        veri = ds.dataset(dosyalar, schema=sema, format="parquet")
+        return veri.to_table(columns=sutunlar, filter=kosul).to_pandas()
+
+
+if __name__ == "__main__":
+    # Zamanlanmış görev olarak çalıştırılır: python task_archive.py
+    from dotenv import load_dotenv
+    load_dotenv()
+    db_manager = DatabaseManager(backend=backend_olustur())
+    db_manager.connect()
+    arsiv = GorevArsivi(os.getenv("ARSIV_DIZINI", "arsiv"), int(os.getenv("ARSIV_SAKLAMA_GUN", "180")), db_manager)
+    sonuc = arsiv.sikistir()
+    print(f"Toplam {sonuc['tasinan']} satır arşive taşındı.")
+    db_manager.close()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import socket
+import threading
+import unittest
+
+import ollama
+from async_pipeline import AsenkronKomutHatti, AsenkronOllamaIstemcisi, OllamaHatasi
+from benchmarks.fake_ollama import SahteOllama
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+
+YANIT = {"person": "Ali Veli", "task": "kazı", "vehicle": None, "duration": {"value": 1, "unit": "saat"}}
+
+
+def yanit(prompt):
+    return json.dumps(YANIT, ensure_ascii=False)
+
+
+class AsenkronOllamaIstemcisiTesti(unittest.IsolatedAsyncioTestCase):
+    def _sunucu(self, **ayarlar):
+        sunucu = SahteOllama(ilk_parca_gecikmesi=0, parca_gecikmesi=0, yanit=yanit, **ayarlar).baslat()
+        self.addCleanup(sunucu.durdur)
+        return sunucu
+
+    async def _istemci(self, url, **ayarlar):
+        istemci = AsenkronOllamaIstemcisi(url, **ayarlar)
+        self.addAsyncCleanup(istemci.kapat)
+        return istemci
+
+    async def test_govde_bicimleri(self):
+        # chunked akış, Content-Length'li akışsız yanıt ve bağlantı kapanışıyla biten gövde
+        for aktarim in SahteOllama.AKTARIMLAR:
+            sunucu = self._sunucu(aktarim=aktarim)
+            istemci = await self._istemci(sunucu.url)
+            for stream in (True, False):
+                for format in ("json", ""):
+                    with self.subTest(aktarim=aktarim, stream=stream, format=format):
+                        metin = await istemci.uret("Metin: \"Ali Veli kazı\"", stream=stream, format=format)
+                        self.assertEqual(json.loads(metin), YANIT)
+
+    async def test_sonuna_kadar_okunan_yanitin_baglantisi_yeniden_kullanilir(self):
+        sunucu = self._sunucu()
+        istemci = await self._istemci(sunucu.url)
+        for _ in range(3):
+            await istemci.uret("a", stream=False)
+        for _ in range(3):
+            await istemci.uret("a", format="")
+        self.assertEqual((sunucu.istek_sayisi, sunucu.baglanti_sayisi), (6, 1))
+
+    async def test_json_tamamlaninca_akis_baglantisi_kapatilir(self):
+        sunucu = self._sunucu()
+        istemci = await self._istemci(sunucu.url)
+        for _ in range(3):
+            await istemci.uret("a")
+        self.assertEqual(sunucu.baglanti_sayisi, 3)
+        self.assertEqual(istemci._bostakiler, [])
+
+    async def test_kapatilan_baglanti_yeniden_kullanilmaz(self):
+        sunucu = self._sunucu(aktarim="kapat")
+        istemci = await self._istemci(sunucu.url)
+        for _ in range(3):
+            await istemci.uret("a", stream=False)
+        self.assertEqual(sunucu.baglanti_sayisi, 3)
+        self.assertEqual(istemci._bostakiler, [])
+
+    async def test_hatalar_ollama_hatasi_olarak_bildirilir(self):
+        sunucu = self._sunucu()
+        istemci = await self._istemci(sunucu.url + "/yok")
+        with self.assertRaisesRegex(OllamaHatasi, "HTTP 404"):
+            await istemci.uret("a")
+
+        yavas = self._sunucu()
+        yavas.ilk_parca_gecikmesi = 1
+        istemci = await self._istemci(yavas.url)
+        with self.assertRaisesRegex(OllamaHatasi, "zaman aşımı"):
+            await istemci.uret("a", zaman_asimi=0.1)
+
+        # Dinlemeyen bir porta bağlantı reddedilir
+        with socket.socket() as soket:
+            soket.bind(("127.0.0.1", 0))
+            port = soket.getsockname()[1]
+        istemci = await self._istemci(f"http://127.0.0.1:{port}")
+        with self.assertRaises(OllamaHatasi):
+            await istemci.uret("a")
+
+
+class _KayitOnbellegi:
+    """koy() çağrısının hangi iş parçacığında yapıldığını kaydeden önbellek."""
+
+    def __init__(self):
+        self.koyanlar = []
+
+    def al(self, metin, model, surum):
+        return None
+
+    def koy(self, metin, model, surum, sonuc):
+        self.koyanlar.append(threading.current_thread())
+
+
+class AsenkronKomutHattiTesti(unittest.IsolatedAsyncioTestCase):
+    async def test_llm_sonucu_onbellege_olay_dongusu_disinda_yazilir(self):
+        db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        db.connect()
+        self.addCleanup(db.close)
+        onbellek = _KayitOnbellegi()
+        ollama.analiz_onbellegini_ayarla(onbellek)
+        self.addCleanup(ollama.analiz_onbellegini_ayarla, None)
+        sunucu = SahteOllama(ilk_parca_gecikmesi=0, parca_gecikmesi=0, yanit=yanit).baslat()
+        self.addCleanup(sunucu.durdur)
+
+        async with AsenkronKomutHatti(db, istemci=AsenkronOllamaIstemcisi(sunucu.url)) as hat:
+            sonuc = await hat.analyze("Ali Veli vinç ile kazı yapsın 2 saat")
+
+        self.assertEqual(sonuc["kaynak"], "llm")
+        self.assertEqual(len(onbellek.koyanlar), 1)
+        self.assertIsNot(onbellek.koyanlar[0], threading.current_thread())
+
+
+if __name__ == "__main__":
+    unittest.main()
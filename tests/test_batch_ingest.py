@@ -0,0 +1,61 @@
+import unittest
+from datetime import datetime, timedelta
+
+from batch_ingest import TopluKomutIsleyici
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+
+ANALIZLER = {
+    "Ali bitti": {"komut_turu": "gorev_bitti", "person": "Ali Veli"},
+    "Ali vinç 1 kazı": {"komut_turu": "yeni_gorev", "person": "Ali Veli", "vehicle": "Vinç 1", "task": "kazı",
+                        "duration": {"value": 1, "unit": "saat"}},
+    "Ali vinç 2 yükleme": {"komut_turu": "yeni_gorev", "person": "Ali Veli", "vehicle": "Vinç 2",
+                           "task": "yükleme", "duration": {"value": 1, "unit": "saat"}},
+}
+
+
+class KarisikTopluGirisTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        with self.db._baglanti() as baglanti:
+            cursor = baglanti.cursor()
+            self.db.backend.coklu_calistir(cursor, "INSERT INTO Personeller (Personel, Durum) VALUES (?, ?)",
+                                           [("Ali Veli", "Boşta")])
+            self.db.backend.coklu_calistir(cursor, "INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)",
+                                           [("Vinç 1", "Boşta"), ("Vinç 2", "Boşta")])
+            baglanti.commit()
+        # Ali'nin Vinç 1 ile süren bir görevi var
+        self.db.toplu_gorev_ata([{"Personel": "Ali Veli", "Arac": "Vinç 1", "Gorev": "hafriyat",
+                                  "Tahmini_bitis": datetime.now() + timedelta(hours=1)}])
+        self.isleyici = TopluKomutIsleyici(self.db, max_isci=1, analiz=lambda metin, model: ANALIZLER.get(metin))
+
+    def tearDown(self):
+        self.db.close()
+
+    def _sorgula(self, sorgu):
+        with self.db._baglanti() as baglanti:
+            cursor = baglanti.cursor()
+            cursor.execute(sorgu)
+            return cursor.fetchall()
+
+    def test_bitirme_sonrasi_yeni_gorev_yazildigi_sirada_uygulanir(self):
+        rapor = self.isleyici.isle("Ali bitti\nAli vinç 1 kazı")
+
+        self.assertEqual([kayit["Sonuç"] for kayit in rapor], ["tamamlandı", "eklendi"])
+        self.assertEqual([tuple(satir) for satir in self._sorgula("SELECT Personel, Arac, Gorev FROM Aktif_isler")],
+                         [("Ali Veli", "Vinç 1", "kazı")])
+        self.assertEqual([satir[0] for satir in self._sorgula("SELECT Gorev FROM Tamamlanan_isler")], ["hafriyat"])
+        self.assertEqual(self._sorgula("SELECT Durum FROM Personeller WHERE Personel = 'Ali Veli'")[0][0], "Aktif")
+
+    def test_sonraki_satirda_bitirilecek_personele_yeni_gorev_reddedilir(self):
+        rapor = self.isleyici.isle("Ali vinç 2 yükleme\nAli bitti")
+
+        self.assertEqual([kayit["Sonuç"] for kayit in rapor], ["hata", "tamamlandı"])
+        self.assertIn("sonraki bir satırda bitiriliyor", rapor[0]["Mesaj"])
+        self.assertEqual(self._sorgula("SELECT Personel FROM Aktif_isler"), [])
+        self.assertEqual([satir[0] for satir in self._sorgula("SELECT Gorev FROM Tamamlanan_isler")], ["hafriyat"])
+
+
+if __name__ == "__main__":
+    unittest.main()
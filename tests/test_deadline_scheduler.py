@@ -0,0 +1,97 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from deadline_scheduler import BitisZamanlayici
+
+T0 = datetime(2026, 3, 2, 8, 0)
+
+
+def saat(n):
+    return T0 + timedelta(hours=n)
+
+
+class BitisZamanlayiciTesti(unittest.TestCase):
+    def setUp(self):
+        self.zamanlayici = BitisZamanlayici(saat=lambda: T0)
+
+    def test_uzatilan_gorevin_eski_bitisi_tetiklenmez(self):
+        self.zamanlayici.ekle("Ali Veli", saat(1), {"Gorev": "kazı"})
+        self.zamanlayici.ekle("Ayşe Kara", saat(2))
+        self.zamanlayici.ekle("Ali Veli", saat(3), {"Gorev": "kazı"})
+
+        self.assertEqual(self.zamanlayici.sonraki_bitis(), saat(2))
+        self.assertEqual([p for p, _, _ in self.zamanlayici.suresi_dolanlari_al(saat(2.5))], ["Ayşe Kara"])
+        dolanlar = self.zamanlayici.suresi_dolanlari_al(saat(3))
+        self.assertEqual([(p, b, g["Gorev"]) for p, b, g in dolanlar], [("Ali Veli", saat(3), "kazı")])
+        self.assertEqual(self.zamanlayici.suresi_dolanlari_al(saat(10)), [])
+
+    def test_tamamlanan_gorev_tetiklenmez_ve_gecikenlerden_cikar(self):
+        self.zamanlayici.ekle("Ali Veli", saat(1))
+        self.zamanlayici.ekle("Ayşe Kara", saat(2))
+        self.zamanlayici.kaldir("Ali Veli")
+
+        self.assertEqual(self.zamanlayici.sonraki_bitis(), saat(2))
+        self.assertEqual(self.zamanlayici.isle(saat(5)), 1)
+        self.assertEqual(list(self.zamanlayici.gecikenler()), ["Ayşe Kara"])
+        self.zamanlayici.kaldir("Ayşe Kara")
+        self.assertEqual(self.zamanlayici.gecikenler(), {})
+        self.assertIsNone(self.zamanlayici.sonraki_bitis())
+
+    def test_geciken_gorev_uzatilinca_yeniden_beklenir(self):
+        self.zamanlayici.ekle("Ali Veli", saat(1))
+        self.zamanlayici.suresi_dolanlari_al(saat(2))
+        self.zamanlayici.ekle("Ali Veli", saat(4))
+
+        self.assertEqual(self.zamanlayici.gecikenler(), {})
+        self.assertEqual(self.zamanlayici.sonraki_bitis(), saat(4))
+
+    def test_gecersiz_kayitlar_yigini_buyutmez(self):
+        for i in range(1000):
+            self.zamanlayici.ekle(f"Personel {i % 10}", saat(i))
+        self.assertLessEqual(len(self.zamanlayici._yigin), 65)
+        self.assertEqual(len(self.zamanlayici.suresi_dolanlari_al(saat(1000))), 10)
+
+    def test_arka_plan_is_parcacigi_bitiste_geri_cagirir(self):
+        zamanlayici = BitisZamanlayici()
+        tetiklenen = threading.Event()
+        zamanlayici.geri_cagirma_ekle(lambda personel, bitis, gorev: tetiklenen.set())
+        zamanlayici.baslat()
+        try:
+            # Uzak bitiş beklenirken eklenen daha erken bitiş bekleyen iş parçacığını uyandırır
+            zamanlayici.ekle("Ali Veli", datetime.now() + timedelta(hours=1))
+            zamanlayici.ekle("Ayşe Kara", datetime.now() + timedelta(milliseconds=50))
+            self.assertTrue(tetiklenen.wait(5))
+        finally:
+            zamanlayici.durdur()
+        self.assertEqual(list(zamanlayici.gecikenler()), ["Ayşe Kara"])
+
+
+class GorevOlaylariTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        self.db.gorev_ekle("Personeller", {"Personel": "Ali Veli", "Durum": "Boşta"})
+        self.zamanlayici = BitisZamanlayici(self.db)
+        self.zamanlayici.yukle()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_uzatma_ve_tamamlama_olaylari_yigini_gunceller(self):
+        bitis = datetime.now().replace(microsecond=0) + timedelta(hours=1)
+        self.db.aktif_gorev_ekle({"Personel": "Ali Veli", "Gorev": "kazı", "Tahmini_bitis": bitis})
+        self.assertEqual(self.zamanlayici.sonraki_bitis(), bitis)
+
+        self.db.sure_uzat("Ali Veli", 30)
+        self.assertEqual(self.zamanlayici.sonraki_bitis(), bitis + timedelta(minutes=30))
+        self.assertEqual(self.zamanlayici.suresi_dolanlari_al(bitis + timedelta(minutes=10)), [])
+
+        self.db.gorev_tamamla("Ali Veli")
+        self.assertIsNone(self.zamanlayici.sonraki_bitis())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import itertools
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+
+import dispatch_optimizer
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from dispatch_optimizer import GorevDagitici, en_ucuz_eslesme
+from reservation import RezervasyonDefteri
+
+T0 = datetime(2026, 3, 2, 8, 0)
+
+
+def kaba_kuvvet(maliyet):
+    """Tüm permütasyonlar üzerinden en küçük toplam maliyet."""
+    n, m = maliyet.shape
+    if n > m:
+        return kaba_kuvvet(maliyet.T)
+    return min(sum(maliyet[i, j] for i, j in enumerate(sutunlar))
+               for sutunlar in itertools.permutations(range(m), n))
+
+
+class EnUcuzEslesmeTesti(unittest.TestCase):
+    def setUp(self):
+        # scipy kurulu olsa da NumPy Macar uygulaması sınanır
+        yama = mock.patch.object(dispatch_optimizer, "linear_sum_assignment", None)
+        yama.start()
+        self.addCleanup(yama.stop)
+        self.rng = np.random.default_rng(11)
+
+    def _dogrula(self, maliyet):
+        satirlar, sutunlar = en_ucuz_eslesme(maliyet)
+        n, m = maliyet.shape
+        self.assertEqual(len(satirlar), min(n, m))
+        self.assertEqual(len(set(satirlar.tolist())), len(satirlar))
+        self.assertEqual(len(set(sutunlar.tolist())), len(sutunlar))
+        self.assertEqual(satirlar.tolist(), sorted(satirlar.tolist()))
+        self.assertAlmostEqual(maliyet[satirlar, sutunlar].sum(), kaba_kuvvet(maliyet))
+
+    def test_rastgele_kare_ve_genis_matrisler(self):
+        for _ in range(60):
+            n = int(self.rng.integers(1, 6))
+            m = int(self.rng.integers(n, 7))
+            self._dogrula(self.rng.random((n, m)) * 10)
+
+    def test_satir_sayisi_sutunlardan_fazla_olan_matrisler(self):
+        for _ in range(60):
+            m = int(self.rng.integers(1, 5))
+            n = int(self.rng.integers(m + 1, 7))
+            self._dogrula(self.rng.random((n, m)) * 10)
+
+    def test_esit_maliyetli_matrisler(self):
+        for _ in range(60):
+            n = int(self.rng.integers(1, 6))
+            m = int(self.rng.integers(1, 6))
+            self._dogrula(self.rng.integers(0, 3, size=(n, m)).astype(float))
+        self._dogrula(np.zeros((4, 4)))
+        self._dogrula(np.full((3, 5), dispatch_optimizer.UYGUN_DEGIL))
+
+    def test_bos_matris(self):
+        satirlar, sutunlar = en_ucuz_eslesme(np.empty((0, 3)))
+        self.assertEqual((len(satirlar), len(sutunlar)), (0, 0))
+
+
+class PlanlamaTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        self.defter = RezervasyonDefteri(araclar=["Vinç 1", "Vinç 2", "Kamyon 3"], saat=lambda: T0)
+        self.dagitici = GorevDagitici(self.db, defter=self.defter, saat=lambda: T0)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_tur_uyusmazligi_mesgul_kaynak_ve_aracsiz_gorev(self):
+        # Vinç 1 bir saat sonra rezerve; Ayşe şimdi başka bir görevde
+        self.defter.rezerve_et("Vinç 1", None, T0 + timedelta(hours=1), T0 + timedelta(hours=3))
+        self.defter._gorev_olayi('eklendi', "Ayşe Kara", {"Arac": None, "Baslangic_tarihi": T0,
+                                                         "Tahmini_bitis": T0 + timedelta(hours=4)})
+        gorevler = [
+            {"Gorev": "kazı", "Arac_turu": "vinç", "Sure": timedelta(hours=2)},
+            {"Gorev": "keşif", "Arac_turu": None, "Sure": 30},
+            {"Gorev": "nakliye", "Arac_turu": "forklift", "Sure": 60},
+        ]
+
+        atamalar, atanamayanlar = self.dagitici.planla(
+            gorevler, personeller=["Ali Veli", "Ayşe Kara", "Can Demir"], araclar=["Vinç 1", "Vinç 2", "Kamyon 3"])
+
+        atanan = {a["Gorev"]: a for a in atamalar}
+        self.assertEqual(atanan["kazı"]["Arac"], "Vinç 2")
+        self.assertIsNone(atanan["keşif"]["Arac"])
+        self.assertEqual(atanan["keşif"]["Tahmini_bitis"], T0 + timedelta(minutes=30))
+        self.assertNotIn("Ayşe Kara", [a["Personel"] for a in atamalar])
+        self.assertEqual(len({a["Personel"] for a in atamalar}), 2)
+        self.assertEqual([g["Gorev"] for g in atanamayanlar], ["nakliye"])
+
+    def test_kisa_is_dar_bosluga_yerlesir(self):
+        # Vinç 1'in boşluğu bir saat: kısa iş oraya, uzun iş Vinç 2'ye gider
+        self.defter.rezerve_et("Vinç 1", None, T0 + timedelta(hours=1), T0 + timedelta(hours=3))
+        gorevler = [{"Gorev": "uzun", "Arac_turu": "vinç", "Sure": 120},
+                    {"Gorev": "kısa", "Arac_turu": "vinç", "Sure": 45}]
+
+        atamalar, atanamayanlar = self.dagitici.planla(gorevler, personeller=["Ali Veli", "Can Demir"],
+                                                       araclar=["Vinç 1", "Vinç 2"])
+
+        self.assertEqual(atanamayanlar, [])
+        self.assertEqual({a["Gorev"]: a["Arac"] for a in atamalar}, {"uzun": "Vinç 2", "kısa": "Vinç 1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
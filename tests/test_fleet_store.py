@@ -0,0 +1,149 @@
+import random
+import unittest
+
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from fleet_store import DEGISMEZ, DurumDeposu, FiloAynasi
+
+DURUMLAR = ["Boşta", "Aktif", "Bakımda"]
+ARACLAR = ["Vinç 1", "Vinç 2", "Kamyon 3", None]
+
+
+class DurumDeposuTesti(unittest.TestCase):
+    def _indeksleri_dogrula(self, depo, gorunumler):
+        for durum in DURUMLAR:
+            beklenen = [k.ad for k in depo if k.durum == durum]
+            self.assertEqual(set(depo.durumdakiler(durum)), set(beklenen))
+            self.assertEqual(set(gorunumler[durum]), set(beklenen))
+            self.assertEqual(depo.sayi(durum), len(beklenen))
+        for arac in ARACLAR[:-1]:
+            beklenen = {k.ad for k in depo if k.arac == arac}
+            self.assertEqual(set(depo.araci_kullananlar(arac)), beklenen)
+            self.assertEqual(set(gorunumler[arac]), beklenen)
+
+    def test_rastgele_islemlerden_sonra_indeksler_tutarli(self):
+        rng = random.Random(3)
+        depo = DurumDeposu(varsayilan_durum="Boşta")
+        # Görünümler boş depoda alınır; sonraki tüm değişiklikleri göstermeliler
+        gorunumler = {durum: depo.durumdakiler(durum) for durum in DURUMLAR}
+        gorunumler.update({arac: depo.araci_kullananlar(arac) for arac in ARACLAR[:-1]})
+        adlar = [f"Personel {i}" for i in range(8)]
+        for _ in range(500):
+            ad = rng.choice(adlar)
+            islem = rng.randrange(3)
+            if islem == 0:
+                depo.ekle(ad, rng.choice(DURUMLAR), rng.choice(ARACLAR))
+            elif islem == 1:
+                depo.durum_ata(ad, rng.choice(DURUMLAR), rng.choice(ARACLAR + [DEGISMEZ]))
+            else:
+                depo.kaldir(ad)
+            self._indeksleri_dogrula(depo, gorunumler)
+
+    def test_bosalan_kovanin_gorunumu_guncel_kalir(self):
+        depo = DurumDeposu(["Vinç 1"], varsayilan_durum="boşta")
+        calisanlar = depo.durumdakiler("çalışıyor")
+        depo.durum_ata("Vinç 1", "çalışıyor")
+        depo.durum_ata("Vinç 1", "boşta")
+        depo.durum_ata("Vinç 1", "çalışıyor")
+        self.assertEqual(list(calisanlar), ["Vinç 1"])
+
+        kullananlar = depo.araci_kullananlar("Kamyon 3")
+        depo.ekle("Ali Veli", "Aktif", "Kamyon 3")
+        depo.kaldir("Ali Veli")
+        depo.ekle("Ayşe Kara", "Aktif", "Kamyon 3")
+        self.assertEqual(list(kullananlar), ["Ayşe Kara"])
+
+    def test_durum_ata_eski_araci_dondurur(self):
+        depo = DurumDeposu()
+        depo.ekle("Ali Veli", "Aktif", "Vinç 1")
+        self.assertEqual(depo.durum_ata("Ali Veli", "Aktif"), "Vinç 1")
+        self.assertEqual(depo.durum_ata("Ali Veli", "Boşta", None), "Vinç 1")
+        self.assertIsNone(depo.arac("Ali Veli"))
+        self.assertIsNone(depo.durum_ata("Yok", "Boşta"))
+
+    def test_tablo_degisene_kadar_ayni_nesne(self):
+        depo = DurumDeposu(["Vinç 1", "Vinç 2"])
+        tablo = depo.tablo("Araç", "Durum")
+        self.assertIs(depo.tablo("Araç", "Durum"), tablo)
+        depo.durum_ata("Vinç 2", "çalışıyor")
+        self.assertEqual(depo.tablo("Araç", "Durum")["Durum"].tolist(), ["boşta", "çalışıyor"])
+
+
+class FiloAynasiTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        self._yaz("INSERT INTO Personeller (Personel, Durum) VALUES (?, ?)", [("Ali Veli", "Boşta"), ("Ayşe Kara", "Boşta")])
+        self._yaz("INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)", [("Vinç 1", "Boşta"), ("Vinç 2", "Boşta")])
+        self.ayna = FiloAynasi(self.db, mutabakat_araligi=3600)
+        self.assertEqual(self.ayna.mutabakat(), 4)
+        # Sonraki okumaları say: yazma dinleyicisiyle güncellenen ayna tabloyu yeniden okumamalı
+        self.okumalar = 0
+        durum_tablolari_al = self.db.durum_tablolari_al
+
+        def sayarak_oku():
+            self.okumalar += 1
+            return durum_tablolari_al()
+        self.db.durum_tablolari_al = sayarak_oku
+
+    def tearDown(self):
+        self.db.close()
+
+    def _yaz(self, sorgu, satirlar):
+        """DatabaseManager'ı atlayan (başka süreçten gelmiş gibi) yazma."""
+        with self.db._baglanti() as baglanti:
+            self.db.backend.coklu_calistir(baglanti.cursor(), sorgu, satirlar)
+            baglanti.commit()
+
+    def test_yazmalar_bellege_aninda_uygulanir(self):
+        self.db.operatoru_aktif_yap("Ali Veli", "Vinç 1")
+
+        self.assertFalse(self.ayna.personel_musait("Ali Veli"))
+        self.assertFalse(self.ayna.arac_musait("Vinç 1"))
+        self.assertEqual(self.ayna.araci_kullanan("Vinç 1"), "Ali Veli")
+        self.assertEqual(self.ayna.bostaki_araclar(), ["Vinç 2"])
+
+        self.db.operatoru_bosa_al("Ali Veli")
+        self.assertTrue(self.ayna.arac_musait("Vinç 1"))
+        self.assertIsNone(self.ayna.araci_kullanan("Vinç 1"))
+        self.assertEqual(self.okumalar, 0)
+        self.assertEqual(self.ayna.durum_tablolari(), self.db.durum_tablolari_al())
+
+    def test_operator_birakilinca_araci_da_bosa_alinir(self):
+        self.db.operatoru_aktif_yap("Ali Veli", "Vinç 1")
+        # Yalnızca personel satırı bildirilse de araç boşa alınır (veritabanındaki davranış)
+        self.ayna._yazildi(("Personeller",), [("Personeller", "Ali Veli", {"Durum": "Boşta", "Arac": None})])
+
+        self.assertTrue(self.ayna.arac_musait("Vinç 1"))
+        self.assertEqual(self.ayna.durum_tablolari()[0]["Ali Veli"], ("Boşta", None))
+
+    def test_disaridan_yazma_mutabakatta_duzeltilir(self):
+        self._yaz("UPDATE Araclar SET Durum = ? WHERE Arac = ?", [("Aktif", "Vinç 2")])
+        self._yaz("DELETE FROM Personeller WHERE Personel = ?", [("Ayşe Kara",)])
+
+        # Mutabakat aralığı dolmadan bellekteki eski durum kullanılır
+        self.assertTrue(self.ayna.arac_musait("Vinç 2"))
+        self.assertEqual(self.ayna.mutabakat(), 2)
+        self.assertFalse(self.ayna.arac_musait("Vinç 2"))
+        self.assertEqual(self.ayna.personel_adlari(), ["Ali Veli"])
+        self.assertEqual(self.ayna.mutabakat(), 0)
+
+    def test_ayrintisi_bilinmeyen_yazma_yeniden_okutur(self):
+        self.db.gorev_ekle("Personeller", {"Personel": "Can Demir", "Durum": "Boşta"})
+
+        self.assertIn("Can Demir", self.ayna.bostaki_personeller())
+        self.assertEqual(self.okumalar, 1)
+        self.ayna.bostaki_personeller()
+        self.assertEqual(self.okumalar, 1)
+
+    def test_bellekte_olmayan_ada_yazma_yeniden_okutur(self):
+        self._yaz("INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)", [("Kamyon 3", "Boşta")])
+        self.db.operatoru_aktif_yap("Ayşe Kara", "Kamyon 3")
+
+        self.assertFalse(self.ayna.arac_musait("Kamyon 3"))
+        self.assertEqual(self.ayna.araci_kullanan("Kamyon 3"), "Ayşe Kara")
+        self.assertEqual(self.okumalar, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
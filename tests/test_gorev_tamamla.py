@@ -0,0 +1,37 @@
+import unittest
+from datetime import datetime, timedelta
+
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+
+
+class GorevTamamlamaTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        with self.db._baglanti() as baglanti:
+            cursor = baglanti.cursor()
+            self.db.backend.coklu_calistir(cursor, "INSERT INTO Personeller (Personel, Durum, Arac) VALUES (?, ?, ?)",
+                                           [("Ahmet Yılmaz", "Aktif", "Vinç 1"), ("Mehmet Kaya", "Boşta", None)])
+            self.db.backend.coklu_calistir(cursor, "INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)",
+                                           [("Vinç 1", "Aktif"), ("Vinç 2", "Boşta")])
+            baglanti.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_yazildigi_gibi_kaydedilen_adlarla_tamamlanan_gorev_kayitlari_bosa_alir(self):
+        # Görev satırı model çıktısındaki adlarla kaydedilmiş, tamamlama da hatalı yazılmış adla yapılıyor
+        self.db.aktif_gorev_ekle({"Personel": "ahmet", "Arac": "vinç 1", "Gorev": "kazı",
+                                  "Tahmini_bitis": datetime.now() + timedelta(hours=1)})
+
+        self.assertTrue(self.db.gorev_tamamla("ahmett"))
+
+        personeller, araclar = self.db.durum_tablolari_al()
+        self.assertEqual(personeller["Ahmet Yılmaz"], ("Boşta", None))
+        self.assertEqual(araclar["Vinç 1"], "Boşta")
+        self.assertEqual(araclar["Vinç 2"], "Boşta")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime, timedelta
+
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from is_yoneticisi import IsYoneticisi
+from reservation import RezervasyonDefteri
+
+
+class IsEklemeCakismaTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        with self.db._baglanti() as baglanti:
+            cursor = baglanti.cursor()
+            self.db.backend.coklu_calistir(cursor, "INSERT INTO Personeller (Personel, Durum) VALUES (?, ?)",
+                                           [("Ahmet Yılmaz", "Boşta"), ("Mehmet Kaya", "Boşta")])
+            self.db.backend.coklu_calistir(cursor, "INSERT INTO Araclar (Arac, Durum) VALUES (?, ?)",
+                                           [("Vinç 1", "Boşta"), ("Vinç 2", "Boşta")])
+            baglanti.commit()
+        self.defter = RezervasyonDefteri(self.db)
+        self.defter.yukle()
+        self.is_yoneticisi = IsYoneticisi(self.db, self.defter)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _aktif_isler(self):
+        with self.db._baglanti() as baglanti:
+            cursor = baglanti.cursor()
+            cursor.execute("SELECT Personel, Arac FROM Aktif_isler ORDER BY Personel")
+            return [tuple(satir) for satir in cursor.fetchall()]
+
+    def test_yazildigi_gibi_verilen_adlar_kayitli_adlarla_eklenir(self):
+        bitis = datetime.now() + timedelta(hours=2)
+        self.assertTrue(self.is_yoneticisi.is_ekle("ahmet", "vinç 1", "kazı", bitis))
+
+        self.assertEqual(self._aktif_isler(), [("Ahmet Yılmaz", "Vinç 1")])
+        self.assertEqual([r["Arac"] for r in self.defter.rezervasyonlar(arac="Vinç 1")], ["Vinç 1"])
+
+    def test_ayni_araca_farkli_yazimla_ikinci_gorev_reddedilir(self):
+        bitis = datetime.now() + timedelta(hours=2)
+        self.assertTrue(self.is_yoneticisi.is_ekle("ahmet", "vinç 1", "kazı", bitis))
+
+        self.assertFalse(self.is_yoneticisi.is_ekle("Mehmet Kaya", "Vinç 1", "yükleme", bitis))
+        self.assertEqual([c["Neden"] for c in self.is_yoneticisi.son_cakisma["cakismalar"]], ["araç"])
+        self.assertEqual(self.is_yoneticisi.son_cakisma["alternatifler"]["araclar"], ["Vinç 2"])
+        self.assertEqual(self._aktif_isler(), [("Ahmet Yılmaz", "Vinç 1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import unittest
+
+from thefuzz import process
+
+from arac_yoneticisi import AracYoneticisi
+from name_index import IsimIndeksi, eslesme_skoru, isim_normalize
+from operator_manager import OperatorYoneticisi
+
+ADLAR = ["Ahmet", "Mehmet", "Ali", "Ayşe", "Fatma", "Can", "Cem", "Deniz", "Emre", "Şükrü", "İsmail", "Gül"]
+SOYADLAR = ["Yılmaz", "Kaya", "Kara", "Demir", "Baydemir", "Çelik", "Öztürk", "Aydın", "Şahin", "Koç"]
+ARACLAR = ["Vinç 1", "Vinç 2", "Vinç 10", "Kamyon 3", "Kamyon 12", "Forklift 4", "Kepçe 5", "Beton Pompası 6"]
+
+
+def yazim_hatasi(ad, rng):
+    """Ada rastgele bir harf silme, ekleme, değiştirme veya yer değiştirme uygular."""
+    i = rng.randrange(len(ad))
+    harf = rng.choice("abcdeiklmnorstuyz")
+    islem = rng.randrange(4)
+    if islem == 0:
+        return ad[:i] + ad[i + 1:]
+    if islem == 1:
+        return ad[:i] + harf + ad[i:]
+    if islem == 2:
+        return ad[:i] + harf + ad[i + 1:]
+    return ad[:i] + ad[i + 1:i + 2] + ad[i:i + 1] + ad[i + 2:] if i + 1 < len(ad) else ad
+
+
+def kaba_kuvvet(adlar, aranan, limit, esik):
+    """İndeks öncesi doğrusal tarama: tüm adlar puanlanır."""
+    aranan_norm = isim_normalize(aranan)
+    sonuclar = [(-eslesme_skoru(aranan_norm, isim_normalize(ad)), sira) for sira, ad in enumerate(adlar)]
+    sonuclar = sorted(s for s in sonuclar if -s[0] >= esik)
+    return [(adlar[sira], -skor) for skor, sira in sonuclar[:limit]]
+
+
+class IsimIndeksiTesti(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(5)
+        self.kadro = [f"{ad} {soyad}" for ad in ADLAR for soyad in SOYADLAR]
+
+    def test_ara_dogrusal_taramayla_ayni_sonucu_verir(self):
+        indeks = IsimIndeksi(self.kadro)
+        for _ in range(400):
+            ad = self.rng.choice(self.kadro)
+            aranan = self.rng.choice([ad, ad.lower(), ad.split()[0], ad.split()[1], yazim_hatasi(ad, self.rng),
+                                      f"{yazim_hatasi(ad.split()[0], self.rng)} {ad.split()[1]}"])
+            with self.subTest(aranan=aranan):
+                beklenen = kaba_kuvvet(self.kadro, aranan, 5, 60)
+                if isim_normalize(aranan) in map(isim_normalize, self.kadro):
+                    beklenen = beklenen[:1]
+                self.assertEqual(indeks.ara(aranan), beklenen)
+
+    def test_tam_eslesme_turkce_karakterleri_ve_buyuk_harfi_yok_sayar(self):
+        indeks = IsimIndeksi(self.kadro)
+        self.assertEqual(indeks.tam("sukru  OZTURK"), "Şükrü Öztürk")
+        self.assertEqual(indeks.tam("İSMAİL KOÇ"), "İsmail Koç")
+        self.assertIsNone(indeks.tam("Ahmet"))
+
+    def test_kaldirilan_ad_aranmaz_yeniden_eklenebilir(self):
+        indeks = IsimIndeksi(self.kadro)
+        indeks.kaldir("Ali Baydemir")
+        self.assertNotIn("Ali Baydemir", indeks)
+        self.assertNotIn("Ali Baydemir", [ad for ad, _ in indeks.ara("Baydemir", limit=20)])
+        self.assertEqual(len(indeks), len(self.kadro) - 1)
+        indeks.ekle("Ali Baydemir")
+        self.assertEqual(indeks.en_iyi("ali baydemir"), "Ali Baydemir")
+
+
+class BulanikEslesmeTesti(unittest.TestCase):
+    """Yöneticilerin eşleşmeleri tüm listede thefuzz.extractOne ile aynı olmalı."""
+
+    def setUp(self):
+        self.rng = random.Random(9)
+        self.kadro = [f"{ad} {soyad}" for ad in ADLAR for soyad in SOYADLAR]
+
+    def test_operator_yazim_hatalari(self):
+        yonetici = OperatorYoneticisi(self.kadro)
+        for _ in range(300):
+            aranan = yazim_hatasi(self.rng.choice(self.kadro), self.rng)
+            eslesme = process.extractOne(aranan, self.kadro, score_cutoff=70)
+            with self.subTest(aranan=aranan):
+                self.assertEqual(yonetici.operator_bul(aranan), eslesme[0] if eslesme else None)
+
+    def test_arac_yazim_hatalari(self):
+        yonetici = AracYoneticisi(ARACLAR)
+        for _ in range(300):
+            aranan = yazim_hatasi(self.rng.choice(ARACLAR), self.rng)
+            eslesme = process.extractOne(aranan, ARACLAR, score_cutoff=80)
+            with self.subTest(aranan=aranan):
+                self.assertEqual(yonetici._arac_bul(aranan), eslesme[0] if eslesme else None)
+
+    def test_normalize_hali_ayni_olan_ad_dogrudan_bulunur(self):
+        self.assertEqual(AracYoneticisi(ARACLAR)._arac_bul("vinc 1"), "Vinç 1")
+        self.assertEqual(OperatorYoneticisi(self.kadro).operator_bul("sukru sahin"), "Şükrü Şahin")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from reservation import ACIK_UC, AralikAgaci, RezervasyonDefteri
+
+T0 = datetime(2026, 3, 2, 8, 0)
+
+
+def saat(n):
+    return T0 + timedelta(hours=n)
+
+
+class AralikAgaciTesti(unittest.TestCase):
+    def test_kaba_kuvvetle_ayni_sonucu_verir(self):
+        rng = random.Random(7)
+        agac = AralikAgaci()
+        kayitlar = {}
+        for adim in range(600):
+            if kayitlar and rng.random() < 0.3:
+                kimlik = rng.choice(list(kayitlar))
+                del kayitlar[kimlik]
+                self.assertTrue(agac.sil(kimlik))
+            else:
+                kimlik = rng.randrange(150)
+                bas = rng.randrange(100)
+                kayitlar[kimlik] = (bas, bas + rng.randrange(1, 20))
+                agac.ekle(kayitlar[kimlik][0], kayitlar[kimlik][1], kimlik)
+            self.assertEqual(len(agac), len(kayitlar))
+
+            bas = rng.randrange(-5, 120)
+            bit = bas + rng.randrange(1, 30)
+            beklenen = sorted((b, e, k) for k, (b, e) in kayitlar.items() if b < bit and e > bas)
+            bulunan = agac.kesisenler(bas, bit)
+            self.assertEqual(sorted(bulunan), beklenen)
+            self.assertEqual([b for b, _, _ in bulunan], sorted(b for b, _, _ in bulunan))
+
+            beklenen = sorted((b, e, k) for k, (b, e) in kayitlar.items() if e > bas)
+            bulunan = list(agac.sonrakiler(bas))
+            self.assertEqual(sorted(bulunan), beklenen)
+            self.assertEqual([b for b, _, _ in bulunan], sorted(b for b, _, _ in bulunan))
+
+    def test_silinmeyen_kimlik_false_doner(self):
+        agac = AralikAgaci()
+        agac.ekle(1, 2, "a")
+        self.assertFalse(agac.sil("b"))
+        self.assertIn("a", agac)
+
+
+class RezervasyonDefteriTesti(unittest.TestCase):
+    def setUp(self):
+        self.defter = RezervasyonDefteri(araclar=["Vinç 1", "Vinç 2", "Kamyon 3"], saat=lambda: T0)
+
+    def _gorev_ekle(self, personel, arac, bas, bitis):
+        self.defter._gorev_olayi('eklendi', personel, {"Arac": arac, "Baslangic_tarihi": bas, "Tahmini_bitis": bitis})
+
+    def test_kesisen_aralik_reddedilir_bitisik_aralik_kabul_edilir(self):
+        kimlik, hata = self.defter.rezerve_et("Vinç 1", "Ali Veli", saat(2), saat(4))
+        self.assertIsNotNone(kimlik)
+        self.assertIsNone(hata)
+
+        kimlik, hata = self.defter.rezerve_et("Vinç 1", "Ayşe Kara", saat(3), saat(5))
+        self.assertIsNone(kimlik)
+        self.assertEqual([c["Neden"] for c in hata["cakismalar"]], ["araç"])
+        self.assertEqual(hata["alternatifler"], {"araclar": ["Vinç 2"], "ilk_bos": saat(4)})
+
+        self.assertIsNotNone(self.defter.rezerve_et("Vinç 1", "Ayşe Kara", saat(4), saat(5))[0])
+        self.assertIsNotNone(self.defter.rezerve_et("Vinç 1", "Ayşe Kara", saat(1), saat(2))[0])
+        self.assertEqual(self.defter.cakismalar("Vinç 2", "Ali Veli", saat(3), saat(3.5))[0]["Neden"], "personel")
+
+    def test_kendi_rezervasyonunu_ayni_aracla_kullanmak_cakisma_degildir(self):
+        self.defter.rezerve_et("Vinç 1", "Ali Veli", saat(2), saat(4))
+        self.assertEqual(self.defter.cakismalar("Vinç 1", "Ali Veli", saat(2), saat(3)), [])
+        self.assertEqual(len(self.defter.cakismalar("Vinç 1", "Ayşe Kara", saat(2), saat(3))), 1)
+
+    def test_bitisi_olmayan_aktif_gorev_sonsuza_kadar_mesgul(self):
+        self._gorev_ekle("Ali Veli", "Vinç 1", T0, None)
+
+        self.assertEqual(len(self.defter.cakismalar("Vinç 1", None, saat(100), saat(101))), 1)
+        self.assertEqual(self.defter.bos_kalacagi_zaman(arac="Vinç 1"), T0)
+        self.assertIsNone(self.defter.sonraki_bos_aralik(timedelta(hours=1), araclar=["Vinç 1"]))
+
+        self.defter._gorev_olayi('tamamlandi', "Ali Veli", {})
+        self.assertEqual(self.defter.cakismalar("Vinç 1", None, saat(100), saat(101)), [])
+
+    def test_bitisi_gecen_aktif_gorev_simdiyi_engeller_ileriyi_engellemez(self):
+        self._gorev_ekle("Ali Veli", "Vinç 1", saat(-3), saat(-1))
+
+        self.assertEqual(len(self.defter.cakismalar("Vinç 1", None, T0, saat(1))), 1)
+        self.assertEqual(len(self.defter.cakismalar(None, "Ali Veli", T0, saat(1))), 1)
+        self.assertEqual(self.defter.cakismalar("Vinç 1", None, saat(2), saat(3)), [])
+        self.assertEqual(self.defter.sonraki_bos_aralik(timedelta(hours=1), araclar=["Vinç 1"]),
+                         ("Vinç 1", T0 + RezervasyonDefteri.SIMDI_PAYI))
+
+        # Uzatılan görev yeni bitişine kadar ileri tarihli istekleri de engeller
+        self.defter._gorev_olayi('uzatildi', "Ali Veli", {"Tahmini_bitis": saat(3)})
+        self.assertEqual(len(self.defter.cakismalar("Vinç 1", None, saat(2), saat(4))), 1)
+
+    def test_ilk_bosluk_yeterince_uzun_araligi_bulur(self):
+        self.defter.rezerve_et("Vinç 1", None, T0, saat(1))
+        self.defter.rezerve_et("Vinç 1", None, saat(1.5), saat(3))
+
+        self.assertEqual(self.defter._ilk_bosluk(("arac", "Vinç 1"), T0, timedelta(minutes=30)), saat(1))
+        self.assertEqual(self.defter._ilk_bosluk(("arac", "Vinç 1"), T0, timedelta(hours=1)), saat(3))
+        self.assertEqual(self.defter._ilk_bosluk(("arac", "Vinç 2"), saat(2), timedelta(hours=1)), saat(2))
+
+    def test_bos_aralik_arac_ve_operator_takvimlerinin_ortak_boslugudur(self):
+        # Araç 0-2 arası, operatör başka araçla 2-3 ve 3.5-5 arası dolu
+        self.defter.rezerve_et("Vinç 1", "Ayşe Kara", T0, saat(2))
+        self.defter.rezerve_et("Kamyon 3", "Ali Veli", saat(2), saat(3))
+        self.defter.rezerve_et("Kamyon 3", "Ali Veli", saat(3.5), saat(5))
+        sure = timedelta(hours=1)
+
+        self.assertEqual(self.defter.sonraki_bos_aralik(sure, araclar=["Vinç 1"]), ("Vinç 1", saat(2)))
+        self.assertEqual(self.defter.sonraki_bos_aralik(sure, araclar=["Vinç 1"], personel="Ali Veli"),
+                         ("Vinç 1", saat(5)))
+        # Türe göre arama en erken boşalan aracı seçer
+        self.assertEqual(self.defter.sonraki_bos_aralik(sure, tur="vinç"), ("Vinç 2", T0))
+        self.assertEqual(self.defter.sonraki_bos_aralik(sure, tur="vinç", personel="Ali Veli"), ("Vinç 2", T0))
+
+        self.assertEqual(self.defter.alternatifler("Vinç 1", "Ali Veli", saat(1), saat(2)),
+                         {"araclar": ["Vinç 2"], "ilk_bos": saat(5)})
+        self.assertEqual(self.defter.alternatifler(None, "Ali Veli", saat(2), saat(3)),
+                         {"araclar": [], "ilk_bos": saat(5)})
+        self.assertEqual(self.defter.bos_kalacagi_zaman(personel="Ali Veli"), saat(2))
+        self.assertEqual(self.defter.bos_kalacagi_zaman(arac="Vinç 2"), ACIK_UC)
+
+
+if __name__ == "__main__":
+    unittest.main()
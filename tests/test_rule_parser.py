@@ -0,0 +1,90 @@
+import unittest
+
+import ollama
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from rule_parser import KuralAyristirici
+
+PERSONELLER = ["Ali Baydemir", "Ahmet Yılmaz", "Mehmet Kaya", "Mehmet Kara"]
+ARACLAR = ["Vinç 1", "Vinç 2", "Kamyon 3"]
+
+
+def yeni_gorev(kisi, gorev, sure, arac=None):
+    return {"komut_turu": "yeni_gorev", "person": kisi, "task": gorev, "duration": sure, "vehicle": arac}
+
+
+def uzatma(kisi, sure):
+    return {"komut_turu": "sure_uzatma", "person": kisi, "duration": sure}
+
+
+# (metin, beklenen sonuç); None: karar LLM'e bırakılır
+ORNEKLER = [
+    ("Ali Baydemir on beş dakika vinç 1 ile kazı",
+     yeni_gorev("Ali Baydemir", "kazı", {"value": 15, "unit": "dakika"}, "Vinç 1")),
+    ("Ahmet Yılmaz bir buçuk saat kamyon 3 yükleme",
+     yeni_gorev("Ahmet Yılmaz", "yükleme", {"value": 90, "unit": "dakika"}, "Kamyon 3")),
+    ("Ahmet Yılmaz iki saat buçuk temizlik",
+     yeni_gorev("Ahmet Yılmaz", "temizlik", {"value": 150, "unit": "dakika"})),
+    ("Ali Baydemir 1,5 saat vinç 2 ile kamyon 3 yükleme",
+     yeni_gorev("Ali Baydemir", "yükleme", {"value": 90, "unit": "dakika"}, "Vinç 2")),
+    ("Ali Baydemir vinç 2 kamyon 3 ile yükleme 2 saat",
+     yeni_gorev("Ali Baydemir", "yükleme", {"value": 2, "unit": "saat"}, "Kamyon 3")),
+    ("Ali Baydemir yarım gün vinç 2 ile kazı",
+     yeni_gorev("Ali Baydemir", "kazı", {"value": 12, "unit": "saat"}, "Vinç 2")),
+    ("Ahmet Yılmaz bekleyecek 1 saat",
+     yeni_gorev("Ahmet Yılmaz", "bekleyecek", {"value": 1, "unit": "saat"})),
+    ("Ahmet Yılmaz görevini 1 saat uzat lütfen", uzatma("Ahmet Yılmaz", {"value": 1, "unit": "saat"})),
+    ("Ahmet Yılmaz işini 30 dk daha uzatın", uzatma("Ahmet Yılmaz", {"value": 30, "unit": "dakika"})),
+    ("Ali Baydemir 2 saat daha", uzatma("Ali Baydemir", {"value": 2, "unit": "saat"})),
+    ("Ali Baydemir'in işi bitti", {"komut_turu": "gorev_bitti", "person": "Ali Baydemir"}),
+    # Listede olmayan araç, birden çok ya da belirsiz kişi, yorumlanamayan ifade
+    ("Ahmet Yılmaz vinç 7 ile kazı 2 saat", None),
+    ("Mehmet 2 saat kazı", None),
+    ("Ali Baydemir ve Ahmet Yılmaz kazı", None),
+    ("Ahmet Yılmaz 2 saat vinç 1 uzat", None),
+    ("Ahmet Yılmaz uzat", None),
+    ("Ali Baydemir 3 kazı", None),
+    ("Ali Baydemir 2 saat", None),
+    ("", None),
+]
+
+
+class KuralAyristiriciTesti(unittest.TestCase):
+    def test_ornekler(self):
+        ayristirici = KuralAyristirici(PERSONELLER, ARACLAR)
+        for metin, beklenen in ORNEKLER:
+            with self.subTest(metin=metin):
+                self.assertEqual(ayristirici.ayristir(metin)[0], beklenen)
+
+
+class KuralSozluguTazelemeTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        self.db.gorev_ekle("Personeller", {"Personel": "Ali Baydemir", "Durum": "Boşta"})
+        self.db.gorev_ekle("Araclar", {"Arac": "Vinç 1", "Durum": "Boşta"})
+        ollama.kural_sozlugu_baglan(self.db)
+
+    def tearDown(self):
+        ollama._kural_kaynagi = None
+        ollama._kural_ayristirici = None
+        self.db.close()
+
+    def test_yeni_eklenen_personel_ve_arac_taninir(self):
+        self.assertIsNone(ollama._kural_ayristirici.ayristir("Can Demir 1 saat kamyon 3 ile yükleme")[0])
+
+        self.db.gorev_ekle("Personeller", {"Personel": "Can Demir", "Durum": "Boşta"})
+        self.db.gorev_ekle("Araclar", {"Arac": "Kamyon 3", "Durum": "Boşta"})
+
+        sonuc, istek = ollama.yerel_analiz("Can Demir 1 saat kamyon 3 ile yükleme")
+        self.assertIsNone(istek)
+        self.assertEqual((sonuc["person"], sonuc["vehicle"], sonuc["kaynak"]), ("Can Demir", "Kamyon 3", "kural"))
+
+    def test_surum_degismedikce_listeler_yeniden_okunmaz(self):
+        ayristirici = ollama._kural_ayristirici
+        ollama.yerel_analiz("Ali Baydemir 1 saat vinç 1 ile kazı")
+        self.assertIs(ollama._kural_ayristirici, ayristirici)
+
+
+if __name__ == "__main__":
+    unittest.main()
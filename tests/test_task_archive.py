@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import task_archive
+from database_backends import SqliteBackend
+from database_manager import DatabaseManager
+from task_archive import GorevArsivi
+
+SIMDI = datetime(2026, 6, 1)
+
+
+@unittest.skipIf(task_archive.pa is None, "pyarrow kurulu değil")
+class GorevArsiviTesti(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(backend=SqliteBackend(":memory:"))
+        self.db.connect()
+        gecici = tempfile.TemporaryDirectory()
+        self.addCleanup(gecici.cleanup)
+        self.arsiv = GorevArsivi(os.path.join(gecici.name, "arsiv"), saklama_gun=30, db_manager=self.db)
+        # Ocak-Mart arasında 90 eski iş ve saklama süresi içinde 5 iş
+        satirlar = [(f"Personel {i % 4}", f"Vinç {i % 3}", "kazı", datetime(2026, 1, 1) + timedelta(days=i))
+                    for i in range(90)]
+        satirlar += [("Personel 0", "Vinç 0", "yükleme", SIMDI - timedelta(days=i)) for i in range(5)]
+        with self.db._baglanti() as baglanti:
+            self.db.backend.coklu_calistir(
+                baglanti.cursor(), "INSERT INTO Tamamlanan_isler (Personel, Arac, Gorev, Bitis_tarihi, Durum) "
+                                   "VALUES (?, ?, ?, ?, 'Tamamlandı')", satirlar)
+            baglanti.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _canli_sayisi(self):
+        with self.db._baglanti() as baglanti:
+            cursor = baglanti.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Tamamlanan_isler")
+            return cursor.fetchone()[0]
+
+    def _dosyalar(self):
+        return [dosya for yil, ay in self.arsiv.aylar() for dosya in self.arsiv._ay_dosyalari(yil, ay)]
+
+    def test_her_parca_yeni_dosya_olarak_yazilir(self):
+        sonuc = self.arsiv.sikistir(SIMDI, parca_boyutu=20)
+
+        self.assertEqual(sonuc, {"tasinan": 90, "aylar": [(2026, 1), (2026, 2), (2026, 3)]})
+        self.assertEqual(self._canli_sayisi(), 5)
+        # 20'lik 5 parça; ay sınırına düşen parçalar iki aya bölünür
+        self.assertEqual(len(self._dosyalar()), 7)
+        df = self.arsiv.sorgula()
+        self.assertEqual(len(df), 90)
+        self.assertEqual(df["ID"].nunique(), 90)
+        self.assertEqual(len(self.arsiv.sorgula(datetime(2026, 2, 1), datetime(2026, 3, 1), arac="Vinç 1")), 10)
+
+    def test_sonraki_calistirma_mevcut_dosyalari_yeniden_yazmaz(self):
+        self.arsiv.sikistir(SIMDI, parca_boyutu=50)
+        oncekiler = {dosya: os.stat(dosya).st_mtime_ns for dosya in self._dosyalar()}
+
+        sonuc = self.arsiv.sikistir(SIMDI + timedelta(days=40), parca_boyutu=50)
+
+        self.assertEqual(sonuc, {"tasinan": 5, "aylar": [(2026, 5), (2026, 6)]})
+        self.assertEqual({dosya: os.stat(dosya).st_mtime_ns for dosya in oncekiler}, oncekiler)
+        self.assertEqual(len(self._dosyalar()), len(oncekiler) + 2)
+        self.assertEqual(len(self.arsiv.sorgula()), 95)
+
+    def test_silme_basarisiz_olunca_tekrar_calistirma_cift_kayit_yazmaz(self):
+        with mock.patch.object(self.db, "tamamlananlari_sil", return_value=None):
+            self.assertEqual(self.arsiv.sikistir(SIMDI, parca_boyutu=40)["tasinan"], 0)
+        self.assertEqual(self._canli_sayisi(), 95)
+        dosya_sayisi = len(self._dosyalar())
+
+        self.assertEqual(self.arsiv.sikistir(SIMDI, parca_boyutu=40)["tasinan"], 90)
+
+        df = self.arsiv.sorgula()
+        self.assertEqual((len(df), df["ID"].nunique()), (90, 90))
+        self.assertEqual(self._canli_sayisi(), 5)
+        self.assertGreater(len(self._dosyalar()), dosya_sayisi)
+
+    def test_eski_tek_dosyali_aylar_okunur(self):
+        self.arsiv.sikistir(SIMDI, parca_boyutu=100)
+        ocak = self.arsiv._ay_dosyalari(2026, 1)
+        self.assertEqual(len(ocak), 1)
+        os.replace(ocak[0], os.path.join(os.path.dirname(ocak[0]), "tamamlanan.parquet"))
+
+        self.assertEqual(len(self.arsiv.sorgula(datetime(2026, 1, 1), datetime(2026, 2, 1))), 31)
+
+
+if __name__ == "__main__":
+    unittest.main()